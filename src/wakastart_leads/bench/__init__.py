@@ -0,0 +1 @@
+"""Outils de benchmark (micro-benchmarks et harnais de charge hors-ligne)."""
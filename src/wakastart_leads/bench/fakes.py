@@ -0,0 +1,480 @@
+"""Doublures locales des fournisseurs (LLMs et APIs) pour le harnais de charge.
+
+- `FakeProviderServer` : serveur HTTP local qui imite Serper, Sirene, Apollo,
+  Gamma, Unavatar et les pages web a scraper.
+- `FakeLLM` : LLM CrewAI scripte (format ReAct) qui appelle les outils de l'agent
+  puis produit une reponse finale plausible pour chaque tache.
+
+Chaque fournisseur a un profil de latence (log-normale parametree par la mediane
+et le p95) ainsi qu'un taux d'erreurs et de reponses 429.
+"""
+
+import json
+import math
+import random
+import re
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+from urllib.parse import parse_qs, urlparse
+
+from crewai.llms.base_llm import BaseLLM
+
+from wakastart_leads.shared.tools.registry import is_valid_siren
+from wakastart_leads.shared.utils.parallel_runner import CSV_HEADER
+
+HTTP_PROVIDERS = ("serper", "sirene", "apollo", "gamma", "unavatar", "site")
+LLM_PROVIDERS = ("gemini", "anthropic", "openai")
+
+# Domaine fictif des URLs de benchmark : https://company-{i}.bench.local
+BENCH_DOMAIN_SUFFIX = "bench.local"
+_COMPANY_RE = re.compile(r"company-(\d+)\b")
+
+
+class FakeRateLimitError(RuntimeError):
+    """Erreur 429 simulee par un LLM factice."""
+
+
+class FakeProviderError(RuntimeError):
+    """Erreur serveur simulee par un LLM factice."""
+
+
+@dataclass
+class ProviderProfile:
+    """Profil de comportement d'un fournisseur simule."""
+
+    median_ms: float = 100.0
+    p95_ms: float = 300.0
+    error_rate: float = 0.0
+    rate_limit_rate: float = 0.0
+
+    def sample_latency(self, rng: random.Random) -> float:
+        """Tire une latence (secondes) selon une log-normale (mediane, p95)."""
+        if self.median_ms <= 0:
+            return 0.0
+        sigma = math.log(max(self.p95_ms, self.median_ms) / self.median_ms) / 1.645
+        return rng.lognormvariate(math.log(self.median_ms), sigma) / 1000.0
+
+    def sample_outcome(self, rng: random.Random) -> str:
+        """Tire l'issue d'un appel : "ok", "error" ou "rate_limited"."""
+        draw = rng.random()
+        if draw < self.rate_limit_rate:
+            return "rate_limited"
+        if draw < self.rate_limit_rate + self.error_rate:
+            return "error"
+        return "ok"
+
+
+@dataclass
+class BenchProfiles:
+    """Profils de tous les fournisseurs simules."""
+
+    profiles: dict[str, ProviderProfile] = field(default_factory=dict)
+    seed: int = 42
+
+    def get(self, provider: str) -> ProviderProfile:
+        return self.profiles.get(provider, ProviderProfile())
+
+    @classmethod
+    def build(
+        cls,
+        llm: ProviderProfile,
+        api: ProviderProfile,
+        overrides: dict[str, dict] | None = None,
+        seed: int = 42,
+    ) -> "BenchProfiles":
+        """Construit les profils : `llm` pour les LLMs, `api` pour les APIs, puis surcharges par fournisseur."""
+        profiles = {name: ProviderProfile(**vars(llm)) for name in LLM_PROVIDERS}
+        profiles.update({name: ProviderProfile(**vars(api)) for name in HTTP_PROVIDERS})
+        for name, values in (overrides or {}).items():
+            base = vars(profiles.get(name, ProviderProfile()))
+            profiles[name] = ProviderProfile(**(base | values))
+        return cls(profiles=profiles, seed=seed)
+
+
+class ProviderStats:
+    """Compteurs thread-safe d'appels par fournisseur."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.calls: Counter[str] = Counter()
+        self.errors: Counter[str] = Counter()
+        self.rate_limited: Counter[str] = Counter()
+
+    def record(self, provider: str, outcome: str) -> None:
+        with self._lock:
+            self.calls[provider] += 1
+            if outcome == "error":
+                self.errors[provider] += 1
+            elif outcome == "rate_limited":
+                self.rate_limited[provider] += 1
+
+    def as_dict(self) -> dict[str, dict[str, int]]:
+        with self._lock:
+            return {
+                name: {
+                    "calls": self.calls[name],
+                    "errors": self.errors[name],
+                    "rate_limited": self.rate_limited[name],
+                }
+                for name in sorted(self.calls)
+            }
+
+
+def company_index(text: str) -> int:
+    """Extrait l'index d'entreprise d'un texte contenant une URL de benchmark (0 si absent)."""
+    match = _COMPANY_RE.search(text)
+    return int(match.group(1)) if match else 0
+
+
+def bench_url(index: int) -> str:
+    """URL fictive d'une entreprise de benchmark."""
+    return f"https://company-{index}.{BENCH_DOMAIN_SUFFIX}"
+
+
+def bench_siren(index: int) -> str:
+    """SIREN fictif (9 chiffres, cle de Luhn valide) d'une entreprise de benchmark."""
+    base = f"{90000000 + index:08d}"
+    return next(base + str(key) for key in range(10) if is_valid_siren(base + str(key)))
+
+
+def bench_siren_index(siren: str) -> int:
+    """Index de l'entreprise de benchmark d'un SIREN fictif."""
+    return int(siren[:8]) - 90000000
+
+
+# ---------------------------------------------------------------------------
+# Serveur HTTP factice
+# ---------------------------------------------------------------------------
+
+
+class _FakeHandler(BaseHTTPRequestHandler):
+    """Routeur HTTP : /{provider}/... -> reponse JSON ou HTML factice."""
+
+    server: "_FakeHTTPServer"
+
+    def log_message(self, format: str, *args: Any) -> None:
+        return
+
+    def do_GET(self) -> None:
+        self._handle("GET")
+
+    def do_POST(self) -> None:
+        self._handle("POST")
+
+    def do_HEAD(self) -> None:
+        self._handle("HEAD")
+
+    def _handle(self, method: str) -> None:
+        parsed = urlparse(self.path)
+        parts = [p for p in parsed.path.split("/") if p]
+        provider = parts[0] if parts else ""
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length).decode("utf-8") if length else ""
+
+        outcome = self.server.apply_profile(provider)
+        if outcome == "rate_limited":
+            self._send(429, {"message": "Too Many Requests (fake)"})
+            return
+        if outcome == "error":
+            self._send(500, {"message": "Internal Server Error (fake)"})
+            return
+
+        status, payload = _route(provider, parts[1:], parse_qs(parsed.query), body, method)
+        self._send(status, payload, head_only=method == "HEAD")
+
+    def _send(self, status: int, payload: Any, head_only: bool = False) -> None:
+        if isinstance(payload, str):
+            data = payload.encode("utf-8")
+            content_type = "text/html; charset=utf-8"
+        else:
+            data = json.dumps(payload).encode("utf-8")
+            content_type = "application/json"
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        if not head_only:
+            self.wfile.write(data)
+
+
+def _route(provider: str, parts: list[str], query: dict[str, list[str]], body: str, method: str) -> tuple[int, Any]:
+    """Construit la reponse factice d'un fournisseur."""
+    text = " ".join(parts) + " " + body + " " + json.dumps(query)
+    index = company_index(text)
+
+    if provider == "serper":
+        return 200, {
+            "searchParameters": {"q": json.loads(body or "{}").get("q", "")},
+            "organic": [
+                {
+                    "title": f"Company {index} - SaaS B2B",
+                    "link": bench_url(index),
+                    "snippet": f"Company {index} edite une plateforme SaaS. SIREN {bench_siren(index)}.",
+                    "position": 1,
+                }
+            ],
+            "credits": 1,
+        }
+
+    if provider == "sirene":
+        if parts[:1] == ["siren"] and len(parts) > 1:
+            siren = parts[1]
+            return 200, {"uniteLegale": _fake_unite_legale(siren, bench_siren_index(siren))}
+        return 200, {"unitesLegales": [_fake_unite_legale(bench_siren(index), index)]}
+
+    if provider == "apollo":
+        if parts[-1:] == ["api_search"]:
+            return 200, {
+                "people": [
+                    {"id": f"apollo-{index}-{n}", "first_name": name, "title": title, "has_email": True}
+                    for n, (name, title) in enumerate([("Jean", "CEO"), ("Marie", "CTO"), ("Luc", "VP Sales")])
+                ]
+            }
+        person_id = json.loads(body or "{}").get("id", f"apollo-{index}-0")
+        index = int(person_id.split("-")[1]) if person_id.count("-") == 2 else index
+        return 200, {
+            "person": {
+                "id": person_id,
+                "first_name": "Jean",
+                "last_name": f"Dupont{index}",
+                "title": "CEO",
+                "email": f"jean@company-{index}.{BENCH_DOMAIN_SUFFIX}",
+                "linkedin_url": f"https://www.linkedin.com/in/jean-dupont-{index}",
+            }
+        }
+
+    if provider == "gamma":
+        if method == "POST":
+            return 200, {"generationId": f"gen-{index}"}
+        generation_id = parts[-1] if parts else "gen-0"
+        return 200, {"status": "completed", "gammaUrl": f"https://gamma.app/docs/{generation_id}"}
+
+    if provider == "unavatar":
+        return 200, ""
+
+    if provider == "site":
+        return 200, (
+            f"<html><head><title>Company {index}</title></head><body>"
+            f"<h1>Company {index}</h1><p>Plateforme SaaS B2B pour la sante. Hebergement HDS.</p>"
+            f"<footer>Mentions legales - SIREN {bench_siren(index)} - RCS Paris</footer>"
+            "</body></html>"
+        )
+
+    return 404, {"message": f"Fournisseur inconnu: {provider}"}
+
+
+def _fake_unite_legale(siren: str, index: int) -> dict:
+    return {
+        "siren": siren,
+        "dateCreationUniteLegale": f"{2010 + index % 15}-01-01",
+        "trancheEffectifsUniteLegale": "12",
+        "categorieEntreprise": "PME",
+        "periodesUniteLegale": [
+            {
+                "denominationUniteLegale": f"COMPANY {index}",
+                "categorieJuridiqueUniteLegale": "5710",
+                "activitePrincipaleUniteLegale": "62.01Z",
+                "etatAdministratifUniteLegale": "A",
+            }
+        ],
+    }
+
+
+class _FakeHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, profiles: BenchProfiles, stats: ProviderStats) -> None:
+        super().__init__(("127.0.0.1", 0), _FakeHandler)
+        self.profiles = profiles
+        self.stats = stats
+        self._rng = random.Random(profiles.seed)
+        self._rng_lock = threading.Lock()
+
+    def apply_profile(self, provider: str) -> str:
+        """Applique latence et issue simulees pour un appel, et enregistre la statistique."""
+        profile = self.profiles.get(provider)
+        with self._rng_lock:
+            latency = profile.sample_latency(self._rng)
+            outcome = profile.sample_outcome(self._rng)
+        time.sleep(latency)
+        self.stats.record(provider, outcome)
+        return outcome
+
+
+class FakeProviderServer:
+    """Serveur HTTP local demarre dans un thread (utiliser comme context manager)."""
+
+    def __init__(self, profiles: BenchProfiles, stats: ProviderStats | None = None) -> None:
+        self.stats = stats or ProviderStats()
+        self._server = _FakeHTTPServer(profiles, self.stats)
+        self._thread = threading.Thread(target=self._server.serve_forever, name="FakeProviderServer", daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def url(self, provider: str) -> str:
+        """URL de base d'un fournisseur sur le serveur local."""
+        return f"{self.base_url}/{provider}"
+
+    def __enter__(self) -> "FakeProviderServer":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+
+# ---------------------------------------------------------------------------
+# LLM factice
+# ---------------------------------------------------------------------------
+
+
+def llm_provider_for(model: str) -> str:
+    """Deduit le fournisseur simule a partir du nom de modele."""
+    model = model.lower()
+    if "claude" in model or model.startswith("anthropic/"):
+        return "anthropic"
+    if "gemini" in model:
+        return "gemini"
+    return "openai"
+
+
+class FakeLLM(BaseLLM):
+    """
+    LLM scripte au format ReAct.
+
+    Pour chaque tache : `tool_calls_per_task` appels d'outils (parmi les outils
+    de l'agent, dans l'ordre ; par defaut un appel par outil), puis une
+    "Final Answer" adaptee a la tache.
+    """
+
+    def __init__(
+        self,
+        model: str,
+        profiles: BenchProfiles,
+        site_base_url: str,
+        stats: ProviderStats,
+        tool_calls_per_task: int | None = None,
+        temperature: float | None = None,
+    ) -> None:
+        super().__init__(model=model, temperature=temperature)
+        self.provider_name = llm_provider_for(model)
+        self.profile = profiles.get(self.provider_name)
+        self.site_base_url = site_base_url
+        self.stats = stats
+        self.tool_calls_per_task = tool_calls_per_task
+        self._rng = random.Random(f"{profiles.seed}-{model}-{id(self)}")
+        self._lock = threading.Lock()
+        self._calls_per_task: Counter[str] = Counter()
+
+    def supports_function_calling(self) -> bool:
+        return False
+
+    def supports_stop_words(self) -> bool:
+        return False
+
+    def get_context_window_size(self) -> int:
+        return 1_000_000
+
+    def call(
+        self,
+        messages: Any,
+        tools: Any = None,
+        callbacks: Any = None,
+        available_functions: Any = None,
+        from_task: Any = None,
+        from_agent: Any = None,
+        response_model: Any = None,
+    ) -> str:
+        prompt = messages if isinstance(messages, str) else "\n".join(str(m.get("content", "")) for m in messages)
+
+        with self._lock:
+            latency = self.profile.sample_latency(self._rng)
+            outcome = self.profile.sample_outcome(self._rng)
+            task_key = str(getattr(from_task, "id", "")) or "default"
+            call_number = self._calls_per_task[task_key]
+            self._calls_per_task[task_key] += 1
+
+        time.sleep(latency)
+        self.stats.record(self.provider_name, outcome)
+        if outcome == "rate_limited":
+            raise FakeRateLimitError(f"429 Too Many Requests ({self.provider_name}, fake)")
+        if outcome == "error":
+            raise FakeProviderError(f"500 Internal Server Error ({self.provider_name}, fake)")
+
+        tools_available = list(getattr(from_agent, "tools", None) or [])
+        tool_calls = len(tools_available) if self.tool_calls_per_task is None else self.tool_calls_per_task
+        if tools_available and call_number < tool_calls:
+            tool = tools_available[call_number % len(tools_available)]
+            answer = self._action(tool, prompt)
+        else:
+            answer = f"Thought: I now know the final answer\nFinal Answer: {self._final_answer(from_task, prompt)}"
+
+        self._track_token_usage_internal(
+            {"prompt_tokens": len(prompt) // 4, "completion_tokens": len(answer) // 4, "total_tokens": 0}
+        )
+        return answer
+
+    def _action(self, tool: Any, prompt: str) -> str:
+        index = company_index(prompt)
+        domain = f"company-{index}.{BENCH_DOMAIN_SUFFIX}"
+        name = getattr(tool, "name", "")
+        inputs_by_tool = {
+            "sirene_search": {"query": bench_siren(index)},
+            "apollo_search": {"domain": domain, "company_name": f"Company {index}"},
+            "gamma_create_webpage": {
+                "prompt": f"Page de vente pour Company {index}",
+                "company_name": f"Company {index}",
+                "company_domain": domain,
+            },
+            "pappers_search": {"query": bench_siren(index)},
+        }
+        if name in inputs_by_tool:
+            action_input = inputs_by_tool[name]
+        elif "serper" in name.lower() or "search" in name.lower():
+            action_input = {"search_query": f"Company {index} SIREN"}
+        else:
+            action_input = {"website_url": f"{self.site_base_url}/company-{index}"}
+        return f"Thought: Je dois utiliser un outil\nAction: {name}\nAction Input: {json.dumps(action_input)}"
+
+    def _final_answer(self, task: Any, prompt: str) -> str:
+        task_name = str(getattr(task, "name", "") or "")
+        if task_name == "compile_final_company_analysis_report":
+            return _fake_csv_row(company_index(prompt))
+        if task_name == "enrich_company_data":
+            return _fake_enrichment_json(prompt)
+        if task_name == "search_saas_deep_scan":
+            return json.dumps([bench_url(i) for i in range(5)])
+        index = company_index(prompt)
+        return f"Company {index} : analyse terminee (SIREN {bench_siren(index)}, pertinence 70%)."
+
+
+def _fake_csv_row(index: int) -> str:
+    cells = [f"Company {index}", bench_url(index), "FR", "2015", "HealthTech. Plateforme SaaS", "70%", "Angle HDS"]
+    cells += ["Non trouve"] * (len(CSV_HEADER.split(",")) - len(cells) - 1)
+    cells.append(f"https://gamma.app/docs/gen-{index}")
+    return ",".join(cells)
+
+
+def _fake_enrichment_json(prompt: str) -> str:
+    indices = sorted({int(i) for i in _COMPANY_RE.findall(prompt)})
+    return json.dumps(
+        [
+            {
+                "url": f"company-{i}.{BENCH_DOMAIN_SUFFIX}",
+                "nationalite": "FR",
+                "solution_saas": "HealthTech. Plateforme SaaS",
+                "pertinence": "70 %",
+                "explication": "Cible Parfaite. Donnees de sante.",
+            }
+            for i in indices
+        ],
+        ensure_ascii=False,
+    )
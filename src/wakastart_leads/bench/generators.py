@@ -0,0 +1,167 @@
+"""Generateurs de donnees synthetiques pour les benchmarks.
+
+Toutes les fonctions sont deterministes pour un `seed` donne afin que deux
+executions successives mesurent exactement le meme volume de travail.
+"""
+
+import csv
+import json
+import random
+from pathlib import Path
+
+from wakastart_leads.shared.utils.parallel_runner import CSV_HEADER
+
+_SECTORS = ["HealthTech", "FinTech", "HRTech", "LegalTech", "EdTech", "PropTech", "MedTech", "GreenTech"]
+_TLDS = ["com", "fr", "io", "co", "eu", "tech"]
+_FIRST_NAMES = ["Jean", "Marie", "Pierre", "Sophie", "Luc", "Camille", "Nicolas", "Julie"]
+_LAST_NAMES = ["Dupont", "Martin", "Durand", "Bernard", "Petit", "Moreau", "Laurent", "Simon"]
+_TITLES = ["CEO", "CTO", "Co-founder", "Directeur Technique", "VP Engineering"]
+
+
+def generate_domain(index: int, rng: random.Random) -> str:
+    """Genere un domaine unique et stable pour un index donne."""
+    return f"company-{index}-{rng.randint(100, 999)}.{rng.choice(_TLDS)}"
+
+
+def generate_noisy_url(index: int, rng: random.Random) -> str:
+    """Genere une URL avec les variations rencontrees en production (protocole, www, casse, slash)."""
+    domain = generate_domain(index, rng)
+    if rng.random() < 0.3:
+        domain = domain.upper()
+    prefix = rng.choice(["https://", "http://", "https://www.", "www.", ""])
+    suffix = rng.choice(["", "/", "/fr/", "  "])
+    return f"{prefix}{domain}{suffix}"
+
+
+def generate_csv_row(index: int, rng: random.Random, n_cols: int = 23) -> list[str]:
+    """Genere une ligne CSV de 23 colonnes au format du rapport d'analyse."""
+    domain = generate_domain(index, rng)
+    row = [
+        f"Company {index} SAS",
+        f"https://{domain}",
+        rng.choice(["FR", "US", "UK", "DE"]),
+        str(rng.randint(1990, 2025)),
+        f"{rng.choice(_SECTORS)}. Plateforme SaaS de gestion, avec IA et tableaux de bord",
+        f"{rng.randint(10, 100)}%",
+        'Angle HDS, conformite ISO 27001 et acceleration du delivery, "Migration Pack"',
+    ]
+    for _ in range(3):
+        first, last = rng.choice(_FIRST_NAMES), rng.choice(_LAST_NAMES)
+        row.extend(
+            [
+                f"{first} {last}",
+                rng.choice(_TITLES),
+                f"{first.lower()}.{last.lower()}@{domain}",
+                "Non trouve",
+                f"https://www.linkedin.com/in/{first.lower()}-{last.lower()}-{index}",
+            ]
+        )
+    row.append(f"https://url.wakastart.com/company-{index}")
+    return row[:n_cols]
+
+
+def generate_csv_rows(n_rows: int, seed: int = 42) -> list[list[str]]:
+    """Genere `n_rows` lignes CSV de 23 colonnes."""
+    rng = random.Random(seed)
+    return [generate_csv_row(i, rng) for i in range(n_rows)]
+
+
+def _row_to_csv_line(row: list[str]) -> str:
+    """Serialise une ligne en CSV (guillemets si necessaire)."""
+    cells = []
+    for cell in row:
+        if any(c in cell for c in ',"\n'):
+            cell = '"' + cell.replace('"', '""') + '"'
+        cells.append(cell)
+    return ",".join(cells)
+
+
+def generate_noisy_llm_rows(n_rows: int, seed: int = 42) -> list[str]:
+    """Genere des sorties brutes d'agent LLM : code fences, headers repetes, retours a la ligne."""
+    rng = random.Random(seed)
+    outputs = []
+    for i in range(n_rows):
+        line = _row_to_csv_line(generate_csv_row(i, rng))
+        noise = rng.random()
+        if noise < 0.25:
+            line = f"```csv\n{CSV_HEADER}\n{line}\n```"
+        elif noise < 0.45:
+            line = f"``` {CSV_HEADER} {line} ```"
+        elif noise < 0.6:
+            line = f"{CSV_HEADER}\n{CSV_HEADER}\n{line}"
+        elif noise < 0.7:
+            line = f"```\n{line}\n```"
+        outputs.append(line)
+    return outputs
+
+
+def generate_noisy_urls(n_urls: int, seed: int = 42) -> list[str]:
+    """Genere `n_urls` URLs bruitees."""
+    rng = random.Random(seed)
+    return [generate_noisy_url(i, rng) for i in range(n_urls)]
+
+
+def generate_enrichment_objects(n_items: int, seed: int = 42) -> list[dict]:
+    """Genere des objets d'enrichissement au format de la tache enrich_company_data."""
+    rng = random.Random(seed)
+    return [
+        {
+            "url": generate_domain(i, rng),
+            "nationalite": rng.choice(["🇫🇷", "🇺🇸", "International", "Inconnu"]),
+            "solution_saas": f"{rng.choice(_SECTORS)}. Plateforme SaaS de gestion pour PME avec IA.",
+            "pertinence": f"{rng.randint(10, 100)} %",
+            "explication": "Cible Premium (FinTech B2B). Plateforme pour grands comptes. Migration Pack.",
+        }
+        for i in range(n_items)
+    ]
+
+
+def generate_enrichment_outputs(n_items: int, batch_size: int = 20, seed: int = 42) -> list[str]:
+    """Genere des sorties brutes d'enrichissement par batch (fences, prose autour du JSON)."""
+    rng = random.Random(seed)
+    objects = generate_enrichment_objects(n_items, seed)
+    outputs = []
+    for start in range(0, len(objects), batch_size):
+        payload = json.dumps(objects[start : start + batch_size], ensure_ascii=False, indent=2)
+        noise = rng.random()
+        if noise < 0.4:
+            payload = f"```json\n{payload}\n```"
+        elif noise < 0.7:
+            payload = f"Voici le resultat de l'analyse :\n\n{payload}\n\nFin de l'analyse."
+        outputs.append(payload)
+    return outputs
+
+
+def generate_enrichment_csv_rows(n_rows: int, seed: int = 42) -> list[dict]:
+    """Genere des lignes de CSV d'entree pour le crew d'enrichissement (colonne Site Internet)."""
+    rng = random.Random(seed)
+    return [
+        {
+            "Raison sociale": f"Company {i}",
+            "Site Internet": generate_domain(i, rng) if i % 2 else f"https://www.{generate_domain(i, rng)}/",
+            "Nationalite": "",
+            "Solution Saas": "",
+            "Pertinance": "",
+            "Explication": "",
+        }
+        for i in range(n_rows)
+    ]
+
+
+def write_csv(path: Path, rows: list[list[str]], header: list[str] | None = None, encoding: str = "utf-8-sig") -> None:
+    """Ecrit un CSV de benchmark (avec header optionnel)."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding=encoding, newline="") as f:
+        writer = csv.writer(f, quoting=csv.QUOTE_MINIMAL)
+        if header:
+            writer.writerow(header)
+        writer.writerows(rows)
+
+
+def write_noisy_llm_csv(path: Path, rows: list[list[str]]) -> None:
+    """Ecrit un CSV tel que produit par l'agent compilateur (code fences, lignes vides)."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    lines = ["```csv", CSV_HEADER, ""]
+    lines.extend(_row_to_csv_line(row) for row in rows)
+    lines.extend(["", "```"])
+    path.write_text("\n".join(lines), encoding="utf-8")
@@ -0,0 +1,419 @@
+"""Harnais de charge hors-ligne de bout en bout.
+
+Execute les vrais AnalysisCrew/EnrichmentCrew a travers les modes sequentiel,
+parallele et batch, en remplacant chaque fournisseur (Gemini, Anthropic, OpenAI,
+Serper, Sirene, Apollo, Gamma, pages web) par les doublures locales de
+`bench.fakes`. Aucun appel reseau externe, aucune cle API reelle.
+
+Usage:
+    python -m wakastart_leads.bench.load --mode parallel --urls 30 --parallel 5
+    python -m wakastart_leads.bench.load --mode all --llm-median-ms 800 --llm-p95-ms 3000
+    python -m wakastart_leads.bench.load --rate-limit-rate 0.05 --error-rate 0.02
+
+Rapporte le debit (URLs/heure), les latences p50/p95 par URL et l'efficacite de
+concurrence (somme des durees / (duree totale x workers)).
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+from collections.abc import Iterator
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any
+from unittest import mock
+
+from crewai.events.event_listener import EventListener
+from crewai_tools import SerperDevTool
+
+from wakastart_leads.crews.analysis import AnalysisCrew
+from wakastart_leads.crews.analysis.prefetch import prefetch_company_data
+from wakastart_leads.crews.enrichment import EnrichmentCrew
+from wakastart_leads.shared.tools.sirene_tool import SireneSearchTool
+from wakastart_leads.shared.tools.web_tools import CachedSerperDevTool
+from wakastart_leads.shared.utils.parallel_runner import RunStatus, UrlResult, run_parallel, run_sequential
+from wakastart_leads.shared.utils.search_cache import SearchCache
+
+from .fakes import (
+    BenchProfiles,
+    FakeLLM,
+    FakeProviderServer,
+    ProviderProfile,
+    ProviderStats,
+    bench_url,
+    company_index,
+)
+
+MODES = ("sequential", "parallel", "batch")
+
+# Variables d'environnement factices : les outils verifient la presence des cles avant d'appeler l'API
+_FAKE_ENV = {
+    "GEMINI_API_KEY": "bench-fake-key",
+    "ANTHROPIC_API_KEY": "bench-fake-key",
+    "OPENAI_API_KEY": "bench-fake-key",
+    "SERPER_API_KEY": "bench-fake-key",
+    "INSEE_SIRENE_API_KEY": "bench-fake-key",
+    "SIRENE_INDEX_ENABLED": "0",
+    "NAME_INDEX_ENABLED": "0",
+    "SEEN_INDEX_ENABLED": "0",
+    "APOLLO_API_KEY": "bench-fake-key",
+    "GAMMA_API_KEY": "bench-fake-key",
+    "LINKENER_API_BASE": "",
+    "CREWAI_DISABLE_TELEMETRY": "true",
+    "CREWAI_TRACING_ENABLED": "false",
+    "OTEL_SDK_DISABLED": "true",
+}
+
+
+@dataclass
+class LoadReport:
+    """Resultat d'un mode du harnais de charge."""
+
+    mode: str
+    workers: int
+    urls: int
+    succeeded: int
+    wall_seconds: float
+    busy_seconds: float
+    latencies: list[float] = field(default_factory=list)
+    provider_stats: dict[str, dict[str, int]] = field(default_factory=dict)
+
+    @property
+    def failed(self) -> int:
+        return self.urls - self.succeeded
+
+    @property
+    def urls_per_hour(self) -> float:
+        """URLs traitees avec succes par heure."""
+        return self.succeeded * 3600 / self.wall_seconds if self.wall_seconds > 0 else 0.0
+
+    @property
+    def p50(self) -> float:
+        return _percentile(self.latencies, 0.50)
+
+    @property
+    def p95(self) -> float:
+        return _percentile(self.latencies, 0.95)
+
+    @property
+    def concurrency_efficiency(self) -> float:
+        """Part du temps-worker reellement occupee (1.0 = workers jamais inactifs)."""
+        capacity = self.wall_seconds * self.workers
+        return self.busy_seconds / capacity if capacity > 0 else 0.0
+
+    def as_dict(self) -> dict[str, Any]:
+        return asdict(self) | {
+            "failed": self.failed,
+            "urls_per_hour": self.urls_per_hour,
+            "p50": self.p50,
+            "p95": self.p95,
+            "concurrency_efficiency": self.concurrency_efficiency,
+        }
+
+
+def _percentile(values: list[float], q: float) -> float:
+    """Percentile par interpolation lineaire (0.0 si la liste est vide)."""
+    if not values:
+        return 0.0
+    if len(values) == 1:
+        return values[0]
+    return statistics.quantiles(values, n=100, method="inclusive")[round(q * 100) - 1]
+
+
+@contextlib.contextmanager
+def bench_environment(server: FakeProviderServer) -> Iterator[None]:
+    """Redirige les cles et URLs de base des outils vers le serveur local."""
+    with contextlib.ExitStack() as stack:
+        stack.enter_context(mock.patch.dict(os.environ, _FAKE_ENV))
+        stack.enter_context(
+            mock.patch(
+                "wakastart_leads.crews.analysis.tools.apollo_tool.ApolloSearchTool.API_BASE", server.url("apollo")
+            )
+        )
+        stack.enter_context(
+            mock.patch("wakastart_leads.crews.analysis.tools.gamma_tool.GAMMA_API_BASE", server.url("gamma"))
+        )
+        stack.enter_context(
+            mock.patch("wakastart_leads.crews.analysis.tools.gamma_tool.UNAVATAR_BASE", server.url("unavatar"))
+        )
+        yield
+
+
+def make_bench_crew_class(
+    crew_class: Any,
+    server: FakeProviderServer,
+    profiles: BenchProfiles,
+    tool_calls_per_task: int | None = None,
+) -> type:
+    """
+    Construit une classe compatible avec `run_single_url` qui instancie le vrai crew
+    puis remplace ses LLMs et URLs d'outils par les doublures locales.
+    """
+
+    # Cache de recherche memoire propre a la mesure (jamais le cache disque du projet)
+    search_cache = SearchCache()
+
+    class BenchCrew:
+        log_file: str | None = None
+
+        def crew(self) -> Any:
+            instance = crew_class()
+            instance.log_file = self.log_file
+            crew = instance.crew()
+            self._crew = crew
+            crew.verbose = False
+            listener = EventListener()
+            listener.verbose = listener.formatter.verbose = False
+            for agent in crew.agents:
+                agent.verbose = False
+                agent.llm = FakeLLM(
+                    model=agent.llm.model,
+                    profiles=profiles,
+                    site_base_url=server.url("site"),
+                    stats=server.stats,
+                    tool_calls_per_task=tool_calls_per_task,
+                )
+                for tool in agent.tools or []:
+                    if isinstance(tool, SerperDevTool):
+                        tool.base_url = server.url("serper")
+                        if isinstance(tool, CachedSerperDevTool):
+                            tool.search_cache = search_cache
+                    elif isinstance(tool, SireneSearchTool):
+                        tool._BASE_URL = server.url("sirene")
+            for crew_task in crew.tasks:
+                # Ne jamais ecraser les fichiers de sortie reels du projet
+                crew_task.output_file = None
+            return crew
+
+    if hasattr(crew_class, "prefetch_inputs"):
+
+        def prefetch_inputs(self: Any, url: str) -> dict[str, str]:
+            # Memes outils que les agents, page d'accueil servie par le faux site
+            tools = [tool for agent in self._crew.agents for tool in agent.tools or []]
+            return prefetch_company_data(url, tools, homepage_url=f"{server.url('site')}/company-{company_index(url)}")
+
+        BenchCrew.prefetch_inputs = prefetch_inputs
+
+    BenchCrew.__name__ = f"Bench{crew_class.__name__}"
+    return BenchCrew
+
+
+async def _run_runner_mode(
+    mode: str,
+    urls: list[str],
+    crew_class: type,
+    workdir: Path,
+    workers: int,
+    timeout: int,
+    retry_count: int,
+    stats: ProviderStats,
+) -> LoadReport:
+    """Execute run_sequential ou run_parallel et mesure le resultat."""
+    log_dir = workdir / mode / "logs"
+    output_path = workdir / mode / "company_report.csv"
+    log_dir.mkdir(parents=True, exist_ok=True)
+
+    start = time.perf_counter()
+    # Les runners affichent leur progression : on la masque pour garder un rapport lisible
+    with contextlib.redirect_stdout(io.StringIO()):
+        if mode == "sequential":
+            results = await run_sequential(urls, crew_class, log_dir, output_path, timeout, retry_count)
+        else:
+            results = await run_parallel(urls, crew_class, log_dir, workers, timeout, retry_count, output_path)
+    wall = time.perf_counter() - start
+
+    return _report(mode, workers if mode == "parallel" else 1, results, wall, stats)
+
+
+def _run_batch_mode(
+    urls: list[str],
+    crew_class: type,
+    workdir: Path,
+    batch_size: int,
+    stats: ProviderStats,
+) -> LoadReport:
+    """Execute EnrichmentCrew par lots, comme `wakastart enrich`."""
+    from wakastart_leads.main import _parse_enrichment_output
+
+    log_dir = workdir / "batch" / "logs"
+    log_dir.mkdir(parents=True, exist_ok=True)
+    latencies: list[float] = []
+    busy = 0.0
+    succeeded = 0
+
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        for i in range(0, len(urls), batch_size):
+            batch = urls[i : i + batch_size]
+            instance = crew_class()
+            instance.log_file = str(log_dir / f"enrich_{i // batch_size}.json")
+            batch_start = time.perf_counter()
+            try:
+                output = instance.crew().kickoff(inputs={"urls": "\n".join(f"- {url}" for url in batch)})
+                succeeded += len(_parse_enrichment_output(output.raw))
+            except Exception:
+                pass
+            # Chaque URL du lot attend la fin du lot complet
+            batch_duration = time.perf_counter() - batch_start
+            busy += batch_duration
+            latencies.extend([batch_duration] * len(batch))
+    wall = time.perf_counter() - start
+
+    return LoadReport(
+        mode="batch",
+        workers=1,
+        urls=len(urls),
+        succeeded=min(succeeded, len(urls)),
+        wall_seconds=wall,
+        busy_seconds=busy,
+        latencies=latencies,
+        provider_stats=stats.as_dict(),
+    )
+
+
+def _report(mode: str, workers: int, results: list[UrlResult], wall: float, stats: ProviderStats) -> LoadReport:
+    return LoadReport(
+        mode=mode,
+        workers=workers,
+        urls=len(results),
+        succeeded=sum(1 for r in results if r.status == RunStatus.SUCCESS),
+        wall_seconds=wall,
+        busy_seconds=sum(r.duration_seconds for r in results),
+        latencies=[r.duration_seconds for r in results],
+        provider_stats=stats.as_dict(),
+    )
+
+
+def run_load(
+    mode: str,
+    n_urls: int,
+    profiles: BenchProfiles,
+    workers: int = 3,
+    batch_size: int = 20,
+    timeout: int = 600,
+    retry_count: int = 0,
+    tool_calls_per_task: int | None = None,
+) -> LoadReport:
+    """Demarre les doublures locales et execute un mode du harnais."""
+    if mode not in MODES:
+        raise ValueError(f"Mode inconnu: {mode} (attendu: {', '.join(MODES)})")
+
+    urls = [bench_url(i) for i in range(n_urls)]
+    stats = ProviderStats()
+
+    with (
+        FakeProviderServer(profiles, stats) as server,
+        bench_environment(server),
+        tempfile.TemporaryDirectory(prefix="wakastart_load_") as tmp,
+    ):
+        workdir = Path(tmp)
+        if mode == "batch":
+            crew_class = make_bench_crew_class(EnrichmentCrew, server, profiles, tool_calls_per_task)
+            return _run_batch_mode(urls, crew_class, workdir, batch_size, stats)
+
+        crew_class = make_bench_crew_class(AnalysisCrew, server, profiles, tool_calls_per_task)
+        return asyncio.run(_run_runner_mode(mode, urls, crew_class, workdir, workers, timeout, retry_count, stats))
+
+
+def format_report(reports: list[LoadReport]) -> str:
+    """Formate un tableau texte des modes executes puis les compteurs par fournisseur."""
+    lines = [
+        f"{'Mode':<12} {'Workers':>7} {'URLs':>6} {'OK':>6} {'Duree (s)':>10} {'URLs/h':>10} "
+        f"{'p50 (s)':>8} {'p95 (s)':>8} {'Efficacite':>10}",
+        "-" * 86,
+    ]
+    for r in reports:
+        lines.append(
+            f"{r.mode:<12} {r.workers:>7} {r.urls:>6} {r.succeeded:>6} {r.wall_seconds:>10.2f} "
+            f"{r.urls_per_hour:>10,.0f} {r.p50:>8.2f} {r.p95:>8.2f} {r.concurrency_efficiency:>10.0%}"
+        )
+    for r in reports:
+        lines.append(f"\n[{r.mode}] Appels par fournisseur :")
+        for name, counts in r.provider_stats.items():
+            lines.append(
+                f"  - {name:<10} {counts['calls']:>6} appel(s), {counts['errors']} erreur(s), "
+                f"{counts['rate_limited']} 429"
+            )
+    return "\n".join(lines)
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Point d'entree CLI du harnais de charge. Retourne le code de sortie."""
+    parser = argparse.ArgumentParser(description="Harnais de charge hors-ligne (LLMs et APIs simules)")
+    parser.add_argument("--mode", choices=[*MODES, "all"], default="all", help="Mode a executer")
+    parser.add_argument("--urls", "-n", type=int, default=20, help="Nombre d'URLs synthetiques")
+    parser.add_argument("--parallel", "-p", type=int, default=3, help="Workers du mode parallele")
+    parser.add_argument("--batch-size", "-b", type=int, default=20, help="Taille de lot du mode batch")
+    parser.add_argument("--timeout", type=int, default=600, help="Timeout par URL en secondes")
+    parser.add_argument("--retry", type=int, default=0, help="Nombre de retry par URL")
+    parser.add_argument(
+        "--tool-calls", type=int, default=None, help="Appels d'outils par tache (defaut: un par outil de l'agent)"
+    )
+    parser.add_argument("--llm-median-ms", type=float, default=50.0, help="Latence mediane des LLMs (ms)")
+    parser.add_argument("--llm-p95-ms", type=float, default=150.0, help="Latence p95 des LLMs (ms)")
+    parser.add_argument("--api-median-ms", type=float, default=20.0, help="Latence mediane des APIs (ms)")
+    parser.add_argument("--api-p95-ms", type=float, default=60.0, help="Latence p95 des APIs (ms)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Taux d'erreurs 500 (0.02 = 2%%)")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="Taux de reponses 429")
+    parser.add_argument(
+        "--provider",
+        action="append",
+        default=[],
+        metavar="NOM=JSON",
+        help='Surcharge d\'un fournisseur, ex: anthropic=\'{"median_ms": 2000, "p95_ms": 8000}\'',
+    )
+    parser.add_argument("--seed", type=int, default=42, help="Graine des tirages aleatoires")
+    parser.add_argument("--json", type=str, default=None, help="Ecrire les resultats bruts en JSON")
+
+    args = parser.parse_args(argv)
+
+    overrides: dict[str, dict] = {}
+    for item in args.provider:
+        name, _, raw = item.partition("=")
+        try:
+            overrides[name] = json.loads(raw)
+        except json.JSONDecodeError:
+            print(f"[WARNING] Surcharge ignoree (JSON invalide): {item}")
+
+    profiles = BenchProfiles.build(
+        llm=ProviderProfile(args.llm_median_ms, args.llm_p95_ms, args.error_rate, args.rate_limit_rate),
+        api=ProviderProfile(args.api_median_ms, args.api_p95_ms, args.error_rate, args.rate_limit_rate),
+        overrides=overrides,
+        seed=args.seed,
+    )
+
+    modes = list(MODES) if args.mode == "all" else [args.mode]
+    reports: list[LoadReport] = []
+    for mode in modes:
+        print(f"[INFO] Mode {mode} : {args.urls} URL(s)...")
+        reports.append(
+            run_load(
+                mode,
+                args.urls,
+                profiles,
+                workers=args.parallel,
+                batch_size=args.batch_size,
+                timeout=args.timeout,
+                retry_count=args.retry,
+                tool_calls_per_task=args.tool_calls,
+            )
+        )
+
+    print(format_report(reports))
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump([r.as_dict() for r in reports], f, indent=2)
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
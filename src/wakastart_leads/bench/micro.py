@@ -0,0 +1,411 @@
+"""Micro-benchmarks des chemins chauds CSV/URL.
+
+Mesure le debit (elements/s) et le pic memoire (tracemalloc) de chaque fonction
+sur des donnees synthetiques, puis compare a une baseline stockee. Tout tourne
+hors-ligne, sans cle API.
+
+Le debit absolu depend de la machine (et de sa charge) : chaque execution
+chronometree est precedee d'une boucle de reference en Python pur. La baseline
+enregistre le debit relatif (debit / debit de reference), comparable d'une
+machine a l'autre. La baseline note aussi la machine qui l'a enregistree : les
+regressions ne font echouer la verification que sur cette machine (baseline
+enregistree localement), ailleurs elles ne sont que signalees.
+
+Usage:
+    python -m wakastart_leads.bench.micro                      # 100k lignes, compare a la baseline
+    python -m wakastart_leads.bench.micro --rows 1000000       # 1M lignes
+    python -m wakastart_leads.bench.micro --only normalize_url --only clean_csv_row
+    python -m wakastart_leads.bench.micro --save-baseline      # met a jour la baseline
+
+Le code de sortie vaut 1 si une regression depasse le seuil (--threshold, 25% par defaut)
+et que la baseline a ete enregistree sur cette machine.
+"""
+
+import argparse
+import contextlib
+import hashlib
+import io
+import json
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections.abc import Callable
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+from wakastart_leads.shared.utils.csv_utils import load_existing_csv, post_process_csv
+from wakastart_leads.shared.utils.parallel_runner import CSV_HEADER, clean_csv_row
+from wakastart_leads.shared.utils.url_utils import normalize_url
+
+from . import generators
+
+BASELINE_PATH = Path(__file__).parent / "baselines" / "micro.json"
+DEFAULT_ROWS = 100_000
+DEFAULT_THRESHOLD = 0.25
+# En dessous de cet ecart (octets/element), une variation memoire est du bruit d'allocation
+MEMORY_NOISE_FLOOR = 64
+# Elements de la boucle de reference (calibrage de la vitesse de la machine)
+REFERENCE_ITEMS = 50_000
+
+# Un benchmark prepare ses donnees une fois puis retourne (reset, run).
+# `reset` (optionnel) remet les fichiers dans leur etat initial hors chronometre,
+# `run` execute la fonction mesuree et retourne le nombre d'elements traites.
+BenchSetup = Callable[[int, Path], tuple[Callable[[], None] | None, Callable[[], int]]]
+
+
+@dataclass
+class BenchResult:
+    """Resultat d'un micro-benchmark."""
+
+    name: str
+    items: int
+    seconds: float
+    peak_bytes: int
+    # Debit rapporte a celui de la boucle de reference (None si non mesure)
+    relative: float | None = None
+
+    @property
+    def throughput(self) -> float:
+        """Elements traites par seconde."""
+        return self.items / self.seconds if self.seconds > 0 else float("inf")
+
+    @property
+    def peak_bytes_per_item(self) -> float:
+        """Pic memoire ramene a un element (comparable entre tailles de jeu)."""
+        return self.peak_bytes / self.items if self.items else 0.0
+
+
+def _bench_clean_csv_row(n_rows: int, workdir: Path) -> tuple[None, Callable[[], int]]:
+    raw_rows = generators.generate_noisy_llm_rows(n_rows)
+
+    def run() -> int:
+        for raw in raw_rows:
+            clean_csv_row(raw)
+        return len(raw_rows)
+
+    return None, run
+
+
+def _bench_normalize_url(n_rows: int, workdir: Path) -> tuple[None, Callable[[], int]]:
+    urls = generators.generate_noisy_urls(n_rows)
+
+    def run() -> int:
+        for url in urls:
+            normalize_url(url)
+        return len(urls)
+
+    return None, run
+
+
+def _bench_load_existing_csv(n_rows: int, workdir: Path) -> tuple[None, Callable[[], int]]:
+    csv_path = workdir / "load_existing.csv"
+    generators.write_csv(csv_path, generators.generate_csv_rows(n_rows), header=CSV_HEADER.split(","))
+
+    def run() -> int:
+        load_existing_csv(csv_path)
+        return n_rows
+
+    return None, run
+
+
+def _bench_post_process_csv(n_rows: int, workdir: Path) -> tuple[Callable[[], None], Callable[[], int]]:
+    # Moitie des lignes existantes, l'autre moitie arrive du LLM avec un recouvrement de 25%
+    all_rows = generators.generate_csv_rows(n_rows + n_rows // 4)
+    existing_rows = all_rows[: n_rows // 2]
+    new_rows = all_rows[n_rows // 4 : n_rows // 4 + n_rows // 2]
+
+    template_dir = workdir / "post_process_template"
+    generators.write_csv(template_dir / "final.csv", existing_rows, header=CSV_HEADER.split(","))
+    generators.write_noisy_llm_csv(template_dir / "new.csv", new_rows)
+
+    run_dir = workdir / "post_process_run"
+    final_path = run_dir / "final.csv"
+    new_path = run_dir / "new.csv"
+
+    def reset() -> None:
+        if run_dir.exists():
+            shutil.rmtree(run_dir)
+        shutil.copytree(template_dir, run_dir)
+
+    def run() -> int:
+        with contextlib.redirect_stdout(io.StringIO()):
+            post_process_csv(new_csv_path=new_path, final_csv_path=final_path, backup_dir=run_dir / "backups")
+        return len(existing_rows) + len(new_rows)
+
+    return reset, run
+
+
+def _bench_update_csv_with_enrichment(n_rows: int, workdir: Path) -> tuple[Callable[[], None], Callable[[], int]]:
+    from wakastart_leads.main import _update_csv_with_enrichment
+
+    template_rows = generators.generate_enrichment_csv_rows(n_rows)
+    enrichments = generators.generate_enrichment_objects(n_rows)
+    state: dict[str, list[dict]] = {}
+
+    def reset() -> None:
+        state["rows"] = [dict(row) for row in template_rows]
+
+    def run() -> int:
+        _update_csv_with_enrichment(state["rows"], enrichments)
+        return n_rows
+
+    return reset, run
+
+
+def _bench_parse_enrichment_output(n_rows: int, workdir: Path) -> tuple[None, Callable[[], int]]:
+    from wakastart_leads.main import _parse_enrichment_output
+
+    outputs = generators.generate_enrichment_outputs(n_rows)
+
+    def run() -> int:
+        count = 0
+        for raw in outputs:
+            count += len(_parse_enrichment_output(raw))
+        return count
+
+    return None, run
+
+
+BENCHMARKS: dict[str, BenchSetup] = {
+    "clean_csv_row": _bench_clean_csv_row,
+    "normalize_url": _bench_normalize_url,
+    "load_existing_csv": _bench_load_existing_csv,
+    "post_process_csv": _bench_post_process_csv,
+    "_update_csv_with_enrichment": _bench_update_csv_with_enrichment,
+    "_parse_enrichment_output": _bench_parse_enrichment_output,
+}
+
+
+def _reference_words() -> list[str]:
+    return [f"  Https://WWW.Site{i % 977}.fr/Page/{i}  " for i in range(REFERENCE_ITEMS)]
+
+
+def time_reference(words: list[str]) -> float:
+    """Duree d'une passe de la boucle de reference (chaines et dictionnaire, Python pur)."""
+    start = time.perf_counter()
+    counts: dict[str, int] = {}
+    for word in words:
+        key = word.strip().lower().split("/")[2]
+        counts[key] = counts.get(key, 0) + 1
+    return time.perf_counter() - start
+
+
+def run_benchmark(name: str, n_rows: int, workdir: Path, repeat: int = 3) -> BenchResult:
+    """
+    Execute un benchmark : meilleur temps sur `repeat` executions puis une passe tracemalloc.
+
+    Chaque execution est encadree par la boucle de reference (meme etat de la
+    machine) : le debit relatif retenu est la mediane des `repeat` rapports.
+    """
+    reset, run = BENCHMARKS[name](n_rows, workdir)
+    words = _reference_words()
+
+    best = float("inf")
+    ratios: list[float] = []
+    items = 0
+    for _ in range(max(repeat, 1)):
+        if reset:
+            reset()
+        before = time_reference(words)
+        start = time.perf_counter()
+        items = run()
+        elapsed = time.perf_counter() - start
+        reference = (before + time_reference(words)) / 2
+        best = min(best, elapsed)
+        if elapsed > 0:
+            ratios.append(items / elapsed * reference / REFERENCE_ITEMS)
+
+    # Passe memoire separee : tracemalloc ralentit fortement l'execution
+    if reset:
+        reset()
+    tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        run()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    relative = statistics.median(ratios) if ratios else None
+    return BenchResult(name=name, items=items, seconds=best, peak_bytes=peak, relative=relative)
+
+
+def run_all(
+    n_rows: int = DEFAULT_ROWS,
+    names: list[str] | None = None,
+    repeat: int = 3,
+) -> list[BenchResult]:
+    """Execute les benchmarks demandes (tous par defaut) dans un dossier temporaire."""
+    selected = names or list(BENCHMARKS)
+    unknown = [n for n in selected if n not in BENCHMARKS]
+    if unknown:
+        raise ValueError(f"Benchmark(s) inconnu(s): {', '.join(unknown)}")
+
+    with tempfile.TemporaryDirectory(prefix="wakastart_bench_") as tmp:
+        return [run_benchmark(name, n_rows, Path(tmp), repeat) for name in selected]
+
+
+def machine_id() -> str:
+    """Empreinte courte de la machine courante (hote, architecture, version de Python)."""
+    raw = f"{platform.node()}|{platform.machine()}|{platform.python_version()}"
+    return hashlib.sha256(raw.encode()).hexdigest()[:12]
+
+
+def _read_baseline_file(path: Path) -> dict:
+    if not path.exists():
+        return {}
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def load_baseline(path: Path) -> dict[str, dict]:
+    """Charge la baseline ({nom: {throughput, peak_bytes_per_item, ...}}), vide si absente."""
+    return _read_baseline_file(path).get("benchmarks", {})
+
+
+def is_local_baseline(path: Path) -> bool:
+    """Indique si la baseline a ete enregistree sur cette machine."""
+    return _read_baseline_file(path).get("machine") == machine_id()
+
+
+def save_baseline(results: list[BenchResult], path: Path, n_rows: int) -> None:
+    """Ecrit la baseline en conservant les entrees des benchmarks non relances."""
+    benchmarks = load_baseline(path)
+    for r in results:
+        benchmarks[r.name] = {
+            "throughput": round(r.throughput, 1),
+            "peak_bytes_per_item": round(r.peak_bytes_per_item, 1),
+            "rows": n_rows,
+        }
+        if r.relative is not None:
+            benchmarks[r.name]["relative"] = round(r.relative, 4)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"machine": machine_id(), "benchmarks": dict(sorted(benchmarks.items()))}, f, indent=2)
+        f.write("\n")
+
+
+def compare_to_baseline(
+    results: list[BenchResult],
+    baseline: dict[str, dict],
+    threshold: float = DEFAULT_THRESHOLD,
+) -> list[str]:
+    """
+    Compare les resultats a la baseline.
+
+    Le debit relatif (a la boucle de reference) est compare quand la baseline
+    l'enregistre, le debit absolu sinon.
+
+    Returns:
+        Liste des regressions (debit en baisse ou memoire/element en hausse au-dela du seuil)
+    """
+    regressions: list[str] = []
+    for r in results:
+        ref = baseline.get(r.name)
+        if not ref:
+            continue
+        ref_relative = ref.get("relative")
+        if ref_relative and r.relative is not None:
+            if r.relative < ref_relative * (1 - threshold):
+                regressions.append(
+                    f"{r.name}: debit relatif {r.relative:.3f} vs baseline {ref_relative:.3f} "
+                    f"(-{1 - r.relative / ref_relative:.0%})"
+                )
+            ref_throughput = 0
+        else:
+            ref_throughput = ref.get("throughput", 0)
+        if ref_throughput and r.throughput < ref_throughput * (1 - threshold):
+            drop = 1 - r.throughput / ref_throughput
+            regressions.append(
+                f"{r.name}: debit {r.throughput:,.0f}/s vs baseline {ref_throughput:,.0f}/s (-{drop:.0%})"
+            )
+        ref_mem = ref.get("peak_bytes_per_item", 0)
+        mem_delta = r.peak_bytes_per_item - ref_mem
+        if mem_delta > MEMORY_NOISE_FLOOR and r.peak_bytes_per_item > ref_mem * (1 + threshold):
+            regressions.append(
+                f"{r.name}: memoire {r.peak_bytes_per_item:,.0f} o/elt vs baseline {ref_mem:,.0f} o/elt "
+                f"(+{mem_delta:,.0f} o/elt)"
+            )
+    return regressions
+
+
+def format_report(results: list[BenchResult], baseline: dict[str, dict]) -> str:
+    """Formate un tableau texte des resultats (avec delta vs baseline si disponible)."""
+    lines = [
+        f"{'Fonction':<30} {'Elements':>10} {'Temps (s)':>10} {'Debit (/s)':>14} {'Pic (Mo)':>10} {'vs baseline':>12}",
+        "-" * 92,
+    ]
+    for r in results:
+        ref = baseline.get(r.name, {})
+        if ref.get("relative") and r.relative is not None:
+            delta = f"{r.relative / ref['relative'] - 1:+.0%}"
+        else:
+            delta = f"{r.throughput / ref['throughput'] - 1:+.0%}" if ref.get("throughput") else "n/a"
+        lines.append(
+            f"{r.name:<30} {r.items:>10,} {r.seconds:>10.3f} {r.throughput:>14,.0f} "
+            f"{r.peak_bytes / 1_048_576:>10.1f} {delta:>12}"
+        )
+    return "\n".join(lines)
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Point d'entree CLI des micro-benchmarks. Retourne le code de sortie."""
+    parser = argparse.ArgumentParser(description="Micro-benchmarks des utilitaires CSV/URL")
+    parser.add_argument("--rows", "-n", type=int, default=DEFAULT_ROWS, help="Nombre de lignes synthetiques")
+    parser.add_argument("--repeat", "-r", type=int, default=3, help="Nombre d'executions chronometrees")
+    parser.add_argument("--only", action="append", choices=list(BENCHMARKS), help="Limiter a une fonction")
+    parser.add_argument("--baseline", type=str, default=str(BASELINE_PATH), help="Fichier de baseline JSON")
+    parser.add_argument("--save-baseline", action="store_true", help="Enregistrer les resultats comme baseline")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="Seuil de regression (0.25 = 25%%)")
+    parser.add_argument("--json", type=str, default=None, help="Ecrire les resultats bruts en JSON")
+
+    args = parser.parse_args(argv)
+    baseline_path = Path(args.baseline)
+
+    print(f"[INFO] Micro-benchmarks sur {args.rows:,} ligne(s), {args.repeat} execution(s)")
+    results = run_all(n_rows=args.rows, names=args.only, repeat=args.repeat)
+    baseline = load_baseline(baseline_path)
+
+    print(format_report(results, baseline))
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump([asdict(r) | {"throughput": r.throughput} for r in results], f, indent=2)
+
+    if args.save_baseline:
+        save_baseline(results, baseline_path, args.rows)
+        print(f"[OK] Baseline mise a jour : {baseline_path}")
+        return 0
+
+    if not baseline:
+        print(f"[WARNING] Aucune baseline trouvee ({baseline_path}), comparaison ignoree")
+        return 0
+
+    regressions = compare_to_baseline(results, baseline, args.threshold)
+    has_relative = all(baseline[r.name].get("relative") for r in results if r.name in baseline)
+    if not has_relative or not is_local_baseline(baseline_path):
+        # Baseline d'une autre machine : regressions signalees sans faire echouer la verification
+        for line in regressions:
+            print(f"[WARNING] {line}")
+        print(
+            "[WARNING] Baseline enregistree sur une autre machine (ou sans debit relatif) : "
+            "relancer --save-baseline --baseline <fichier local> pour une verification bloquante"
+        )
+        return 0
+
+    if regressions:
+        print(f"\n[REGRESSION] {len(regressions)} regression(s) au-dela de {args.threshold:.0%} :")
+        for line in regressions:
+            print(f"  - {line}")
+        return 1
+
+    print(f"\n[OK] Aucune regression au-dela de {args.threshold:.0%}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,245 @@
+"""Benchmark du temps de demarrage des points d'entree CLI.
+
+Pour chaque script de `[project.scripts]` (pyproject.toml), importe le module et
+resout la fonction dans un interpreteur neuf lance avec `python -X importtime`,
+puis compare le cout cumule des imports a une baseline stockee. Les imports
+lourds (CrewAI, litellm, google-genai...) ne doivent etre charges que par la
+commande qui les utilise.
+
+Usage:
+    python -m wakastart_leads.bench.startup                    # tous les points d'entree
+    python -m wakastart_leads.bench.startup --only wakastart-sirene-index
+    python -m wakastart_leads.bench.startup --save-baseline    # met a jour la baseline
+
+Le code de sortie vaut 1 si une regression depasse le seuil (--threshold, 50% par defaut).
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+from dataclasses import asdict, dataclass, field
+from importlib.metadata import entry_points
+from pathlib import Path
+
+BASELINE_PATH = Path(__file__).parent / "baselines" / "startup.json"
+PYPROJECT_PATH = Path(__file__).resolve().parents[3] / "pyproject.toml"
+SRC_DIR = Path(__file__).resolve().parents[2]
+DEFAULT_THRESHOLD = 0.5
+DEFAULT_REPEAT = 3
+# En dessous de cet ecart (microsecondes), une variation est du bruit (cache disque, CPU)
+IMPORT_NOISE_FLOOR_US = 50_000
+# Ecrit sur stderr juste avant l'import mesure : les imports du demarrage de l'interpreteur sont ignores
+_MARKER = "--wakastart-startup--"
+
+
+@dataclass
+class StartupResult:
+    """Cout d'import d'un point d'entree."""
+
+    name: str
+    target: str
+    import_us: int
+    modules: list[str] = field(default_factory=list)
+    heaviest: list[tuple[str, int]] = field(default_factory=list)
+
+
+def load_entry_points(pyproject: Path = PYPROJECT_PATH) -> dict[str, str]:
+    """
+    Scripts du projet ({nom: "module:fonction"}).
+
+    Lus dans `[project.scripts]` du pyproject.toml ; a defaut (Python 3.10 sans
+    tomllib, package installe sans les sources), dans les metadonnees du package installe.
+    """
+    try:
+        import tomllib
+    except ModuleNotFoundError:
+        tomllib = None
+
+    if tomllib is not None and pyproject.exists():
+        with open(pyproject, "rb") as f:
+            return dict(tomllib.load(f).get("project", {}).get("scripts", {}))
+    scripts = entry_points(group="console_scripts")
+    return {ep.name: ep.value for ep in scripts if ep.value.startswith("wakastart_leads.")}
+
+
+def parse_importtime(stderr: str) -> tuple[int, list[str], list[tuple[str, int]]]:
+    """
+    Analyse la sortie de `-X importtime` apres le marqueur.
+
+    Returns:
+        (cout cumule en microsecondes, modules importes dans l'ordre,
+        paquets racine hors wakastart_leads tries du plus couteux au moins couteux)
+    """
+    lines = stderr.splitlines()
+    if _MARKER in lines:
+        lines = lines[lines.index(_MARKER) + 1 :]
+
+    total = 0
+    modules: list[str] = []
+    packages: list[tuple[str, int]] = []
+    for line in lines:
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:") :].split("|")
+        if len(parts) != 3 or not parts[1].strip().isdigit():
+            continue  # ligne d'en-tete
+        cumulative = int(parts[1])
+        raw_name = parts[2].rstrip()
+        name = raw_name.strip()
+        modules.append(name)
+        # Un module de premier niveau n'est pas indente (ses dependances le sont)
+        if len(raw_name) - len(raw_name.lstrip()) <= 1:
+            total += cumulative
+        # Paquets racine (crewai, litellm...) : ce qu'une commande a charge en trop
+        if "." not in name and name != "wakastart_leads":
+            packages.append((name, cumulative))
+    return total, modules, sorted(packages, key=lambda item: item[1], reverse=True)
+
+
+def measure_entry_point(name: str, target: str, repeat: int = DEFAULT_REPEAT) -> StartupResult:
+    """Meilleur cout d'import sur `repeat` interpreteurs neufs pour un point d'entree "module:fonction"."""
+    module, _, attr = target.partition(":")
+    code = f"import sys; sys.stderr.write({_MARKER!r} + '\\n'); import {module} as m"
+    if attr:
+        code += f"; m.{attr}"
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(p for p in (str(SRC_DIR), env.get("PYTHONPATH")) if p)
+
+    best: StartupResult | None = None
+    for _ in range(max(repeat, 1)):
+        proc = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", code],
+            capture_output=True,
+            text=True,
+            env=env,
+            check=False,
+        )
+        if proc.returncode != 0:
+            raise RuntimeError(f"Import de {target} impossible:\n{proc.stderr[-2000:]}")
+        import_us, modules, heaviest = parse_importtime(proc.stderr)
+        if best is None or import_us < best.import_us:
+            best = StartupResult(name=name, target=target, import_us=import_us, modules=modules, heaviest=heaviest[:3])
+    return best
+
+
+def run_all(
+    names: list[str] | None = None,
+    repeat: int = DEFAULT_REPEAT,
+    pyproject: Path = PYPROJECT_PATH,
+) -> list[StartupResult]:
+    """Mesure les points d'entree demandes (tous par defaut)."""
+    scripts = load_entry_points(pyproject)
+    selected = names or list(scripts)
+    unknown = [n for n in selected if n not in scripts]
+    if unknown:
+        raise ValueError(f"Point(s) d'entree inconnu(s): {', '.join(unknown)}")
+    return [measure_entry_point(name, scripts[name], repeat) for name in selected]
+
+
+def load_baseline(path: Path) -> dict[str, dict]:
+    """Charge la baseline ({nom: {import_us, modules, ...}}), vide si absente."""
+    if not path.exists():
+        return {}
+    with open(path, encoding="utf-8") as f:
+        return json.load(f).get("entry_points", {})
+
+
+def save_baseline(results: list[StartupResult], path: Path) -> None:
+    """Ecrit la baseline en conservant les entrees des points d'entree non remesures."""
+    entries = load_baseline(path)
+    for r in results:
+        entries[r.name] = {"target": r.target, "import_us": r.import_us, "modules": len(r.modules)}
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"entry_points": dict(sorted(entries.items()))}, f, indent=2)
+        f.write("\n")
+
+
+def compare_to_baseline(
+    results: list[StartupResult],
+    baseline: dict[str, dict],
+    threshold: float = DEFAULT_THRESHOLD,
+) -> list[str]:
+    """
+    Compare les resultats a la baseline.
+
+    Returns:
+        Liste des regressions (cout d'import en hausse au-dela du seuil et du bruit)
+    """
+    regressions: list[str] = []
+    for r in results:
+        ref = baseline.get(r.name, {}).get("import_us", 0)
+        if not ref:
+            continue
+        delta = r.import_us - ref
+        if delta > IMPORT_NOISE_FLOOR_US and r.import_us > ref * (1 + threshold):
+            heaviest = ", ".join(f"{name} {us / 1000:,.0f} ms" for name, us in r.heaviest)
+            regressions.append(
+                f"{r.name}: {r.import_us / 1000:,.0f} ms vs baseline {ref / 1000:,.0f} ms "
+                f"(+{delta / 1000:,.0f} ms ; imports les plus lourds : {heaviest})"
+            )
+    return regressions
+
+
+def format_report(results: list[StartupResult], baseline: dict[str, dict]) -> str:
+    """Formate un tableau texte des resultats (avec delta vs baseline si disponible)."""
+    lines = [
+        f"{'Script':<26} {'Import (ms)':>12} {'Modules':>8} {'vs baseline':>12}  Plus lourd",
+        "-" * 92,
+    ]
+    for r in results:
+        ref = baseline.get(r.name, {}).get("import_us")
+        delta = f"{r.import_us / ref - 1:+.0%}" if ref else "n/a"
+        heaviest = f"{r.heaviest[0][0]} ({r.heaviest[0][1] / 1000:,.0f} ms)" if r.heaviest else ""
+        lines.append(f"{r.name:<26} {r.import_us / 1000:>12,.1f} {len(r.modules):>8} {delta:>12}  {heaviest}")
+    return "\n".join(lines)
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Point d'entree CLI du benchmark de demarrage. Retourne le code de sortie."""
+    parser = argparse.ArgumentParser(description="Temps d'import des points d'entree CLI (python -X importtime)")
+    parser.add_argument("--only", action="append", help="Limiter a un point d'entree (ex: wakastart-run)")
+    parser.add_argument("--repeat", "-r", type=int, default=DEFAULT_REPEAT, help="Interpreteurs lances par point")
+    parser.add_argument("--pyproject", type=str, default=str(PYPROJECT_PATH), help="pyproject.toml des scripts")
+    parser.add_argument("--baseline", type=str, default=str(BASELINE_PATH), help="Fichier de baseline JSON")
+    parser.add_argument("--save-baseline", action="store_true", help="Enregistrer les resultats comme baseline")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="Seuil de regression (0.5 = 50%%)")
+    parser.add_argument("--json", type=str, default=None, help="Ecrire les resultats bruts en JSON")
+
+    args = parser.parse_args(argv)
+    baseline_path = Path(args.baseline)
+
+    print(f"[INFO] Temps d'import des points d'entree, meilleur de {args.repeat} interpreteur(s)")
+    results = run_all(names=args.only, repeat=args.repeat, pyproject=Path(args.pyproject))
+    baseline = load_baseline(baseline_path)
+
+    print(format_report(results, baseline))
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump([asdict(r) for r in results], f, indent=2)
+
+    if args.save_baseline:
+        save_baseline(results, baseline_path)
+        print(f"[OK] Baseline mise a jour : {baseline_path}")
+        return 0
+
+    if not baseline:
+        print(f"[WARNING] Aucune baseline trouvee ({baseline_path}), comparaison ignoree")
+        return 0
+
+    regressions = compare_to_baseline(results, baseline, args.threshold)
+    if regressions:
+        print(f"\n[REGRESSION] {len(regressions)} regression(s) au-dela de {args.threshold:.0%} :")
+        for line in regressions:
+            print(f"  - {line}")
+        return 1
+
+    print(f"\n[OK] Aucune regression au-dela de {args.threshold:.0%}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,7 +1,18 @@
 """Crews disponibles."""
 
-from .analysis import AnalysisCrew
-from .enrichment import EnrichmentCrew
-from .search import SearchCrew
+from typing import TYPE_CHECKING
+
+from wakastart_leads.shared.utils.lazy_import import lazy_exports
+
+if TYPE_CHECKING:
+    from .analysis import AnalysisCrew
+    from .enrichment import EnrichmentCrew
+    from .search import SearchCrew
+
+# Chaque crew est importe a la premiere utilisation (une commande ne charge que le sien)
+__getattr__ = lazy_exports(
+    __name__,
+    {"AnalysisCrew": ".analysis", "EnrichmentCrew": ".enrichment", "SearchCrew": ".search"},
+)
 
 __all__ = ["AnalysisCrew", "EnrichmentCrew", "SearchCrew"]
@@ -1,5 +1,13 @@
 """Analysis crew - Analyse complete des entreprises SaaS."""
 
-from .crew import AnalysisCrew
+from typing import TYPE_CHECKING
+
+from wakastart_leads.shared.utils.lazy_import import lazy_exports
+
+if TYPE_CHECKING:
+    from .crew import AnalysisCrew
+
+# Crew (et CrewAI) importe a la premiere utilisation : les modules voisins restent legers
+__getattr__ = lazy_exports(__name__, {"AnalysisCrew": ".crew"})
 
 __all__ = ["AnalysisCrew"]
@@ -0,0 +1,95 @@
+"""Cascade de modeles pour le scoring commercial (ACT 4).
+
+En mode cascade, l'analyse commerciale est produite par un modele economique qui
+termine sa reponse par un signal `SCORE: <0-100> | CONFIANCE: <haute|moyenne|basse>`.
+La revue par le modele premium (tache conditionnelle `commercial_analysis_review`)
+n'est executee que pour les cas limites : score dans la zone d'incertitude,
+confiance basse ou signal absent. Les leads evidents (tres pertinents ou hors
+cible) ne paient que le modele economique.
+
+La page Gamma suit la meme escalade : redigee par le modele economique quand le
+score est accepte, par le modele premium de redaction (`gamma_webpage_creation_premium`)
+quand la revue a eu lieu. Les deux variantes sont des taches conditionnelles
+enchainees : chacune ne s'execute que si la tache precedente a ete sautee.
+
+Configuration :
+    ANALYSIS_CASCADE=1              # active la cascade (aussi: run/pipeline --cascade)
+    ANALYSIS_CASCADE_BAND=50-80     # zone d'incertitude (bornes incluses)
+"""
+
+import os
+import re
+import threading
+from collections import Counter
+from typing import Any
+
+CHEAP_MODEL = "gemini/gemini-2.5-flash"
+PREMIUM_MODEL = "anthropic/claude-sonnet-4-5-20250929"
+# Redaction de la page Gamma (modele par defaut, et cas limites en cascade)
+GAMMA_PREMIUM_MODEL = "gemini/gemini-2.5-pro"
+DEFAULT_BAND = (50, 80)
+
+SIGNAL_PATTERN = re.compile(r"SCORE\s*:\s*(\d{1,3})\s*%?\s*(?:\|\s*CONFIANCE\s*:\s*(haute|moyenne|basse))?", re.I)
+
+stats: Counter[str] = Counter()
+_stats_lock = threading.Lock()
+
+
+def is_cascade_enabled() -> bool:
+    """True si la cascade est activee (ANALYSIS_CASCADE)."""
+    return os.environ.get("ANALYSIS_CASCADE", "").strip().lower() in ("1", "true", "yes", "on")
+
+
+def uncertainty_band() -> tuple[int, int]:
+    """Zone d'incertitude (bornes incluses), depuis ANALYSIS_CASCADE_BAND ("50-80")."""
+    raw = os.environ.get("ANALYSIS_CASCADE_BAND", "")
+    match = re.fullmatch(r"\s*(\d{1,3})\s*-\s*(\d{1,3})\s*", raw)
+    if not match:
+        return DEFAULT_BAND
+    low, high = sorted((int(match.group(1)), int(match.group(2))))
+    return low, high
+
+
+def parse_score_signal(text: str) -> tuple[int | None, str | None]:
+    """(score, confiance) du dernier signal `SCORE: ... | CONFIANCE: ...` du texte."""
+    matches = list(SIGNAL_PATTERN.finditer(text or ""))
+    if not matches:
+        return None, None
+    score, confidence = matches[-1].groups()
+    return min(int(score), 100), confidence.lower() if confidence else None
+
+
+def needs_review(output: Any) -> bool:
+    """
+    Condition de la revue premium, evaluee sur la sortie de l'analyse commerciale.
+
+    Revue si le signal est absent, la confiance basse ou le score dans la zone
+    d'incertitude.
+    """
+    score, confidence = parse_score_signal(getattr(output, "raw", None) or str(output or ""))
+    low, high = uncertainty_band()
+    review = score is None or confidence == "basse" or low <= score <= high
+    with _stats_lock:
+        stats["reviewed" if review else "accepted"] += 1
+    return review
+
+
+def previous_task_skipped(output: Any) -> bool:
+    """
+    Condition des variantes Gamma : la tache conditionnelle precedente a ete sautee.
+
+    Une tache conditionnelle sautee produit une sortie vide ; la revue executee ou
+    la page Gamma economique redigee produisent du texte.
+    """
+    return not (getattr(output, "raw", None) or "").strip()
+
+
+def format_cascade_stats() -> str | None:
+    """Ligne de log : scores acceptes au premier niveau / revus par le modele premium (None si inutilise)."""
+    total = stats["reviewed"] + stats["accepted"]
+    if not total:
+        return None
+    return (
+        f"[INFO] Cascade scoring: {stats['accepted']} score(s) accepte(s) sans modele premium, "
+        f"{stats['reviewed']} revu(s) sur {total}"
+    )
@@ -1,11 +1,26 @@
 """Analysis crew - Analyse complete des entreprises SaaS pour WakaStart."""
 
 from crewai import LLM, Agent, Crew, Process, Task
-from crewai.project import CrewBase, agent, crew, task
-from crewai_tools import ScrapeWebsiteTool, SerperDevTool
+from crewai.project import CrewBase, agent, before_kickoff, crew, task
+from crewai.tasks.conditional_task import ConditionalTask
 
+from wakastart_leads.shared.tools.registry import RegistryFacts, apply_registry_facts
 from wakastart_leads.shared.tools.sirene_tool import SireneSearchTool
+from wakastart_leads.shared.tools.web_tools import CachedScrapeWebsiteTool, CachedSerperDevTool
+from wakastart_leads.shared.utils.llm_cache import enable_response_cache
+from wakastart_leads.shared.utils.log_config import is_crew_verbose
+from wakastart_leads.shared.utils.parallel_runner import UrlResult, clean_csv_row
+from wakastart_leads.shared.utils.prompt_cache import enable_prompt_caching
 
+from .cascade import (
+    CHEAP_MODEL,
+    GAMMA_PREMIUM_MODEL,
+    PREMIUM_MODEL,
+    is_cascade_enabled,
+    needs_review,
+    previous_task_skipped,
+)
+from .prefetch import NO_PREFETCH, prefetch_company
 from .tools.apollo_tool import ApolloSearchTool
 from .tools.gamma_tool import GammaCreateTool
 
@@ -17,13 +32,16 @@ class AnalysisCrew:
     agents_config = "config/agents.yaml"
     tasks_config = "config/tasks.yaml"
     log_file: str | None = None
+    registry_facts: RegistryFacts | None = None
+    # Construit une fois par execution, copie pour chaque URL (CrewFactory)
+    reusable_crew = True
 
     @agent
     def economic_intelligence_analyst(self) -> Agent:
         """ACT 0 + ACT 1 : Expert en Intelligence Economique & Tech Scouting"""
         return Agent(
             config=self.agents_config["economic_intelligence_analyst"],
-            tools=[ScrapeWebsiteTool(), SerperDevTool(), SireneSearchTool()],
+            tools=[CachedScrapeWebsiteTool(), CachedSerperDevTool(), SireneSearchTool()],
             reasoning=False,
             max_reasoning_attempts=None,
             inject_date=True,
@@ -31,9 +49,11 @@ class AnalysisCrew:
             max_iter=25,
             max_rpm=None,
             max_execution_time=None,
-            llm=LLM(
-                model="gemini/gemini-2.5-flash",  # Optimise: extraction de donnees
-                temperature=0.2,
+            llm=enable_prompt_caching(
+                LLM(
+                    model="gemini/gemini-2.5-flash",  # Optimise: extraction de donnees
+                    temperature=0.2,
+                )
             ),
         )
 
@@ -42,7 +62,7 @@ class AnalysisCrew:
         """ACT 2 + ACT 3 : Analyste Donnees Corporatives & Qualification SaaS"""
         return Agent(
             config=self.agents_config["corporate_analyst_and_saas_qualifier"],
-            tools=[SerperDevTool(), ScrapeWebsiteTool(), SireneSearchTool()],
+            tools=[CachedSerperDevTool(), CachedScrapeWebsiteTool(), SireneSearchTool()],
             reasoning=False,
             max_reasoning_attempts=None,
             inject_date=True,
@@ -50,18 +70,29 @@ class AnalysisCrew:
             max_iter=25,
             max_rpm=None,
             max_execution_time=None,
-            llm=LLM(
-                model="gemini/gemini-2.5-flash",  # Optimise: qualification SaaS
-                temperature=0.4,
+            llm=enable_prompt_caching(
+                LLM(
+                    model="gemini/gemini-2.5-flash",  # Optimise: qualification SaaS
+                    temperature=0.4,
+                )
             ),
         )
 
     @agent
     def wakastart_sales_engineer(self) -> Agent:
-        """ACT 4 : Ingenieur Commercial Senior WakaStart"""
+        """ACT 4 : Ingenieur Commercial Senior WakaStart (modele economique en mode cascade)"""
+        # Premium: scoring commercial critique ; en cascade, premium reserve a la revue des cas limites
+        return self._sales_agent("wakastart_sales_engineer", CHEAP_MODEL if is_cascade_enabled() else PREMIUM_MODEL)
+
+    @agent
+    def wakastart_sales_reviewer(self) -> Agent:
+        """ACT 4 bis : Revue premium du scoring des cas limites (mode cascade uniquement)"""
+        return self._sales_agent("wakastart_sales_reviewer", PREMIUM_MODEL)
+
+    def _sales_agent(self, config_name: str, model: str) -> Agent:
         return Agent(
-            config=self.agents_config["wakastart_sales_engineer"],
-            tools=[ScrapeWebsiteTool(), SerperDevTool(), SireneSearchTool()],
+            config=self.agents_config[config_name],
+            tools=[CachedScrapeWebsiteTool(), CachedSerperDevTool(), SireneSearchTool()],
             reasoning=False,
             max_reasoning_attempts=None,
             inject_date=True,
@@ -69,15 +100,26 @@ class AnalysisCrew:
             max_iter=25,
             max_rpm=None,
             max_execution_time=None,
-            llm=LLM(
-                model="anthropic/claude-sonnet-4-5-20250929",  # Premium: scoring commercial critique
-                temperature=0.6,
+            llm=enable_prompt_caching(
+                LLM(
+                    model=model,
+                    temperature=0.6,
+                )
             ),
         )
 
     @agent
     def gamma_webpage_creator(self) -> Agent:
         """Architecte de Contenu Commercial Digital - Creation pages Gamma"""
+        # Premium: creation contenu commercial creatif (economique en mode cascade, hors cas limites)
+        return self._gamma_agent(CHEAP_MODEL if is_cascade_enabled() else GAMMA_PREMIUM_MODEL)
+
+    @agent
+    def gamma_webpage_creator_premium(self) -> Agent:
+        """Creation pages Gamma des cas limites revus (mode cascade uniquement)"""
+        return self._gamma_agent(GAMMA_PREMIUM_MODEL)
+
+    def _gamma_agent(self, model: str) -> Agent:
         return Agent(
             config=self.agents_config["gamma_webpage_creator"],
             tools=[GammaCreateTool()],
@@ -88,9 +130,11 @@ class AnalysisCrew:
             max_iter=25,
             max_rpm=None,
             max_execution_time=None,
-            llm=LLM(
-                model="gemini/gemini-2.5-pro",  # Premium: creation contenu commercial creatif
-                temperature=0.3,
+            llm=enable_prompt_caching(
+                LLM(
+                    model=model,
+                    temperature=0.3,
+                )
             ),
         )
 
@@ -100,8 +144,8 @@ class AnalysisCrew:
         return Agent(
             config=self.agents_config["lead_generation_expert"],
             tools=[
-                SerperDevTool(),
-                ScrapeWebsiteTool(),
+                CachedSerperDevTool(),
+                CachedScrapeWebsiteTool(),
                 SireneSearchTool(),
                 ApolloSearchTool(),
             ],
@@ -112,9 +156,11 @@ class AnalysisCrew:
             max_iter=25,
             max_rpm=None,
             max_execution_time=None,
-            llm=LLM(
-                model="gemini/gemini-2.5-flash",  # Optimise: identification decideurs
-                temperature=0.2,
+            llm=enable_prompt_caching(
+                LLM(
+                    model="gemini/gemini-2.5-flash",  # Optimise: identification decideurs
+                    temperature=0.2,
+                )
             ),
         )
 
@@ -131,9 +177,11 @@ class AnalysisCrew:
             max_iter=25,
             max_rpm=None,
             max_execution_time=None,
-            llm=LLM(
-                model="gemini/gemini-2.0-flash-lite",  # Budget: formatage CSV simple
-                temperature=0.1,
+            llm=enable_prompt_caching(
+                LLM(
+                    model="gemini/gemini-2.0-flash-lite",  # Budget: formatage CSV simple
+                    temperature=0.1,
+                )
             ),
         )
 
@@ -161,14 +209,39 @@ class AnalysisCrew:
             markdown=False,
         )
 
+    @task
+    def commercial_analysis_review(self) -> ConditionalTask:
+        """ACT 4 bis : Revue premium du score, executee seulement pour les cas limites (mode cascade)"""
+        return ConditionalTask(
+            config=self.tasks_config["commercial_analysis_review"],
+            condition=needs_review,
+            markdown=False,
+        )
+
     @task
     def gamma_webpage_creation(self) -> Task:
-        """Creation de pages web Gamma pour chaque prospect"""
+        """Creation de pages web Gamma pour chaque prospect (en cascade : score accepte sans revue)"""
+        if is_cascade_enabled():
+            return ConditionalTask(
+                config=self.tasks_config["gamma_webpage_creation"],
+                condition=previous_task_skipped,
+                markdown=False,
+            )
         return Task(
             config=self.tasks_config["gamma_webpage_creation"],
             markdown=False,
         )
 
+    @task
+    def gamma_webpage_creation_premium(self) -> ConditionalTask:
+        """Creation de la page Gamma par le modele premium, pour les cas limites revus (mode cascade)"""
+        return ConditionalTask(
+            config=self.tasks_config["gamma_webpage_creation"],
+            agent=self.gamma_webpage_creator_premium(),
+            condition=previous_task_skipped,
+            markdown=False,
+        )
+
     @task
     def decision_makers_identification(self) -> Task:
         """ACT 5 : Identification des decideurs (CEO, CTO, etc.)"""
@@ -185,14 +258,62 @@ class AnalysisCrew:
             output_file="src/wakastart_leads/crews/analysis/output/company_report_new.csv",
         )
 
+    def prefetch_inputs(self, url: str) -> dict[str, str]:
+        """Pre-charge en parallele les donnees de l'URL avec les outils des agents (appele par le runner)."""
+        prefetched = prefetch_company(url, [tool for crew_agent in self.agents for tool in crew_agent.tools or []])
+        self.registry_facts = prefetched.registry
+        return prefetched.inputs
+
+    def finalize_result(self, result: UrlResult) -> None:
+        """Ecrit les faits du registre dans le resultat, sans passer par un agent (appele par le runner)."""
+        if self.registry_facts is None:
+            return
+        result.facts.update(self.registry_facts.as_dict())
+        if result.csv_row:
+            row = clean_csv_row(result.csv_row)
+            if row:
+                result.csv_row = apply_registry_facts(row, self.registry_facts)
+
+    @before_kickoff
+    def default_prefetch_inputs(self, inputs: dict | None) -> dict:
+        """Valeurs par defaut quand le kickoff n'est pas precede d'un pre-chargement."""
+        inputs = dict(inputs or {})
+        inputs.setdefault("prefetched_company_data", NO_PREFETCH)
+        inputs.setdefault("prefetched_decision_makers", NO_PREFETCH)
+        return inputs
+
     @crew
     def crew(self) -> Crew:
         """Creates the Analysis crew"""
+        # Cache disque des reponses LLM (opt-in via LLM_CACHE_ENABLED)
+        for crew_agent in self.agents:
+            enable_response_cache(crew_agent.llm)
+
+        agents, tasks = self.agents, self.tasks
+        if is_cascade_enabled():
+            # La revue (si executee) prevaut sur l'analyse commerciale pour Gamma et le CSV final ;
+            # la page Gamma vient de la variante executee (economique ou premium)
+            review = self.commercial_analysis_review()
+            gamma_premium = self.gamma_webpage_creation_premium()
+            final_report = self.compile_final_company_analysis_report()
+            for dependent, upstream in (
+                (self.gamma_webpage_creation(), review),
+                (gamma_premium, review),
+                (final_report, review),
+                (final_report, gamma_premium),
+            ):
+                if isinstance(dependent.context, list) and upstream not in dependent.context:
+                    dependent.context.append(upstream)
+        else:
+            cascade_only = (self.wakastart_sales_reviewer(), self.gamma_webpage_creator_premium())
+            agents = [a for a in agents if all(a is not cascade_agent for cascade_agent in cascade_only)]
+            tasks = [t for t in tasks if t.name not in ("commercial_analysis_review", "gamma_webpage_creation_premium")]
+
         return Crew(
-            agents=self.agents,
-            tasks=self.tasks,
+            agents=agents,
+            tasks=tasks,
             process=Process.sequential,
-            verbose=True,
+            verbose=is_crew_verbose(),
             chat_llm=LLM(model="gemini/gemini-2.0-flash-lite"),  # Optimise: chat interne
             output_log_file=self.log_file,
         )
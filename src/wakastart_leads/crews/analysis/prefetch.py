@@ -0,0 +1,179 @@
+"""Pre-chargement concurrent des donnees d'une entreprise avant le kickoff du crew d'analyse.
+
+Les agents decouvrent les faits par appels d'outils successifs (scraping, Sirene,
+Apollo, logo), chacun precede d'un tour de LLM. Ici, les memes outils sont appeles
+en parallele avant le kickoff et leurs resultats injectes dans les inputs du crew.
+Les outils memorisent leurs resultats (cache de pages, decideurs, logo) : un appel
+de l'agent pour les memes donnees est ensuite servi sans nouvel appel reseau.
+
+Les faits legaux (SIREN, creation, forme juridique, effectif) sont resolus sans
+LLM a partir des mentions legales et du JSON Sirene/Pappers (`registry`).
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+from urllib.parse import urljoin
+
+from wakastart_leads.shared.tools.pappers_tool import PappersSearchTool
+from wakastart_leads.shared.tools.registry import RegistryFacts, find_sirens, name_matches, resolve_registry_facts
+from wakastart_leads.shared.tools.sirene_tool import SireneSearchTool
+from wakastart_leads.shared.tools.web_tools import CachedScrapeWebsiteTool
+
+from .tools.apollo_tool import ApolloSearchTool
+from .tools.gamma_tool import GammaCreateTool
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+NO_PREFETCH = "Aucune donnee pre-chargee."
+MAX_SECTION_CHARS = 4000
+# Pages scrapees pour trouver le SIREN quand la page d'accueil ne le cite pas
+LEGAL_PATHS = ("/mentions-legales", "/legal")
+
+
+@dataclass
+class CompanyPrefetch:
+    """Resultat du pre-chargement : inputs du crew et faits du registre."""
+
+    inputs: dict[str, str]
+    registry: RegistryFacts | None = None
+
+
+def company_domain(url: str) -> str:
+    """Domaine nu d'une URL ("https://www.acme.fr/produit" -> "acme.fr")."""
+    domain = url.strip().lower().replace("https://", "").replace("http://", "").split("/")[0]
+    return domain.removeprefix("www.")
+
+
+def company_name_hint(domain: str) -> str:
+    """Nom probable de l'entreprise deduit du domaine ("acme-sante.fr" -> "acme sante")."""
+    return domain.split(".")[0].replace("-", " ")
+
+
+def _truncate(text: str) -> str:
+    text = str(text).strip()
+    return text if len(text) <= MAX_SECTION_CHARS else text[:MAX_SECTION_CHARS] + "\n[...]"
+
+
+def _find_tool(tools: list[Any], tool_type: type) -> Any:
+    return next((tool for tool in tools if isinstance(tool, tool_type)), None)
+
+
+def _lookup_registry(
+    base_url: str, homepage: str, scrape: Any, sirene: Any, pappers: Any, hints: tuple[str, ...]
+) -> RegistryFacts | None:
+    """
+    SIREN des mentions legales (accueil puis pages legales) puis faits Sirene/Pappers.
+
+    Chaque SIREN cite est resolu et seul celui dont la denomination correspond a
+    l'un des `hints` (domaine, nom deduit) est retenu : le SIREN de l'hebergeur ou
+    de l'editeur du site n'est jamais injecte. None si aucun ne correspond.
+    """
+    tried: set[str] = set()
+
+    def matching_facts(text: str) -> RegistryFacts | None:
+        for siren in find_sirens(text):
+            if siren in tried:
+                continue
+            tried.add(siren)
+            facts = resolve_registry_facts(siren, sirene, pappers)
+            if facts is not None and name_matches(facts.name, *hints):
+                return facts
+        return None
+
+    facts = matching_facts(homepage)
+    for path in LEGAL_PATHS:
+        if facts is not None or scrape is None:
+            break
+        try:
+            facts = matching_facts(str(scrape._run(website_url=urljoin(base_url, path))))
+        except Exception:
+            continue
+    return facts
+
+
+def prefetch_company_data(url: str, tools: list[Any], homepage_url: str | None = None) -> dict[str, str]:
+    """Inputs pre-charges pour une URL (voir `prefetch_company`)."""
+    return prefetch_company(url, tools, homepage_url).inputs
+
+
+def prefetch_company(url: str, tools: list[Any], homepage_url: str | None = None) -> CompanyPrefetch:
+    """
+    Recupere en parallele page d'accueil, faits du registre, donnees Sirene, decideurs Apollo et logo.
+
+    Les outils utilises sont ceux des agents du crew (memes instances, donc memes
+    caches et memes spans de timing). Un outil absent ou en erreur est simplement
+    omis : les agents peuvent toujours l'appeler eux-memes.
+
+    Args:
+        url: URL de l'entreprise
+        tools: Outils des agents du crew
+        homepage_url: URL a scraper si differente de `url`
+
+    Returns:
+        CompanyPrefetch : inputs a fusionner (`prefetched_company_data`,
+        `prefetched_decision_makers`) et faits du registre (None si non resolus)
+    """
+    domain = company_domain(url)
+    name = company_name_hint(domain)
+    scrape = _find_tool(tools, CachedScrapeWebsiteTool)
+    sirene = _find_tool(tools, SireneSearchTool)
+    apollo = _find_tool(tools, ApolloSearchTool)
+    gamma = _find_tool(tools, GammaCreateTool)
+    pappers = _find_tool(tools, PappersSearchTool) or PappersSearchTool()
+    registry: list[RegistryFacts] = []
+
+    def homepage_and_registry() -> str:
+        text = str(scrape._run(website_url=homepage_url or url))
+        try:
+            facts = _lookup_registry(homepage_url or url, text, scrape, sirene, pappers, (domain, name))
+        except Exception as e:
+            print(f"[WARNING] Faits registre indisponibles pour {domain}: {e}")
+            facts = None
+        if facts is not None:
+            registry.append(facts)
+        return text
+
+    jobs: dict[str, Callable[[], Any]] = {}
+    if scrape is not None:
+        jobs["homepage"] = homepage_and_registry
+    if sirene is not None:
+        jobs["sirene"] = lambda: sirene._run(query=name)
+    if apollo is not None:
+        jobs["apollo"] = lambda: apollo._run(domain=domain, company_name=name)
+    if gamma is not None:
+        jobs["logo"] = lambda: gamma._resolve_company_logo(domain, name)
+
+    results: dict[str, str] = {}
+    if jobs:
+        with ThreadPoolExecutor(max_workers=len(jobs)) as pool:
+            futures = {key: pool.submit(job) for key, job in jobs.items()}
+            for key, future in futures.items():
+                try:
+                    results[key] = _truncate(future.result())
+                except Exception as e:
+                    print(f"[WARNING] Pre-chargement {key} echoue pour {domain}: {e}")
+
+    facts = registry[0] if registry else None
+    sections = []
+    if facts is not None:
+        sections.append(
+            f"FAITS REGISTRE ({facts.source.capitalize()}, SIREN des mentions legales correspondant au site - "
+            f"verifies, ne pas les rechercher a nouveau) :\n{facts.as_prompt()}"
+        )
+    if results.get("homepage"):
+        sections.append(f"PAGE D'ACCUEIL ({homepage_url or url}) :\n{results['homepage']}")
+    if results.get("sirene") and facts is None:
+        sections.append(
+            f'SIRENE (recherche sur le nom deduit du domaine "{name}", a confirmer avec le SIREN '
+            f"des mentions legales) :\n{results['sirene']}"
+        )
+    if results.get("logo"):
+        sections.append(f"LOGO : {results['logo']}")
+
+    inputs = {
+        "prefetched_company_data": "\n\n".join(sections) or NO_PREFETCH,
+        "prefetched_decision_makers": results.get("apollo") or NO_PREFETCH,
+    }
+    return CompanyPrefetch(inputs, facts)
@@ -1,12 +1,15 @@
 """Apollo.io Search & Enrichment Tool pour l'identification des decideurs."""
 
+import asyncio
 import os
 import re
 from typing import ClassVar
 
+import httpx
 import requests
-from crewai.tools import BaseTool
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr
+
+from wakastart_leads.shared.tools.async_http import AsyncTool, get_async_client
 
 
 class ApolloSearchInput(BaseModel):
@@ -16,7 +19,7 @@ class ApolloSearchInput(BaseModel):
     company_name: str = Field(..., description="Nom de l'entreprise pour contexte")
 
 
-class ApolloSearchTool(BaseTool):
+class ApolloSearchTool(AsyncTool):
     """
     Recherche et enrichit les decideurs d'une entreprise via l'API Apollo.io.
 
@@ -58,6 +61,9 @@ class ApolloSearchTool(BaseTool):
     # Titres specifiques a cibler (CTO et variantes)
     TARGET_TITLES: ClassVar[list[str]] = ["CTO", "Chief Technology Officer", "Directeur Technique"]
 
+    # Resultats deja obtenus par domaine (pre-chargement puis appel de l'agent = 1 seul enrichissement)
+    _results: dict[str, str] = PrivateAttr(default_factory=dict)
+
     def _get_headers(self) -> dict[str, str]:
         """Construit les headers d'authentification Apollo."""
         api_key = os.getenv("APOLLO_API_KEY", "").strip()
@@ -100,7 +106,16 @@ class ApolloSearchTool(BaseTool):
         """
         url = f"{self.API_BASE}{self.SEARCH_ENDPOINT}"
         response = requests.post(url, headers=self._get_headers(), params=params, timeout=30)
+        return self._search_results(response)
+
+    async def _aexecute_search(self, params: list[tuple[str, str]]) -> list[dict]:
+        """Version asynchrone de `_execute_search` (memes erreurs levees)."""
+        url = f"{self.API_BASE}{self.SEARCH_ENDPOINT}"
+        response = await get_async_client().post(url, headers=self._get_headers(), params=params, timeout=30)
+        return self._search_results(response)
 
+    def _search_results(self, response: requests.Response | httpx.Response) -> list[dict]:
+        """Candidats d'une reponse People API Search (requests ou httpx)."""
         if response.status_code == 401:
             raise PermissionError("Cle API Apollo invalide ou expiree.")
         if response.status_code == 403:
@@ -139,6 +154,13 @@ class ApolloSearchTool(BaseTool):
         params_fallback = self._build_search_params(domain, with_filters=False)
         return self._execute_search(params_fallback)
 
+    async def _asearch_people(self, domain: str) -> list[dict]:
+        """Version asynchrone de `_search_people` (meme fallback sans filtres)."""
+        people = await self._aexecute_search(self._build_search_params(domain, with_filters=True))
+        if people:
+            return people
+        return await self._aexecute_search(self._build_search_params(domain, with_filters=False))
+
     def _enrich_person(self, apollo_id: str) -> dict | None:
         """
         Etape 2 : Enrichit un decideur par son ID Apollo (payant, 1 credit).
@@ -164,6 +186,26 @@ class ApolloSearchTool(BaseTool):
         except requests.exceptions.RequestException:
             return None
 
+    async def _aenrich_person(self, apollo_id: str) -> dict | None:
+        """Version asynchrone de `_enrich_person`."""
+        url = f"{self.API_BASE}{self.ENRICH_ENDPOINT}"
+        payload = {
+            "id": apollo_id,
+            "reveal_personal_emails": True,
+        }
+
+        try:
+            response = await get_async_client().post(url, headers=self._get_headers(), json=payload, timeout=30)
+
+            if response.status_code != 200:
+                return None
+
+            data = response.json()
+            return data.get("person")
+
+        except httpx.HTTPError:
+            return None
+
     def _rank_candidates(self, people: list[dict]) -> list[dict]:
         """Trie les candidats par seniority puis par disponibilite email."""
         if not people:
@@ -266,7 +308,60 @@ class ApolloSearchTool(BaseTool):
         return "\n".join(lines)
 
     def _run(self, domain: str, company_name: str) -> str:
-        """Execute la recherche et l'enrichissement Apollo."""
+        """Execute la recherche et l'enrichissement Apollo (une seule fois par domaine)."""
+        key = domain.strip().lower()
+        if key in self._results:
+            return self._results[key]
+        result = self._search_and_enrich(domain, company_name)
+        if not result.startswith("Erreur"):
+            self._results[key] = result
+        return result
+
+    async def _arun(self, domain: str, company_name: str) -> str:
+        """Execute la recherche et l'enrichissement Apollo (client HTTP asynchrone partage)."""
+        key = domain.strip().lower()
+        if key in self._results:
+            return self._results[key]
+        result = await self._asearch_and_enrich(domain, company_name)
+        if not result.startswith("Erreur"):
+            self._results[key] = result
+        return result
+
+    async def _asearch_and_enrich(self, domain: str, company_name: str) -> str:
+        """Version asynchrone de `_search_and_enrich` (top 3 enrichis simultanement)."""
+        api_key = os.getenv("APOLLO_API_KEY", "").strip()
+        if not api_key:
+            return "Erreur: APOLLO_API_KEY non configuree dans les variables d'environnement."
+
+        try:
+            candidates = await self._asearch_people(domain)
+
+            if not candidates:
+                return f"Aucun decideur trouve pour {company_name} ({domain})."
+
+            ids = [c["id"] for c in self._rank_candidates(candidates) if c.get("id")]
+            people = await asyncio.gather(*(self._aenrich_person(apollo_id) for apollo_id in ids))
+            enriched_people = [person for person in people if person]
+
+            if not enriched_people:
+                return f"Decideurs trouves mais enrichissement echoue pour {company_name} ({domain})."
+
+            result = self._format_decideurs(enriched_people, company_name)
+            return self._format_output(result)
+
+        except PermissionError as e:
+            return f"Erreur: {e!s}"
+        except ConnectionError as e:
+            return f"Erreur: {e!s}"
+        except httpx.TimeoutException:
+            return "Erreur: Timeout lors de la connexion a l'API Apollo."
+        except httpx.HTTPError as e:
+            return f"Erreur de connexion a l'API Apollo: {e!s}"
+        except Exception as e:
+            return f"Erreur inattendue: {e!s}"
+
+    def _search_and_enrich(self, domain: str, company_name: str) -> str:
+        """Recherche les decideurs puis enrichit les meilleurs profils."""
         api_key = os.getenv("APOLLO_API_KEY", "").strip()
         if not api_key:
             return "Erreur: APOLLO_API_KEY non configuree dans les variables d'environnement."
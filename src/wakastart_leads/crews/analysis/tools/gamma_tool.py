@@ -1,13 +1,18 @@
 """Gamma API Tool for automated webpage creation from template."""
 
+import asyncio
+import functools
 import os
 import re
 import time
 import unicodedata
 
+import httpx
 import requests
-from crewai.tools import BaseTool
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr
+
+from wakastart_leads.shared.tools.async_http import AsyncTool, get_async_client
+from wakastart_leads.shared.utils.log_config import get_logger
 
 GAMMA_TEMPLATE_ID = "g_w56csm22x0u632h"
 GAMMA_API_BASE = "https://public-api.gamma.app/v1.0"
@@ -27,6 +32,16 @@ IMAGE_PROXY_BASE = "https://wsrv.nl"
 LOGO_TARGET_WIDTH = 150
 LOGO_TARGET_HEIGHT = 80
 
+# Traces detaillees visibles avec LOG_COMPONENTS=gamma=DEBUG,linkener=DEBUG
+logger = get_logger("gamma")
+linkener_logger = get_logger("linkener")
+
+
+@functools.cache
+def _warn_linkener_not_configured() -> None:
+    """Avertit une seule fois par processus, et non a chaque page Gamma, que Linkener n'est pas configure."""
+    linkener_logger.warning("Variables d'environnement manquantes, liens courts desactives")
+
 
 class GammaCreateInput(BaseModel):
     """Input schema for GammaCreateTool."""
@@ -56,7 +71,7 @@ class GammaCreateInput(BaseModel):
     )
 
 
-class GammaCreateTool(BaseTool):
+class GammaCreateTool(AsyncTool):
     """
     Outil pour creer une page web Gamma a partir du template de vente WakaStart.
 
@@ -75,6 +90,9 @@ class GammaCreateTool(BaseTool):
     )
     args_schema: type[BaseModel] = GammaCreateInput
 
+    # Logos deja resolus par domaine (le pre-chargement evite la resolution pendant la tache)
+    _logos: dict[str, str] = PrivateAttr(default_factory=dict)
+
     def _resize_logo_via_proxy(self, original_url: str) -> str:
         """Redimensionne un logo via le proxy wsrv.nl pour harmoniser l'affichage."""
         from urllib.parse import quote
@@ -89,14 +107,15 @@ class GammaCreateTool(BaseTool):
 
     def _resolve_company_logo(self, domain: str, company_name: str) -> str:
         """Resout l'URL du logo de l'entreprise via Unavatar puis Google Favicon."""
-        clean_domain = domain.strip().lower()
-        clean_domain = clean_domain.replace("https://", "").replace("http://", "")
-        clean_domain = clean_domain.replace("www.", "").rstrip("/")
+        clean_domain = self._clean_domain(domain)
 
         if not clean_domain:
-            print(f"[GAMMA DEBUG] Domaine vide pour {company_name}, pas de logo")
+            logger.debug("Domaine vide pour %s, pas de logo", company_name)
             return ""
 
+        if clean_domain in self._logos:
+            return self._logos[clean_domain]
+
         original_logo_url: str | None = None
 
         # Strategie 1 : Unavatar (gratuit, sans cle API, agrege plusieurs sources)
@@ -104,19 +123,53 @@ class GammaCreateTool(BaseTool):
         try:
             response = requests.head(unavatar_url, timeout=5, allow_redirects=True)
             if response.status_code == 200:
-                print(f"[GAMMA DEBUG] Logo Unavatar trouve pour {clean_domain}")
+                logger.debug("Logo Unavatar trouve pour %s", clean_domain)
                 original_logo_url = unavatar_url
         except requests.exceptions.RequestException as e:
-            print(f"[GAMMA DEBUG] Unavatar erreur pour {clean_domain}: {e}")
+            logger.debug("Unavatar erreur pour %s: %s", clean_domain, e)
+
+        return self._store_logo(clean_domain, original_logo_url)
 
+    async def _aresolve_company_logo(self, domain: str, company_name: str) -> str:
+        """Version asynchrone de `_resolve_company_logo`."""
+        clean_domain = self._clean_domain(domain)
+
+        if not clean_domain:
+            logger.debug("Domaine vide pour %s, pas de logo", company_name)
+            return ""
+
+        if clean_domain in self._logos:
+            return self._logos[clean_domain]
+
+        original_logo_url: str | None = None
+
+        unavatar_url = f"{UNAVATAR_BASE}/{clean_domain}"
+        try:
+            response = await get_async_client().head(unavatar_url, timeout=5, follow_redirects=True)
+            if response.status_code == 200:
+                logger.debug("Logo Unavatar trouve pour %s", clean_domain)
+                original_logo_url = unavatar_url
+        except httpx.HTTPError as e:
+            logger.debug("Unavatar erreur pour %s: %s", clean_domain, e)
+
+        return self._store_logo(clean_domain, original_logo_url)
+
+    def _clean_domain(self, domain: str) -> str:
+        clean_domain = domain.strip().lower()
+        clean_domain = clean_domain.replace("https://", "").replace("http://", "")
+        return clean_domain.replace("www.", "").rstrip("/")
+
+    def _store_logo(self, clean_domain: str, original_logo_url: str | None) -> str:
+        """Logo final (Google Favicon a defaut d'Unavatar), redimensionne et memorise pour le domaine."""
         # Strategie 2 : Google Favicon (fallback)
         if not original_logo_url:
             original_logo_url = GOOGLE_FAVICON_BASE.format(domain=clean_domain)
-            print(f"[GAMMA DEBUG] Fallback Google Favicon pour {clean_domain}")
+            logger.debug("Fallback Google Favicon pour %s", clean_domain)
 
         # Redimensionner via proxy pour harmoniser l'affichage (150x80px)
         resized_url = self._resize_logo_via_proxy(original_logo_url)
-        print(f"[GAMMA DEBUG] Logo redimensionne: {LOGO_TARGET_WIDTH}x{LOGO_TARGET_HEIGHT}px")
+        logger.debug("Logo redimensionne: %sx%spx", LOGO_TARGET_WIDTH, LOGO_TARGET_HEIGHT)
+        self._logos[clean_domain] = resized_url
         return resized_url
 
     def _build_enhanced_prompt(
@@ -127,7 +180,14 @@ class GammaCreateTool(BaseTool):
     ) -> str:
         """Construit le prompt enrichi avec les 3 images pour la premiere page."""
         company_logo_url = self._resolve_company_logo(company_domain, company_name)
+        return self._prompt_with_images(original_prompt, company_name, company_logo_url)
 
+    async def _abuild_enhanced_prompt(self, original_prompt: str, company_domain: str, company_name: str) -> str:
+        """Version asynchrone de `_build_enhanced_prompt`."""
+        company_logo_url = await self._aresolve_company_logo(company_domain, company_name)
+        return self._prompt_with_images(original_prompt, company_name, company_logo_url)
+
+    def _prompt_with_images(self, original_prompt: str, company_name: str, company_logo_url: str) -> str:
         image_lines: list[str] = []
 
         if company_logo_url:
@@ -190,18 +250,41 @@ class GammaCreateTool(BaseTool):
                 token = response.text.strip()
                 return token if token else None
         except requests.exceptions.RequestException as e:
-            print(f"[LINKENER DEBUG] Erreur authentification: {e}")
+            linkener_logger.warning("Erreur authentification: %s", e)
         return None
 
-    def _create_linkener_url(self, gamma_url: str, company_name: str) -> str | None:
-        """Cree un lien court Linkener pour l'URL Gamma."""
+    async def _aget_linkener_token(self, api_base: str, username: str, password: str) -> str | None:
+        """Version asynchrone de `_get_linkener_token`."""
+        try:
+            response = await get_async_client().post(
+                f"{api_base}/auth/new_token",
+                json={"username": username, "password": password},
+                timeout=10,
+            )
+            if response.status_code == 200:
+                token = response.text.strip()
+                return token if token else None
+        except httpx.HTTPError as e:
+            linkener_logger.warning("Erreur authentification: %s", e)
+        return None
+
+    def _linkener_settings(self) -> tuple[str, str, str] | None:
+        """(api_base, username, password) Linkener, ou None si non configure."""
         api_base = os.getenv("LINKENER_API_BASE", "").strip()
         username = os.getenv("LINKENER_USERNAME", "").strip()
         password = os.getenv("LINKENER_PASSWORD", "").strip()
 
         if not all([api_base, username, password]):
-            print("[LINKENER DEBUG] Variables d'environnement manquantes")
+            _warn_linkener_not_configured()
+            return None
+        return api_base, username, password
+
+    def _create_linkener_url(self, gamma_url: str, company_name: str) -> str | None:
+        """Cree un lien court Linkener pour l'URL Gamma."""
+        settings = self._linkener_settings()
+        if settings is None:
             return None
+        api_base, username, password = settings
 
         # 1. Obtenir un access token
         token = self._get_linkener_token(api_base, username, password)
@@ -239,13 +322,44 @@ class GammaCreateTool(BaseTool):
                         base_url = api_base.replace("/api", "")
                         return f"{base_url}/{slug}"
                 except requests.exceptions.RequestException as e:
-                    print(f"[LINKENER DEBUG] Erreur retry apres conflit: {e}")
+                    linkener_logger.warning("Erreur retry apres conflit: %s", e)
 
         except requests.exceptions.RequestException as e:
-            print(f"[LINKENER DEBUG] Erreur creation lien: {e}")
+            linkener_logger.warning("Erreur creation lien: %s", e)
 
         return None
 
+    async def _acreate_linkener_url(self, gamma_url: str, company_name: str) -> str | None:
+        """Version asynchrone de `_create_linkener_url` (meme gestion du slug deja pris)."""
+        settings = self._linkener_settings()
+        if settings is None:
+            return None
+        api_base, username, password = settings
+
+        token = await self._aget_linkener_token(api_base, username, password)
+        if not token:
+            return None
+
+        client = get_async_client()
+        base_slug = self._sanitize_slug(company_name)
+        # Slug deja existant (409 Conflict) : un seul essai avec suffixe
+        for slug in (base_slug, f"{base_slug}-{int(time.time()) % 1000}"):
+            try:
+                response = await client.post(
+                    f"{api_base}/urls/",
+                    headers={"Authorization": token},
+                    json={"slug": slug, "url": gamma_url},
+                    timeout=30,
+                )
+            except httpx.HTTPError as e:
+                linkener_logger.warning("Erreur creation lien: %s", e)
+                return None
+            if response.status_code in (200, 201):
+                return f"{api_base.replace('/api', '')}/{slug}"
+            if response.status_code != 409:
+                return None
+        return None
+
     def _run(self, prompt: str, company_name: str, company_domain: str) -> str:
         """Execute Gamma webpage creation from template."""
         api_key = os.getenv("GAMMA_API_KEY", "").strip()
@@ -254,9 +368,75 @@ class GammaCreateTool(BaseTool):
 
         # Construire le prompt enrichi avec les images
         enhanced_prompt = self._build_enhanced_prompt(prompt, company_domain, company_name)
+        headers, payload = self._generation_request(api_key, enhanced_prompt)
+
+        try:
+            response = requests.post(
+                f"{GAMMA_API_BASE}/generations/from-template", headers=headers, json=payload, timeout=120
+            )
+            generation_id = self._read_generation(response)
+            if generation_id.startswith("Erreur"):
+                return generation_id
+
+            logger.debug("Demarrage du polling...")
+            gamma_url = self._poll_generation_status(generation_id, api_key)
+
+            # Vérifier que c'est bien une URL valide
+            if gamma_url.startswith("http"):
+                # Créer le lien court automatiquement
+                short_url = self._create_linkener_url(gamma_url, company_name)
+                if short_url:
+                    logger.debug("Lien court créé: %s", short_url)
+                    return short_url
+                logger.debug("Linkener indisponible, retour URL Gamma")
+
+            return gamma_url  # Fallback sur URL Gamma si Linkener échoue
 
-        url = f"{GAMMA_API_BASE}/generations/from-template"
+        except requests.exceptions.Timeout:
+            return "Erreur: Timeout lors de la creation Gamma (120s)."
+        except requests.exceptions.RequestException as e:
+            return f"Erreur de connexion a l'API Gamma: {e!s}"
+        except Exception as e:
+            return f"Erreur inattendue Gamma: {e!s}"
 
+    async def _arun(self, prompt: str, company_name: str, company_domain: str) -> str:
+        """Execute Gamma webpage creation from template (client HTTP asynchrone partage)."""
+        api_key = os.getenv("GAMMA_API_KEY", "").strip()
+        if not api_key:
+            return "Erreur: GAMMA_API_KEY non configuree dans les variables d'environnement."
+
+        enhanced_prompt = await self._abuild_enhanced_prompt(prompt, company_domain, company_name)
+        headers, payload = self._generation_request(api_key, enhanced_prompt)
+
+        try:
+            response = await get_async_client().post(
+                f"{GAMMA_API_BASE}/generations/from-template", headers=headers, json=payload, timeout=120
+            )
+            generation_id = self._read_generation(response)
+            if generation_id.startswith("Erreur"):
+                return generation_id
+
+            logger.debug("Demarrage du polling...")
+            gamma_url = await self._apoll_generation_status(generation_id, api_key)
+
+            if gamma_url.startswith("http"):
+                short_url = await self._acreate_linkener_url(gamma_url, company_name)
+                if short_url:
+                    logger.debug("Lien court créé: %s", short_url)
+                    return short_url
+                logger.debug("Linkener indisponible, retour URL Gamma")
+
+            return gamma_url
+
+        except httpx.TimeoutException:
+            return "Erreur: Timeout lors de la creation Gamma (120s)."
+        except httpx.HTTPError as e:
+            return f"Erreur de connexion a l'API Gamma: {e!s}"
+        except Exception as e:
+            return f"Erreur inattendue Gamma: {e!s}"
+
+    def _generation_request(self, api_key: str, enhanced_prompt: str) -> tuple[dict[str, str], dict]:
+        """Headers et payload de POST /generations/from-template."""
         headers = {
             "Content-Type": "application/json",
             "X-API-KEY": api_key,
@@ -271,54 +451,35 @@ class GammaCreateTool(BaseTool):
             },
         }
 
-        print(f"[GAMMA DEBUG] Creation from template: {GAMMA_TEMPLATE_ID}")
-        print(f"[GAMMA DEBUG] Cle API : {api_key[:8]}... (longueur: {len(api_key)})")
-        print(f"[GAMMA DEBUG] Prompt enrichi (500 premiers chars): {enhanced_prompt[:500]}")
+        logger.debug("Creation from template: %s", GAMMA_TEMPLATE_ID)
+        logger.debug("Cle API : %s... (longueur: %s)", api_key[:8], len(api_key))
+        logger.debug("Prompt enrichi (500 premiers chars): %s", enhanced_prompt[:500])
+        return headers, payload
 
-        try:
-            response = requests.post(url, headers=headers, json=payload, timeout=120)
-
-            print(f"[GAMMA DEBUG] Status POST from-template: {response.status_code}")
-
-            if response.status_code == 400:
-                error_data = response.json()
-                return f"Erreur Gamma (validation) : {error_data.get('message', response.text)}"
-            elif response.status_code == 403:
-                return "Erreur: Cle API Gamma invalide ou permissions insuffisantes."
-            elif response.status_code == 429:
-                return "Erreur: Limite de requetes Gamma atteinte. Reessayez plus tard."
-            elif response.status_code not in (200, 201):
-                print(f"[GAMMA DEBUG] Response body: {response.text[:500]}")
-                return f"Erreur API Gamma (code {response.status_code}): {response.text}"
-
-            data = response.json()
-            generation_id = data.get("generationId")
-            if not generation_id:
-                print(f"[GAMMA DEBUG] Reponse POST sans generationId: {data}")
-                return "Erreur: Reponse Gamma sans generationId."
-
-            print(f"[GAMMA DEBUG] Generation ID: {generation_id}")
-            print("[GAMMA DEBUG] Demarrage du polling...")
+    def _read_generation(self, response: requests.Response | httpx.Response) -> str:
+        """generationId de la reponse from-template (requests ou httpx), ou message d'erreur."""
+        logger.debug("Status POST from-template: %s", response.status_code)
 
-            gamma_url = self._poll_generation_status(generation_id, api_key)
+        if response.status_code == 400:
+            error_data = response.json()
+            return f"Erreur Gamma (validation) : {error_data.get('message', response.text)}"
+        elif response.status_code == 403:
+            return "Erreur: Cle API Gamma invalide ou permissions insuffisantes."
+        elif response.status_code == 429:
+            return "Erreur: Limite de requetes Gamma atteinte. Reessayez plus tard."
+        elif response.status_code not in (200, 201):
+            logger.debug("Response body: %s", response.text[:500])
+            return f"Erreur API Gamma (code {response.status_code}): {response.text}"
 
-            # Vérifier que c'est bien une URL valide
-            if gamma_url.startswith("http"):
-                # Créer le lien court automatiquement
-                short_url = self._create_linkener_url(gamma_url, company_name)
-                if short_url:
-                    print(f"[GAMMA DEBUG] Lien court créé: {short_url}")
-                    return short_url
-                print("[GAMMA DEBUG] Linkener indisponible, retour URL Gamma")
+        data = response.json()
+        generation_id = data.get("generationId")
 
-            return gamma_url  # Fallback sur URL Gamma si Linkener échoue
+        if not generation_id:
+            logger.debug("Reponse POST sans generationId: %s", data)
+            return "Erreur: Reponse Gamma sans generationId."
 
-        except requests.exceptions.Timeout:
-            return "Erreur: Timeout lors de la creation Gamma (120s)."
-        except requests.exceptions.RequestException as e:
-            return f"Erreur de connexion a l'API Gamma: {e!s}"
-        except Exception as e:
-            return f"Erreur inattendue Gamma: {e!s}"
+        logger.debug("Generation ID: %s", generation_id)
+        return generation_id
 
     def _poll_generation_status(
         self,
@@ -337,39 +498,71 @@ class GammaCreateTool(BaseTool):
         for attempt in range(max_retries):
             try:
                 response = requests.get(url, headers=headers, timeout=30)
-
-                if response.status_code != 200:
-                    print(f"[GAMMA DEBUG] Poll attempt {attempt + 1}: HTTP {response.status_code}")
-                    if response.status_code in (401, 403):
-                        return f"Erreur: Authentification Gamma echouee lors du polling (HTTP {response.status_code})"
-                    time.sleep(poll_interval)
-                    continue
-
-                data = response.json()
-                status = data.get("status", "unknown")
-                print(f"[GAMMA DEBUG] Poll attempt {attempt + 1}: status={status}")
-
-                if status == "completed":
-                    # Chercher l'URL dans les champs connus
-                    for key in ("gammaUrl", "url", "link", "pageUrl", "docUrl"):
-                        if data.get(key):
-                            print(f"[GAMMA DEBUG] URL finale Gamma ({key}): {data[key]}")
-                            return data[key]
-
-                    # Log complet si aucun champ URL trouve
-                    print(f"[GAMMA DEBUG] Reponse complete (aucun champ URL): {data}")
-                    return f"Erreur: Generation terminee mais URL introuvable. Reponse: {data}"
-
-                if status in ("failed", "error"):
-                    error_msg = data.get("error", data.get("message", "Erreur inconnue"))
-                    print(f"[GAMMA DEBUG] Generation echouee: {error_msg}")
-                    return f"Erreur: Generation Gamma echouee: {error_msg}"
-
-                # status == "pending" ou autre => continuer le polling
+                outcome = self._poll_outcome(response, attempt)
+                if outcome is not None:
+                    return outcome
                 time.sleep(poll_interval)
 
             except requests.exceptions.RequestException as e:
-                print(f"[GAMMA DEBUG] Poll attempt {attempt + 1}: erreur reseau: {e}")
+                logger.debug("Poll attempt %s: erreur reseau: %s", attempt + 1, e)
                 time.sleep(poll_interval)
 
         return f"Erreur: Timeout polling Gamma apres {max_retries * poll_interval}s (generation_id={generation_id})"
+
+    async def _apoll_generation_status(
+        self,
+        generation_id: str,
+        api_key: str,
+        poll_interval: int = 3,
+        max_retries: int = 60,
+    ) -> str:
+        """Version asynchrone de `_poll_generation_status` (attente sans bloquer la boucle)."""
+        url = f"{GAMMA_API_BASE}/generations/{generation_id}"
+        headers = {
+            "X-API-KEY": api_key,
+            "Accept": "application/json",
+        }
+        client = get_async_client()
+
+        for attempt in range(max_retries):
+            try:
+                response = await client.get(url, headers=headers, timeout=30)
+                outcome = self._poll_outcome(response, attempt)
+                if outcome is not None:
+                    return outcome
+            except httpx.HTTPError as e:
+                logger.debug("Poll attempt %s: erreur reseau: %s", attempt + 1, e)
+            await asyncio.sleep(poll_interval)
+
+        return f"Erreur: Timeout polling Gamma apres {max_retries * poll_interval}s (generation_id={generation_id})"
+
+    def _poll_outcome(self, response: requests.Response | httpx.Response, attempt: int) -> str | None:
+        """URL finale ou message d'erreur d'une reponse de polling, None si la generation est en cours."""
+        if response.status_code != 200:
+            logger.debug("Poll attempt %s: HTTP %s", attempt + 1, response.status_code)
+            if response.status_code in (401, 403):
+                return f"Erreur: Authentification Gamma echouee lors du polling (HTTP {response.status_code})"
+            return None
+
+        data = response.json()
+        status = data.get("status", "unknown")
+        logger.debug("Poll attempt %s: status=%s", attempt + 1, status)
+
+        if status == "completed":
+            # Chercher l'URL dans les champs connus
+            for key in ("gammaUrl", "url", "link", "pageUrl", "docUrl"):
+                if data.get(key):
+                    logger.debug("URL finale Gamma (%s): %s", key, data[key])
+                    return data[key]
+
+            # Log complet si aucun champ URL trouve
+            logger.debug("Reponse complete (aucun champ URL): %s", data)
+            return f"Erreur: Generation terminee mais URL introuvable. Reponse: {data}"
+
+        if status in ("failed", "error"):
+            error_msg = data.get("error", data.get("message", "Erreur inconnue"))
+            logger.warning("Generation echouee: %s", error_msg)
+            return f"Erreur: Generation Gamma echouee: {error_msg}"
+
+        # status == "pending" ou autre => continuer le polling
+        return None
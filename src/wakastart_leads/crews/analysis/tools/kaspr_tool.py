@@ -3,10 +3,18 @@
 import os
 import re
 
+import httpx
 import requests
-from crewai.tools import BaseTool
 from pydantic import BaseModel, Field
 
+from wakastart_leads.shared.tools.async_http import AsyncTool, get_async_client
+from wakastart_leads.shared.utils.log_config import get_logger
+
+KASPR_PROFILE_URL = "https://api.developers.kaspr.io/profile/linkedin"
+
+# Traces détaillées visibles avec LOG_COMPONENTS=kaspr=DEBUG
+logger = get_logger("kaspr")
+
 
 class KasprEnrichInput(BaseModel):
     """Input schema for KasprEnrichTool."""
@@ -17,7 +25,7 @@ class KasprEnrichInput(BaseModel):
     full_name: str = Field(..., description="Nom complet de la personne (Prénom Nom)")
 
 
-class KasprEnrichTool(BaseTool):
+class KasprEnrichTool(AsyncTool):
     """
     Outil pour enrichir les informations de contact via l'API Kaspr.
 
@@ -36,6 +44,42 @@ class KasprEnrichTool(BaseTool):
 
     def _run(self, linkedin_url: str, full_name: str) -> str:
         """Execute Kaspr contact enrichment."""
+        request = self._build_request(linkedin_url, full_name)
+        if isinstance(request, str):
+            return request
+        headers, payload = request
+
+        try:
+            response = requests.post(KASPR_PROFILE_URL, headers=headers, json=payload, timeout=30)
+            return self._handle_response(response, full_name, linkedin_url)
+
+        except requests.exceptions.Timeout:
+            return "Erreur: Timeout lors de la connexion à l'API Kaspr."
+        except requests.exceptions.RequestException as e:
+            return f"Erreur de connexion à l'API Kaspr: {e!s}"
+        except Exception as e:
+            return f"Erreur inattendue: {e!s}"
+
+    async def _arun(self, linkedin_url: str, full_name: str) -> str:
+        """Execute Kaspr contact enrichment (client HTTP asynchrone partagé)."""
+        request = self._build_request(linkedin_url, full_name)
+        if isinstance(request, str):
+            return request
+        headers, payload = request
+
+        try:
+            response = await get_async_client().post(KASPR_PROFILE_URL, headers=headers, json=payload, timeout=30)
+            return self._handle_response(response, full_name, linkedin_url)
+
+        except httpx.TimeoutException:
+            return "Erreur: Timeout lors de la connexion à l'API Kaspr."
+        except httpx.HTTPError as e:
+            return f"Erreur de connexion à l'API Kaspr: {e!s}"
+        except Exception as e:
+            return f"Erreur inattendue: {e!s}"
+
+    def _build_request(self, linkedin_url: str, full_name: str) -> tuple[dict[str, str], dict] | str:
+        """Headers et payload de l'appel Kaspr, ou message d'erreur (clé absente, URL invalide)."""
         api_key = os.getenv("KASPR_API_KEY", "").strip()
         if not api_key:
             return "Erreur: KASPR_API_KEY non configurée dans les variables d'environnement."
@@ -47,8 +91,6 @@ class KasprEnrichTool(BaseTool):
                 f"Erreur: URL LinkedIn invalide: {linkedin_url}. Format attendu: https://www.linkedin.com/in/username"
             )
 
-        url = "https://api.developers.kaspr.io/profile/linkedin"
-
         headers = {
             "Authorization": f"Bearer {api_key}",
             "Accept": "application/json",
@@ -58,38 +100,31 @@ class KasprEnrichTool(BaseTool):
 
         payload = {"id": linkedin_id, "name": full_name, "dataToGet": ["phone", "workEmail", "directEmail"]}
 
-        print(f"[KASPR DEBUG] Clé API: {api_key[:8]}... (longueur: {len(api_key)})")
-        print(f"[KASPR DEBUG] Payload: {payload}")
-
-        try:
-            response = requests.post(url, headers=headers, json=payload, timeout=30)
-
-            print(f"[KASPR DEBUG] Status: {response.status_code}")
-
-            if response.status_code == 401:
-                print(f"[KASPR DEBUG] Response body: {response.text[:500]}")
-                return "Erreur: Clé API Kaspr invalide ou expirée."
-            elif response.status_code == 402:
-                print(f"[KASPR DEBUG] Response body: {response.text[:500]}")
-                return "Erreur: Crédits Kaspr insuffisants."
-            elif response.status_code == 404:
-                return f"Aucun contact trouvé pour: {full_name} ({linkedin_url})"
-            elif response.status_code == 429:
-                return "Erreur: Limite de requêtes Kaspr atteinte. Réessayez plus tard."
-            elif response.status_code != 200:
-                print(f"[KASPR DEBUG] Response body: {response.text[:500]}")
-                return f"Erreur API Kaspr (code {response.status_code}): {response.text}"
-
-            data = response.json()
-            print(f"[KASPR DEBUG] Réponse brute pour {full_name}: {data}")
-            return self._format_contact_info(data, full_name, linkedin_url)
-
-        except requests.exceptions.Timeout:
-            return "Erreur: Timeout lors de la connexion à l'API Kaspr."
-        except requests.exceptions.RequestException as e:
-            return f"Erreur de connexion à l'API Kaspr: {e!s}"
-        except Exception as e:
-            return f"Erreur inattendue: {e!s}"
+        logger.debug("Clé API: %s... (longueur: %s)", api_key[:8], len(api_key))
+        logger.debug("Payload: %s", payload)
+        return headers, payload
+
+    def _handle_response(self, response: requests.Response | httpx.Response, full_name: str, linkedin_url: str) -> str:
+        """Réponse Kaspr (requests ou httpx) formatée pour l'agent."""
+        logger.debug("Status: %s", response.status_code)
+
+        if response.status_code == 401:
+            logger.debug("Response body: %s", response.text[:500])
+            return "Erreur: Clé API Kaspr invalide ou expirée."
+        elif response.status_code == 402:
+            logger.debug("Response body: %s", response.text[:500])
+            return "Erreur: Crédits Kaspr insuffisants."
+        elif response.status_code == 404:
+            return f"Aucun contact trouvé pour: {full_name} ({linkedin_url})"
+        elif response.status_code == 429:
+            return "Erreur: Limite de requêtes Kaspr atteinte. Réessayez plus tard."
+        elif response.status_code != 200:
+            logger.debug("Response body: %s", response.text[:500])
+            return f"Erreur API Kaspr (code {response.status_code}): {response.text}"
+
+        data = response.json()
+        logger.debug("Réponse brute pour %s: %s", full_name, data)
+        return self._format_contact_info(data, full_name, linkedin_url)
 
     def _extract_linkedin_id(self, url: str) -> str | None:
         """Extract LinkedIn ID from URL."""
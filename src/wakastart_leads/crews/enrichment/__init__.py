@@ -1,5 +1,13 @@
 """Enrichment crew - Enrichissement des donnees d'entreprises."""
 
-from .crew import EnrichmentCrew
+from typing import TYPE_CHECKING
+
+from wakastart_leads.shared.utils.lazy_import import lazy_exports
+
+if TYPE_CHECKING:
+    from .crew import EnrichmentCrew
+
+# Crew (et CrewAI) importe a la premiere utilisation : les modules voisins restent legers
+__getattr__ = lazy_exports(__name__, {"EnrichmentCrew": ".crew"})
 
 __all__ = ["EnrichmentCrew"]
@@ -0,0 +1,153 @@
+"""Taille de batch adaptative pour l'enrichissement.
+
+Chaque kickoff EnrichmentCrew recoit un batch d'URLs et repond par un seul
+tableau JSON. Un batch trop grand depasse la limite de sortie du modele (JSON
+tronque) et un JSON invalide fait perdre tout le batch ; un batch trop petit
+multiplie les kickoffs. La taille est ajustee apres chaque batch :
+
+- echec (kickoff en erreur, JSON illisible ou resultats manquants) : taille
+  divisee par deux, et plafond a la taille qui a echoue (releve prudemment apres
+  des batchs sains) ;
+- sortie proche de la limite de tokens : taille bornee par le budget, d'apres
+  les tokens de sortie par URL (moyenne glissante). Les tokens sont ceux comptes
+  par le kickoff (`token_usage.completion_tokens`), estimes depuis la longueur
+  de la reponse a defaut ;
+- batch plus lent que la latence cible : taille reduite d'un quart ;
+- sinon : croissance de 25 % (au moins une URL).
+
+La taille converge ainsi vers le plus grand batch sur, entre `min_size` et `max_size`.
+"""
+
+import math
+from dataclasses import dataclass
+from typing import Any
+
+# Limite de sortie de openai/gpt-4o (tokens par reponse) et marge conservee
+DEFAULT_OUTPUT_TOKEN_BUDGET = 16_384
+TOKEN_HEADROOM = 0.7
+DEFAULT_TARGET_LATENCY = 600.0
+# Part minimale des URLs du batch presentes dans la reponse pour un batch sain
+SUCCESS_RATIO = 0.9
+GROWTH_FACTOR = 1.25
+# Batchs sains consecutifs au plafond avant de le relever d'une URL
+CEILING_PROBE = 3
+# Estimation des tokens d'une reponse depuis sa longueur
+CHARS_PER_TOKEN = 4
+EWMA_WEIGHT = 0.5
+
+
+def estimate_output_tokens(raw: str) -> int:
+    """Tokens approximatifs d'une reponse (~4 caracteres par token)."""
+    return math.ceil(len(raw or "") / CHARS_PER_TOKEN)
+
+
+def observed_output_tokens(crew_output: Any) -> int:
+    """Tokens de sortie reels d'un kickoff (token_usage.completion_tokens), estimes depuis `raw` a defaut."""
+    completion_tokens = getattr(getattr(crew_output, "token_usage", None), "completion_tokens", None)
+    if isinstance(completion_tokens, int) and completion_tokens > 0:
+        return completion_tokens
+    return estimate_output_tokens(getattr(crew_output, "raw", None))
+
+
+@dataclass
+class BatchObservation:
+    """Resultat d'un batch, tel que vu par le dimensionnement."""
+
+    size: int
+    parsed: int
+    output_tokens: int
+    latency: float
+
+    @property
+    def healthy(self) -> bool:
+        return self.size > 0 and self.parsed >= self.size * SUCCESS_RATIO
+
+
+class AdaptiveBatchSizer:
+    """Taille de batch ajustee d'apres les tokens de sortie, les echecs de parsing et la latence."""
+
+    def __init__(
+        self,
+        initial: int = 20,
+        min_size: int = 1,
+        max_size: int = 50,
+        output_token_budget: int = DEFAULT_OUTPUT_TOKEN_BUDGET,
+        target_latency: float | None = DEFAULT_TARGET_LATENCY,
+    ) -> None:
+        self.min_size = max(1, min_size)
+        self.max_size = max(self.min_size, max_size)
+        self.output_token_budget = output_token_budget
+        self.target_latency = target_latency
+        self.size = self._clamp(initial)
+        self.ceiling = self.max_size
+        self.tokens_per_url: float | None = None
+        self.history: list[BatchObservation] = []
+        self._healthy_at_ceiling = 0
+
+    def _clamp(self, size: int) -> int:
+        return max(self.min_size, min(self.max_size, size))
+
+    def next_size(self, remaining: int) -> int:
+        """Taille du prochain batch (au plus `remaining`)."""
+        return max(0, min(self.size, remaining))
+
+    def record(self, size: int, parsed: int, output_tokens: int, latency: float) -> int:
+        """
+        Enregistre le resultat d'un batch et ajuste la taille.
+
+        Args:
+            size: Nombre d'URLs envoyees
+            parsed: Nombre de resultats lus dans la reponse
+            output_tokens: Tokens de sortie du kickoff (0 si inconnus)
+            latency: Duree du kickoff en secondes
+
+        Returns:
+            Taille du prochain batch
+        """
+        observation = BatchObservation(size, parsed, output_tokens, latency)
+        self.history.append(observation)
+
+        if parsed and output_tokens:
+            per_url = output_tokens / parsed
+            self.tokens_per_url = (
+                per_url
+                if self.tokens_per_url is None
+                else EWMA_WEIGHT * per_url + (1 - EWMA_WEIGHT) * self.tokens_per_url
+            )
+
+        if not observation.healthy:
+            self.ceiling = max(self.min_size, size - 1)
+            self._healthy_at_ceiling = 0
+            self.size = self._clamp(min(size // 2, self.ceiling))
+            return self.size
+
+        if size >= self.ceiling:
+            self._healthy_at_ceiling += 1
+            if self._healthy_at_ceiling >= CEILING_PROBE:
+                self.ceiling = min(self.max_size, self.ceiling + 1)
+                self._healthy_at_ceiling = 0
+
+        if self.target_latency and latency > self.target_latency:
+            target = int(size * 0.75)
+        else:
+            target = max(size + 1, int(size * GROWTH_FACTOR))
+        self.size = self._clamp(min(target, self.ceiling, self.token_limit()))
+        return self.size
+
+    def token_limit(self) -> int:
+        """Plus grand batch dont la sortie estimee tient dans le budget de tokens."""
+        if not self.tokens_per_url:
+            return self.max_size
+        return max(self.min_size, int(self.output_token_budget * TOKEN_HEADROOM / self.tokens_per_url))
+
+
+def format_batch_stats(sizer: AdaptiveBatchSizer) -> str | None:
+    """Ligne de log : batchs executes, echecs et taille retenue (None si aucun batch)."""
+    if not sizer.history:
+        return None
+    failed = sum(not o.healthy for o in sizer.history)
+    sizes = [o.size for o in sizer.history]
+    return (
+        f"[INFO] Batchs d'enrichissement: {len(sizes)} batch(s), {failed} en echec, "
+        f"taille {min(sizes)}-{max(sizes)} (prochaine: {sizer.size})"
+    )
@@ -2,7 +2,11 @@
 
 from crewai import LLM, Agent, Crew, Process, Task
 from crewai.project import CrewBase, agent, crew, task
-from crewai_tools import ScrapeWebsiteTool, SerperDevTool
+
+from wakastart_leads.shared.tools.web_tools import CachedScrapeWebsiteTool, CachedSerperDevTool
+from wakastart_leads.shared.utils.llm_cache import enable_response_cache
+from wakastart_leads.shared.utils.log_config import is_crew_verbose
+from wakastart_leads.shared.utils.prompt_cache import enable_prompt_caching
 
 
 @CrewBase
@@ -18,7 +22,7 @@ class EnrichmentCrew:
         """Agent d'analyse et qualification SaaS pour WakaStart"""
         return Agent(
             config=self.agents_config["saas_enrichment_analyst"],
-            tools=[SerperDevTool(), ScrapeWebsiteTool()],
+            tools=[CachedSerperDevTool(), CachedScrapeWebsiteTool()],
             reasoning=False,
             max_reasoning_attempts=None,
             inject_date=True,
@@ -26,9 +30,11 @@ class EnrichmentCrew:
             max_iter=30,
             max_rpm=30,
             max_execution_time=None,
-            llm=LLM(
-                model="openai/gpt-4o",
-                temperature=0.3,
+            llm=enable_prompt_caching(
+                LLM(
+                    model="openai/gpt-4o",
+                    temperature=0.3,
+                )
             ),
         )
 
@@ -43,11 +49,15 @@ class EnrichmentCrew:
     @crew
     def crew(self) -> Crew:
         """Creates the Enrichment crew"""
+        # Cache disque des reponses LLM (opt-in via LLM_CACHE_ENABLED)
+        for crew_agent in self.agents:
+            enable_response_cache(crew_agent.llm)
+
         return Crew(
             agents=self.agents,
             tasks=self.tasks,
             process=Process.sequential,
-            verbose=True,
+            verbose=is_crew_verbose(),
             chat_llm=LLM(model="openai/gpt-4o-mini"),
             output_log_file=self.log_file,
         )
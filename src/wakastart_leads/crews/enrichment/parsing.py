@@ -0,0 +1,81 @@
+"""Lecture tolerante de la reponse JSON de l'enrichissement.
+
+La reponse d'un batch est un tableau JSON d'objets (un par URL). Une reponse
+tronquee (limite de sortie) ou un caractere invalide rendait tout le tableau
+illisible. Les objets complets sont ici recuperes un par un
+(`json.JSONDecoder.raw_decode`), rapproches des URLs du batch, et les URLs sans
+resultat sont signalees pour etre renvoyees dans un batch ulterieur.
+"""
+
+import json
+from collections.abc import Iterable
+
+from wakastart_leads.shared.utils.seen_index import domain_key
+from wakastart_leads.shared.utils.url_utils import normalize_url
+
+_DECODER = json.JSONDecoder(strict=False)
+
+
+def _strip_fences(raw: str) -> str:
+    lines = [line for line in raw.strip().splitlines() if not line.strip().startswith("```")]
+    return "\n".join(lines).strip()
+
+
+def salvage_json_objects(raw: str) -> list[dict]:
+    """
+    Objets JSON complets d'une reponse, meme tronquee ou entouree de texte.
+
+    Le tableau entier est lu s'il est valide ; sinon chaque objet `{...}` qui se
+    decode est conserve (les objets tronques ou invalides sont ignores).
+    """
+    content = _strip_fences(raw or "")
+    if not content:
+        return []
+    try:
+        data = _DECODER.decode(content)
+    except json.JSONDecodeError:
+        pass
+    else:
+        if isinstance(data, list):
+            return [item for item in data if isinstance(item, dict)]
+        if isinstance(data, dict):
+            return [data]
+
+    objects: list[dict] = []
+    position = content.find("{")
+    while position != -1:
+        try:
+            obj, end = _DECODER.raw_decode(content, position)
+        except json.JSONDecodeError:
+            # Objet tronque ou invalide : reprise au prochain "{"
+            position = content.find("{", position + 1)
+            continue
+        if isinstance(obj, dict):
+            objects.append(obj)
+        position = content.find("{", end)
+    return objects
+
+
+def match_batch_results(results: Iterable[dict], batch: list[str]) -> tuple[list[dict], list[str]]:
+    """
+    Rapproche les resultats des URLs du batch.
+
+    Un resultat correspond a une URL par URL normalisee, sinon par domaine. Son
+    champ `url` est remplace par l'URL du batch ; les resultats sans URL du batch
+    et les doublons sont ignores.
+
+    Returns:
+        (resultats retenus, URLs du batch sans resultat)
+    """
+    by_url = {normalize_url(url): url for url in batch}
+    by_domain = {domain_key(url): url for url in reversed(batch)}
+    matched: dict[str, dict] = {}
+    for result in results:
+        value = str(result.get("url") or "").strip()
+        if not value:
+            continue
+        url = by_url.get(normalize_url(value)) or by_domain.get(domain_key(value))
+        if url is not None and url not in matched:
+            matched[url] = {**result, "url": url}
+    missing = [url for url in batch if url not in matched]
+    return list(matched.values()), missing
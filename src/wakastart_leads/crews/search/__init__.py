@@ -1,5 +1,13 @@
 """Search crew - Decouverte d'URLs d'entreprises SaaS."""
 
-from .crew import SearchCrew
+from typing import TYPE_CHECKING
+
+from wakastart_leads.shared.utils.lazy_import import lazy_exports
+
+if TYPE_CHECKING:
+    from .crew import SearchCrew
+
+# Crew (et CrewAI) importe a la premiere utilisation : les modules voisins restent legers
+__getattr__ = lazy_exports(__name__, {"SearchCrew": ".crew"})
 
 __all__ = ["SearchCrew"]
@@ -2,9 +2,13 @@
 
 from crewai import LLM, Agent, Crew, Process, Task
 from crewai.project import CrewBase, agent, crew, task
-from crewai_tools import ScrapeWebsiteTool, SerperDevTool
 
+from wakastart_leads.shared.tools.pappers_tool import PappersBulkSearchTool
 from wakastart_leads.shared.tools.sirene_tool import SireneSearchTool
+from wakastart_leads.shared.tools.web_tools import CachedScrapeWebsiteTool, CachedSerperDevTool
+from wakastart_leads.shared.utils.llm_cache import enable_response_cache
+from wakastart_leads.shared.utils.log_config import is_crew_verbose
+from wakastart_leads.shared.utils.prompt_cache import enable_prompt_caching
 
 
 @CrewBase
@@ -14,13 +18,22 @@ class SearchCrew:
     agents_config = "config/agents.yaml"
     tasks_config = "config/tasks.yaml"
     log_file: str | None = None
+    # Sortie de la tache finale (une par sous-recherche en parallele)
+    output_file: str = "src/wakastart_leads/crews/search/output/search_results_raw.json"
+    # Index des domaines deja connus, retires des resultats Serper (aucun par defaut)
+    seen_indexes: list | None = None
 
     @agent
     def saas_discovery_scout(self) -> Agent:
         """Agent de decouverte et validation d'entreprises SaaS"""
         return Agent(
             config=self.agents_config["saas_discovery_scout"],
-            tools=[SerperDevTool(), ScrapeWebsiteTool(), SireneSearchTool()],
+            tools=[
+                CachedSerperDevTool(exclude_domains=self.seen_indexes),
+                CachedScrapeWebsiteTool(),
+                SireneSearchTool(),
+                PappersBulkSearchTool(),
+            ],
             reasoning=False,
             max_reasoning_attempts=None,
             inject_date=True,
@@ -28,9 +41,11 @@ class SearchCrew:
             max_iter=40,
             max_rpm=None,
             max_execution_time=None,
-            llm=LLM(
-                model="anthropic/claude-sonnet-4-5-20250929",
-                temperature=0.3,
+            llm=enable_prompt_caching(
+                LLM(
+                    model="anthropic/claude-sonnet-4-5-20250929",
+                    temperature=0.3,
+                )
             ),
         )
 
@@ -56,17 +71,21 @@ class SearchCrew:
         return Task(
             config=self.tasks_config["search_saas_deep_scan"],
             markdown=False,
-            output_file="src/wakastart_leads/crews/search/output/search_results_raw.json",
+            output_file=self.output_file,
         )
 
     @crew
     def crew(self) -> Crew:
         """Creates the Search crew"""
+        # Cache disque des reponses LLM (opt-in via LLM_CACHE_ENABLED)
+        for crew_agent in self.agents:
+            enable_response_cache(crew_agent.llm)
+
         return Crew(
             agents=self.agents,
             tasks=self.tasks,
             process=Process.sequential,
-            verbose=True,
+            verbose=is_crew_verbose(),
             chat_llm=LLM(model="openai/gpt-4o-mini"),
             output_log_file=self.log_file,
         )
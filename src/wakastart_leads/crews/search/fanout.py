@@ -0,0 +1,127 @@
+"""Decoupage des criteres de recherche en sous-recherches independantes.
+
+Un seul kickoff explore tous les mots-cles dans la boucle d'un meme agent : les
+recherches s'enchainent et le contexte de l'agent grossit a chaque mot-cle. Les
+criteres sont ici decoupes par mot-cle et par zone geographique ; chaque
+sous-recherche est un kickoff SearchCrew distinct (contexte borne), execute en
+parallele, puis les URLs sont fusionnees et dedoublonnees avec `normalize_url`.
+"""
+
+import json
+import math
+import re
+from collections.abc import Callable, Iterable
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+from wakastart_leads.shared.utils.url_utils import normalize_url
+
+DEFAULT_MAX_RESULTS = 50
+
+
+def _as_list(value: Any) -> list[str]:
+    """Liste de valeurs depuis une liste JSON ou une chaine "a, b; c"."""
+    if isinstance(value, list):
+        items = [str(v) for v in value]
+    elif value:
+        items = re.split(r"[,;]", str(value))
+    else:
+        items = []
+    return [item.strip() for item in items if item.strip()]
+
+
+def split_criteria(criteria: dict, max_subsearches: int | None = None) -> list[dict]:
+    """
+    Decoupe les criteres en sous-criteres (un mot-cle x une zone).
+
+    Les autres criteres (secteur, taille, annees, NAF...) sont repris tels quels.
+    `max_results` est reparti entre les sous-recherches ; la fusion tronque
+    ensuite au total demande.
+
+    Args:
+        criteria: Criteres de recherche (contenu de search_criteria.json)
+        max_subsearches: Nombre maximum de sous-recherches (les premieres combinaisons)
+
+    Returns:
+        Liste de criteres, ou [criteria] si rien a decouper
+    """
+    keywords = _as_list(criteria.get("keywords")) or [None]
+    zones = _as_list(criteria.get("geographic_zone")) or [None]
+    combos = [(keyword, zone) for keyword in keywords for zone in zones][:max_subsearches]
+    if len(combos) <= 1:
+        return [criteria]
+
+    total = int(criteria.get("max_results") or DEFAULT_MAX_RESULTS)
+    per_search = max(1, math.ceil(total / len(combos)))
+    subsearches = []
+    for keyword, zone in combos:
+        sub = dict(criteria, max_results=per_search)
+        if keyword is not None:
+            sub["keywords"] = [keyword]
+        if zone is not None:
+            sub["geographic_zone"] = zone
+        subsearches.append(sub)
+    return subsearches
+
+
+def parse_url_list(content: str) -> list[str] | None:
+    """URLs d'une sortie de la tache finale (liste JSON, eventuellement dans un bloc ```), None si illisible."""
+    content = content.strip()
+    if content.startswith("```"):
+        lines = [line for line in content.splitlines() if not line.strip().startswith("```")]
+        content = "\n".join(lines).strip()
+    try:
+        urls = json.loads(content)
+    except json.JSONDecodeError:
+        return None
+    if not isinstance(urls, list):
+        return None
+    return [url.strip() for url in urls if isinstance(url, str) and url.strip()]
+
+
+def merge_urls(url_lists: Iterable[list[str]], limit: int | None = None) -> list[str]:
+    """
+    Fusionne les URLs des sous-recherches, dedoublonnees par `normalize_url`.
+
+    Les listes sont entrelacees (1re URL de chaque sous-recherche, puis 2e...) :
+    une troncature a `limit` garde des resultats de chaque mot-cle.
+    """
+    lists = [list(urls) for urls in url_lists]
+    seen: set[str] = set()
+    merged: list[str] = []
+    for rank in range(max((len(urls) for urls in lists), default=0)):
+        for urls in lists:
+            if rank >= len(urls):
+                continue
+            url = urls[rank]
+            if not url.startswith(("http://", "https://")):
+                url = f"https://{url}"
+            normalized = normalize_url(url)
+            if normalized not in seen:
+                seen.add(normalized)
+                merged.append(url)
+    return merged[:limit] if limit is not None else merged
+
+
+def run_subsearches(
+    subsearches: list[dict], run_one: Callable[[int, dict], list[str]], max_workers: int
+) -> list[list[str]]:
+    """
+    Execute les sous-recherches en parallele (au plus `max_workers` a la fois).
+
+    Une sous-recherche en erreur est signalee et ne retourne aucune URL.
+
+    Returns:
+        URLs de chaque sous-recherche, dans l'ordre de `subsearches`
+    """
+
+    def guarded(index: int, sub: dict) -> list[str]:
+        try:
+            return run_one(index, sub)
+        except Exception as e:
+            print(f"[WARNING] Sous-recherche {index + 1}/{len(subsearches)} echouee: {e}")
+            return []
+
+    workers = max(1, min(max_workers, len(subsearches)))
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(guarded, range(len(subsearches)), subsearches))
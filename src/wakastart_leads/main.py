@@ -6,29 +6,63 @@ from __future__ import annotations
 import argparse
 import asyncio
 import json
-import re
+import os
 import sys
+import time
+from collections import Counter, deque
 from datetime import datetime
 from pathlib import Path
+from typing import TYPE_CHECKING
 
-from wakastart_leads.crews.analysis import AnalysisCrew
-from wakastart_leads.crews.enrichment import EnrichmentCrew
-from wakastart_leads.crews.search import SearchCrew
+from wakastart_leads.crews.analysis.cascade import format_cascade_stats, is_cascade_enabled, uncertainty_band
+from wakastart_leads.crews.enrichment.batching import AdaptiveBatchSizer, format_batch_stats, observed_output_tokens
+from wakastart_leads.crews.enrichment.parsing import match_batch_results, salvage_json_objects
+from wakastart_leads.crews.search.fanout import merge_urls, parse_url_list, run_subsearches, split_criteria
 from wakastart_leads.shared.utils import (
     ANALYSIS_INPUT,
     ANALYSIS_OUTPUT,
+    ANALYSIS_SEEN,
     ENRICHMENT_INPUT,
     ENRICHMENT_OUTPUT,
+    ENRICHMENT_SEEN,
     SEARCH_INPUT,
     SEARCH_OUTPUT,
+    SEEN_NAMESPACES,
+    SIRENE_INDEX_PATH,
+    LogIndex,
+    RunLog,
+    SeenDomainIndex,
+    archive_log,
+    build_sirene_index,
     cleanup_old_logs,
+    configure_logging,
+    ensure_https,
+    format_name_index_stats,
+    format_page_cache_stats,
+    format_search_cache_stats,
+    format_seen_index_stats,
+    format_sirene_index_stats,
+    get_name_index,
+    get_page_cache,
+    get_search_cache,
+    get_seen_index,
+    get_sirene_index,
+    iter_stock_rows,
+    live_metrics,
+    load_existing_csv,
     load_urls,
     normalize_url,
     post_process_csv,
-    run_parallel,
-    run_sequential,
+    read_log,
+    sirene_name_entries,
 )
 
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+# Tentatives par URL en enrichissement (URL absente de la reponse -> batch ulterieur)
+ENRICH_MAX_ATTEMPTS = 2
+
 
 def _setup_log_file(crew_output_dir: Path, workflow: str) -> str:
     """Cree le dossier de logs et retourne le chemin du fichier de log."""
@@ -39,6 +73,164 @@ def _setup_log_file(crew_output_dir: Path, workflow: str) -> str:
     return str(log_path)
 
 
+def _add_llm_cache_option(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--llm-cache",
+        action="store_true",
+        help="Cache disque des reponses LLM (equivalent a LLM_CACHE_ENABLED=1)",
+    )
+
+
+def _apply_llm_cache_option(args: argparse.Namespace) -> None:
+    from wakastart_leads.shared.utils import get_llm_cache, is_llm_cache_enabled
+
+    if args.llm_cache:
+        os.environ["LLM_CACHE_ENABLED"] = "1"
+    if is_llm_cache_enabled():
+        print(f"[INFO] Cache LLM active: {get_llm_cache().path}")
+
+
+def _add_cascade_option(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--cascade",
+        action="store_true",
+        help="Scoring par un modele economique, revue premium des cas limites (equivalent a ANALYSIS_CASCADE=1)",
+    )
+
+
+def _apply_cascade_option(args: argparse.Namespace) -> None:
+    if args.cascade:
+        os.environ["ANALYSIS_CASCADE"] = "1"
+    if is_cascade_enabled():
+        low, high = uncertainty_band()
+        print(f"[INFO] Cascade de modeles active: revue premium des scores {low}-{high}%")
+
+
+def _add_async_option(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--async",
+        dest="async_kickoff",
+        action="store_true",
+        help="Kickoff asynchrone natif, outils sur un client HTTP partage (equivalent a RUNNER_ASYNC=1)",
+    )
+
+
+def _apply_async_option(args: argparse.Namespace) -> None:
+    from wakastart_leads.shared.utils import is_async_kickoff_enabled
+
+    if args.async_kickoff:
+        os.environ["RUNNER_ASYNC"] = "1"
+    if is_async_kickoff_enabled():
+        print("[INFO] Kickoff asynchrone natif active (une boucle d'evenements, sans thread par URL)")
+
+
+def _add_logging_options(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--quiet",
+        "-q",
+        action="store_true",
+        help="Console reduite aux resumes par URL et aux avertissements (equivalent a LOG_QUIET=1)",
+    )
+    parser.add_argument(
+        "--log-level",
+        choices=["DEBUG", "INFO", "WARNING", "ERROR"],
+        default=None,
+        help="Niveau de journalisation console (equivalent a LOG_LEVEL ; par composant : LOG_COMPONENTS)",
+    )
+
+
+def _apply_logging_options(args: argparse.Namespace) -> None:
+    if args.quiet:
+        os.environ["LOG_QUIET"] = "1"
+    if args.log_level:
+        os.environ["LOG_LEVEL"] = args.log_level
+    configure_logging()
+
+
+def _add_metrics_options(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--metrics-port",
+        type=int,
+        default=None,
+        help="Expose les metriques en direct sur http://127.0.0.1:PORT/metrics (equivalent a RUNNER_METRICS_PORT)",
+    )
+    parser.add_argument(
+        "--progress",
+        action="store_true",
+        help="Ligne de progression : debit, ETA, erreurs, latence LLM (equivalent a RUNNER_PROGRESS=1)",
+    )
+
+
+def _apply_metrics_options(args: argparse.Namespace) -> None:
+    if args.metrics_port is not None:
+        os.environ["RUNNER_METRICS_PORT"] = str(args.metrics_port)
+    if args.progress:
+        os.environ["RUNNER_PROGRESS"] = "1"
+
+
+def _add_seen_option(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--include-seen",
+        action="store_true",
+        help=(
+            "Traite aussi les domaines deja connus (analyses pour run et pipeline, enrichis pour enrich, "
+            "les deux pour search)"
+        ),
+    )
+
+
+def _load_seen_indexes(*namespaces: str) -> list[SeenDomainIndex]:
+    """Index des domaines vus par les commandes `namespaces`, completes par leurs resultats existants."""
+    indexes = []
+    for namespace in namespaces:
+        index = get_seen_index(namespace)
+        if index is None:
+            continue
+        if namespace == ANALYSIS_SEEN:
+            _, known = load_existing_csv(ANALYSIS_OUTPUT / "company_report.csv")
+        else:
+            _, known = _load_accumulated_results(ENRICHMENT_OUTPUT / "enrichment_accumulated.json")
+        index.add_many(known)
+        index.flush()
+        indexes.append(index)
+    return indexes
+
+
+def _skip_seen(urls: list[str], indexes: list[SeenDomainIndex]) -> list[str]:
+    """URLs dont le domaine n'est connu d'aucun des index."""
+    remaining = [url for url in urls if not any(url in index for index in indexes)]
+    if len(remaining) < len(urls):
+        print(f"[INFO] {len(urls) - len(remaining)} URL(s) deja connue(s) ignoree(s) (--include-seen pour les traiter)")
+    return remaining
+
+
+def _record_seen_domains(urls: Iterable[str], namespace: str = ANALYSIS_SEEN) -> None:
+    """Ajoute les domaines traites a l'index des domaines vus de la commande `namespace`."""
+    index = get_seen_index(namespace)
+    if index is None:
+        return
+    index.add_many(urls)
+    index.flush()
+
+
+def _report_caches() -> None:
+    from wakastart_leads.shared.utils import get_llm_cache, is_llm_cache_enabled
+
+    if is_llm_cache_enabled():
+        cache = get_llm_cache()
+        print(f"[INFO] Cache LLM: {cache.hits} hit(s), {cache.misses} miss(es), {len(cache)} entree(s)")
+    for stats in (
+        format_page_cache_stats(get_page_cache()),
+        format_search_cache_stats(get_search_cache()),
+        format_sirene_index_stats(get_sirene_index()),
+        format_name_index_stats(get_name_index()),
+        *(format_seen_index_stats(get_seen_index(namespace), namespace) for namespace in SEEN_NAMESPACES),
+        format_cascade_stats(),
+    ):
+        if stats:
+            print(stats)
+
+
 def run() -> None:
     """Run the analysis crew."""
     parser = argparse.ArgumentParser(description="Run the analysis crew")
@@ -66,10 +258,30 @@ def run() -> None:
         default=600,
         help="Timeout par URL en secondes (defaut: 600)",
     )
+    _add_seen_option(parser)
+    _add_cascade_option(parser)
+    _add_async_option(parser)
+    _add_llm_cache_option(parser)
+    _add_logging_options(parser)
+    _add_metrics_options(parser)
 
     args, _ = parser.parse_known_args(sys.argv[2:] if len(sys.argv) > 2 else [])
+    _apply_logging_options(args)
+    _apply_metrics_options(args)
+    _apply_cascade_option(args)
+    _apply_async_option(args)
+    _apply_llm_cache_option(args)
 
     urls = load_urls(ANALYSIS_INPUT)
+    seen = [] if args.include_seen else _load_seen_indexes(ANALYSIS_SEEN)
+    # Domaines deja analyses ignores : le rapport existant est complete au lieu d'etre remplace
+    args.keep_report = bool(seen)
+    if seen:
+        urls = _skip_seen(urls, seen)
+        if not urls:
+            print("[WARNING] Aucune URL nouvelle a traiter")
+            _report_caches()
+            return
 
     if args.batch:
         _run_batch_mode(urls)
@@ -78,9 +290,24 @@ def run() -> None:
     else:
         asyncio.run(_run_sequential_mode(urls, args))
 
+    _report_caches()
+
+
+def _record_known_names(results: list) -> None:
+    """Ajoute les entreprises resolues (faits du registre) a l'index de noms."""
+    index = get_name_index()
+    if index is None:
+        return
+    index.add_many(
+        ((r.facts["name"], r.facts.get("siren", ""), r.url) for r in results if r.facts.get("name")),
+        source="run",
+    )
+
 
 def _run_batch_mode(urls: list[str]) -> None:
     """Mode batch legacy : toutes les URLs en un seul kickoff."""
+    from wakastart_leads.crews.analysis import AnalysisCrew
+
     print(
         "[WARNING] Le mode batch ne sauvegarde pas de maniere incrementale. "
         "En cas de crash, tous les resultats seront perdus. "
@@ -93,6 +320,7 @@ def _run_batch_mode(urls: list[str]) -> None:
     print(f"[INFO] Mode batch - Logs: {crew_instance.log_file}")
 
     crew_instance.crew().kickoff(inputs=inputs)
+    archive_log(crew_instance.log_file)
 
     post_process_csv(
         new_csv_path=ANALYSIS_OUTPUT / "company_report_new.csv",
@@ -105,6 +333,14 @@ def _run_batch_mode(urls: list[str]) -> None:
 
 async def _run_parallel_mode(urls: list[str], args: argparse.Namespace) -> None:
     """Mode parallele : chaque URL est traitee independamment avec sauvegarde incrementale."""
+    from wakastart_leads.crews.analysis import AnalysisCrew
+    from wakastart_leads.shared.utils import (
+        format_time_summary,
+        format_usage_summary,
+        run_parallel,
+        write_cost_report,
+    )
+
     log_dir = ANALYSIS_OUTPUT / "logs"
     log_dir.mkdir(parents=True, exist_ok=True)
     output_path = ANALYSIS_OUTPUT / "company_report.csv"
@@ -116,16 +352,17 @@ async def _run_parallel_mode(urls: list[str], args: argparse.Namespace) -> None:
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         backup_path = backup_dir / f"company_report_{timestamp}.csv"
         backup_path.write_text(output_path.read_text(encoding="utf-8-sig"), encoding="utf-8-sig")
-        output_path.unlink()
+        if not args.keep_report:
+            output_path.unlink()
 
     # Log TXT consolide
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     consolidated_log_path = log_dir / f"run_parallel_{timestamp}.txt"
+    trace_path = log_dir / f"run_parallel_{timestamp}_trace.jsonl"
+    cost_report_path = log_dir / f"run_parallel_{timestamp}_costs.json"
 
-    def write_log(message: str) -> None:
-        with open(consolidated_log_path, "a", encoding="utf-8") as f:
-            f.write(message + "\n")
-        print(message)
+    run_log = RunLog(consolidated_log_path)
+    write_log = run_log.write
 
     write_log("=" * 70)
     write_log("WAKASTART LEADS - EXECUTION LOG (PARALLELE)")
@@ -153,17 +390,25 @@ async def _run_parallel_mode(urls: list[str], args: argparse.Namespace) -> None:
                 write_log(f"    - Pertinence: {parts[5]}")
         elif result.error:
             write_log(f"  Erreur: {result.error}")
-
-    results = await run_parallel(
-        urls=urls,
-        crew_class=AnalysisCrew,
-        log_dir=log_dir,
-        max_workers=args.parallel,
-        timeout=args.timeout,
-        retry_count=args.retry,
-        output_path=output_path,
-        on_result=on_result,
-    )
+        if result.usage:
+            write_log(f"  Tokens: {result.total_tokens:,} (cout estime ${result.cost_usd:.4f})")
+        run_log.summary(f"[{status_icon}] {result.url} ({result.duration_seconds:.1f}s)")
+
+    with live_metrics(total=len(urls), workers=args.parallel) as metrics:
+        results = await run_parallel(
+            urls=urls,
+            crew_class=AnalysisCrew,
+            log_dir=log_dir,
+            max_workers=args.parallel,
+            timeout=args.timeout,
+            retry_count=args.retry,
+            output_path=output_path,
+            on_result=on_result,
+            trace_path=trace_path,
+            metrics=metrics,
+        )
+    _record_known_names(results)
+    _record_seen_domains(r.url for r in results if r.status.value == "success")
 
     # Resume
     success = sum(1 for r in results if r.status.value == "success")
@@ -177,16 +422,38 @@ async def _run_parallel_mode(urls: list[str], args: argparse.Namespace) -> None:
     write_log(f"  Succes: {success}")
     write_log(f"  Echecs: {failed}")
     write_log(f"  Timeouts: {timeout_count}")
+    all_spans = [span for r in results for span in r.spans]
+    if all_spans:
+        write_log("\nREPARTITION DU TEMPS:")
+        for line in format_time_summary(all_spans):
+            write_log(line)
+    all_usage = [record for r in results for record in r.usage]
+    if all_usage:
+        write_log("\nCONSOMMATION LLM:")
+        for line in format_usage_summary(all_usage):
+            write_log(line)
+        write_cost_report(results, cost_report_path)
     write_log(f"\nFichier CSV: {output_path}")
     write_log(f"Fichier log: {consolidated_log_path}")
+    if trace_path.exists():
+        write_log(f"Fichier trace: {trace_path}")
+    if cost_report_path.exists():
+        write_log(f"Rapport de couts: {cost_report_path}")
     write_log(f"Termine le: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
     write_log("=" * 70)
+    run_log.close()
 
+    archived = archive_log(consolidated_log_path)
+    if archived and archived != consolidated_log_path:
+        print(f"[INFO] Log archive : {archived}")
     cleanup_old_logs(log_dir)
 
 
 async def _run_sequential_mode(urls: list[str], args: argparse.Namespace) -> None:
     """Mode séquentiel : chaque URL est traitée une par une avec sauvegarde immédiate."""
+    from wakastart_leads.crews.analysis import AnalysisCrew
+    from wakastart_leads.shared.utils import run_sequential
+
     log_dir = ANALYSIS_OUTPUT / "logs"
     log_dir.mkdir(parents=True, exist_ok=True)
     output_path = ANALYSIS_OUTPUT / "company_report.csv"
@@ -198,21 +465,26 @@ async def _run_sequential_mode(urls: list[str], args: argparse.Namespace) -> Non
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         backup_path = backup_dir / f"company_report_{timestamp}.csv"
         backup_path.write_text(output_path.read_text(encoding="utf-8-sig"), encoding="utf-8-sig")
-        # Supprimer le fichier pour repartir de zéro
-        output_path.unlink()
+        # Supprimer le fichier pour repartir de zéro (sauf si les domaines connus sont ignores)
+        if not args.keep_report:
+            output_path.unlink()
 
     print(f"[INFO] Mode séquentiel - Traitement de {len(urls)} URL(s)")
     print(f"[INFO] Timeout: {args.timeout}s par URL, Retry: {args.retry}")
     print(f"[INFO] Chaque résultat sera sauvegardé immédiatement dans le CSV\n")
 
-    results = await run_sequential(
-        urls=urls,
-        crew_class=AnalysisCrew,
-        log_dir=log_dir,
-        output_path=output_path,
-        timeout=args.timeout,
-        retry_count=args.retry,
-    )
+    with live_metrics(total=len(urls), workers=1) as metrics:
+        results = await run_sequential(
+            urls=urls,
+            crew_class=AnalysisCrew,
+            log_dir=log_dir,
+            output_path=output_path,
+            timeout=args.timeout,
+            retry_count=args.retry,
+            metrics=metrics,
+        )
+    _record_known_names(results)
+    _record_seen_domains(r.url for r in results if r.status.value == "success")
 
     # Résumé
     success = sum(1 for r in results if r.status.value == "success")
@@ -231,37 +503,243 @@ async def _run_sequential_mode(urls: list[str], args: argparse.Namespace) -> Non
 
 def search() -> None:
     """Search for SaaS company URLs based on criteria."""
+    from wakastart_leads.crews.search import SearchCrew
+
     parser = argparse.ArgumentParser(description="Search for SaaS company URLs")
     parser.add_argument("--criteria", type=str, help="Path to JSON criteria file")
     parser.add_argument("--output", type=str, help="Output file path")
+    parser.add_argument(
+        "--workers",
+        "-w",
+        type=int,
+        default=4,
+        help="Sous-recherches (mot-cle x zone) en parallele (1 = un seul kickoff pour tous les criteres)",
+    )
+    _add_seen_option(parser)
+    _add_llm_cache_option(parser)
+    _add_logging_options(parser)
 
     args, _ = parser.parse_known_args(sys.argv[2:] if len(sys.argv) > 2 else [])
+    _apply_logging_options(args)
+    _apply_llm_cache_option(args)
 
     criteria_path = Path(args.criteria) if args.criteria else SEARCH_INPUT / "search_criteria.json"
 
     with open(criteria_path, encoding="utf-8") as f:
         criteria = json.load(f)
 
-    search_criteria_text = _format_search_criteria(criteria)
-    max_results = criteria.get("max_results", 50)
+    print("[INFO] Lancement recherche avec criteres:")
+    print(_format_search_criteria(criteria))
+
+    # Les entreprises deja analysees ou enrichies sont exclues des resultats Serper des la decouverte
+    seen = [] if args.include_seen else _load_seen_indexes(*SEEN_NAMESPACES)
+
+    subsearches = split_criteria(criteria) if args.workers > 1 else [criteria]
+    if len(subsearches) == 1:
+        search_crew = SearchCrew()
+        search_crew.seen_indexes = seen
+        search_crew.log_file = _setup_log_file(SEARCH_OUTPUT, "search")
+        print(f"[INFO] Logs: {search_crew.log_file}")
+        search_crew.crew().kickoff(inputs=_search_inputs(criteria))
+        archive_log(search_crew.log_file)
+        _post_process_search_results(args.output, seen)
+    else:
+        print(f"[INFO] {len(subsearches)} sous-recherche(s), {min(args.workers, len(subsearches))} en parallele")
+        url_lists = run_subsearches(subsearches, lambda index, sub: _run_subsearch(index, sub, seen), args.workers)
+        urls = merge_urls(url_lists)
+        if seen:
+            # Filet de securite : URLs citees par l'agent sans passer par les resultats Serper
+            urls = _skip_seen(urls, seen)
+        max_results = int(criteria.get("max_results") or 50)
+        _write_search_urls(urls[:max_results], args.output)
 
-    inputs = {
-        "search_criteria": search_criteria_text,
+    cleanup_old_logs(SEARCH_OUTPUT / "logs")
+    _report_caches()
+
+
+def _search_inputs(criteria: dict) -> dict:
+    """Inputs du SearchCrew pour des criteres de recherche."""
+    max_results = criteria.get("max_results", 50)
+    return {
+        "search_criteria": _format_search_criteria(criteria),
         "max_results": int(max_results) if max_results else 50,
         "sector": str(criteria.get("sector", "technologie")),
     }
 
-    print("[INFO] Lancement recherche avec criteres:")
-    print(search_criteria_text)
 
+def _run_subsearch(index: int, criteria: dict, seen: list[SeenDomainIndex] | None = None) -> list[str]:
+    """Kickoff d'une sous-recherche ; sortie brute dans un fichier propre a la sous-recherche."""
+    from wakastart_leads.crews.search import SearchCrew
+
+    raw_path = SEARCH_OUTPUT / f"search_results_raw_{index + 1}.json"
     search_crew = SearchCrew()
-    search_crew.log_file = _setup_log_file(SEARCH_OUTPUT, "search")
-    print(f"[INFO] Logs: {search_crew.log_file}")
+    search_crew.output_file = str(raw_path)
+    search_crew.seen_indexes = seen
+    search_crew.log_file = _setup_log_file(SEARCH_OUTPUT, f"search_{index + 1}")
+    print(f"[INFO] Sous-recherche {index + 1}: {_format_search_criteria(criteria).replace(chr(10), ' | ')}")
+    search_crew.crew().kickoff(inputs=_search_inputs(criteria))
+    archive_log(search_crew.log_file)
+
+    if not raw_path.exists():
+        return []
+    urls = parse_url_list(raw_path.read_text(encoding="utf-8")) or []
+    raw_path.unlink(missing_ok=True)
+    print(f"[OK] Sous-recherche {index + 1}: {len(urls)} URL(s)")
+    return urls
 
-    search_crew.crew().kickoff(inputs=inputs)
 
-    _post_process_search_results(args.output)
+def pipeline() -> None:
+    """Search then analyze: each URL found by a sub-search is analyzed without waiting for the others."""
+    parser = argparse.ArgumentParser(description="Search and analyze SaaS companies in a single streaming run")
+    parser.add_argument("--criteria", type=str, help="Path to JSON criteria file")
+    parser.add_argument(
+        "--workers",
+        "-w",
+        type=int,
+        default=4,
+        help="Sous-recherches (mot-cle x zone) en parallele",
+    )
+    parser.add_argument(
+        "--parallel",
+        "-p",
+        type=int,
+        default=3,
+        help="Analyses d'URLs en parallele",
+    )
+    parser.add_argument("--retry", type=int, default=1, help="Nombre de retry par URL en cas d'echec")
+    parser.add_argument("--timeout", type=int, default=600, help="Timeout par URL en secondes (defaut: 600)")
+    _add_seen_option(parser)
+    _add_cascade_option(parser)
+    _add_async_option(parser)
+    _add_llm_cache_option(parser)
+    _add_logging_options(parser)
+    _add_metrics_options(parser)
+
+    args, _ = parser.parse_known_args(sys.argv[2:] if len(sys.argv) > 2 else [])
+    _apply_logging_options(args)
+    _apply_metrics_options(args)
+    _apply_cascade_option(args)
+    _apply_async_option(args)
+    _apply_llm_cache_option(args)
+
+    criteria_path = Path(args.criteria) if args.criteria else SEARCH_INPUT / "search_criteria.json"
+    with open(criteria_path, encoding="utf-8") as f:
+        criteria = json.load(f)
+
+    print("[INFO] Pipeline recherche -> analyse avec criteres:")
+    print(_format_search_criteria(criteria))
+
+    asyncio.run(_run_pipeline(criteria, args))
+
     cleanup_old_logs(SEARCH_OUTPUT / "logs")
+    cleanup_old_logs(ANALYSIS_OUTPUT / "logs")
+    _report_caches()
+
+
+async def _run_pipeline(criteria: dict, args: argparse.Namespace) -> list:
+    """
+    Sous-recherches (threads) -> file asyncio -> workers d'analyse.
+
+    Les URLs de chaque sous-recherche terminee sont publiees dans la file des
+    workers d'analyse, dedoublonnees entre elles et avec company_report.csv
+    (resultats existants conserves, nouveaux resultats ajoutes a la suite). Les
+    domaines deja analyses sont retires des resultats Serper des la decouverte,
+    sauf avec --include-seen (seul company_report.csv est alors pris en compte).
+    """
+    from wakastart_leads.crews.analysis import AnalysisCrew
+    from wakastart_leads.shared.utils import run_stream
+
+    log_dir = ANALYSIS_OUTPUT / "logs"
+    log_dir.mkdir(parents=True, exist_ok=True)
+    output_path = ANALYSIS_OUTPUT / "company_report.csv"
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    trace_path = log_dir / f"pipeline_{timestamp}_trace.jsonl"
+
+    # Backup du CSV existant (conserve : les nouveaux resultats y sont ajoutes)
+    if output_path.exists():
+        backup_dir = ANALYSIS_OUTPUT / "backups"
+        backup_dir.mkdir(parents=True, exist_ok=True)
+        backup_path = backup_dir / f"company_report_{timestamp}.csv"
+        backup_path.write_text(output_path.read_text(encoding="utf-8-sig"), encoding="utf-8-sig")
+
+    _, existing = load_existing_csv(output_path)
+    seen = set(existing)
+    seen_indexes = [] if args.include_seen else _load_seen_indexes(ANALYSIS_SEEN)
+    max_results = int(criteria.get("max_results") or 50)
+    queue: asyncio.Queue[str | None] = asyncio.Queue()
+    published: list[str] = []
+    skipped = 0
+    loop = asyncio.get_running_loop()
+
+    def publish(urls: list[str]) -> None:
+        # Execute dans la boucle asyncio (call_soon_threadsafe) : pas de verrou necessaire
+        nonlocal skipped
+        for url in urls:
+            url = ensure_https(url)
+            key = normalize_url(url)
+            # Filet de securite : les domaines connus sont deja retires des resultats Serper
+            if key in seen or any(url in index for index in seen_indexes):
+                skipped += 1
+                continue
+            if len(published) >= max_results:
+                break
+            seen.add(key)
+            published.append(url)
+            queue.put_nowait(url)
+            if metrics is not None:
+                metrics.add_planned()
+            print(f"[INFO] -> analyse: {url}")
+
+    def run_one(index: int, sub: dict) -> list[str]:
+        urls = _run_subsearch(index, sub, seen_indexes)
+        loop.call_soon_threadsafe(publish, urls)
+        return urls
+
+    async def search_then_close() -> None:
+        try:
+            await asyncio.to_thread(run_subsearches, subsearches, run_one, args.workers)
+        finally:
+            # Apres les publications en attente (meme file d'appels de la boucle)
+            queue.put_nowait(None)
+
+    def on_result(result) -> None:
+        status_icon = {"success": "OK", "failed": "ECHEC", "timeout": "TIMEOUT"}.get(result.status.value, "?")
+        print(f"[{status_icon}] {result.url} ({result.duration_seconds:.1f}s)")
+
+    subsearches = split_criteria(criteria) if args.workers > 1 else [criteria]
+    print(f"[INFO] {len(subsearches)} sous-recherche(s), {args.parallel} worker(s) d'analyse")
+    known = sum(len(index) for index in seen_indexes) if seen_indexes else len(existing)
+    print(f"[INFO] {known} domaine(s) deja connu(s) (ignore(s))")
+
+    # Total inconnu au depart : il progresse avec les URLs publiees
+    with live_metrics(total=0, workers=args.parallel) as metrics:
+        _, results = await asyncio.gather(
+            search_then_close(),
+            run_stream(
+                url_queue=queue,
+                crew_class=AnalysisCrew,
+                log_dir=log_dir,
+                max_workers=args.parallel,
+                timeout=args.timeout,
+                retry_count=args.retry,
+                output_path=output_path,
+                on_result=on_result,
+                trace_path=trace_path,
+                metrics=metrics,
+            ),
+        )
+    _record_known_names(results)
+    _record_seen_domains(r.url for r in results if r.status.value == "success")
+    _write_search_urls(published, None)
+
+    success = sum(1 for r in results if r.status.value == "success")
+    print(f"\n{'=' * 50}")
+    print("[DONE] Pipeline:")
+    print(f"  - URLs decouvertes: {len(published)} ({skipped} deja connue(s))")
+    print(f"  - Succes: {success}")
+    print(f"  - Echecs/Timeouts: {len(results) - success}")
+    print(f"[OUTPUT] {output_path}")
+    return results
 
 
 def enrich() -> None:
@@ -272,10 +750,19 @@ def enrich() -> None:
     parser = argparse.ArgumentParser(description="Enrich company CSV")
     parser.add_argument("--input", "-i", type=str, default="Datas entreprises Tom - Affinage n°6.csv")
     parser.add_argument("--output", "-o", type=str, default=None)
-    parser.add_argument("--batch-size", "-b", type=int, default=20)
+    parser.add_argument("--batch-size", "-b", type=int, default=20, help="Taille du premier batch (ajustee ensuite)")
+    parser.add_argument("--min-batch-size", type=int, default=1, help="Taille minimale des batchs")
+    parser.add_argument(
+        "--max-batch-size", type=int, default=50, help="Taille maximale des batchs (= --batch-size pour la figer)"
+    )
     parser.add_argument("--test", action="store_true")
+    _add_seen_option(parser)
+    _add_llm_cache_option(parser)
+    _add_logging_options(parser)
 
     args, _ = parser.parse_known_args(sys.argv[2:] if len(sys.argv) > 2 else [])
+    _apply_logging_options(args)
+    _apply_llm_cache_option(args)
 
     input_path = Path(args.input)
     if not input_path.is_absolute():
@@ -309,30 +796,13 @@ def enrich() -> None:
     all_enrichments, processed_urls = _load_accumulated_results(accumulated_file)
 
     urls_to_process = [url for url in all_urls if normalize_url(url) not in processed_urls]
+    seen = [] if args.include_seen else _load_seen_indexes(ENRICHMENT_SEEN)
+    if seen:
+        urls_to_process = _skip_seen(urls_to_process, seen)
     print(f"[INFO] {len(urls_to_process)} URL(s) restante(s)")
 
-    if urls_to_process:
-        batch_size = args.batch_size
-        for i in range(0, len(urls_to_process), batch_size):
-            batch = urls_to_process[i : i + batch_size]
-            batch_num = i // batch_size + 1
-            total_batches = (len(urls_to_process) + batch_size - 1) // batch_size
-
-            print(f"\n[INFO] === Batch {batch_num}/{total_batches} ===")
-
-            urls_text = "\n".join(f"- {url}" for url in batch)
-            inputs = {"urls": urls_text}
-
-            enrichment_crew = EnrichmentCrew()
-            enrichment_crew.log_file = _setup_log_file(ENRICHMENT_OUTPUT, "enrich")
-
-            crew_output = enrichment_crew.crew().kickoff(inputs=inputs)
-            batch_results = _parse_enrichment_output(crew_output.raw)
-
-            all_enrichments.extend(batch_results)
-
-            with open(accumulated_file, "w", encoding="utf-8") as f:
-                json.dump(all_enrichments, f, ensure_ascii=False, indent=2)
+    sizer = AdaptiveBatchSizer(args.batch_size, args.min_batch_size, args.max_batch_size)
+    _run_enrichment_batches(urls_to_process, sizer, all_enrichments, accumulated_file)
 
     rows = _update_csv_with_enrichment(rows, all_enrichments)
 
@@ -352,6 +822,72 @@ def enrich() -> None:
     print(f"\n[OK] Fichier: {output_path}")
 
     cleanup_old_logs(ENRICHMENT_OUTPUT / "logs")
+    _report_caches()
+
+
+def _run_enrichment_batches(
+    urls: list[str], sizer: AdaptiveBatchSizer, all_enrichments: list[dict], accumulated_file: Path
+) -> None:
+    """
+    Enrichit les URLs par batchs de taille adaptative.
+
+    Les objets complets d'une reponse tronquee ou invalide sont conserves ; les
+    URLs sans resultat, ou d'un batch dont le kickoff a echoue, sont renvoyees
+    dans un batch ulterieur (au plus ENRICH_MAX_ATTEMPTS tentatives par URL). Les
+    resultats sont accumules dans `accumulated_file` apres chaque batch.
+    """
+    from wakastart_leads.crews.enrichment import EnrichmentCrew
+
+    pending = deque(urls)
+    attempts: Counter[str] = Counter()
+    batch_num = 0
+    while pending:
+        batch = [pending.popleft() for _ in range(sizer.next_size(len(pending)))]
+        attempts.update(batch)
+        batch_num += 1
+
+        print(f"\n[INFO] === Batch {batch_num} ({len(batch)} URL(s), {len(pending)} en attente) ===")
+
+        urls_text = "\n".join(f"- {url}" for url in batch)
+        inputs = {"urls": urls_text}
+
+        enrichment_crew = EnrichmentCrew()
+        enrichment_crew.log_file = _setup_log_file(ENRICHMENT_OUTPUT, "enrich")
+
+        start = time.perf_counter()
+        try:
+            crew_output = enrichment_crew.crew().kickoff(inputs=inputs)
+        except Exception as e:
+            # Erreur LLM, contexte depasse... : batch en echec (taille reduite), URLs remises en file
+            print(f"[WARNING] Batch {batch_num} en erreur: {e}")
+            crew_output = None
+        latency = time.perf_counter() - start
+        archive_log(enrichment_crew.log_file)
+        if crew_output is None:
+            batch_results, missing = [], batch
+            sizer.record(len(batch), 0, 0, latency)
+        else:
+            batch_results, missing = match_batch_results(_parse_enrichment_output(crew_output.raw), batch)
+            # Taille ajustee apres chaque batch (tokens de sortie, resultats manquants, latence)
+            sizer.record(len(batch), len(batch_results), observed_output_tokens(crew_output), latency)
+
+        if missing:
+            requeued = [url for url in missing if attempts[url] < ENRICH_MAX_ATTEMPTS]
+            pending.extend(requeued)
+            print(
+                f"[WARNING] {len(missing)} URL(s) sans resultat: {len(requeued)} remise(s) en file, "
+                f"{len(missing) - len(requeued)} abandonnee(s)"
+            )
+
+        all_enrichments.extend(batch_results)
+        _record_seen_domains((e["url"] for e in batch_results), ENRICHMENT_SEEN)
+
+        with open(accumulated_file, "w", encoding="utf-8") as f:
+            json.dump(all_enrichments, f, ensure_ascii=False, indent=2)
+
+    batch_stats = format_batch_stats(sizer)
+    if batch_stats:
+        print(batch_stats)
 
 
 def _format_search_criteria(criteria: dict) -> str:
@@ -371,37 +907,27 @@ def _format_search_criteria(criteria: dict) -> str:
     return "\n".join(parts) if parts else "Recherche large SaaS France"
 
 
-def _post_process_search_results(output_path: str | None) -> list[str]:
-    """Post-traitement des resultats de recherche."""
+def _post_process_search_results(output_path: str | None, seen: list[SeenDomainIndex] | None = None) -> list[str]:
+    """Post-traitement des resultats de recherche (filet de securite : domaines connus des index `seen` exclus)."""
     raw_path = SEARCH_OUTPUT / "search_results_raw.json"
     if not raw_path.exists():
         return []
 
     with open(raw_path, encoding="utf-8") as f:
-        content = f.read().strip()
-
-    if content.startswith("```"):
-        lines = [line for line in content.splitlines() if not line.strip().startswith("```")]
-        content = "\n".join(lines).strip()
-
-    try:
-        urls = json.loads(content)
-    except json.JSONDecodeError:
+        urls = parse_url_list(f.read())
+    if urls is None:
         return []
 
-    seen: set[str] = set()
-    final_urls: list[str] = []
-    for url in urls:
-        if not isinstance(url, str):
-            continue
-        url = url.strip()
-        if not url.startswith(("http://", "https://")):
-            url = f"https://{url}"
-        normalized = normalize_url(url)
-        if normalized not in seen:
-            seen.add(normalized)
-            final_urls.append(url)
+    urls = merge_urls([urls])
+    if seen:
+        urls = _skip_seen(urls, seen)
+    final_urls = _write_search_urls(urls, output_path)
+    raw_path.unlink(missing_ok=True)
+    return final_urls
+
 
+def _write_search_urls(final_urls: list[str], output_path: str | None) -> list[str]:
+    """Ecrit la liste finale d'URLs (search_urls_<timestamp>.json par defaut)."""
     if output_path:
         final_path = Path(output_path)
     else:
@@ -412,7 +938,6 @@ def _post_process_search_results(output_path: str | None) -> list[str]:
     with open(final_path, "w", encoding="utf-8") as f:
         json.dump(final_urls, f, indent=2, ensure_ascii=False)
 
-    raw_path.unlink(missing_ok=True)
     print(f"[OK] {len(final_urls)} URL(s) -> {final_path}")
     return final_urls
 
@@ -444,20 +969,8 @@ def _load_accumulated_results(path: Path) -> tuple[list[dict], set[str]]:
 
 
 def _parse_enrichment_output(raw: str) -> list[dict]:
-    """Parse le resultat JSON d'enrichissement."""
-    if not raw:
-        return []
-    content = raw.strip()
-    lines = [line for line in content.splitlines() if not line.strip().startswith("```")]
-    content = "\n".join(lines).strip()
-    if not content.startswith("["):
-        match = re.search(r"\[\s*\{.*\}\s*\]", content, re.DOTALL)
-        if match:
-            content = match.group(0)
-    try:
-        return json.loads(content)
-    except json.JSONDecodeError:
-        return []
+    """Parse le resultat JSON d'enrichissement (objets complets recuperes d'une reponse tronquee)."""
+    return salvage_json_objects(raw)
 
 
 def _update_csv_with_enrichment(rows: list[dict], enrichments: list[dict]) -> list[dict]:
@@ -481,33 +994,119 @@ def _update_csv_with_enrichment(rows: list[dict], enrichments: list[dict]) -> li
 
 def train() -> None:
     """Train the crew."""
+    from wakastart_leads.crews.analysis import AnalysisCrew
+
     urls = load_urls(ANALYSIS_INPUT)
     AnalysisCrew().crew().train(n_iterations=int(sys.argv[2]), filename=sys.argv[3], inputs={"urls": urls})
 
 
 def replay() -> None:
     """Replay from a specific task."""
+    from wakastart_leads.crews.analysis import AnalysisCrew
+
     AnalysisCrew().crew().replay(task_id=sys.argv[2])
 
 
 def test() -> None:
     """Test the crew."""
+    from wakastart_leads.crews.analysis import AnalysisCrew
+
     urls = load_urls(ANALYSIS_INPUT)
     AnalysisCrew().crew().test(n_iterations=int(sys.argv[2]), openai_model_name=sys.argv[3], inputs={"urls": urls})
 
 
+def bench() -> None:
+    """Run benchmarks: `bench load` (harnais de charge hors-ligne, defaut), `bench micro` ou `bench startup`."""
+    args = sys.argv[2:]
+    kind = "load"
+    if args and args[0] in ("load", "micro", "startup"):
+        kind, args = args[0], args[1:]
+
+    if kind == "micro":
+        from wakastart_leads.bench.micro import main as bench_main
+    elif kind == "startup":
+        from wakastart_leads.bench.startup import main as bench_main
+    else:
+        from wakastart_leads.bench.load import main as bench_main
+
+    sys.exit(bench_main(args))
+
+
+def sirene_index() -> None:
+    """Build the local Sirene index from the INSEE stock file (StockUniteLegale)."""
+    parser = argparse.ArgumentParser(description="Construit l'index Sirene local depuis le fichier stock INSEE")
+    parser.add_argument("source", type=str, help="Fichier StockUniteLegale (.csv, .zip ou .parquet)")
+    parser.add_argument("--output", type=str, help=f"Base SQLite produite (defaut: {SIRENE_INDEX_PATH})")
+    parser.add_argument("--active-only", action="store_true", help="Ignore les unites legales cessees")
+    parser.add_argument(
+        "--names", action="store_true", help="Alimente aussi l'index de noms (recherche approchee par nom)"
+    )
+
+    args = parser.parse_args(sys.argv[2:])
+    source = Path(args.source)
+    output = Path(args.output or os.environ.get("SIRENE_INDEX_PATH") or SIRENE_INDEX_PATH)
+    if not source.exists():
+        parser.error(f"fichier introuvable: {source}")
+
+    print(f"[INFO] Construction de l'index Sirene depuis {source}...")
+    start = time.perf_counter()
+    count = build_sirene_index(source, output, active_only=args.active_only)
+    print(f"[OK] {count} unite(s) legale(s) indexee(s) dans {output} ({time.perf_counter() - start:.1f}s)")
+
+    if args.names:
+        names = get_name_index()
+        if names is None:
+            print("[WARNING] Index de noms desactive (NAME_INDEX_ENABLED=0), noms non importes")
+            return
+        rows = iter_stock_rows(source)
+        if args.active_only:
+            rows = (row for row in rows if row["etatAdministratifUniteLegale"] != "C")
+        start = time.perf_counter()
+        added = names.add_many(sirene_name_entries(rows), source="sirene")
+        print(f"[OK] {added} nom(s) ajoute(s) a l'index de noms ({time.perf_counter() - start:.1f}s)")
+
+
+def logs() -> None:
+    """Find the logs of a URL or a run through the log index (no directory scan)."""
+    parser = argparse.ArgumentParser(description="Retrouve les logs d'une URL ou d'une execution via l'index")
+    parser.add_argument("key", type=str, help="URL traitee ou identifiant d'execution (ex: run_20250101_120000)")
+    parser.add_argument("--workflow", choices=("analysis", "search", "enrichment"), help="Limiter a un workflow")
+    parser.add_argument("--show", action="store_true", help="Affiche le contenu du log le plus recent")
+
+    args = parser.parse_args(sys.argv[2:])
+    output_dirs = {"analysis": ANALYSIS_OUTPUT, "search": SEARCH_OUTPUT, "enrichment": ENRICHMENT_OUTPUT}
+    selected = [output_dirs[args.workflow]] if args.workflow else list(output_dirs.values())
+
+    found: list[Path] = []
+    for output_dir in selected:
+        index = LogIndex(output_dir / "logs")
+        found += index.find(run_id=args.key) or index.find(url=args.key)
+    if not found:
+        print(f"[WARNING] Aucun log indexe pour {args.key}")
+        sys.exit(1)
+
+    for path in found:
+        print(path)
+    if args.show:
+        print(read_log(found[-1]))
+
+
 def cli() -> None:
     """Point d'entree CLI principal."""
     if len(sys.argv) < 2:
         print("Usage: python -m wakastart_leads.main <command>")
-        print("Commands: run, search, enrich, train, replay, test")
+        print("Commands: run, search, pipeline, enrich, bench, sirene-index, logs, train, replay, test")
         sys.exit(1)
 
     command = sys.argv[1]
     commands = {
         "run": run,
         "search": search,
+        "pipeline": pipeline,
         "enrich": enrich,
+        "bench": bench,
+        "sirene-index": sirene_index,
+        "logs": logs,
         "train": train,
         "replay": replay,
         "test": test,
@@ -1,5 +1,15 @@
 """Tools partages entre plusieurs crews."""
 
-from .pappers_tool import PappersSearchTool
+from .pappers_tool import PappersBulkSearchTool, PappersLookup, PappersSearchTool
+from .registry import RegistryFacts, resolve_registry_facts
+from .web_tools import CachedScrapeWebsiteTool, CachedSerperDevTool
 
-__all__ = ["PappersSearchTool"]
+__all__ = [
+    "CachedScrapeWebsiteTool",
+    "CachedSerperDevTool",
+    "PappersBulkSearchTool",
+    "PappersLookup",
+    "PappersSearchTool",
+    "RegistryFacts",
+    "resolve_registry_facts",
+]
@@ -0,0 +1,86 @@
+"""Client HTTP asynchrone partage par les outils (implementations `_arun`).
+
+Les outils exposent `_run` (requests, chemin synchrone de CrewAI) et `_arun`
+(httpx), utilise par le chemin asynchrone natif (`Crew.akickoff`) : les appels
+HTTP de centaines d'URLs en cours partagent alors un client et une boucle
+d'evenements au lieu d'un thread par appel.
+
+CrewAI 1.7 n'appelle pas `_arun` de lui-meme : sur le chemin asynchrone, un outil
+structure execute `_run` dans le pool de threads par defaut. Les outils qui
+heritent de `AsyncTool` branchent `_arun` sur ce chemin.
+
+Configuration :
+    HTTP_MAX_CONNECTIONS=200    # connexions simultanees du client partage
+"""
+
+import asyncio
+import os
+import weakref
+from typing import Any
+
+import httpx
+from crewai.tools import BaseTool
+from crewai.tools.structured_tool import CrewStructuredTool, ToolUsageLimitExceededError
+
+DEFAULT_MAX_CONNECTIONS = 200
+KEEPALIVE_CONNECTIONS = 50
+DEFAULT_TIMEOUT = 30.0
+
+# Un client par boucle d'evenements (un client httpx ne peut pas changer de boucle)
+_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = weakref.WeakKeyDictionary()
+
+
+def get_async_client() -> httpx.AsyncClient:
+    """Client httpx partage de la boucle courante (pool de connexions commun a tous les outils)."""
+    loop = asyncio.get_running_loop()
+    client = _clients.get(loop)
+    if client is None or client.is_closed:
+        max_connections = int(os.environ.get("HTTP_MAX_CONNECTIONS") or DEFAULT_MAX_CONNECTIONS)
+        client = httpx.AsyncClient(
+            timeout=DEFAULT_TIMEOUT,
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=min(KEEPALIVE_CONNECTIONS, max_connections),
+            ),
+        )
+        _clients[loop] = client
+    return client
+
+
+async def aclose_async_client() -> None:
+    """Ferme le client de la boucle courante (fin d'execution)."""
+    client = _clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
+
+
+class AsyncStructuredTool(CrewStructuredTool):
+    """Outil structure CrewAI dont l'appel asynchrone execute `_arun` de l'outil d'origine."""
+
+    async def ainvoke(self, input: str | dict, config: dict | None = None, **kwargs: Any) -> Any:
+        parsed_args = self._parse_args(input)
+        if self.has_reached_max_usage_count():
+            raise ToolUsageLimitExceededError(
+                f"Tool '{self.name}' has reached its maximum usage limit of {self.max_usage_count}. "
+                f"You should not use the {self.name} tool again."
+            )
+        self._increment_usage_count()
+        return await self._original_tool._arun(**parsed_args, **kwargs)
+
+
+class AsyncTool(BaseTool):
+    """Outil avec implementations synchrone (`_run`) et asynchrone (`_arun`)."""
+
+    def to_structured_tool(self) -> CrewStructuredTool:
+        self._set_args_schema()
+        structured_tool = AsyncStructuredTool(
+            name=self.name,
+            description=self.description,
+            args_schema=self.args_schema,
+            func=self._run,
+            result_as_answer=self.result_as_answer,
+            max_usage_count=self.max_usage_count,
+            current_usage_count=self.current_usage_count,
+        )
+        structured_tool._original_tool = self
+        return structured_tool
@@ -1,10 +1,23 @@
 """Pappers API Tool for French company data retrieval."""
 
+import asyncio
 import os
+from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 
+import httpx
 import requests
-from crewai.tools import BaseTool
 from pydantic import BaseModel, Field
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from wakastart_leads.shared.tools.async_http import AsyncTool, get_async_client
+
+# Recherche groupee : requetes simultanees sur une session HTTP partagee
+BULK_MAX_WORKERS = 8
+BULK_RETRIES = 3
+RETRY_STATUSES = (429, 500, 502, 503, 504)
 
 
 class PappersSearchInput(BaseModel):
@@ -13,7 +26,53 @@ class PappersSearchInput(BaseModel):
     query: str = Field(..., description="Nom de l'entreprise ou numéro SIREN à rechercher")
 
 
-class PappersSearchTool(BaseTool):
+class PappersBulkSearchInput(BaseModel):
+    """Input schema for PappersBulkSearchTool."""
+
+    queries: list[str] = Field(..., description="Liste de numéros SIREN ou de noms d'entreprises à vérifier")
+
+
+@dataclass
+class PappersLookup:
+    """Résultat d'une entrée de la recherche groupée."""
+
+    query: str
+    siren: str | None = None
+    data: dict | None = None
+    error: str | None = None
+
+    @property
+    def found(self) -> bool:
+        return self.data is not None
+
+    def summary(self) -> dict[str, str | bool | None]:
+        """Champs utiles à la validation (SIREN, nom, création, NAF, statut, ville)."""
+        data = self.data or {}
+        return {
+            "siren": self.siren,
+            "nom": data.get("nom_entreprise") or data.get("denomination"),
+            "date_creation": data.get("date_creation"),
+            "code_naf": data.get("code_naf"),
+            "active": None if not data else not data.get("entreprise_cessee"),
+            "ville": (data.get("siege") or {}).get("ville"),
+        }
+
+
+def _is_siren(query: str) -> bool:
+    clean_query = query.strip().replace(" ", "")
+    return clean_query.isdigit() and len(clean_query) == 9
+
+
+def _search_hits(data: dict) -> list[dict]:
+    """Résultats d'une recherche par nom, toutes sources confondues."""
+    hits: list[dict] = []
+    for key in ["resultats_nom_entreprise", "resultats_denomination", "resultats"]:
+        if data.get(key):
+            hits.extend(data[key])
+    return hits
+
+
+class PappersSearchTool(AsyncTool):
     """
     Outil pour rechercher des entreprises françaises via l'API Pappers.
 
@@ -29,47 +88,121 @@ class PappersSearchTool(BaseTool):
     )
     args_schema: type[BaseModel] = PappersSearchInput
 
+    _BASE_URL: str = "https://api.pappers.fr/v2"
+
+    def fetch_entreprise(self, siren: str) -> dict | None:
+        """Fiche entreprise brute (JSON Pappers) d'un SIREN, sans formatage texte.
+
+        Retourne None si la clé est absente, le SIREN inconnu ou l'API indisponible.
+        """
+        api_key = os.getenv("PAPPERS_API_KEY")
+        if not api_key:
+            return None
+        try:
+            response = requests.get(
+                f"{self._BASE_URL}/entreprise", headers={"api-key": api_key}, params={"siren": siren}, timeout=30
+            )
+        except requests.exceptions.RequestException:
+            return None
+        if response.status_code != 200:
+            return None
+        try:
+            return response.json() or None
+        except ValueError:
+            return None
+
+    def search_many(self, queries: Iterable[str], max_workers: int = BULK_MAX_WORKERS) -> dict[str, PappersLookup]:
+        """
+        Recherche groupée : SIREN ou noms résolus en parallèle sur une session HTTP partagée.
+
+        Un SIREN donne la fiche entreprise, un nom le meilleur résultat de la
+        recherche. Les entrées en double ne sont interrogées qu'une fois ; les
+        réponses 429/5xx sont retentées avec backoff par la session.
+
+        Args:
+            queries: SIREN ou noms d'entreprises
+            max_workers: Requêtes simultanées au plus
+
+        Returns:
+            PappersLookup par entrée (clé = entrée sans espaces superflus), dans l'ordre des entrées
+        """
+        unique = list(dict.fromkeys(q.strip() for q in queries if q and q.strip()))
+        if not unique:
+            return {}
+        api_key = os.getenv("PAPPERS_API_KEY")
+        if not api_key:
+            return {q: PappersLookup(q, error="PAPPERS_API_KEY non configurée") for q in unique}
+
+        workers = max(1, min(max_workers, len(unique)))
+        with _bulk_session(api_key, workers) as session, ThreadPoolExecutor(max_workers=workers) as pool:
+            lookups = list(pool.map(lambda query: self._lookup(session, query), unique))
+        return dict(zip(unique, lookups, strict=True))
+
+    async def asearch_many(
+        self, queries: Iterable[str], max_concurrency: int = BULK_MAX_WORKERS
+    ) -> dict[str, PappersLookup]:
+        """Recherche groupée asynchrone (client HTTP partagé), mêmes résultats que `search_many`."""
+        unique = list(dict.fromkeys(q.strip() for q in queries if q and q.strip()))
+        if not unique:
+            return {}
+        api_key = os.getenv("PAPPERS_API_KEY")
+        if not api_key:
+            return {q: PappersLookup(q, error="PAPPERS_API_KEY non configurée") for q in unique}
+
+        semaphore = asyncio.Semaphore(max(1, max_concurrency))
+
+        async def lookup(query: str) -> PappersLookup:
+            url, params = self._lookup_request(query)
+            async with semaphore:
+                try:
+                    response = await _aget_with_retry(url, params, {"api-key": api_key})
+                except httpx.HTTPError as e:
+                    return PappersLookup(query, error=f"Erreur de connexion: {e!s}")
+            return self._lookup_response(query, response)
+
+        lookups = await asyncio.gather(*(lookup(query) for query in unique))
+        return dict(zip(unique, lookups, strict=True))
+
+    def _lookup_request(self, query: str) -> tuple[str, dict[str, str | int]]:
+        """URL et paramètres d'une entrée de la recherche groupée."""
+        if _is_siren(query):
+            return f"{self._BASE_URL}/entreprise", {"siren": query.replace(" ", "")}
+        return f"{self._BASE_URL}/recherche", {"q": query, "par_page": 1, "cibles": "nom_entreprise,denomination"}
+
+    def _lookup(self, session: requests.Session, query: str) -> PappersLookup:
+        """Une entrée de la recherche groupée (fiche pour un SIREN, meilleur résultat pour un nom)."""
+        url, params = self._lookup_request(query)
+        try:
+            response = session.get(url, params=params, timeout=30)
+        except requests.exceptions.RequestException as e:
+            return PappersLookup(query, error=f"Erreur de connexion: {e!s}")
+        return self._lookup_response(query, response)
+
+    def _lookup_response(self, query: str, response: requests.Response | httpx.Response) -> PappersLookup:
+        if response.status_code == 404:
+            return PappersLookup(query)
+        if response.status_code != 200:
+            return PappersLookup(query, error=f"Erreur API Pappers (code {response.status_code})")
+        try:
+            data = response.json() or {}
+        except ValueError:
+            return PappersLookup(query, error="Réponse Pappers illisible")
+        if not _is_siren(query):
+            data = next(iter(_search_hits(data)), {})
+        if not data:
+            return PappersLookup(query)
+        return PappersLookup(query, siren=data.get("siren"), data=data)
+
     def _run(self, query: str) -> str:
         """Execute Pappers search."""
         api_key = os.getenv("PAPPERS_API_KEY")
         if not api_key:
             return "Erreur: PAPPERS_API_KEY non configurée dans les variables d'environnement."
 
-        base_url = "https://api.pappers.fr/v2"
-        headers = {"api-key": api_key}
-
-        # Déterminer si c'est un SIREN (9 chiffres) ou un nom
-        clean_query = query.strip().replace(" ", "")
-        is_siren = clean_query.isdigit() and len(clean_query) == 9
-
+        url, params = self._search_request(query)
         try:
-            if is_siren:
-                # Recherche directe par SIREN
-                response = requests.get(
-                    f"{base_url}/entreprise", headers=headers, params={"siren": clean_query}, timeout=30
-                )
-            else:
-                # Recherche par nom d'entreprise
-                response = requests.get(
-                    f"{base_url}/recherche",
-                    headers=headers,
-                    params={"q": query, "par_page": 5, "cibles": "nom_entreprise,denomination"},
-                    timeout=30,
-                )
-
-            if response.status_code == 401:
-                return "Erreur: Clé API Pappers invalide ou expirée."
-            elif response.status_code == 404:
-                return f"Aucune entreprise trouvée pour: {query}"
-            elif response.status_code != 200:
-                return f"Erreur API Pappers (code {response.status_code}): {response.text}"
-
-            data = response.json()
-
-            if is_siren:
-                return self._format_company_details(data)
-            else:
-                return self._format_search_results(data, query)
+            response = requests.get(url, headers={"api-key": api_key}, params=params, timeout=30)
+            return self._search_response(response, query)
 
         except requests.exceptions.Timeout:
             return "Erreur: Timeout lors de la connexion à l'API Pappers."
@@ -78,6 +211,46 @@ class PappersSearchTool(BaseTool):
         except Exception as e:
             return f"Erreur inattendue: {e!s}"
 
+    async def _arun(self, query: str) -> str:
+        """Execute Pappers search (client HTTP asynchrone partagé)."""
+        api_key = os.getenv("PAPPERS_API_KEY")
+        if not api_key:
+            return "Erreur: PAPPERS_API_KEY non configurée dans les variables d'environnement."
+
+        url, params = self._search_request(query)
+        try:
+            response = await get_async_client().get(url, headers={"api-key": api_key}, params=params, timeout=30)
+            return self._search_response(response, query)
+
+        except httpx.TimeoutException:
+            return "Erreur: Timeout lors de la connexion à l'API Pappers."
+        except httpx.HTTPError as e:
+            return f"Erreur de connexion à l'API Pappers: {e!s}"
+        except Exception as e:
+            return f"Erreur inattendue: {e!s}"
+
+    def _search_request(self, query: str) -> tuple[str, dict[str, str | int]]:
+        """URL et paramètres : fiche entreprise pour un SIREN (9 chiffres), recherche sinon."""
+        if _is_siren(query):
+            return f"{self._BASE_URL}/entreprise", {"siren": query.strip().replace(" ", "")}
+        return f"{self._BASE_URL}/recherche", {"q": query, "par_page": 5, "cibles": "nom_entreprise,denomination"}
+
+    def _search_response(self, response: requests.Response | httpx.Response, query: str) -> str:
+        """Réponse Pappers (requests ou httpx) formatée pour l'agent."""
+        if response.status_code == 401:
+            return "Erreur: Clé API Pappers invalide ou expirée."
+        elif response.status_code == 404:
+            return f"Aucune entreprise trouvée pour: {query}"
+        elif response.status_code != 200:
+            return f"Erreur API Pappers (code {response.status_code}): {response.text}"
+
+        data = response.json()
+
+        if _is_siren(query):
+            return self._format_company_details(data)
+        else:
+            return self._format_search_results(data, query)
+
     def _format_company_details(self, data: dict) -> str:
         """Format detailed company information."""
         result_parts = []
@@ -142,12 +315,8 @@ class PappersSearchTool(BaseTool):
 
     def _format_search_results(self, data: dict, query: str) -> str:
         """Format search results."""
-        results = []
-
         # Récupérer les résultats de différentes sources
-        for key in ["resultats_nom_entreprise", "resultats_denomination", "resultats"]:
-            if data.get(key):
-                results.extend(data[key])
+        results = _search_hits(data)
 
         if not results:
             return f"Aucune entreprise trouvée pour: {query}"
@@ -171,3 +340,82 @@ class PappersSearchTool(BaseTool):
         result_parts.append("\n💡 Pour plus de détails, recherchez avec le numéro SIREN.")
 
         return "\n".join(result_parts)
+
+
+def _bulk_session(api_key: str, pool_size: int) -> requests.Session:
+    """Session HTTP de la recherche groupée : connexions réutilisées, retry sur 429/5xx."""
+    session = requests.Session()
+    session.headers["api-key"] = api_key
+    retry = Retry(
+        total=BULK_RETRIES,
+        backoff_factor=0.5,
+        status_forcelist=RETRY_STATUSES,
+        allowed_methods=frozenset({"GET"}),
+        raise_on_status=False,
+    )
+    session.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=retry))
+    return session
+
+
+async def _aget_with_retry(url: str, params: dict, headers: dict[str, str]) -> httpx.Response:
+    """GET asynchrone retenté sur 429/5xx avec backoff (équivalent du Retry de `_bulk_session`)."""
+    client = get_async_client()
+    for attempt in range(BULK_RETRIES + 1):
+        response = await client.get(url, params=params, headers=headers, timeout=30)
+        if response.status_code not in RETRY_STATUSES or attempt == BULK_RETRIES:
+            return response
+        await asyncio.sleep(0.5 * 2**attempt)
+    return response
+
+
+class PappersBulkSearchTool(AsyncTool):
+    """
+    Vérification groupée d'entreprises françaises via l'API Pappers.
+
+    Un seul appel d'outil valide toute une liste de candidats (SIREN ou noms).
+    """
+
+    name: str = "pappers_bulk_search"
+    description: str = (
+        "Vérifie en un seul appel une liste d'entreprises françaises (SIREN ou noms) via l'API Pappers. "
+        "Retourne une ligne par entrée : SIREN, nom, date de création, code NAF, statut et ville du siège. "
+        "Utilise cet outil pour valider tous les candidats d'une recherche en une fois."
+    )
+    args_schema: type[BaseModel] = PappersBulkSearchInput
+
+    def _run(self, queries: list[str]) -> str:
+        """Execute Pappers bulk search."""
+        if not os.getenv("PAPPERS_API_KEY"):
+            return "Erreur: PAPPERS_API_KEY non configurée dans les variables d'environnement."
+        return self._format_lookups(PappersSearchTool().search_many(queries))
+
+    async def _arun(self, queries: list[str]) -> str:
+        """Execute Pappers bulk search (client HTTP asynchrone partagé)."""
+        if not os.getenv("PAPPERS_API_KEY"):
+            return "Erreur: PAPPERS_API_KEY non configurée dans les variables d'environnement."
+        return self._format_lookups(await PappersSearchTool().asearch_many(queries))
+
+    def _format_lookups(self, lookups: dict[str, PappersLookup]) -> str:
+        if not lookups:
+            return "Aucune entrée à vérifier."
+        lines = [f"**Vérification Pappers ({len(lookups)} entrées):**"]
+        for lookup in lookups.values():
+            lines.append(self._format_lookup(lookup))
+        return "\n".join(lines)
+
+    @staticmethod
+    def _format_lookup(lookup: PappersLookup) -> str:
+        if lookup.error:
+            return f"- {lookup.query} -> {lookup.error}"
+        if not lookup.found:
+            return f"- {lookup.query} -> Non trouvé sur Pappers"
+        info = lookup.summary()
+        parts = [f"SIREN {info['siren'] or 'N/A'}", info["nom"] or "Nom inconnu"]
+        if info["date_creation"]:
+            parts.append(f"création {info['date_creation']}")
+        if info["code_naf"]:
+            parts.append(f"NAF {info['code_naf']}")
+        parts.append("Active" if info["active"] else "Cessée")
+        if info["ville"]:
+            parts.append(info["ville"])
+        return f"- {lookup.query} -> " + " | ".join(parts)
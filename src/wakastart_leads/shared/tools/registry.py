@@ -0,0 +1,195 @@
+"""Chemin deterministe (sans LLM) pour les faits legaux d'une entreprise francaise.
+
+Le SIREN est extrait des mentions legales par expression reguliere (valide par la
+cle de Luhn), puis les faits officiels sont lus directement dans le JSON Sirene
+(repli Pappers) : SIREN, denomination, annee de creation, forme juridique et
+tranche d'effectif. Seul le SIREN dont la denomination correspond au prospect est
+retenu (un pied de page cite aussi l'hebergeur). SIREN, forme juridique et
+effectif sont ecrits tels quels dans le resultat ; l'annee de creation et la
+nationalite ne completent que les colonnes laissees vides par l'agent.
+"""
+
+import csv
+import io
+import re
+from dataclasses import asdict, dataclass
+
+from wakastart_leads.shared.utils.sirene_index import normalize_name
+
+from .pappers_tool import PappersSearchTool
+from .sirene_tool import SireneSearchTool
+
+# "SIREN : 123 456 789", "RCS Paris B 123 456 789", "SIRET 123 456 789 00012"
+SIREN_PATTERN = re.compile(r"\b(?:SIREN|SIRET|RCS)\b[^0-9\n]{0,40}?(\d{3})[ .\u00a0]?(\d{3})[ .\u00a0]?(\d{3})", re.I)
+
+# Colonnes du CSV final renseignees depuis le registre
+NATIONALITY_COLUMN = 2
+CREATION_YEAR_COLUMN = 3
+CSV_COLUMN_COUNT = 23
+# Valeurs de l'agent considerees comme non renseignees
+UNKNOWN_VALUES = {"", "unknown", "n/a", "inconnu"}
+# Nationalite d'une personne morale de droit etranger immatriculee en France
+FOREIGN_WITH_FR_LINK = "INT (Lien FR)"
+# Longueur minimale d'un indice de nom pour rapprocher une denomination
+MIN_HINT_LENGTH = 3
+
+
+@dataclass
+class RegistryFacts:
+    """Faits legaux officiels d'une unite legale."""
+
+    siren: str
+    name: str | None = None
+    creation_year: str | None = None
+    legal_form: str | None = None
+    headcount_band: str | None = None
+    active: bool | None = None
+    foreign: bool = False
+    source: str = "sirene"
+
+    def as_dict(self) -> dict[str, str]:
+        """Faits renseignes, en chaines (pour UrlResult.facts)."""
+        return {key: str(value) for key, value in asdict(self).items() if value is not None}
+
+    def as_prompt(self) -> str:
+        """Bloc texte injecte dans les inputs du crew."""
+        lines = [f"- SIREN: {self.siren}"]
+        if self.name:
+            lines.append(f"- Denomination: {self.name}")
+        if self.creation_year:
+            lines.append(f"- Annee de creation: {self.creation_year}")
+        if self.legal_form:
+            lines.append(f"- Forme juridique: {self.legal_form}")
+        if self.headcount_band:
+            lines.append(f"- Effectif: {self.headcount_band}")
+        if self.active is not None:
+            lines.append(f"- Statut: {'Active' if self.active else 'Cessee'}")
+        return "\n".join(lines)
+
+
+def is_valid_siren(siren: str) -> bool:
+    """True si `siren` compte 9 chiffres et respecte la cle de Luhn."""
+    if len(siren) != 9 or not siren.isdigit():
+        return False
+    total = 0
+    for position, char in enumerate(reversed(siren)):
+        digit = int(char) * (2 if position % 2 else 1)
+        total += digit - 9 if digit > 9 else digit
+    return total % 10 == 0
+
+
+def find_sirens(text: str) -> list[str]:
+    """SIREN valides cites dans un texte (mentions legales, pied de page), dans l'ordre, sans doublon."""
+    sirens: list[str] = []
+    for match in SIREN_PATTERN.finditer(text or ""):
+        siren = "".join(match.groups())
+        if is_valid_siren(siren) and siren not in sirens:
+            sirens.append(siren)
+    return sirens
+
+
+def find_siren(text: str) -> str | None:
+    """Premier SIREN valide cite dans un texte (mentions legales, pied de page)."""
+    sirens = find_sirens(text)
+    return sirens[0] if sirens else None
+
+
+def name_matches(name: str | None, *hints: str) -> bool:
+    """
+    True si la denomination du registre correspond a l'un des indices (domaine, nom deduit).
+
+    La comparaison ignore casse, accents, ponctuation et espaces : "ACME SANTE SAS"
+    correspond a "acme-sante.fr" et a "acme sante".
+    """
+    compact_name = normalize_name(name or "").replace(" ", "")
+    if not compact_name:
+        return False
+    for hint in hints:
+        compact_hint = normalize_name(hint.split(".")[0] if "." in hint else hint).replace(" ", "")
+        if len(compact_hint) >= MIN_HINT_LENGTH and (compact_hint in compact_name or compact_name in compact_hint):
+            return True
+    return False
+
+
+def facts_from_sirene(unite: dict, tool: SireneSearchTool | None = None) -> RegistryFacts:
+    """Faits legaux depuis une uniteLegale Sirene."""
+    tool = tool or SireneSearchTool()
+    periodes = unite.get("periodesUniteLegale") or [{}]
+    periode = periodes[0]
+    categorie = periode.get("categorieJuridiqueUniteLegale") or ""
+    tranche = unite.get("trancheEffectifsUniteLegale") or ""
+    etat = periode.get("etatAdministratifUniteLegale")
+    return RegistryFacts(
+        siren=unite.get("siren", ""),
+        name=periode.get("denominationUniteLegale") or periode.get("nomUniteLegale"),
+        creation_year=(unite.get("dateCreationUniteLegale") or "")[:4] or None,
+        legal_form=tool._get_forme_juridique(categorie) if categorie else None,
+        headcount_band=tool._get_tranche_effectif(tranche) if tranche else None,
+        active=None if etat not in ("A", "C") else etat == "A",
+        # Categorie juridique 3xxx : personne morale de droit etranger
+        foreign=categorie.startswith("3"),
+        source="sirene",
+    )
+
+
+def facts_from_pappers(data: dict) -> RegistryFacts:
+    """Faits legaux depuis une fiche entreprise Pappers."""
+    return RegistryFacts(
+        siren=data.get("siren", ""),
+        name=data.get("nom_entreprise") or data.get("denomination"),
+        creation_year=(data.get("date_creation") or "")[:4] or None,
+        legal_form=data.get("forme_juridique"),
+        headcount_band=data.get("effectif"),
+        active=not data.get("entreprise_cessee"),
+        foreign=str(data.get("categorie_juridique") or "").startswith("3"),
+        source="pappers",
+    )
+
+
+def resolve_registry_facts(
+    siren: str,
+    sirene: SireneSearchTool | None = None,
+    pappers: PappersSearchTool | None = None,
+) -> RegistryFacts | None:
+    """
+    Resout les faits legaux d'un SIREN : Sirene d'abord, Pappers en repli.
+
+    Args:
+        siren: SIREN (9 chiffres)
+        sirene: Instance SireneSearchTool a utiliser (defaut: nouvelle instance)
+        pappers: Instance PappersSearchTool a utiliser (defaut: nouvelle instance)
+
+    Returns:
+        RegistryFacts, ou None si aucun registre ne connait ce SIREN
+    """
+    sirene = sirene or SireneSearchTool()
+    unite = sirene.fetch_unite_legale(siren)
+    if unite:
+        return facts_from_sirene(unite, sirene)
+    data = (pappers or PappersSearchTool()).fetch_entreprise(siren)
+    if data:
+        return facts_from_pappers(data)
+    return None
+
+
+def apply_registry_facts(csv_row: str, facts: RegistryFacts) -> str:
+    """
+    Complete une ligne CSV finale (23 colonnes) avec les faits du registre.
+
+    L'annee de creation et la nationalite ne sont ecrites que si l'agent les a
+    laissees vides ou "Unknown" : la colonne annee porte l'annee du pivot et une
+    unite legale francaise peut etre la filiale d'une societe etrangere, donc "FR"
+    n'est jamais deduit du registre seul. Seule une personne morale de droit
+    etranger donne "INT (Lien FR)". Une ligne mal formee est retournee telle quelle.
+    """
+    rows = list(csv.reader(io.StringIO(csv_row)))
+    if len(rows) != 1 or len(rows[0]) != CSV_COLUMN_COUNT:
+        return csv_row
+    cells = rows[0]
+    if facts.creation_year and cells[CREATION_YEAR_COLUMN].strip().lower() in UNKNOWN_VALUES:
+        cells[CREATION_YEAR_COLUMN] = facts.creation_year
+    if facts.foreign and cells[NATIONALITY_COLUMN].strip().lower() in UNKNOWN_VALUES:
+        cells[NATIONALITY_COLUMN] = FOREIGN_WITH_FR_LINK
+    output = io.StringIO()
+    csv.writer(output, lineterminator="").writerow(cells)
+    return output.getvalue()
@@ -1,11 +1,20 @@
 """Sirene INSEE API Tool for French company data retrieval."""
 
 import os
+import sqlite3
+from typing import Any
 
+import httpx
 import requests
-from crewai.tools import BaseTool
 from pydantic import BaseModel, Field
 
+from wakastart_leads.shared.tools.async_http import AsyncTool, get_async_client
+from wakastart_leads.shared.utils.name_index import LEGAL_FORMS, CompanyNameIndex, NameMatch, get_name_index
+from wakastart_leads.shared.utils.sirene_index import SireneIndex, get_sirene_index, normalize_name
+
+# Similarite minimale pour repondre depuis l'index de noms sans consulter Sirene
+STRONG_NAME_MATCH = 0.8
+
 
 class SireneSearchInput(BaseModel):
     """Input schema for SireneSearchTool."""
@@ -13,7 +22,7 @@ class SireneSearchInput(BaseModel):
     query: str = Field(..., description="Nom de l'entreprise ou numero SIREN a rechercher")
 
 
-class SireneSearchTool(BaseTool):
+class SireneSearchTool(AsyncTool):
     """
     Outil pour rechercher des entreprises francaises via l'API Sirene de l'INSEE.
 
@@ -25,6 +34,12 @@ class SireneSearchTool(BaseTool):
     - Creer une application (mode "simple", pas "backend to backend")
     - Souscrire a l'API Sirene (plan "Public")
     - Recuperer la cle API et la mettre dans INSEE_SIRENE_API_KEY
+
+    Si un index local a ete construit (`wakastart sirene-index`), les recherches
+    y sont servies sans appel reseau ; l'API n'est appelee que pour les absents.
+    Les recherches par nom consultent d'abord l'index de noms (recherche approchee,
+    candidats classes par similarite) : il ne repond que si le meilleur candidat
+    est une correspondance forte (STRONG_NAME_MATCH), sinon Sirene prend le relais.
     """
 
     name: str = "sirene_search"
@@ -35,6 +50,8 @@ class SireneSearchTool(BaseTool):
         "Utilise cet outil pour obtenir des donnees officielles sur les entreprises francaises."
     )
     args_schema: type[BaseModel] = SireneSearchInput
+    local_index: Any = Field(default=None, exclude=True)
+    name_index: Any = Field(default=None, exclude=True)
 
     # URL officielle de l'API Sirene v3.11
     _BASE_URL: str = "https://api.insee.fr/api-sirene/3.11"
@@ -54,15 +71,19 @@ class SireneSearchTool(BaseTool):
 
     def _run(self, query: str) -> str:
         """Execute Sirene search."""
+        # Determiner si c'est un SIREN (9 chiffres) ou un nom
+        clean_query = query.strip().replace(" ", "")
+        is_siren = clean_query.isdigit() and len(clean_query) == 9
+
+        local = self._search_local(clean_query if is_siren else query, is_siren)
+        if local is not None:
+            return local
+
         try:
             headers = self._get_headers()
         except ValueError as e:
             return f"Erreur: {e!s}"
 
-        # Determiner si c'est un SIREN (9 chiffres) ou un nom
-        clean_query = query.strip().replace(" ", "")
-        is_siren = clean_query.isdigit() and len(clean_query) == 9
-
         try:
             if is_siren:
                 return self._search_by_siren(clean_query, headers)
@@ -76,6 +97,92 @@ class SireneSearchTool(BaseTool):
         except Exception as e:
             return f"Erreur inattendue: {e!s}"
 
+    async def _arun(self, query: str) -> str:
+        """Execute Sirene search (client HTTP asynchrone partage)."""
+        clean_query = query.strip().replace(" ", "")
+        is_siren = clean_query.isdigit() and len(clean_query) == 9
+
+        local = self._search_local(clean_query if is_siren else query, is_siren)
+        if local is not None:
+            return local
+
+        try:
+            headers = self._get_headers()
+        except ValueError as e:
+            return f"Erreur: {e!s}"
+
+        client = get_async_client()
+        try:
+            if is_siren:
+                response = await client.get(f"{self._BASE_URL}/siren/{clean_query}", headers=headers, timeout=30)
+                return self._siren_response(response, clean_query)
+            response = await client.get(
+                f"{self._BASE_URL}/siren", headers=headers, params=self._name_search_params(query), timeout=30
+            )
+            return self._name_response(response, query)
+
+        except httpx.TimeoutException:
+            return "Erreur: Timeout lors de la connexion a l'API Sirene INSEE."
+        except httpx.HTTPError as e:
+            return f"Erreur de connexion a l'API Sirene: {e!s}"
+        except Exception as e:
+            return f"Erreur inattendue: {e!s}"
+
+    def _index(self) -> SireneIndex | None:
+        return self.local_index if self.local_index is not None else get_sirene_index()
+
+    def _names(self) -> CompanyNameIndex | None:
+        return self.name_index if self.name_index is not None else get_name_index()
+
+    def _search_local(self, query: str, is_siren: bool) -> str | None:
+        """Reponse depuis les index locaux, ou None si absent ou illisible (l'API prend le relais)."""
+        try:
+            return self._query_local_indexes(query, is_siren)
+        except sqlite3.Error as e:
+            print(f"[WARNING] Index local Sirene illisible, repli sur l'API: {e}")
+            return None
+
+    def _query_local_indexes(self, query: str, is_siren: bool) -> str | None:
+        if not is_siren:
+            names = self._names()
+            matches = [m for m in names.match(query) if m.siren] if names is not None else []
+            if matches and matches[0].score >= STRONG_NAME_MATCH:
+                return self._format_name_matches(matches, query)
+
+        index = self._index()
+        if index is None:
+            return None
+        if is_siren:
+            unite = index.get(query)
+            return self._format_unite_legale(unite) if unite is not None else None
+        unites = index.search(query)
+        return self._format_search_results(unites, query) if unites else None
+
+    def fetch_unite_legale(self, siren: str) -> dict | None:
+        """Unite legale brute (JSON Sirene) d'un SIREN, sans formatage texte.
+
+        Utilise par le chemin deterministe (`registry`) : retourne None si la cle
+        est absente, le SIREN inconnu ou l'API indisponible, sans lever d'erreur.
+        """
+        index = self._index()
+        try:
+            unite = index.get(siren) if index is not None else None
+        except sqlite3.Error as e:
+            print(f"[WARNING] Index local Sirene illisible, repli sur l'API: {e}")
+            unite = None
+        if unite is not None:
+            return unite
+        try:
+            response = requests.get(f"{self._BASE_URL}/siren/{siren}", headers=self._get_headers(), timeout=30)
+        except (ValueError, requests.exceptions.RequestException):
+            return None
+        if response.status_code != 200:
+            return None
+        try:
+            return response.json().get("uniteLegale") or None
+        except ValueError:
+            return None
+
     def _search_by_siren(self, siren: str, headers: dict[str, str]) -> str:
         """Search company by SIREN number.
 
@@ -84,7 +191,10 @@ class SireneSearchTool(BaseTool):
                  --header 'X-INSEE-Api-Key-Integration: xxxxx'
         """
         response = requests.get(f"{self._BASE_URL}/siren/{siren}", headers=headers, timeout=30)
+        return self._siren_response(response, siren)
 
+    def _siren_response(self, response: requests.Response | httpx.Response, siren: str) -> str:
+        """Reponse de GET /siren/{siren} (requests ou httpx) formatee pour l'agent."""
         if response.status_code == 401:
             return "Erreur: Cle API Sirene INSEE invalide ou expiree."
         elif response.status_code == 404:
@@ -104,17 +214,23 @@ class SireneSearchTool(BaseTool):
         Recherche multicritere sur denominationUniteLegale.
         Syntaxe Sirene: champ:valeur* (wildcard en fin de mot)
         """
-        # Nettoyer le nom pour la recherche (remplacer espaces par *)
-        clean_name = name.strip().replace(" ", "*")
-        search_query = f"periode(denominationUniteLegale:{clean_name}*)"
-
         response = requests.get(
             f"{self._BASE_URL}/siren",
             headers=headers,
-            params={"q": search_query, "nombre": 5},
+            params=self._name_search_params(name),
             timeout=30,
         )
+        return self._name_response(response, name)
+
+    def _name_search_params(self, name: str) -> dict[str, str | int]:
+        """Parametres de GET /siren pour une recherche par nom."""
+        # Nettoyer le nom pour la recherche (sans forme juridique, espaces remplaces par *)
+        words = [w for w in name.split() if normalize_name(w) not in LEGAL_FORMS]
+        clean_name = "*".join(words or name.split())
+        return {"q": f"periode(denominationUniteLegale:{clean_name}*)", "nombre": 5}
 
+    def _name_response(self, response: requests.Response | httpx.Response, name: str) -> str:
+        """Reponse de GET /siren?q=... (requests ou httpx) formatee pour l'agent."""
         if response.status_code == 401:
             return "Erreur: Cle API Sirene INSEE invalide ou expiree."
         elif response.status_code == 404:
@@ -130,6 +246,14 @@ class SireneSearchTool(BaseTool):
         if not unites_legales:
             return f"Aucune entreprise trouvee pour: {name}"
 
+        # Noms connus pour les prochaines recherches approchees
+        names = self._names()
+        if names is not None:
+            names.add_many(
+                ((self._unite_name(unite), unite.get("siren", ""), "") for unite in unites_legales),
+                source="sirene",
+            )
+
         return self._format_search_results(unites_legales, name)
 
     def _format_unite_legale(self, unite: dict) -> str:
@@ -188,6 +312,18 @@ class SireneSearchTool(BaseTool):
 
         return "\n".join(result_parts)
 
+    def _unite_name(self, unite: dict) -> str:
+        periodes = unite.get("periodesUniteLegale") or [{}]
+        return periodes[0].get("denominationUniteLegale") or periodes[0].get("nomUniteLegale") or ""
+
+    def _format_name_matches(self, matches: list[NameMatch], query: str) -> str:
+        """Format ranked candidates from the name index."""
+        result_parts = [f"**Candidats pour '{query}' (recherche approchee, similarite de 0 a 1):**\n"]
+        for i, match in enumerate(matches, 1):
+            result_parts.append(f"{i}. **{match.name}** - SIREN: {match.siren} - similarite {match.score:.2f}")
+        result_parts.append("\nPour plus de details, recherchez avec le numero SIREN.")
+        return "\n".join(result_parts)
+
     def _format_search_results(self, unites: list, query: str) -> str:
         """Format search results."""
         if not unites:
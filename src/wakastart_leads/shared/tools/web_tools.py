@@ -0,0 +1,126 @@
+"""Outils web CrewAI avec cache partage entre agents."""
+
+import re
+import time
+from typing import Any
+
+import requests
+from bs4 import BeautifulSoup
+from crewai_tools import ScrapeWebsiteTool, SerperDevTool
+from pydantic import Field
+
+from wakastart_leads.shared.utils.page_cache import CachedPage, PageCache, get_page_cache
+from wakastart_leads.shared.utils.search_cache import SearchCache, get_search_cache
+
+
+def extract_page_text(html: str) -> str:
+    """Extrait le texte d'une page HTML (meme format que ScrapeWebsiteTool)."""
+    text = "The following text is scraped website content:\n\n"
+    text += BeautifulSoup(html, "html.parser").get_text(" ")
+    text = re.sub("[ \t]+", " ", text)
+    return re.sub("\\s+\n\\s+", "\n", text)
+
+
+class CachedScrapeWebsiteTool(ScrapeWebsiteTool):
+    """
+    ScrapeWebsiteTool dont les pages sont partagees entre agents via un PageCache.
+
+    Une page deja scrapee par un agent est servie depuis le cache aux suivants ;
+    une page expiree est revalidee par requete conditionnelle (ETag / Last-Modified).
+    """
+
+    page_cache: Any = Field(default=None, exclude=True)
+
+    def _run(self, **kwargs: Any) -> Any:
+        website_url: str | None = kwargs.get("website_url", self.website_url)
+        if website_url is None:
+            raise ValueError("Website URL must be provided.")
+
+        cache: PageCache = self.page_cache if self.page_cache is not None else get_page_cache()
+        cached = cache.get(website_url)
+        if cached is not None and cache.is_fresh(cached):
+            cache.record("hit")
+            return cached.text
+
+        headers = dict(self.headers or {})
+        if cached is not None:
+            if cached.etag:
+                headers["If-None-Match"] = cached.etag
+            if cached.last_modified:
+                headers["If-Modified-Since"] = cached.last_modified
+
+        page = requests.get(website_url, timeout=15, headers=headers, cookies=self.cookies or {})
+
+        if cached is not None and page.status_code == 304:
+            cached.fetched_at = time.time()
+            cache.put(cached)
+            cache.record("revalidated")
+            return cached.text
+
+        page.encoding = page.apparent_encoding
+        text = extract_page_text(page.text)
+        cache.record("fetched")
+        if page.ok:
+            cache.put(
+                CachedPage(
+                    url=website_url,
+                    html=page.text,
+                    text=text,
+                    etag=page.headers.get("ETag"),
+                    last_modified=page.headers.get("Last-Modified"),
+                    fetched_at=time.time(),
+                )
+            )
+        return text
+
+
+class CachedSerperDevTool(SerperDevTool):
+    """
+    SerperDevTool dont les reponses sont partagees entre agents et executions via un SearchCache.
+
+    La cle combine la requete normalisee et les parametres de recherche ; les
+    requetes identiques simultanees n'appellent l'API qu'une fois. Les liens dont
+    le domaine est connu d'un des index `exclude_domains` (domaines deja analyses
+    ou enrichis) sont retires des resultats rendus a l'agent, pas du cache.
+    """
+
+    search_cache: Any = Field(default=None, exclude=True)
+    exclude_domains: Any = Field(default=None, exclude=True)
+
+    def _make_api_request(self, search_query: str, search_type: str) -> dict[str, Any]:
+        return self._without_excluded(self._cached_api_request(search_query, search_type))
+
+    def _without_excluded(self, results: dict[str, Any]) -> dict[str, Any]:
+        """Resultats sans les liens dont le domaine est deja connu."""
+        if not self.exclude_domains or not isinstance(results, dict):
+            return results
+
+        def is_known(item: Any) -> bool:
+            link = item.get("link") if isinstance(item, dict) else None
+            return bool(link) and any(link in index for index in self.exclude_domains)
+
+        return {
+            key: [item for item in value if not is_known(item)] if isinstance(value, list) else value
+            for key, value in results.items()
+        }
+
+    def _cached_api_request(self, search_query: str, search_type: str) -> dict[str, Any]:
+        cache: SearchCache = self.search_cache if self.search_cache is not None else get_search_cache()
+        key = cache.make_key(
+            search_query,
+            type=search_type.lower(),
+            num=self.n_results,
+            gl=self.country,
+            location=self.location,
+            hl=self.locale,
+            base_url=self.base_url,
+        )
+        with cache.lock_for(key):
+            results = cache.get(key)
+            if results is not None:
+                cache.record("hit")
+                return results
+            results = super()._make_api_request(search_query, search_type)
+            cache.record("fetched")
+            cache.put(key, search_query, results)
+            return results
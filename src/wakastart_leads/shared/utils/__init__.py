@@ -1,64 +1,239 @@
-"""Utilitaires partages."""
+"""Utilitaires partages.
+
+Les modules qui dependent de CrewAI (ou de requests) sont importes a la premiere
+utilisation d'un de leurs noms : les commandes qui n'en ont pas besoin demarrent
+sans les charger.
+"""
+
+from typing import TYPE_CHECKING
 
 from .constants import (
     ANALYSIS_DIR,
     ANALYSIS_INPUT,
     ANALYSIS_OUTPUT,
+    CACHE_DIR,
     DEFAULT_BATCH_SIZE,
     ENRICHMENT_DIR,
     ENRICHMENT_INPUT,
     ENRICHMENT_OUTPUT,
     EXPECTED_COLUMNS,
+    LLM_CACHE_PATH,
+    NAME_INDEX_PATH,
     PACKAGE_ROOT,
+    PAGE_CACHE_PATH,
+    SEARCH_CACHE_PATH,
     SEARCH_DIR,
     SEARCH_INPUT,
     SEARCH_OUTPUT,
+    SEEN_INDEX_PATH,
+    SIRENE_INDEX_PATH,
     URL_COLUMN_INDEX,
 )
 from .csv_utils import clean_markdown_artifacts, load_existing_csv, post_process_csv
-from .log_rotation import cleanup_old_logs, get_log_retention_days
-from .parallel_runner import (
-    CSV_HEADER,
-    RunStatus,
-    UrlResult,
-    append_result_to_csv,
-    clean_csv_row,
-    merge_results_to_csv,
-    run_parallel,
-    run_sequential,
-    run_single_url,
+from .lazy_import import lazy_exports
+from .log_config import RunLog, configure_logging, get_logger, is_crew_verbose, is_quiet, parse_components
+from .log_rotation import cleanup_old_logs, get_log_max_bytes, get_log_retention_days
+from .log_store import LogIndex, archive_log, compress_log, index_open_log, is_log_compression_enabled, read_log
+from .name_index import CompanyNameIndex, NameMatch, format_name_index_stats, get_name_index, sirene_name_entries
+from .page_cache import CachedPage, PageCache, format_page_cache_stats, get_page_cache
+from .run_metrics import (
+    MetricsServer,
+    ProgressView,
+    RunMetrics,
+    format_progress,
+    get_metrics_port,
+    is_progress_enabled,
+    live_metrics,
+)
+from .search_cache import SearchCache, format_search_cache_stats, get_search_cache
+from .seen_index import (
+    ANALYSIS_SEEN,
+    ENRICHMENT_SEEN,
+    SEEN_NAMESPACES,
+    SeenDomainIndex,
+    format_seen_index_stats,
+    get_seen_index,
+)
+from .sirene_index import (
+    SireneIndex,
+    build_sirene_index,
+    format_sirene_index_stats,
+    get_sirene_index,
+    iter_stock_rows,
 )
 from .url_utils import ensure_https, load_urls, normalize_url
 
+if TYPE_CHECKING:
+    from .crew_factory import CrewFactory, clone_llm, clone_tool, crew_factory_for, is_crew_factory_enabled
+    from .llm_cache import LLMResponseCache, enable_response_cache, get_llm_cache, is_llm_cache_enabled
+    from .parallel_runner import (
+        CSV_HEADER,
+        RunStatus,
+        UrlResult,
+        append_result_to_csv,
+        clean_csv_row,
+        close_async_client,
+        is_async_kickoff_enabled,
+        merge_results_to_csv,
+        record_trace,
+        run_parallel,
+        run_sequential,
+        run_single_url,
+        run_stream,
+        run_with_retry,
+    )
+    from .prompt_cache import enable_prompt_caching
+    from .tracing import Span, Tracer, export_otlp, format_time_summary, summarize_spans
+    from .usage import MODEL_PRICING, UsageRecord, collect_usage, format_usage_summary, price_for, write_cost_report
+
+# Modules charges a la demande (CrewAI : plusieurs secondes d'import)
+__getattr__ = lazy_exports(
+    __name__,
+    {
+        "CrewFactory": ".crew_factory",
+        "clone_llm": ".crew_factory",
+        "clone_tool": ".crew_factory",
+        "crew_factory_for": ".crew_factory",
+        "is_crew_factory_enabled": ".crew_factory",
+        "LLMResponseCache": ".llm_cache",
+        "enable_response_cache": ".llm_cache",
+        "get_llm_cache": ".llm_cache",
+        "is_llm_cache_enabled": ".llm_cache",
+        "CSV_HEADER": ".parallel_runner",
+        "RunStatus": ".parallel_runner",
+        "UrlResult": ".parallel_runner",
+        "append_result_to_csv": ".parallel_runner",
+        "clean_csv_row": ".parallel_runner",
+        "close_async_client": ".parallel_runner",
+        "is_async_kickoff_enabled": ".parallel_runner",
+        "merge_results_to_csv": ".parallel_runner",
+        "record_trace": ".parallel_runner",
+        "run_parallel": ".parallel_runner",
+        "run_sequential": ".parallel_runner",
+        "run_single_url": ".parallel_runner",
+        "run_stream": ".parallel_runner",
+        "run_with_retry": ".parallel_runner",
+        "enable_prompt_caching": ".prompt_cache",
+        "Span": ".tracing",
+        "Tracer": ".tracing",
+        "export_otlp": ".tracing",
+        "format_time_summary": ".tracing",
+        "summarize_spans": ".tracing",
+        "MODEL_PRICING": ".usage",
+        "UsageRecord": ".usage",
+        "collect_usage": ".usage",
+        "format_usage_summary": ".usage",
+        "price_for": ".usage",
+        "write_cost_report": ".usage",
+    },
+)
+
 __all__ = [
     "ANALYSIS_DIR",
     "ANALYSIS_INPUT",
     "ANALYSIS_OUTPUT",
+    "ANALYSIS_SEEN",
+    "CACHE_DIR",
     "CSV_HEADER",
+    "CachedPage",
+    "CompanyNameIndex",
+    "CrewFactory",
     "DEFAULT_BATCH_SIZE",
     "ENRICHMENT_DIR",
     "ENRICHMENT_INPUT",
     "ENRICHMENT_OUTPUT",
+    "ENRICHMENT_SEEN",
     "EXPECTED_COLUMNS",
+    "LLM_CACHE_PATH",
+    "LLMResponseCache",
+    "LogIndex",
+    "MODEL_PRICING",
+    "MetricsServer",
+    "NAME_INDEX_PATH",
+    "NameMatch",
     "PACKAGE_ROOT",
+    "PAGE_CACHE_PATH",
+    "PageCache",
+    "ProgressView",
+    "RunLog",
+    "RunMetrics",
     "RunStatus",
+    "SEARCH_CACHE_PATH",
     "SEARCH_DIR",
     "SEARCH_INPUT",
     "SEARCH_OUTPUT",
+    "SEEN_INDEX_PATH",
+    "SEEN_NAMESPACES",
+    "SIRENE_INDEX_PATH",
+    "SearchCache",
+    "SeenDomainIndex",
+    "SireneIndex",
+    "Span",
+    "Tracer",
     "URL_COLUMN_INDEX",
     "UrlResult",
+    "UsageRecord",
     "append_result_to_csv",
+    "archive_log",
+    "build_sirene_index",
     "clean_csv_row",
     "clean_markdown_artifacts",
     "cleanup_old_logs",
+    "clone_llm",
+    "clone_tool",
+    "close_async_client",
+    "collect_usage",
+    "compress_log",
+    "configure_logging",
+    "crew_factory_for",
+    "enable_prompt_caching",
+    "enable_response_cache",
     "ensure_https",
+    "export_otlp",
+    "format_name_index_stats",
+    "format_page_cache_stats",
+    "format_progress",
+    "format_search_cache_stats",
+    "format_seen_index_stats",
+    "format_sirene_index_stats",
+    "format_time_summary",
+    "format_usage_summary",
+    "get_llm_cache",
+    "get_log_max_bytes",
     "get_log_retention_days",
+    "get_logger",
+    "get_metrics_port",
+    "get_name_index",
+    "get_page_cache",
+    "get_search_cache",
+    "get_seen_index",
+    "get_sirene_index",
+    "index_open_log",
+    "is_async_kickoff_enabled",
+    "is_crew_factory_enabled",
+    "is_crew_verbose",
+    "is_llm_cache_enabled",
+    "is_log_compression_enabled",
+    "is_progress_enabled",
+    "is_quiet",
+    "iter_stock_rows",
+    "lazy_exports",
+    "live_metrics",
     "load_existing_csv",
     "load_urls",
     "merge_results_to_csv",
     "normalize_url",
+    "parse_components",
     "post_process_csv",
+    "price_for",
+    "read_log",
+    "record_trace",
     "run_parallel",
     "run_sequential",
     "run_single_url",
+    "run_stream",
+    "run_with_retry",
+    "sirene_name_entries",
+    "summarize_spans",
+    "write_cost_report",
 ]
@@ -24,6 +24,15 @@ ANALYSIS_CSV_NEW = ANALYSIS_OUTPUT / "company_report_new.csv"
 SEARCH_RAW_OUTPUT = SEARCH_OUTPUT / "search_results_raw.json"
 ENRICHMENT_ACCUMULATED = ENRICHMENT_OUTPUT / "enrichment_accumulated.json"
 
+# Caches disque (cf. llm_cache, page_cache, search_cache, sirene_index, name_index, seen_index)
+CACHE_DIR = PACKAGE_ROOT / ".cache"
+LLM_CACHE_PATH = CACHE_DIR / "llm_responses.sqlite3"
+PAGE_CACHE_PATH = CACHE_DIR / "pages.sqlite3"
+SEARCH_CACHE_PATH = CACHE_DIR / "serper.sqlite3"
+SIRENE_INDEX_PATH = CACHE_DIR / "sirene_index.sqlite3"
+NAME_INDEX_PATH = CACHE_DIR / "company_names.sqlite3"
+SEEN_INDEX_PATH = CACHE_DIR / "seen_domains.bin"
+
 # Configuration
 EXPECTED_COLUMNS = 23
 URL_COLUMN_INDEX = 1
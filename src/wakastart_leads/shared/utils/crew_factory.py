@@ -0,0 +1,127 @@
+"""Construction unique d'un crew, copie isolee par URL.
+
+Instancier une classe @CrewBase et appeler `.crew()` relit agents.yaml et
+tasks.yaml, recree les LLMs (clients des fournisseurs) et chaque outil de chaque
+agent : pres d'une seconde par URL et par tentative, une part notable du temps
+des URLs rejetees tot. `CrewFactory` construit ce modele une fois par execution,
+puis chaque URL recoit une copie (`Crew.copy`) :
+
+- agents, taches et contexte des taches neufs (aucune sortie partagee) ;
+- LLMs copies avec leurs propres compteurs de tokens (rapport de couts par URL),
+  le client du fournisseur restant partage ;
+- outils copies (compteurs d'utilisation et memos propres a l'URL).
+
+Les classes de crew s'y pretent en declarant `reusable_crew = True`.
+
+Configuration :
+    CREW_FACTORY_ENABLED=0      # reconstruit le crew a chaque URL
+"""
+
+import copy
+import inspect
+import os
+import threading
+from typing import Any
+
+from crewai.llms.base_llm import BaseLLM
+from crewai.tools import BaseTool
+from crewai.utilities.file_handler import FileHandler
+
+from .llm_cache import enable_response_cache
+from .prompt_cache import enable_prompt_caching
+
+
+def is_crew_factory_enabled() -> bool:
+    """True sauf si CREW_FACTORY_ENABLED=0."""
+    return os.environ.get("CREW_FACTORY_ENABLED", "1").strip().lower() not in ("0", "false", "no", "off")
+
+
+def clone_llm(llm: Any) -> Any:
+    """
+    Copie d'un LLM CrewAI avec ses propres compteurs et parametres.
+
+    Les methodes remplacees sur l'instance (cache de prompt, cache de reponses)
+    restent liees au LLM d'origine : elles sont retirees puis re-appliquees sur la copie.
+    """
+    if not isinstance(llm, BaseLLM):
+        return llm
+    clone = copy.copy(llm)
+    for name, value in list(vars(clone).items()):
+        if inspect.isfunction(value):
+            del clone.__dict__[name]
+    clone.__dict__.pop("_response_cache", None)
+    clone._token_usage = dict.fromkeys(llm._token_usage, 0)
+    clone.stop = list(llm.stop)
+    clone.additional_params = dict(llm.additional_params)
+    return enable_response_cache(enable_prompt_caching(clone))
+
+
+def clone_tool(tool: Any) -> Any:
+    """Copie d'un outil CrewAI ; ses memos (dict, list, set) ne sont pas partages avec l'original."""
+    if not isinstance(tool, BaseTool):
+        return tool
+    clone = tool.model_copy()
+    private = clone.__pydantic_private__ or {}
+    for name, value in private.items():
+        if isinstance(value, dict | list | set):
+            private[name] = copy.copy(value)
+    return clone
+
+
+class CrewFactory:
+    """Crew d'une classe @CrewBase construit une fois, puis copie pour chaque URL."""
+
+    def __init__(self, crew_class: Any) -> None:
+        self.crew_class = crew_class
+        self.created = 0
+        self._template_instance: Any = None
+        self._template: Any = None
+        self._lock = threading.Lock()
+
+    def _build_template(self) -> None:
+        with self._lock:
+            if self._template is None:
+                instance = self.crew_class()
+                self._template = instance.crew()
+                self._template_instance = instance
+
+    def create(self, log_file: str | None = None) -> tuple[Any, Any]:
+        """
+        Instance de la classe du crew et crew neuf pour une URL.
+
+        Le modele est construit au premier appel (une erreur de construction
+        remonte a l'URL concernee et le prochain appel reessaie).
+
+        Args:
+            log_file: Fichier de log CrewAI propre a l'URL (optionnel)
+
+        Returns:
+            (instance, crew) : l'instance porte les hooks `prefetch_inputs` /
+            `finalize_result` et voit les agents et taches du crew copie.
+        """
+        if self._template is None:
+            self._build_template()
+
+        crew = self._template.copy()
+        for template_agent, crew_agent in zip(self._template.agents, crew.agents, strict=True):
+            crew_agent.llm = clone_llm(template_agent.llm)
+            crew_agent.tools = [clone_tool(tool) for tool in template_agent.tools or []]
+        if log_file:
+            crew.output_log_file = log_file
+            crew._file_handler = FileHandler(log_file)
+
+        instance = copy.copy(self._template_instance)
+        instance.agents = crew.agents
+        instance.tasks = crew.tasks
+        instance.log_file = log_file
+        self.created += 1
+        return instance, crew
+
+
+def crew_factory_for(crew_class: Any) -> CrewFactory | None:
+    """Fabrique pour une classe de crew qui declare `reusable_crew = True` (None sinon ou si desactive)."""
+    if not is_crew_factory_enabled() or not isinstance(crew_class, type):
+        return None
+    if getattr(crew_class, "reusable_crew", False) is not True:
+        return None
+    return CrewFactory(crew_class)
@@ -0,0 +1,36 @@
+"""Exports de package importes a la premiere utilisation (PEP 562).
+
+Importer CrewAI (et litellm, google-genai...) coute plusieurs secondes. Les
+packages qui exposent des crews ou des utilitaires dependant de CrewAI declarent
+leurs exports avec `lazy_exports` : la CLI ne charge que ce dont la commande
+lancee a besoin.
+"""
+
+import importlib
+import sys
+from collections.abc import Callable
+from typing import Any
+
+
+def lazy_exports(package: str, exports: dict[str, str]) -> Callable[[str], Any]:
+    """
+    `__getattr__` de module qui importe chaque nom exporte a sa premiere utilisation.
+
+    Args:
+        package: `__name__` du package
+        exports: nom exporte -> module (relatif au package) qui le definit
+
+    Returns:
+        Fonction a affecter a `__getattr__` dans le `__init__` du package
+    """
+
+    def module_getattr(name: str) -> Any:
+        module = exports.get(name)
+        if module is None:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}")
+        value = getattr(importlib.import_module(module, package), name)
+        # Memorise sur le package : les acces suivants ne repassent plus ici
+        setattr(sys.modules[package], name, value)
+        return value
+
+    return module_getattr
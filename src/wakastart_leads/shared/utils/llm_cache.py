@@ -0,0 +1,232 @@
+"""Cache disque des reponses LLM (correspondance exacte, opt-in).
+
+Une reponse est reutilisee si le modele, la temperature, les stop words, la
+totalite des messages et le schema des outils sont identiques. Utile pour
+`train`, `test`, `replay` et les re-executions sur les memes URLs : les appels
+deja vus sont servis depuis le disque, sans latence ni cout.
+
+Activation :
+    LLM_CACHE_ENABLED=1                 # ou option --llm-cache de run/search/enrich
+    LLM_CACHE_PATH=/chemin/cache.sqlite3  # defaut: src/wakastart_leads/.cache/llm_responses.sqlite3
+    LLM_CACHE_MAX_MB=512                # taille max, eviction LRU au-dela
+"""
+
+import hashlib
+import inspect
+import json
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any
+
+from crewai.llms.base_llm import BaseLLM
+
+from .constants import LLM_CACHE_PATH
+
+DEFAULT_MAX_MB = 512
+
+
+def is_llm_cache_enabled() -> bool:
+    """Retourne True si le cache de reponses LLM est active (LLM_CACHE_ENABLED)."""
+    return os.environ.get("LLM_CACHE_ENABLED", "").strip().lower() in ("1", "true", "yes", "on")
+
+
+class LLMResponseCache:
+    """Cache cle -> reponse texte stocke dans SQLite, avec eviction LRU par taille totale."""
+
+    def __init__(self, path: Path, max_bytes: int = DEFAULT_MAX_MB * 1024 * 1024) -> None:
+        self.path = path
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(path), check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "key TEXT PRIMARY KEY, model TEXT, response TEXT, size INTEGER, "
+            "created_at REAL, last_access REAL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_last_access ON responses(last_access)")
+        self._conn.commit()
+
+    @staticmethod
+    def make_key(
+        model: str,
+        temperature: float | None,
+        messages: Any,
+        tools: Any = None,
+        stop: Any = None,
+        response_model: Any = None,
+    ) -> str:
+        """Empreinte SHA-256 de tout ce qui influence la reponse."""
+        schema = None
+        if response_model is not None and hasattr(response_model, "model_json_schema"):
+            schema = response_model.model_json_schema()
+        payload = json.dumps(
+            {
+                "model": model,
+                "temperature": temperature,
+                "stop": stop,
+                "messages": messages,
+                "tools": tools,
+                "response_model": schema,
+            },
+            sort_keys=True,
+            ensure_ascii=False,
+            default=str,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> str | None:
+        """Retourne la reponse en cache (et la marque comme recemment utilisee) ou None."""
+        with self._lock:
+            row = self._conn.execute("SELECT response FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self._conn.execute("UPDATE responses SET last_access = ? WHERE key = ?", (time.time(), key))
+            self._conn.commit()
+            self.hits += 1
+            return row[0]
+
+    def set(self, key: str, model: str, response: str) -> None:
+        """Enregistre une reponse puis evince les entrees les moins recemment utilisees si besoin."""
+        size = len(response.encode("utf-8"))
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?)",
+                (key, model, response, size, now, now),
+            )
+            self._evict()
+            self._conn.commit()
+
+    def _evict(self) -> None:
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        rows = self._conn.execute("SELECT key, size FROM responses ORDER BY last_access ASC").fetchall()
+        to_delete = []
+        for key, size in rows:
+            if total <= self.max_bytes:
+                break
+            to_delete.append((key,))
+            total -= size
+        self._conn.executemany("DELETE FROM responses WHERE key = ?", to_delete)
+
+    def size_bytes(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM responses")
+            self._conn.commit()
+
+
+_shared_cache: LLMResponseCache | None = None
+_shared_lock = threading.Lock()
+
+
+def get_llm_cache() -> LLMResponseCache:
+    """Cache partage du processus, configure par LLM_CACHE_PATH et LLM_CACHE_MAX_MB."""
+    global _shared_cache
+    with _shared_lock:
+        if _shared_cache is None:
+            path = Path(os.environ.get("LLM_CACHE_PATH") or LLM_CACHE_PATH)
+            max_mb = float(os.environ.get("LLM_CACHE_MAX_MB", str(DEFAULT_MAX_MB)))
+            _shared_cache = LLMResponseCache(path, max_bytes=int(max_mb * 1024 * 1024))
+        return _shared_cache
+
+
+def enable_response_cache(llm: Any, cache: LLMResponseCache | None = None) -> Any:
+    """
+    Sert les appels `llm.call` (et `llm.acall`, chemin `--async`) depuis le cache disque quand il est active.
+
+    Sans LLM_CACHE_ENABLED (et sans `cache` explicite), ou pour un objet qui
+    n'est pas un LLM CrewAI, le LLM est retourne tel quel. Seules les reponses
+    texte sont mises en cache (pas les appels d'outils natifs ni les objets structures).
+
+    Args:
+        llm: Instance retournee par `crewai.LLM(...)`
+        cache: Cache a utiliser (defaut: cache partage du processus)
+
+    Returns:
+        Le meme LLM, instrumente
+    """
+    if not isinstance(llm, BaseLLM) or (cache is None and not is_llm_cache_enabled()):
+        return llm
+    if getattr(llm, "_response_cache", None) is not None:
+        return llm  # deja instrumente (crew() appele plusieurs fois)
+    cache = cache if cache is not None else get_llm_cache()
+    original = llm.call
+
+    def call(
+        messages: Any,
+        tools: Any = None,
+        callbacks: Any = None,
+        available_functions: Any = None,
+        from_task: Any = None,
+        from_agent: Any = None,
+        response_model: Any = None,
+    ) -> Any:
+        key = cache.make_key(llm.model, llm.temperature, messages, tools, llm.stop, response_model)
+        cached = cache.get(key)
+        if cached is not None:
+            return cached
+        response = original(
+            messages,
+            tools=tools,
+            callbacks=callbacks,
+            available_functions=available_functions,
+            from_task=from_task,
+            from_agent=from_agent,
+            response_model=response_model,
+        )
+        if isinstance(response, str) and response.strip():
+            cache.set(key, llm.model, response)
+        return response
+
+    object.__setattr__(llm, "call", call)
+
+    # Chemin asynchrone natif (Crew.akickoff)
+    if inspect.iscoroutinefunction(getattr(llm, "acall", None)):
+        original_async = llm.acall
+
+        async def acall(
+            messages: Any,
+            tools: Any = None,
+            callbacks: Any = None,
+            available_functions: Any = None,
+            from_task: Any = None,
+            from_agent: Any = None,
+            response_model: Any = None,
+        ) -> Any:
+            key = cache.make_key(llm.model, llm.temperature, messages, tools, llm.stop, response_model)
+            cached = cache.get(key)
+            if cached is not None:
+                return cached
+            response = await original_async(
+                messages,
+                tools=tools,
+                callbacks=callbacks,
+                available_functions=available_functions,
+                from_task=from_task,
+                from_agent=from_agent,
+                response_model=response_model,
+            )
+            if isinstance(response, str) and response.strip():
+                cache.set(key, llm.model, response)
+            return response
+
+        object.__setattr__(llm, "acall", acall)
+
+    object.__setattr__(llm, "_response_cache", cache)
+    return llm
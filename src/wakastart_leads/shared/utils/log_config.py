@@ -0,0 +1,157 @@
+"""Journalisation structuree : niveaux, composants et mode silencieux.
+
+Les messages passent par les loggers `wakastart.<composant>` (`get_logger`) :
+
+- niveau global (LOG_LEVEL) et par composant (LOG_COMPONENTS) ;
+- console synchrone, filtree en mode silencieux (LOG_QUIET / --quiet) : seuls
+  les resumes par URL et les avertissements restent, les crews ne sont plus verbeux ;
+- logs TXT consolides ecrits par un thread dedie (`RunLog`, QueueHandler /
+  QueueListener) : le fichier est ouvert une fois par execution et les workers
+  ne bloquent pas sur les ecritures disque.
+
+Configuration :
+    LOG_LEVEL=INFO                      # DEBUG, INFO, WARNING, ERROR
+    LOG_COMPONENTS=gamma=DEBUG,kaspr=DEBUG
+    LOG_QUIET=1                         # resumes par URL uniquement
+    CREW_VERBOSE=0                      # sortie console des agents CrewAI (defaut : active hors mode silencieux)
+"""
+
+import atexit
+import logging
+import os
+import queue
+import sys
+from logging.handlers import QueueHandler, QueueListener
+from pathlib import Path
+from typing import Any
+
+ROOT_LOGGER = "wakastart"
+_TRUE_VALUES = ("1", "true", "yes", "on")
+
+_console_handler: logging.Handler | None = None
+
+
+def is_quiet() -> bool:
+    """True si LOG_QUIET est active (console reduite aux resumes par URL)."""
+    return os.environ.get("LOG_QUIET", "").strip().lower() in _TRUE_VALUES
+
+
+def is_crew_verbose() -> bool:
+    """Sortie console des agents CrewAI : CREW_VERBOSE, active par defaut sauf en mode silencieux."""
+    value = os.environ.get("CREW_VERBOSE", "").strip().lower()
+    if value:
+        return value in _TRUE_VALUES
+    return not is_quiet()
+
+
+def parse_components(spec: str) -> dict[str, int]:
+    """Niveaux par composant ("gamma=DEBUG,kaspr=WARNING" -> {"gamma": 10, "kaspr": 30})."""
+    levels: dict[str, int] = {}
+    for item in spec.split(","):
+        name, _, level = item.partition("=")
+        value = logging.getLevelName(level.strip().upper())
+        if name.strip() and isinstance(value, int):
+            levels[name.strip()] = value
+    return levels
+
+
+class _ConsoleFilter(logging.Filter):
+    """Mode silencieux : resumes (extra summary=True) et avertissements ; sinon tout sauf les resumes."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING:
+            return True
+        summary = getattr(record, "summary", False)
+        return summary if is_quiet() else not summary
+
+
+class _StdoutHandler(logging.StreamHandler):
+    """Console sur le sys.stdout courant (remplace pendant les tests et les redirections)."""
+
+    @property
+    def stream(self) -> Any:
+        return sys.stdout
+
+    @stream.setter
+    def stream(self, value: Any) -> None:
+        pass
+
+
+def configure_logging() -> logging.Logger:
+    """
+    Applique LOG_LEVEL et LOG_COMPONENTS aux loggers `wakastart.*` (idempotent).
+
+    Returns:
+        Logger racine `wakastart`
+    """
+    global _console_handler
+
+    root = logging.getLogger(ROOT_LOGGER)
+    level = logging.getLevelName(os.environ.get("LOG_LEVEL", "INFO").strip().upper())
+    root.setLevel(level if isinstance(level, int) else logging.INFO)
+    for name, component_level in parse_components(os.environ.get("LOG_COMPONENTS", "")).items():
+        logging.getLogger(f"{ROOT_LOGGER}.{name}").setLevel(component_level)
+
+    if _console_handler is None:
+        _console_handler = _StdoutHandler()
+        _console_handler.setFormatter(logging.Formatter("%(message)s"))
+        _console_handler.addFilter(_ConsoleFilter())
+        root.addHandler(_console_handler)
+        root.propagate = False
+    return root
+
+
+def get_logger(component: str) -> logging.Logger:
+    """Logger d'un composant (`wakastart.<component>`), console configuree au premier appel."""
+    if _console_handler is None:
+        configure_logging()
+    return logging.getLogger(f"{ROOT_LOGGER}.{component}")
+
+
+class RunLog:
+    """
+    Log TXT consolide d'une execution.
+
+    Chaque message est ecrit dans le fichier par le thread d'un QueueListener
+    (fichier ouvert une fois) et affiche en console hors mode silencieux.
+    `summary` affiche un resume en mode silencieux uniquement.
+    """
+
+    def __init__(self, path: Path, component: str = "run") -> None:
+        self.path = path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._file_handler = logging.FileHandler(path, mode="a", encoding="utf-8")
+        self._file_handler.setFormatter(logging.Formatter("%(message)s"))
+        self._queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._listener = QueueListener(self._queue, self._file_handler)
+        self._listener.start()
+        # Logger hors registre (un par execution) : le fichier recoit tout, quel que soit LOG_LEVEL
+        self._file_logger = logging.Logger(f"{ROOT_LOGGER}.{component}.file", logging.DEBUG)
+        self._file_logger.addHandler(QueueHandler(self._queue))
+        self._console = get_logger(component)
+        self._closed = False
+        # Arret sur exception : la file est videe avant la sortie de l'interpreteur
+        atexit.register(self.close)
+
+    def write(self, message: str, level: int = logging.INFO) -> None:
+        """Ecrit une ligne dans le log consolide et en console."""
+        self._file_logger.log(level, message)
+        self._console.log(level, message)
+
+    def summary(self, message: str) -> None:
+        """Resume d'une URL, affiche en console en mode silencieux seulement."""
+        self._console.info(message, extra={"summary": True})
+
+    def close(self) -> None:
+        """Vide la file puis ferme le fichier (avant compression)."""
+        if not self._closed:
+            self._closed = True
+            self._listener.stop()
+            self._file_handler.close()
+            atexit.unregister(self.close)
+
+    def __enter__(self) -> "RunLog":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
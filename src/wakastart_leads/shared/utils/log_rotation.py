@@ -4,57 +4,80 @@ import os
 from datetime import datetime, timedelta
 from pathlib import Path
 
+from .log_store import INDEX_FILENAME, LogIndex
+
+# Fichiers du dossier de logs qui ne sont pas des logs
+_NOT_LOGS = {".gitkeep", INDEX_FILENAME}
+
 
 def cleanup_old_logs(
     logs_dir: Path,
-    max_age_days: int = 30,
+    max_age_days: int | None = None,
     min_keep: int = 5,
+    max_total_bytes: int | None = None,
 ) -> int:
     """
-    Supprime les fichiers de logs plus vieux que max_age_days.
-    Garde toujours au minimum min_keep fichiers.
+    Supprime les fichiers de logs plus vieux que max_age_days, puis les plus
+    anciens tant que le dossier depasse max_total_bytes.
+    Garde toujours au minimum min_keep fichiers. Les logs supprimes sont retires de l'index.
 
     Args:
         logs_dir: Dossier contenant les logs
-        max_age_days: Age maximum en jours (defaut: 30)
+        max_age_days: Age maximum en jours (defaut: LOG_RETENTION_DAYS, 30)
         min_keep: Nombre minimum de fichiers a conserver (defaut: 5)
+        max_total_bytes: Taille totale maximum (defaut: LOG_MAX_TOTAL_MB ; 0 = illimitee)
 
     Returns:
         Nombre de fichiers supprimes
     """
     if not logs_dir.exists():
         return 0
+    if max_age_days is None:
+        max_age_days = get_log_retention_days()
+    if max_total_bytes is None:
+        max_total_bytes = get_log_max_bytes()
 
-    # Lister tous les fichiers de log
-    log_files = sorted(
-        [f for f in logs_dir.iterdir() if f.is_file() and f.name != ".gitkeep"],
-        key=lambda f: f.stat().st_mtime,
-        reverse=True,
-    )
+    # Un seul stat par fichier (scandir le met en cache)
+    with os.scandir(logs_dir) as it:
+        log_files = [
+            (entry.name, entry.stat().st_mtime, entry.stat().st_size)
+            for entry in it
+            if entry.is_file() and entry.name not in _NOT_LOGS
+        ]
+    log_files.sort(key=lambda f: f[1], reverse=True)
 
     if len(log_files) <= min_keep:
         return 0
 
-    # Calculer la date limite
-    cutoff_date = datetime.now() - timedelta(days=max_age_days)
-    deleted_count = 0
+    cutoff = (datetime.now() - timedelta(days=max_age_days)).timestamp()
+    total_bytes = sum(size for _, _, size in log_files)
+    removed: set[str] = set()
 
-    # Parcourir les fichiers (en gardant les min_keep premiers)
-    for log_file in log_files[min_keep:]:
-        file_mtime = datetime.fromtimestamp(log_file.stat().st_mtime)
-        if file_mtime < cutoff_date:
-            try:
-                log_file.unlink()
-                deleted_count += 1
-            except OSError:
-                pass
+    # Du plus ancien au plus recent, en gardant les min_keep plus recents
+    for name, mtime, size in reversed(log_files[min_keep:]):
+        too_old = mtime < cutoff
+        too_big = max_total_bytes > 0 and total_bytes > max_total_bytes
+        if not (too_old or too_big):
+            continue
+        try:
+            (logs_dir / name).unlink()
+        except OSError:
+            continue
+        removed.add(name)
+        total_bytes -= size
 
-    if deleted_count > 0:
-        print(f"[INFO] {deleted_count} ancien(s) log(s) supprime(s) dans {logs_dir}")
+    if removed:
+        LogIndex(logs_dir).prune(removed)
+        print(f"[INFO] {len(removed)} ancien(s) log(s) supprime(s) dans {logs_dir}")
 
-    return deleted_count
+    return len(removed)
 
 
 def get_log_retention_days() -> int:
     """Retourne le nombre de jours de retention depuis l'env ou 30 par defaut."""
     return int(os.environ.get("LOG_RETENTION_DAYS", "30"))
+
+
+def get_log_max_bytes() -> int:
+    """Taille maximum d'un dossier de logs (LOG_MAX_TOTAL_MB, 2048 Mo par defaut ; 0 = illimitee)."""
+    return int(float(os.environ.get("LOG_MAX_TOTAL_MB", "2048")) * 1024 * 1024)
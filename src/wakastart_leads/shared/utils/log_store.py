@@ -0,0 +1,174 @@
+"""Stockage des logs : compression a la fermeture et index par URL / execution.
+
+Chaque URL traitee ecrit un log CrewAI verbeux (`{domain}_{timestamp}.json`),
+chaque execution un log TXT consolide. Une fois ferme, un log est compresse en
+gzip (`.json.gz`, `.txt.gz`) et reference dans `index.jsonl` du dossier de logs :
+retrouver le log d'une URL ou d'une execution ne demande plus de lister le dossier.
+
+Configuration :
+    LOG_COMPRESSION=gzip        # "none" : logs laisses en clair
+"""
+
+import gzip
+import json
+import os
+import shutil
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+from .url_utils import normalize_url
+
+INDEX_FILENAME = "index.jsonl"
+COMPRESSED_SUFFIX = ".gz"
+
+# Ajouts a l'index depuis les threads des workers (archive_log via asyncio.to_thread)
+_index_lock = threading.Lock()
+
+
+def is_log_compression_enabled() -> bool:
+    """True sauf si LOG_COMPRESSION=none (ou 0/off)."""
+    return os.environ.get("LOG_COMPRESSION", "gzip").strip().lower() not in ("none", "0", "false", "no", "off")
+
+
+def compress_log(path: Path) -> Path:
+    """
+    Compresse un log ferme en gzip et supprime l'original.
+
+    Returns:
+        Chemin du log compresse (ou `path` inchange si la compression est
+        desactivee, le fichier absent ou deja compresse)
+    """
+    if not is_log_compression_enabled() or path.suffix == COMPRESSED_SUFFIX or not path.is_file():
+        return path
+    target = path.with_name(path.name + COMPRESSED_SUFFIX)
+    stat = path.stat()
+    with open(path, "rb") as src, gzip.open(target, "wb") as dst:
+        shutil.copyfileobj(src, dst)
+    # Conserve la date du log : la rotation par age reste juste
+    os.utime(target, (stat.st_atime, stat.st_mtime))
+    path.unlink()
+    return target
+
+
+def read_log(path: Path) -> str:
+    """Contenu texte d'un log, compresse ou non."""
+    if path.suffix == COMPRESSED_SUFFIX:
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            return f.read()
+    return path.read_text(encoding="utf-8")
+
+
+class LogIndex:
+    """Index JSONL d'un dossier de logs : fichier, URL, identifiant d'execution, taille."""
+
+    def __init__(self, logs_dir: Path) -> None:
+        self.logs_dir = logs_dir
+        self.path = logs_dir / INDEX_FILENAME
+
+    def add(self, log_path: Path, url: str | None = None, run_id: str | None = None) -> dict[str, Any]:
+        """Reference un log (une ligne ajoutee a l'index ; taille 0 s'il n'est pas encore ecrit)."""
+        entry = {
+            "file": log_path.name,
+            "url": url,
+            "run_id": run_id,
+            "bytes": log_path.stat().st_size if log_path.exists() else 0,
+            "created": datetime.now().isoformat(timespec="seconds"),
+        }
+        with _index_lock:
+            self.logs_dir.mkdir(parents=True, exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        return entry
+
+    def entries(self) -> list[dict[str, Any]]:
+        """Toutes les entrees, de la plus ancienne a la plus recente (lignes invalides ignorees)."""
+        if not self.path.exists():
+            return []
+        entries = []
+        with open(self.path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entries.append(json.loads(line))
+                except json.JSONDecodeError:
+                    continue  # ligne tronquee (arret brutal pendant l'ecriture)
+        return entries
+
+    def find(self, url: str | None = None, run_id: str | None = None) -> list[Path]:
+        """
+        Logs d'une URL (comparaison normalisee) et/ou d'une execution, du plus ancien au plus recent.
+
+        Les logs supprimes depuis leur indexation sont ignores.
+        """
+        key = normalize_url(url) if url else None
+        found = []
+        for entry in self.entries():
+            if key is not None and normalize_url(entry.get("url") or "") != key:
+                continue
+            if run_id is not None and entry.get("run_id") != run_id:
+                continue
+            path = self.logs_dir / entry["file"]
+            if path.exists():
+                found.append(path)
+        return found
+
+    def prune(self, removed: set[str]) -> int:
+        """Retire de l'index les logs supprimes (noms de fichiers). Retourne le nombre d'entrees retirees."""
+        if not removed or not self.path.exists():
+            return 0
+        with _index_lock:
+            entries = self.entries()
+            kept = [e for e in entries if e.get("file") not in removed]
+            if len(kept) == len(entries):
+                return 0
+            tmp_path = self.path.with_suffix(".tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                for entry in kept:
+                    f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            tmp_path.replace(self.path)
+        return len(entries) - len(kept)
+
+
+def archive_log(path: Path | str | None, url: str | None = None, run_id: str | None = None) -> Path | None:
+    """
+    Ferme un log : compression puis ajout a l'index de son dossier.
+
+    Args:
+        path: Log ferme (aucun processus ne doit plus y ecrire)
+        url: URL traitee (logs par URL)
+        run_id: Identifiant d'execution ou de tentative (defaut : nom du log sans extension)
+
+    Returns:
+        Chemin final du log, None s'il n'existe pas (crew arrete avant d'ecrire)
+    """
+    if not path:
+        return None
+    path = Path(path)
+    if not path.is_file():
+        return None
+    archived = compress_log(path)
+    LogIndex(archived.parent).add(archived, url=url, run_id=run_id or path.stem)
+    return archived
+
+
+def index_open_log(path: Path | str | None, url: str | None = None, run_id: str | None = None) -> Path | None:
+    """
+    Reference un log encore ouvert, sans le compresser.
+
+    Cas d'un TIMEOUT : le crew continue d'ecrire son log depuis son thread, le
+    compresser le tronquerait. Il reste en clair mais `logs <url>` le retrouve.
+
+    Args:
+        path: Log en cours d'ecriture (eventuellement pas encore cree)
+        url: URL traitee
+        run_id: Identifiant de tentative (defaut : nom du log sans extension)
+
+    Returns:
+        Chemin du log indexe, None si aucun chemin
+    """
+    if not path:
+        return None
+    path = Path(path)
+    LogIndex(path.parent).add(path, url=url, run_id=run_id or path.stem)
+    return path
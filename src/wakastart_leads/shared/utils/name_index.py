@@ -0,0 +1,204 @@
+"""Index de noms d'entreprises pour la recherche approchee (trigrammes).
+
+La recherche Sirene par nom (`denominationUniteLegale:mot*mot*`) rate les
+variantes d'accents, de forme juridique ("SAS", "SA") et les ecarts entre nom
+commercial et denomination legale : les agents relancent alors la recherche avec
+d'autres variantes. Cet index retourne en une requete des candidats classes par
+similarite de trigrammes, a partir des noms deja connus (resultats des
+executions precedentes, extrait Sirene via `sirene-index --names`).
+
+Les candidats sont preselectionnes par une table SQLite FTS5 (tokenizer
+`trigram`, SQLite >= 3.34) sur les trigrammes les plus rares de la requete, puis
+classes par similarite de Jaccard.
+
+Configuration :
+    NAME_INDEX_ENABLED=0      # desactive l'index de noms
+    NAME_INDEX_PERSIST=0      # index memoire uniquement (defaut: SQLite)
+    NAME_INDEX_PATH=...       # defaut: src/wakastart_leads/.cache/company_names.sqlite3
+"""
+
+import os
+import re
+import sqlite3
+import threading
+from collections import Counter
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from pathlib import Path
+
+from .constants import NAME_INDEX_PATH
+from .sirene_index import normalize_name
+
+# Formes juridiques ignorees dans les noms ("Acme SAS" == "ACME")
+LEGAL_FORMS = frozenset(
+    {"sa", "sas", "sasu", "sarl", "eurl", "sci", "scop", "snc", "sca", "selarl", "gie", "ste", "societe"}
+)
+# Candidats preselectionnes par FTS5 avant le classement, via les trigrammes les plus rares
+# (au plus RARE_TRIGRAMS, et pas plus de CANDIDATE_BUDGET noms a classer par FTS5)
+CANDIDATES = 50
+RARE_TRIGRAMS = 6
+CANDIDATE_BUDGET = 2000
+DEFAULT_MIN_SCORE = 0.3
+
+
+@dataclass
+class NameMatch:
+    """Candidat de la recherche approchee."""
+
+    name: str
+    score: float
+    siren: str = ""
+    url: str = ""
+    source: str = ""
+
+
+def company_key(name: str) -> str:
+    """Cle de comparaison : nom normalise sans forme juridique ("Acme Santé S.A.S." -> "acme sante")."""
+    # Sigles pointes : "S.A.S." -> "SAS"
+    words = normalize_name(re.sub(r"(?<=\b\w)\.", "", name)).split()
+    kept = [w for w in words if w not in LEGAL_FORMS]
+    return " ".join(kept or words)
+
+
+def trigrams(key: str) -> set[str]:
+    """Trigrammes d'une cle, bornes par des espaces (comme pg_trgm)."""
+    padded = f"  {key} "
+    return {padded[i : i + 3] for i in range(len(padded) - 2)}
+
+
+def _fts_trigrams(key: str) -> set[str]:
+    """Trigrammes indexes par le tokenizer FTS5 `trigram` (sans bornes)."""
+    return {key[i : i + 3] for i in range(len(key) - 2)}
+
+
+def similarity(a: str, b: str) -> float:
+    """Similarite de Jaccard entre les trigrammes de deux cles (0 a 1)."""
+    ta, tb = trigrams(a), trigrams(b)
+    return len(ta & tb) / len(ta | tb) if ta and tb else 0.0
+
+
+class CompanyNameIndex:
+    """Index memoire (et SQLite par defaut) des noms d'entreprises connus."""
+
+    def __init__(self, path: Path | None = None) -> None:
+        self.path = path
+        self.stats: Counter[str] = Counter()
+        self._lock = threading.Lock()
+        if path is not None:
+            path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(path) if path is not None else ":memory:", check_same_thread=False)
+        self._conn.executescript(
+            "CREATE TABLE IF NOT EXISTS names ("
+            "id INTEGER PRIMARY KEY, key TEXT, name TEXT, siren TEXT, url TEXT, source TEXT, UNIQUE (key, siren));"
+            "CREATE VIRTUAL TABLE IF NOT EXISTS names_fts USING fts5("
+            "key, content='names', content_rowid='id', tokenize='trigram');"
+            "CREATE TABLE IF NOT EXISTS trigram_docs (gram TEXT PRIMARY KEY, docs INTEGER) WITHOUT ROWID;"
+        )
+        self._conn.commit()
+
+    def add(self, name: str, siren: str = "", url: str = "", source: str = "result") -> None:
+        """Ajoute un nom (ignore s'il est deja connu pour ce SIREN)."""
+        self.add_many([(name, siren, url)], source)
+
+    def add_many(self, entries: Iterable[tuple[str, str, str]], source: str) -> int:
+        """Ajoute des (nom, siren, url) en une transaction ; retourne le nombre de noms nouveaux."""
+        added = 0
+        docs: Counter[str] = Counter()
+        with self._lock:
+            for name, siren, url in entries:
+                key = company_key(name)
+                if not key:
+                    continue
+                cursor = self._conn.execute(
+                    "INSERT OR IGNORE INTO names (key, name, siren, url, source) VALUES (?, ?, ?, ?, ?)",
+                    (key, name.strip(), siren or "", url or "", source),
+                )
+                if cursor.rowcount:
+                    self._conn.execute("INSERT INTO names_fts (rowid, key) VALUES (?, ?)", (cursor.lastrowid, key))
+                    docs.update(_fts_trigrams(key))
+                    added += 1
+            # Frequence des trigrammes (choix des plus rares a la recherche)
+            self._conn.executemany(
+                "INSERT INTO trigram_docs VALUES (?, ?) ON CONFLICT (gram) DO UPDATE SET docs = docs + excluded.docs",
+                docs.items(),
+            )
+            self._conn.commit()
+        return added
+
+    def match(self, query: str, limit: int = 5, min_score: float = DEFAULT_MIN_SCORE) -> list[NameMatch]:
+        """Candidats classes par similarite decroissante (score >= `min_score`)."""
+        key = company_key(query)
+        if not key:
+            return []
+        grams = sorted(_fts_trigrams(key))
+        with self._lock:
+            if grams:
+                # Les trigrammes les plus rares suffisent a retrouver les candidats proches
+                placeholders = ", ".join("?" * len(grams))
+                counts = dict(
+                    self._conn.execute(
+                        f"SELECT gram, docs FROM trigram_docs WHERE gram IN ({placeholders})", grams
+                    ).fetchall()
+                )
+                rare: list[str] = []
+                budget = 0
+                for gram in sorted(counts, key=counts.__getitem__)[:RARE_TRIGRAMS]:
+                    if rare and budget + counts[gram] > CANDIDATE_BUDGET:
+                        break
+                    rare.append(gram)
+                    budget += counts[gram]
+                fts_query = " OR ".join('"' + g.replace('"', '""') + '"' for g in rare) or '""'
+                rows = self._conn.execute(
+                    "SELECT names.key, name, siren, url, source FROM names_fts "
+                    "JOIN names ON names.id = names_fts.rowid WHERE names_fts MATCH ? ORDER BY rank LIMIT ?",
+                    (fts_query, CANDIDATES),
+                ).fetchall()
+            else:
+                # Cle trop courte pour le tokenizer trigram : egalite stricte
+                rows = self._conn.execute(
+                    "SELECT key, name, siren, url, source FROM names WHERE key = ?", (key,)
+                ).fetchall()
+            matches = [
+                NameMatch(name, round(similarity(key, row_key), 3), siren, url, source)
+                for row_key, name, siren, url, source in rows
+            ]
+            matches = [m for m in matches if m.score >= min_score]
+            self.stats["hit" if matches else "miss"] += 1
+        return sorted(matches, key=lambda m: -m.score)[:limit]
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM names").fetchone()[0]
+
+
+def sirene_name_entries(rows: Iterable[dict[str, str]]) -> Iterator[tuple[str, str, str]]:
+    """(nom, siren, url) depuis des lignes du stock Sirene : denomination, nom d'usage et sigle."""
+    for row in rows:
+        for column in ("denominationUniteLegale", "denominationUsuelle1UniteLegale", "sigleUniteLegale"):
+            if row.get(column):
+                yield row[column], row["siren"], ""
+
+
+_shared_index: CompanyNameIndex | None = None
+_shared_lock = threading.Lock()
+
+
+def get_name_index() -> CompanyNameIndex | None:
+    """Index de noms partage du processus (configure par NAME_INDEX_*), None si desactive."""
+    global _shared_index
+    if os.environ.get("NAME_INDEX_ENABLED", "1").strip().lower() in ("0", "false", "no", "off"):
+        return None
+    with _shared_lock:
+        if _shared_index is None:
+            persist = os.environ.get("NAME_INDEX_PERSIST", "1").strip().lower() not in ("0", "false", "no", "off")
+            path = Path(os.environ.get("NAME_INDEX_PATH") or NAME_INDEX_PATH) if persist else None
+            _shared_index = CompanyNameIndex(path)
+        return _shared_index
+
+
+def format_name_index_stats(index: CompanyNameIndex | None) -> str | None:
+    """Ligne de log : recherches par nom resolues par l'index (None si inutilise)."""
+    if index is None or not index.stats:
+        return None
+    total = index.stats["hit"] + index.stats["miss"]
+    return f"[INFO] Index de noms: {index.stats['hit']} recherche(s) resolue(s) sur {total}"
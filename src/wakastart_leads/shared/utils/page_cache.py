@@ -0,0 +1,168 @@
+"""Cache des pages web scrapees, partage entre les agents d'une execution.
+
+Les agents du crew d'analyse scrapent souvent les memes pages du prospect
+(accueil, a propos, tarifs). Chaque page est telechargee une seule fois : le
+HTML et le texte extrait sont conserves, cles par URL (hote en minuscules sans www,
+chemin et query inchanges). Passe le delai de fraicheur, la page est revalidee
+par requete conditionnelle (If-None-Match / If-Modified-Since) au lieu d'etre
+retelechargee. En memoire, les pages les moins recemment utilisees sont
+evincees au-dela de la taille maximale.
+
+Configuration :
+    PAGE_CACHE_TTL=900        # duree de fraicheur en secondes (sans revalidation)
+    PAGE_CACHE_MAX_MB=64      # taille max en memoire, eviction LRU au-dela
+    PAGE_CACHE_PERSIST=1      # conserve les pages entre executions (SQLite)
+    PAGE_CACHE_PATH=...       # defaut: src/wakastart_leads/.cache/pages.sqlite3
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from collections import Counter, OrderedDict
+from dataclasses import astuple, dataclass
+from pathlib import Path
+from urllib.parse import urlsplit, urlunsplit
+
+from .constants import PAGE_CACHE_PATH
+from .url_utils import ensure_https
+
+DEFAULT_FRESH_SECONDS = 900.0
+DEFAULT_MAX_MB = 64
+
+
+@dataclass
+class CachedPage:
+    """Page telechargee : HTML brut, texte extrait et validateurs HTTP."""
+
+    url: str
+    html: str
+    text: str
+    etag: str | None = None
+    last_modified: str | None = None
+    fetched_at: float = 0.0
+
+    @property
+    def size(self) -> int:
+        """Taille approximative en memoire (HTML + texte extrait)."""
+        return len(self.html) + len(self.text)
+
+
+def page_key(url: str) -> str:
+    """Cle de cache d'une URL : schema et hote en minuscules (sans www), chemin et query inchanges, sans fragment."""
+    parts = urlsplit(ensure_https(url))
+    host = parts.netloc.lower().removeprefix("www.")
+    return urlunsplit((parts.scheme.lower(), host, parts.path or "/", parts.query, ""))
+
+
+class PageCache:
+    """Cache memoire (et optionnellement SQLite) des pages scrapees."""
+
+    def __init__(
+        self,
+        path: Path | None = None,
+        fresh_seconds: float = DEFAULT_FRESH_SECONDS,
+        max_bytes: int = DEFAULT_MAX_MB * 1024 * 1024,
+    ) -> None:
+        self.path = path
+        self.fresh_seconds = fresh_seconds
+        self.max_bytes = max_bytes
+        self.stats: Counter[str] = Counter()
+        self._pages: OrderedDict[str, CachedPage] = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._conn: sqlite3.Connection | None = None
+        if path is not None:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(str(path), check_same_thread=False)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS pages ("
+                "key TEXT PRIMARY KEY, url TEXT, html TEXT, text TEXT, "
+                "etag TEXT, last_modified TEXT, fetched_at REAL)"
+            )
+            self._conn.commit()
+
+    def get(self, url: str) -> CachedPage | None:
+        """Retourne la page en cache (fraiche ou non) ou None."""
+        key = page_key(url)
+        with self._lock:
+            page = self._pages.get(key)
+            if page is not None:
+                self._pages.move_to_end(key)
+            elif self._conn is not None:
+                row = self._conn.execute(
+                    "SELECT url, html, text, etag, last_modified, fetched_at FROM pages WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None:
+                    page = CachedPage(*row)
+                    self._remember(key, page)
+            return page
+
+    def is_fresh(self, page: CachedPage) -> bool:
+        """True si la page peut etre servie sans revalidation."""
+        return time.time() - page.fetched_at < self.fresh_seconds
+
+    def put(self, page: CachedPage) -> None:
+        """Enregistre (ou remplace) une page."""
+        key = page_key(page.url)
+        with self._lock:
+            self._remember(key, page)
+            if self._conn is not None:
+                self._conn.execute("INSERT OR REPLACE INTO pages VALUES (?, ?, ?, ?, ?, ?, ?)", (key, *astuple(page)))
+                self._conn.commit()
+
+    def _remember(self, key: str, page: CachedPage) -> None:
+        """Place la page en tete du LRU memoire et evince les plus anciennes au-dela de max_bytes."""
+        previous = self._pages.pop(key, None)
+        if previous is not None:
+            self._bytes -= previous.size
+        self._pages[key] = page
+        self._bytes += page.size
+        while self._bytes > self.max_bytes and len(self._pages) > 1:
+            _, evicted = self._pages.popitem(last=False)
+            self._bytes -= evicted.size
+
+    def record(self, outcome: str) -> None:
+        """Comptabilise un acces : "hit", "revalidated" ou "fetched"."""
+        with self._lock:
+            self.stats[outcome] += 1
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._pages)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._pages.clear()
+            self._bytes = 0
+            self.stats.clear()
+            if self._conn is not None:
+                self._conn.execute("DELETE FROM pages")
+                self._conn.commit()
+
+
+_shared_cache: PageCache | None = None
+_shared_lock = threading.Lock()
+
+
+def get_page_cache() -> PageCache:
+    """Cache de pages partage du processus (configure par PAGE_CACHE_*)."""
+    global _shared_cache
+    with _shared_lock:
+        if _shared_cache is None:
+            persist = os.environ.get("PAGE_CACHE_PERSIST", "").strip().lower() in ("1", "true", "yes", "on")
+            path = Path(os.environ.get("PAGE_CACHE_PATH") or PAGE_CACHE_PATH) if persist else None
+            fresh = float(os.environ.get("PAGE_CACHE_TTL", str(DEFAULT_FRESH_SECONDS)))
+            max_mb = float(os.environ.get("PAGE_CACHE_MAX_MB", str(DEFAULT_MAX_MB)))
+            _shared_cache = PageCache(path, fresh_seconds=fresh, max_bytes=int(max_mb * 1024 * 1024))
+        return _shared_cache
+
+
+def format_page_cache_stats(cache: PageCache) -> str | None:
+    """Ligne de log resumant l'activite du cache de pages (None si inutilise)."""
+    if not cache.stats:
+        return None
+    return (
+        f"[INFO] Cache pages web: {cache.stats['hit']} hit(s), "
+        f"{cache.stats['revalidated']} revalidee(s), {cache.stats['fetched']} telechargee(s)"
+    )
@@ -1,12 +1,38 @@
 """Module d'orchestration parallèle pour le traitement des URLs."""
 
 import asyncio
-from dataclasses import dataclass
+import os
+from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
 from pathlib import Path
 from typing import Any
 
+from .crew_factory import CrewFactory, crew_factory_for
+from .log_config import RunLog
+from .log_store import archive_log, index_open_log
+from .run_metrics import RunMetrics
+from .tracing import OTLP_ENDPOINT_ENV, Span, Tracer, append_trace, export_otlp, format_time_summary
+from .usage import UsageRecord, collect_usage, format_usage_summary, write_cost_report
+
+
+def is_async_kickoff_enabled() -> bool:
+    """
+    True si les crews sont executes par `Crew.akickoff` (RUNNER_ASYNC).
+
+    Kickoff asynchrone natif : taches, appels LLM et outils (`_arun`) partagent
+    la boucle d'evenements au lieu d'occuper un thread par URL en cours.
+    """
+    return os.environ.get("RUNNER_ASYNC", "").strip().lower() in ("1", "true", "yes", "on")
+
+
+async def close_async_client() -> None:
+    """Ferme le client HTTP asynchrone des outils (fin d'execution)."""
+    # Import differe : shared.tools importe shared.utils
+    from wakastart_leads.shared.tools.async_http import aclose_async_client
+
+    await aclose_async_client()
+
 
 class RunStatus(Enum):
     """Statut d'exécution d'une URL."""
@@ -25,6 +51,21 @@ class UrlResult:
     csv_row: str | None
     error: str | None
     duration_seconds: float
+    spans: list[Span] = field(default_factory=list)
+    trace_id: str | None = None
+    usage: list[UsageRecord] = field(default_factory=list)
+    facts: dict[str, str] = field(default_factory=dict)
+    log_file: str | None = None
+
+    @property
+    def total_tokens(self) -> int:
+        """Tokens consommés par tous les agents pour cette URL."""
+        return sum(r.total_tokens for r in self.usage)
+
+    @property
+    def cost_usd(self) -> float:
+        """Coût LLM estimé (USD) pour cette URL."""
+        return sum(r.cost_usd for r in self.usage)
 
 
 async def run_single_url(
@@ -32,6 +73,8 @@ async def run_single_url(
     crew_class: Any,
     log_dir: Path,
     timeout: int = 600,
+    factory: CrewFactory | None = None,
+    metrics: RunMetrics | None = None,
 ) -> UrlResult:
     """
     Exécute le crew pour une seule URL.
@@ -41,38 +84,69 @@ async def run_single_url(
         crew_class: Classe du crew à instancier
         log_dir: Dossier pour les logs
         timeout: Timeout en secondes
+        factory: Fabrique du crew (copie d'un crew construit une fois) ; sinon
+            `crew_class` est instancié pour l'URL
+        metrics: Métriques en direct, alimentées par les spans LLM et outils (optionnel)
 
     Returns:
-        UrlResult avec le statut et les données
+        UrlResult avec le statut, les données et les spans de timing
     """
     start = datetime.now()
     domain = url.replace("https://", "").replace("http://", "").split("/")[0].replace("www.", "")
+    tracer = Tracer(observer=metrics)
+    crew = None
+    log_file = None
 
     try:
-        crew_instance = crew_class()
-
         # Configurer log individuel
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         log_dir.mkdir(parents=True, exist_ok=True)
-        crew_instance.log_file = str(log_dir / f"{domain}_{timestamp}.json")
-
-        # Exécuter avec timeout
-        result = await asyncio.wait_for(
-            asyncio.to_thread(
-                crew_instance.crew().kickoff,
-                inputs={"url": url},
-            ),
-            timeout=timeout,
-        )
+        log_file = str(log_dir / f"{domain}_{timestamp}.json")
+
+        if factory is not None:
+            crew_instance, crew = factory.create(log_file)
+        else:
+            crew_instance = crew_class()
+            crew_instance.log_file = log_file
+            crew = crew_instance.crew()
+
+        # Spans par tâche, appel LLM et appel d'outil
+        tracer.instrument_crew(crew)
+
+        inputs: dict[str, Any] = {"url": url}
+        # Pré-chargement et finalisation optionnels, définis par la classe du crew
+        # (ex: AnalysisCrew.prefetch_inputs, AnalysisCrew.finalize_result)
+        prefetch = getattr(type(crew_instance), "prefetch_inputs", None)
+        finalize = getattr(type(crew_instance), "finalize_result", None)
+
+        async def execute() -> Any:
+            if prefetch is not None:
+                with tracer.task_span("prefetch"):
+                    prefetched = await asyncio.to_thread(crew_instance.prefetch_inputs, url)
+                inputs.update(prefetched or {})
+            if is_async_kickoff_enabled():
+                # Annule reellement au timeout (un thread to_thread continuerait)
+                return await crew.akickoff(inputs=inputs)
+            return await asyncio.to_thread(crew.kickoff, inputs=inputs)
+
+        # Exécuter avec timeout (pré-chargement compris)
+        result = await asyncio.wait_for(execute(), timeout=timeout)
 
         duration = (datetime.now() - start).total_seconds()
-        return UrlResult(
+        url_result = UrlResult(
             url=url,
             status=RunStatus.SUCCESS,
             csv_row=result.raw if hasattr(result, "raw") else str(result),
             error=None,
             duration_seconds=duration,
+            spans=tracer.spans,
+            trace_id=tracer.trace_id,
+            usage=collect_usage(crew),
+            log_file=log_file,
         )
+        if finalize is not None:
+            crew_instance.finalize_result(url_result)
+        return url_result
 
     except asyncio.TimeoutError:
         return UrlResult(
@@ -81,6 +155,10 @@ async def run_single_url(
             csv_row=None,
             error=f"Timeout après {timeout}s",
             duration_seconds=float(timeout),
+            spans=tracer.spans,
+            trace_id=tracer.trace_id,
+            usage=collect_usage(crew),
+            log_file=log_file,
         )
     except Exception as e:
         duration = (datetime.now() - start).total_seconds()
@@ -90,9 +168,97 @@ async def run_single_url(
             csv_row=None,
             error=str(e),
             duration_seconds=duration,
+            spans=tracer.spans,
+            trace_id=tracer.trace_id,
+            usage=collect_usage(crew),
+            log_file=log_file,
         )
 
 
+async def archive_result_log(result: UrlResult) -> None:
+    """
+    Compresse et indexe le log CrewAI d'une tentative (hors de la boucle d'evenements).
+
+    Apres un TIMEOUT, le kickoff lance par `asyncio.to_thread` continue d'ecrire
+    son log : il est indexe en clair (non compresse, supprime par la rotation).
+    """
+    if result.status == RunStatus.TIMEOUT:
+        if result.log_file:
+            await asyncio.to_thread(index_open_log, result.log_file, result.url, result.trace_id)
+        return
+    if not result.log_file or not os.path.isfile(result.log_file):
+        result.log_file = None  # crew arrete avant d'ecrire son log
+        return
+    archived = await asyncio.to_thread(archive_log, result.log_file, result.url, result.trace_id)
+    result.log_file = str(archived) if archived else None
+
+
+async def record_trace(result: UrlResult, trace_path: Path | None, lock: asyncio.Lock | None = None) -> None:
+    """
+    Ecrit les spans d'un resultat dans le fichier de trace JSONL et les exporte en OTLP si configure.
+
+    L'export (POST HTTP, jusqu'a 5 s) tourne dans un thread, hors du verrou :
+    un collecteur lent ne bloque ni la boucle d'evenements ni les autres workers.
+    """
+    if trace_path is not None:
+        if lock is not None:
+            async with lock:
+                append_trace(trace_path, result.url, result.spans, result.trace_id)
+        else:
+            append_trace(trace_path, result.url, result.spans, result.trace_id)
+    if result.trace_id and result.spans and os.getenv(OTLP_ENDPOINT_ENV, "").strip():
+        await asyncio.to_thread(export_otlp, result.url, result.spans, result.trace_id)
+
+
+async def run_with_retry(
+    url: str,
+    crew_class: Any,
+    log_dir: Path,
+    timeout: int = 600,
+    retry_count: int = 1,
+    trace_path: Path | None = None,
+    lock: asyncio.Lock | None = None,
+    factory: CrewFactory | None = None,
+    metrics: RunMetrics | None = None,
+) -> UrlResult:
+    """
+    Execute le crew pour une URL, avec retry et backoff exponentiel en cas d'echec.
+
+    Args:
+        url: URL a traiter
+        crew_class: Classe du crew a instancier
+        log_dir: Dossier pour les logs
+        timeout: Timeout par tentative en secondes
+        retry_count: Nombre de retry en cas d'echec
+        trace_path: Fichier JSONL ou ecrire les spans de chaque tentative (optionnel)
+        lock: Verrou des ecritures de fichiers partages entre workers (optionnel)
+        factory: Fabrique du crew partagee entre les URLs (optionnel)
+        metrics: Metriques en direct de l'execution (optionnel)
+
+    Returns:
+        UrlResult de la derniere tentative, avec la consommation LLM de toutes les tentatives
+    """
+    lock = lock or asyncio.Lock()
+    # Tokens des tentatives echouees ou expirees : factures, donc comptes dans le cout
+    usage: list[UsageRecord] = []
+    if metrics is not None:
+        metrics.url_started()
+    for attempt in range(retry_count + 1):
+        result = await run_single_url(url, crew_class, log_dir, timeout, factory, metrics)
+        usage.extend(result.usage)
+        if metrics is not None:
+            metrics.attempt_finished(result)
+        await archive_result_log(result)
+        await record_trace(result, trace_path, lock)
+        if result.status == RunStatus.SUCCESS or attempt == retry_count:
+            break
+        await asyncio.sleep(2**attempt)  # Backoff exponentiel
+    result.usage = usage
+    if metrics is not None:
+        metrics.url_finished(result)
+    return result
+
+
 async def run_parallel(
     urls: list[str],
     crew_class: Any,
@@ -102,6 +268,8 @@ async def run_parallel(
     retry_count: int = 1,
     output_path: Path | None = None,
     on_result: Any = None,
+    trace_path: Path | None = None,
+    metrics: RunMetrics | None = None,
 ) -> list[UrlResult]:
     """
     Execute le crew pour plusieurs URLs en parallele.
@@ -116,39 +284,97 @@ async def run_parallel(
         output_path: Chemin du CSV pour sauvegarde incrementale (optionnel).
             Si fourni, chaque resultat est ecrit au CSV des qu'il est disponible.
         on_result: Callback optionnel appele avec chaque UrlResult des qu'il est pret.
+        trace_path: Fichier JSONL ou ecrire les spans de chaque tentative (optionnel).
+        metrics: Metriques en direct (URLs en cours, debit, latences), voir run_metrics (optionnel).
 
     Returns:
         Liste de UrlResult pour chaque URL
     """
     semaphore = asyncio.Semaphore(max_workers)
     csv_lock = asyncio.Lock()
+    # Crew construit une fois, copie par URL (copies faites dans la boucle, sans concurrence)
+    factory = crew_factory_for(crew_class)
 
-    async def run_with_retry(url: str) -> UrlResult:
+    async def process(url: str) -> UrlResult:
         async with semaphore:
-            last_result = None
-            for attempt in range(retry_count + 1):
-                result = await run_single_url(url, crew_class, log_dir, timeout)
-                if result.status == RunStatus.SUCCESS:
-                    break
-                last_result = result
-                if attempt < retry_count:
-                    await asyncio.sleep(2**attempt)  # Backoff exponentiel
-            else:
-                result = last_result
-
-            # Sauvegarde incrementale au CSV
-            if output_path is not None:
-                async with csv_lock:
-                    append_result_to_csv(result, output_path)
-
-            # Callback de notification
-            if on_result is not None:
-                on_result(result)
-
+            result = await run_with_retry(
+                url, crew_class, log_dir, timeout, retry_count, trace_path, csv_lock, factory, metrics
+            )
+            await _deliver(result, output_path, on_result, csv_lock)
             return result
 
-    tasks = [run_with_retry(url) for url in urls]
-    return await asyncio.gather(*tasks)
+    tasks = [process(url) for url in urls]
+    try:
+        return await asyncio.gather(*tasks)
+    finally:
+        await close_async_client()
+
+
+async def run_stream(
+    url_queue: asyncio.Queue,
+    crew_class: Any,
+    log_dir: Path,
+    max_workers: int = 3,
+    timeout: int = 600,
+    retry_count: int = 1,
+    output_path: Path | None = None,
+    on_result: Any = None,
+    trace_path: Path | None = None,
+    metrics: RunMetrics | None = None,
+) -> list[UrlResult]:
+    """
+    Execute le crew pour les URLs d'une file, au fil de leur arrivee.
+
+    `max_workers` workers consomment la file jusqu'a recevoir None (fin du flux) :
+    le traitement commence des la premiere URL publiee, sans attendre la liste
+    complete (ex: URLs decouvertes par le crew de recherche).
+
+    Args:
+        url_queue: File d'URLs, terminee par None
+        crew_class: Classe du crew a instancier
+        log_dir: Dossier pour les logs
+        max_workers: Nombre maximum d'executions simultanees
+        timeout: Timeout par URL en secondes
+        retry_count: Nombre de retry en cas d'echec
+        output_path: Chemin du CSV pour sauvegarde incrementale (optionnel)
+        on_result: Callback optionnel appele avec chaque UrlResult des qu'il est pret
+        trace_path: Fichier JSONL ou ecrire les spans de chaque tentative (optionnel)
+        metrics: Metriques en direct ; le total progresse avec les URLs recues (optionnel)
+
+    Returns:
+        Liste de UrlResult, dans l'ordre de fin de traitement
+    """
+    csv_lock = asyncio.Lock()
+    results: list[UrlResult] = []
+    factory = crew_factory_for(crew_class)
+
+    async def worker() -> None:
+        while True:
+            url = await url_queue.get()
+            if url is None:
+                # Fin du flux : la laisser aux autres workers
+                url_queue.put_nowait(None)
+                return
+            result = await run_with_retry(
+                url, crew_class, log_dir, timeout, retry_count, trace_path, csv_lock, factory, metrics
+            )
+            await _deliver(result, output_path, on_result, csv_lock)
+            results.append(result)
+
+    try:
+        await asyncio.gather(*(worker() for _ in range(max(1, max_workers))))
+    finally:
+        await close_async_client()
+    return results
+
+
+async def _deliver(result: UrlResult, output_path: Path | None, on_result: Any, lock: asyncio.Lock) -> None:
+    """Sauvegarde incrementale au CSV puis callback de notification."""
+    if output_path is not None:
+        async with lock:
+            append_result_to_csv(result, output_path)
+    if on_result is not None:
+        on_result(result)
 
 
 CSV_HEADER = (
@@ -332,6 +558,7 @@ async def run_sequential(
     timeout: int = 600,
     retry_count: int = 1,
     on_progress: Any = None,
+    metrics: RunMetrics | None = None,
 ) -> list[UrlResult]:
     """
     Exécute le crew pour chaque URL séquentiellement avec sauvegarde immédiate.
@@ -348,23 +575,25 @@ async def run_sequential(
         timeout: Timeout par URL en secondes
         retry_count: Nombre de retry en cas d'échec
         on_progress: Callback optionnel appelé après chaque URL (index, total, result)
+        metrics: Métriques en direct de l'exécution (optionnel)
 
     Returns:
         Liste de UrlResult pour chaque URL
     """
     results: list[UrlResult] = []
     total = len(urls)
+    factory = crew_factory_for(crew_class)
 
     # Créer le fichier de log TXT consolidé
     log_dir.mkdir(parents=True, exist_ok=True)
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     consolidated_log_path = log_dir / f"run_{timestamp}.txt"
+    trace_path = log_dir / f"run_{timestamp}_trace.jsonl"
+    cost_report_path = log_dir / f"run_{timestamp}_costs.json"
 
-    def write_log(message: str) -> None:
-        """Écrit dans le log consolidé et affiche à l'écran."""
-        with open(consolidated_log_path, "a", encoding="utf-8") as f:
-            f.write(message + "\n")
-        print(message)
+    # Écrit dans le log consolidé (thread dédié) et affiche à l'écran hors mode silencieux
+    run_log = RunLog(consolidated_log_path)
+    write_log = run_log.write
 
     # Header du log
     write_log("=" * 70)
@@ -384,12 +613,20 @@ async def run_sequential(
         write_log("-" * 50)
         start_time = datetime.now()
 
-        # Retry logic
+        # Retry logic (consommation LLM cumulee sur toutes les tentatives)
         last_result = None
+        usage: list[UsageRecord] = []
+        if metrics is not None:
+            metrics.url_started()
         for attempt in range(retry_count + 1):
             if attempt > 0:
                 write_log(f"  Tentative {attempt + 1}/{retry_count + 1}...")
-            result = await run_single_url(url, crew_class, log_dir, timeout)
+            result = await run_single_url(url, crew_class, log_dir, timeout, factory, metrics)
+            usage.extend(result.usage)
+            if metrics is not None:
+                metrics.attempt_finished(result)
+            await archive_result_log(result)
+            await record_trace(result, trace_path)
             if result.status == RunStatus.SUCCESS:
                 break
             last_result = result
@@ -400,7 +637,10 @@ async def run_sequential(
         else:
             result = last_result
 
+        result.usage = usage
         results.append(result)
+        if metrics is not None:
+            metrics.url_finished(result)
 
         # Sauvegarde immédiate au CSV
         append_result_to_csv(result, output_path)
@@ -426,12 +666,25 @@ async def run_sequential(
         else:
             write_log(f"  ❌ Erreur: {result.error}")
 
+        if result.spans:
+            write_log("  Temps par étape:")
+            for line in format_time_summary(result.spans, limit=5):
+                write_log(f"  {line}")
+
+        if result.usage:
+            write_log(f"  Tokens: {result.total_tokens:,} (coût estimé ${result.cost_usd:.4f})")
+
         write_log(f"  Heure fin: {end_time.strftime('%H:%M:%S')}")
+        run_log.summary(
+            f"[{index + 1}/{total}] {result.status.value.upper()} {url} ({result.duration_seconds:.1f}s)"
+        )
 
         # Callback de progression
         if on_progress:
             on_progress(index, total, result)
 
+    await close_async_client()
+
     # Résumé final
     success = sum(1 for r in results if r.status == RunStatus.SUCCESS)
     failed = sum(1 for r in results if r.status == RunStatus.FAILED)
@@ -444,9 +697,30 @@ async def run_sequential(
     write_log(f"  ✅ Succès: {success}")
     write_log(f"  ❌ Échecs: {failed}")
     write_log(f"  ⏱️ Timeouts: {timeouts}")
+    all_spans = [span for r in results for span in r.spans]
+    if all_spans:
+        write_log("\nRÉPARTITION DU TEMPS:")
+        for line in format_time_summary(all_spans):
+            write_log(line)
+    all_usage = [record for r in results for record in r.usage]
+    if all_usage:
+        write_log("\nCONSOMMATION LLM:")
+        for line in format_usage_summary(all_usage):
+            write_log(line)
+        write_cost_report(results, cost_report_path)
     write_log(f"\nFichier CSV: {output_path}")
     write_log(f"Fichier log: {consolidated_log_path}")
+    if trace_path.exists():
+        write_log(f"Fichier trace: {trace_path}")
+    if cost_report_path.exists():
+        write_log(f"Rapport de coûts: {cost_report_path}")
     write_log(f"Terminé le: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
     write_log("=" * 70)
+    run_log.close()
+
+    # Log consolidé terminé : compressé et indexé sous le nom de l'exécution
+    archived = archive_log(consolidated_log_path)
+    if archived and archived != consolidated_log_path:
+        print(f"[INFO] Log archive : {archived}")
 
     return results
\ No newline at end of file
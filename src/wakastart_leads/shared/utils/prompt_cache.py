@@ -0,0 +1,119 @@
+"""Cache de prompt cote fournisseur (Anthropic, Gemini, OpenAI) pour les LLMs des crews.
+
+Les backstories et descriptions de taches sont identiques d'une URL a l'autre :
+seules les donnees dynamiques ({url}, {urls}) changent, et elles sont placees en
+fin de prompt dans les fichiers YAML. Le prefixe statique peut donc etre servi
+depuis le cache du fournisseur :
+
+- Anthropic : point de cache explicite (`cache_control`) sur le system prompt
+  (role, goal, backstory, outils) et sur le dernier message, pour reutiliser
+  l'historique de la boucle ReAct d'une meme tache.
+- Gemini (2.5) et OpenAI : cache implicite par prefixe, aucun marquage requis.
+
+Dans tous les cas les tokens servis depuis le cache sont remontes dans
+`cached_prompt_tokens` (compteurs CrewAI, rapport de couts).
+"""
+
+from typing import Any
+
+from crewai.llms.providers.anthropic.completion import AnthropicCompletion
+from crewai.llms.providers.gemini.completion import GeminiCompletion
+from crewai.llms.providers.openai.completion import OpenAICompletion
+
+EPHEMERAL_CACHE = {"type": "ephemeral"}
+
+
+def enable_prompt_caching(llm: Any) -> Any:
+    """
+    Active le cache de prompt et le comptage des tokens en cache sur un LLM CrewAI.
+
+    Les LLMs non natifs (LiteLLM, mocks) sont retournes tels quels.
+
+    Args:
+        llm: Instance retournee par `crewai.LLM(...)`
+
+    Returns:
+        Le meme LLM, instrumente
+    """
+    if isinstance(llm, AnthropicCompletion):
+        _patch_anthropic(llm)
+    elif isinstance(llm, GeminiCompletion):
+        _patch_gemini(llm)
+    elif isinstance(llm, OpenAICompletion):
+        _patch_openai(llm)
+    return llm
+
+
+def _set_instance_attr(obj: Any, name: str, value: Any) -> None:
+    object.__setattr__(obj, name, value)
+
+
+def _with_cache_control(content: Any) -> list[dict[str, Any]]:
+    """Convertit un contenu (texte ou blocs) en blocs dont le dernier porte `cache_control`."""
+    if isinstance(content, str):
+        blocks: list[dict[str, Any]] = [{"type": "text", "text": content}]
+    else:
+        blocks = [dict(block) for block in content]
+    if blocks:
+        blocks[-1]["cache_control"] = EPHEMERAL_CACHE
+    return blocks
+
+
+def add_anthropic_cache_breakpoints(params: dict[str, Any]) -> dict[str, Any]:
+    """Ajoute les points de cache Anthropic sur le system prompt et le dernier message."""
+    if params.get("system"):
+        params["system"] = _with_cache_control(params["system"])
+    messages = params.get("messages") or []
+    if messages and messages[-1].get("content"):
+        messages[-1] = {**messages[-1], "content": _with_cache_control(messages[-1]["content"])}
+    return params
+
+
+def _patch_anthropic(llm: AnthropicCompletion) -> None:
+    prepare = llm._prepare_completion_params
+    extract = llm._extract_anthropic_token_usage
+
+    def _prepare_completion_params(*args: Any, **kwargs: Any) -> dict[str, Any]:
+        return add_anthropic_cache_breakpoints(prepare(*args, **kwargs))
+
+    def _extract_anthropic_token_usage(response: Any) -> dict[str, Any]:
+        usage = extract(response)
+        raw = getattr(response, "usage", None)
+        cache_read = getattr(raw, "cache_read_input_tokens", 0) or 0
+        cache_write = getattr(raw, "cache_creation_input_tokens", 0) or 0
+        if raw is not None:
+            # `input_tokens` n'inclut pas les tokens lus ou ecrits dans le cache
+            prompt_tokens = (usage.get("input_tokens") or 0) + cache_read + cache_write
+            usage.update(
+                input_tokens=prompt_tokens,
+                cached_prompt_tokens=cache_read,
+                total_tokens=prompt_tokens + (usage.get("output_tokens") or 0),
+            )
+        return usage
+
+    _set_instance_attr(llm, "_prepare_completion_params", _prepare_completion_params)
+    _set_instance_attr(llm, "_extract_anthropic_token_usage", _extract_anthropic_token_usage)
+
+
+def _patch_gemini(llm: GeminiCompletion) -> None:
+    extract = llm._extract_token_usage
+
+    def _extract_token_usage(response: Any) -> dict[str, Any]:
+        usage = extract(response)
+        metadata = getattr(response, "usage_metadata", None)
+        usage["cached_prompt_tokens"] = getattr(metadata, "cached_content_token_count", 0) or 0
+        return usage
+
+    _set_instance_attr(llm, "_extract_token_usage", _extract_token_usage)
+
+
+def _patch_openai(llm: OpenAICompletion) -> None:
+    extract = llm._extract_openai_token_usage
+
+    def _extract_openai_token_usage(response: Any) -> dict[str, Any]:
+        usage = extract(response)
+        details = getattr(getattr(response, "usage", None), "prompt_tokens_details", None)
+        usage["cached_prompt_tokens"] = getattr(details, "cached_tokens", 0) or 0
+        return usage
+
+    _set_instance_attr(llm, "_extract_openai_token_usage", _extract_openai_token_usage)
@@ -0,0 +1,434 @@
+"""Metriques en direct d'une execution : endpoint Prometheus et vue de progression.
+
+Pendant une longue execution (`run --parallel`, `pipeline`), le runner tient a
+jour des compteurs (URLs en cours, terminees par statut, tentatives, tokens) et
+des histogrammes (duree par URL, latence par fournisseur LLM / outil) :
+
+- endpoint HTTP local au format texte Prometheus (RUNNER_METRICS_PORT / --metrics-port) ;
+- ligne de progression compacte sur stderr (RUNNER_PROGRESS / --progress) :
+  debit, ETA, taux d'erreur, latence LLM et appel en cours le plus ancien
+  (fournisseur bloque).
+
+Configuration :
+    RUNNER_METRICS_PORT=9464            # http://127.0.0.1:9464/metrics (0 : desactive)
+    RUNNER_PROGRESS=1                   # vue de progression
+"""
+
+import contextlib
+import os
+import sys
+import threading
+import time
+from collections import deque
+from collections.abc import Callable, Iterator
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, TextIO
+
+METRICS_HOST = "127.0.0.1"
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Types de spans mesures comme fournisseurs (les taches regroupent plusieurs appels)
+PROVIDER_KINDS = ("llm", "tool")
+
+LATENCY_BUCKETS = (0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0)
+URL_DURATION_BUCKETS = (10.0, 30.0, 60.0, 120.0, 300.0, 600.0, 900.0, 1800.0)
+
+# Fenetre glissante du debit (URLs terminees) pour l'ETA ; au moins une minute
+# en debut d'execution (pas de debit extrapole depuis la premiere URL)
+THROUGHPUT_WINDOW_SECONDS = 600.0
+MIN_THROUGHPUT_WINDOW_SECONDS = 60.0
+
+
+def get_metrics_port() -> int:
+    """Port de l'endpoint de metriques (RUNNER_METRICS_PORT ; 0 ou absent : desactive)."""
+    try:
+        return int(os.environ.get("RUNNER_METRICS_PORT", "0") or 0)
+    except ValueError:
+        return 0
+
+
+def is_progress_enabled() -> bool:
+    """True si la vue de progression est activee (RUNNER_PROGRESS)."""
+    return os.environ.get("RUNNER_PROGRESS", "").strip().lower() in ("1", "true", "yes", "on")
+
+
+class Histogram:
+    """Histogramme a seaux fixes (cumules a l'export, comme Prometheus)."""
+
+    def __init__(self, buckets: tuple[float, ...]) -> None:
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+        self.count += 1
+        self.sum += value
+
+    def cumulative(self) -> list[tuple[str, int]]:
+        """[(le, nombre cumule)], seau "+Inf" compris."""
+        rows, total = [], 0
+        for bound, count in zip(self.buckets, self.counts, strict=True):
+            total += count
+            rows.append((_format_value(bound), total))
+        rows.append(("+Inf", self.count))
+        return rows
+
+
+class RunMetrics:
+    """
+    Compteurs et histogrammes d'une execution, mis a jour par le runner.
+
+    Les spans des fournisseurs arrivent des threads des crews (`Tracer(observer=...)`),
+    l'export et la vue de progression sont lus depuis d'autres threads : tout passe
+    par un verrou.
+    """
+
+    def __init__(self, total: int | None = None, workers: int = 1, clock: Callable[[], float] = time.time) -> None:
+        self.total = total
+        self.workers = workers
+        self._clock = clock
+        self._lock = threading.Lock()
+        self.started_at = clock()
+        self.in_flight = 0
+        self.completed: dict[str, int] = {}
+        self.attempts: dict[str, int] = {}
+        self.tokens = 0
+        self.cost_usd = 0.0
+        self.url_duration = Histogram(URL_DURATION_BUCKETS)
+        self._finished_at: deque[float] = deque()
+        # Par fournisseur (kind, name)
+        self.provider_latency: dict[tuple[str, str], Histogram] = {}
+        self.provider_errors: dict[tuple[str, str], int] = {}
+        self._provider_calls: dict[str, tuple[str, str, float]] = {}
+
+    # --- Evenements du runner -------------------------------------------------
+
+    def add_planned(self, count: int = 1) -> None:
+        """URLs ajoutees en cours d'execution (flux du pipeline)."""
+        with self._lock:
+            self.total = (self.total or 0) + count
+
+    def url_started(self) -> None:
+        with self._lock:
+            self.in_flight += 1
+
+    def attempt_finished(self, result: Any) -> None:
+        """Une tentative terminee (retries compris)."""
+        status = result.status.value
+        with self._lock:
+            self.attempts[status] = self.attempts.get(status, 0) + 1
+
+    def url_finished(self, result: Any) -> None:
+        """Resultat final d'une URL (apres ses retries)."""
+        status = result.status.value
+        with self._lock:
+            self.in_flight = max(0, self.in_flight - 1)
+            self.completed[status] = self.completed.get(status, 0) + 1
+            self.url_duration.observe(result.duration_seconds)
+            self.tokens += result.total_tokens
+            self.cost_usd += result.cost_usd
+            self._finished_at.append(self._clock())
+
+    # --- Observateur du Tracer ------------------------------------------------
+
+    def span_started(self, span: Any) -> None:
+        if span.kind in PROVIDER_KINDS:
+            with self._lock:
+                self._provider_calls[span.span_id] = (span.kind, span.name, span.start)
+
+    def span_finished(self, span: Any) -> None:
+        if span.kind not in PROVIDER_KINDS:
+            return
+        key = (span.kind, span.name)
+        with self._lock:
+            self._provider_calls.pop(span.span_id, None)
+            self.provider_latency.setdefault(key, Histogram(LATENCY_BUCKETS)).observe(span.duration_seconds)
+            if span.status == "error":
+                self.provider_errors[key] = self.provider_errors.get(key, 0) + 1
+
+    # --- Lecture --------------------------------------------------------------
+
+    def snapshot(self) -> dict[str, Any]:
+        """Etat courant : avancement, debit (URLs/min), ETA, taux d'erreur, latences."""
+        with self._lock:
+            now = self._clock()
+            elapsed = max(now - self.started_at, 1e-9)
+            done = sum(self.completed.values())
+            errors = done - self.completed.get("success", 0)
+
+            while self._finished_at and now - self._finished_at[0] > THROUGHPUT_WINDOW_SECONDS:
+                self._finished_at.popleft()
+            window = max(min(elapsed, THROUGHPUT_WINDOW_SECONDS), MIN_THROUGHPUT_WINDOW_SECONDS)
+            throughput = len(self._finished_at) / window * 60
+
+            remaining = max((self.total or 0) - done, 0) if self.total is not None else None
+            eta = remaining / throughput * 60 if remaining is not None and throughput > 0 else None
+
+            llm = [h for (kind, _), h in self.provider_latency.items() if kind == "llm"]
+            llm_calls = sum(h.count for h in llm)
+            oldest = min(self._provider_calls.values(), key=lambda call: call[2], default=None)
+
+            return {
+                "total": self.total,
+                "done": done,
+                "in_flight": self.in_flight,
+                "workers": self.workers,
+                "completed": dict(self.completed),
+                "elapsed_seconds": elapsed,
+                "throughput_per_minute": throughput,
+                "eta_seconds": eta,
+                "error_rate": errors / done if done else 0.0,
+                "llm_mean_seconds": sum(h.sum for h in llm) / llm_calls if llm_calls else None,
+                "oldest_call": (oldest[1], now - oldest[2]) if oldest else None,
+                "tokens": self.tokens,
+                "cost_usd": self.cost_usd,
+            }
+
+    def render_prometheus(self) -> str:
+        """Metriques au format texte Prometheus (exposition 0.0.4)."""
+        snapshot = self.snapshot()
+        lines: list[str] = []
+
+        def metric(name: str, kind: str, help_text: str, samples: list[tuple[dict[str, str], float]]) -> None:
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            for labels, value in samples:
+                lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+
+        with self._lock:
+            now = self._clock()
+            completed = dict(self.completed)
+            attempts = dict(self.attempts)
+            url_duration = self.url_duration
+            provider_latency = dict(self.provider_latency)
+            provider_errors = dict(self.provider_errors)
+            in_flight_calls: dict[tuple[str, str], list[float]] = {}
+            for kind, name, start in self._provider_calls.values():
+                in_flight_calls.setdefault((kind, name), []).append(now - start)
+
+            metric("wakastart_urls_planned", "gauge", "URLs a traiter", [({}, snapshot["total"] or 0)])
+            metric("wakastart_urls_in_flight", "gauge", "URLs en cours de traitement", [({}, self.in_flight)])
+            metric("wakastart_workers", "gauge", "Workers d'analyse", [({}, self.workers)])
+            metric(
+                "wakastart_urls_completed_total",
+                "counter",
+                "URLs terminees par statut final",
+                [({"status": status}, count) for status, count in sorted(completed.items())],
+            )
+            metric(
+                "wakastart_attempts_total",
+                "counter",
+                "Tentatives terminees par statut (retries compris)",
+                [({"status": status}, count) for status, count in sorted(attempts.items())],
+            )
+            metric("wakastart_tokens_total", "counter", "Tokens LLM consommes", [({}, self.tokens)])
+            metric("wakastart_cost_usd_total", "counter", "Cout LLM estime (USD)", [({}, self.cost_usd)])
+            lines.extend(_render_histogram("wakastart_url_duration_seconds", "Duree par URL", [({}, url_duration)]))
+            lines.extend(
+                _render_histogram(
+                    "wakastart_provider_latency_seconds",
+                    "Latence des appels LLM et outils",
+                    [({"kind": k, "name": n}, hist) for (k, n), hist in sorted(provider_latency.items())],
+                )
+            )
+            metric(
+                "wakastart_provider_errors_total",
+                "counter",
+                "Appels LLM et outils en erreur",
+                [({"kind": k, "name": n}, count) for (k, n), count in sorted(provider_errors.items())],
+            )
+            metric(
+                "wakastart_provider_calls_in_flight",
+                "gauge",
+                "Appels LLM et outils en cours",
+                [({"kind": k, "name": n}, len(ages)) for (k, n), ages in sorted(in_flight_calls.items())],
+            )
+            metric(
+                "wakastart_provider_oldest_call_seconds",
+                "gauge",
+                "Age de l'appel en cours le plus ancien (fournisseur bloque)",
+                [({"kind": k, "name": n}, max(ages)) for (k, n), ages in sorted(in_flight_calls.items())],
+            )
+
+        metric(
+            "wakastart_throughput_urls_per_minute",
+            "gauge",
+            "Debit sur les 10 dernieres minutes",
+            [({}, snapshot["throughput_per_minute"])],
+        )
+        if snapshot["eta_seconds"] is not None:
+            metric("wakastart_eta_seconds", "gauge", "Temps restant estime", [({}, snapshot["eta_seconds"])])
+        metric("wakastart_error_ratio", "gauge", "Part des URLs en echec ou timeout", [({}, snapshot["error_rate"])])
+        metric("wakastart_elapsed_seconds", "gauge", "Duree de l'execution", [({}, snapshot["elapsed_seconds"])])
+        return "\n".join(lines) + "\n"
+
+
+def _render_histogram(name: str, help_text: str, histograms: list[tuple[dict[str, str], Histogram]]) -> list[str]:
+    lines = [f"# HELP {name} {help_text}", f"# TYPE {name} histogram"]
+    for labels, hist in histograms:
+        for le, count in hist.cumulative():
+            lines.append(f"{name}_bucket{_format_labels({**labels, 'le': le})} {count}")
+        lines.append(f"{name}_sum{_format_labels(labels)} {_format_value(hist.sum)}")
+        lines.append(f"{name}_count{_format_labels(labels)} {hist.count}")
+    return lines
+
+
+def _format_labels(labels: dict[str, str]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape_label(value)}"' for key, value in labels.items()) + "}"
+
+
+def _escape_label(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_value(value: float) -> str:
+    if isinstance(value, int) or float(value).is_integer():
+        return str(int(value))
+    return f"{value:.6g}"
+
+
+class MetricsServer:
+    """Endpoint HTTP local (thread dedie) servant `GET /metrics`."""
+
+    def __init__(self, metrics: RunMetrics, port: int, host: str = METRICS_HOST) -> None:
+        self.metrics = metrics
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:
+                if self.path.split("?")[0] != "/metrics":
+                    self.send_error(404)
+                    return
+                body = metrics.render_prometheus().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", CONTENT_TYPE)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format: str, *args: Any) -> None:
+                pass  # pas de ligne par requete (scrape toutes les 15 s)
+
+        self._server = ThreadingHTTPServer((host, port), Handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, name="metrics-server", daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/metrics"
+
+    def start(self) -> "MetricsServer":
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+
+def format_duration(seconds: float) -> str:
+    """Duree compacte : 45s, 12m05s, 2h14m."""
+    seconds = int(seconds)
+    if seconds < 60:
+        return f"{seconds}s"
+    if seconds < 3600:
+        return f"{seconds // 60}m{seconds % 60:02d}s"
+    return f"{seconds // 3600}h{seconds % 3600 // 60:02d}m"
+
+
+def format_progress(snapshot: dict[str, Any]) -> str:
+    """Ligne de progression : avancement, debit, ETA, erreurs, latence LLM, appel le plus ancien."""
+    total = snapshot["total"]
+    parts = [
+        f"en cours {snapshot['in_flight']}/{snapshot['workers']}",
+        f"{snapshot['throughput_per_minute']:.1f} URL/min",
+        f"ETA {format_duration(snapshot['eta_seconds']) if snapshot['eta_seconds'] is not None else '?'}",
+        f"erreurs {snapshot['error_rate']:.0%}",
+    ]
+    if snapshot["llm_mean_seconds"] is not None:
+        parts.append(f"LLM {snapshot['llm_mean_seconds']:.1f}s moy.")
+    if snapshot["oldest_call"] is not None:
+        name, age = snapshot["oldest_call"]
+        parts.append(f"plus ancien: {name} {format_duration(age)}")
+    return f"[{snapshot['done']}/{total if total is not None else '?'}] " + " | ".join(parts)
+
+
+class ProgressView:
+    """
+    Ligne de progression rafraichie par un thread dedie.
+
+    Sur un terminal, la ligne est reecrite en place ; sinon (redirection),
+    une ligne est ajoutee a chaque rafraichissement.
+    """
+
+    def __init__(self, metrics: RunMetrics, stream: TextIO | None = None, interval: float = 2.0) -> None:
+        self.metrics = metrics
+        self.stream = stream
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._loop, name="progress-view", daemon=True)
+
+    def render(self) -> None:
+        stream = self.stream or sys.stderr
+        line = format_progress(self.metrics.snapshot())
+        if stream.isatty():
+            stream.write(f"\r\x1b[K{line}")
+        else:
+            stream.write(line + "\n")
+        stream.flush()
+
+    def _loop(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.render()
+
+    def start(self) -> "ProgressView":
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+        self.render()  # etat final
+        stream = self.stream or sys.stderr
+        if stream.isatty():
+            stream.write("\n")
+
+
+@contextlib.contextmanager
+def live_metrics(total: int | None = None, workers: int = 1) -> Iterator[RunMetrics | None]:
+    """
+    Metriques d'une execution, exposees selon RUNNER_METRICS_PORT et RUNNER_PROGRESS.
+
+    Yields:
+        RunMetrics a passer au runner, None si ni l'endpoint ni la vue ne sont actives
+    """
+    port = get_metrics_port()
+    progress = is_progress_enabled()
+    if not port and not progress:
+        yield None
+        return
+
+    metrics = RunMetrics(total=total, workers=workers)
+    server = view = None
+    try:
+        if port:
+            try:
+                server = MetricsServer(metrics, port).start()
+                print(f"[INFO] Metriques Prometheus: {server.url}")
+            except OSError as e:
+                print(f"[WARNING] Endpoint de metriques indisponible (port {port}): {e}")
+        if progress:
+            view = ProgressView(metrics).start()
+        yield metrics
+    finally:
+        if view is not None:
+            view.stop()
+        if server is not None:
+            server.stop()
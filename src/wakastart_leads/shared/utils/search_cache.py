@@ -0,0 +1,166 @@
+"""Cache des recherches Serper, partage entre agents et entre executions.
+
+Plusieurs agents lancent les memes requetes ("<societe> SIREN", "<societe> levee
+de fonds"). Les resultats bruts de l'API sont conserves, cles par requete
+normalisee et parametres de recherche, pendant une duree limitee. Les requetes
+identiques lancees en meme temps (mode parallele) ne partent qu'une fois. En
+memoire, les recherches les moins recemment utilisees sont evincees au-dela du
+nombre maximal d'entrees (la copie SQLite reste disponible).
+
+Configuration :
+    SEARCH_CACHE_TTL_HOURS=24     # duree de validite des resultats
+    SEARCH_CACHE_MAX_ENTRIES=2000 # entrees max en memoire, eviction LRU au-dela
+    SEARCH_CACHE_PERSIST=0        # cache memoire uniquement (defaut: SQLite)
+    SEARCH_CACHE_PATH=...         # defaut: src/wakastart_leads/.cache/serper.sqlite3
+"""
+
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import Counter, OrderedDict
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any
+
+from .constants import SEARCH_CACHE_PATH
+
+DEFAULT_TTL_HOURS = 24.0
+DEFAULT_MAX_ENTRIES = 2000
+
+
+def normalize_query(query: str) -> str:
+    """Normalise une requete (casse, accents, espaces, guillemets et ponctuation finale)."""
+    text = unicodedata.normalize("NFKD", query)
+    text = "".join(c for c in text if not unicodedata.combining(c)).casefold()
+    return re.sub(r"\s+", " ", text).strip(" \"'?!.")
+
+
+class SearchCache:
+    """Cache memoire (et SQLite par defaut) des reponses brutes Serper."""
+
+    def __init__(
+        self,
+        path: Path | None = None,
+        ttl_seconds: float = DEFAULT_TTL_HOURS * 3600,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+    ) -> None:
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.stats: Counter[str] = Counter()
+        self._entries: OrderedDict[str, tuple[float, dict[str, Any]]] = OrderedDict()
+        self._lock = threading.Lock()
+        # Verrou par requete en vol et nombre de threads qui l'utilisent (retire a zero)
+        self._inflight: dict[str, tuple[threading.Lock, int]] = {}
+        self._conn: sqlite3.Connection | None = None
+        if path is not None:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(str(path), check_same_thread=False)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS searches (key TEXT PRIMARY KEY, query TEXT, results TEXT, created_at REAL)"
+            )
+            self._conn.commit()
+
+    @staticmethod
+    def make_key(query: str, **params: Any) -> str:
+        """Empreinte de la requete normalisee et des parametres (type, pays, langue, nombre...)."""
+        payload = json.dumps({"q": normalize_query(query), **params}, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> dict[str, Any] | None:
+        """Retourne les resultats non expires ou None."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            elif self._conn is not None:
+                row = self._conn.execute("SELECT created_at, results FROM searches WHERE key = ?", (key,)).fetchone()
+                if row is not None:
+                    entry = (row[0], json.loads(row[1]))
+                    self._remember(key, entry)
+            if entry is None or time.time() - entry[0] >= self.ttl_seconds:
+                return None
+            return entry[1]
+
+    def put(self, key: str, query: str, results: dict[str, Any]) -> None:
+        now = time.time()
+        with self._lock:
+            self._remember(key, (now, results))
+            if self._conn is not None:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO searches VALUES (?, ?, ?, ?)",
+                    (key, query, json.dumps(results, ensure_ascii=False), now),
+                )
+                self._conn.commit()
+
+    def _remember(self, key: str, entry: tuple[float, dict[str, Any]]) -> None:
+        """Place l'entree en tete du LRU memoire et evince les plus anciennes au-dela de max_entries."""
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > max(self.max_entries, 1):
+            self._entries.popitem(last=False)
+
+    @contextmanager
+    def lock_for(self, key: str) -> Iterator[None]:
+        """Verrou propre a une requete : une seule requete identique en vol a la fois."""
+        with self._lock:
+            lock, users = self._inflight.get(key, (threading.Lock(), 0))
+            self._inflight[key] = (lock, users + 1)
+        try:
+            with lock:
+                yield
+        finally:
+            with self._lock:
+                lock, users = self._inflight[key]
+                if users > 1:
+                    self._inflight[key] = (lock, users - 1)
+                else:
+                    del self._inflight[key]
+
+    def record(self, outcome: str) -> None:
+        """Comptabilise un appel : "hit" (economise) ou "fetched"."""
+        with self._lock:
+            self.stats[outcome] += 1
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.stats.clear()
+            if self._conn is not None:
+                self._conn.execute("DELETE FROM searches")
+                self._conn.commit()
+
+
+_shared_cache: SearchCache | None = None
+_shared_lock = threading.Lock()
+
+
+def get_search_cache() -> SearchCache:
+    """Cache de recherche partage du processus (configure par SEARCH_CACHE_*)."""
+    global _shared_cache
+    with _shared_lock:
+        if _shared_cache is None:
+            persist = os.environ.get("SEARCH_CACHE_PERSIST", "1").strip().lower() not in ("0", "false", "no", "off")
+            path = Path(os.environ.get("SEARCH_CACHE_PATH") or SEARCH_CACHE_PATH) if persist else None
+            ttl_hours = float(os.environ.get("SEARCH_CACHE_TTL_HOURS", str(DEFAULT_TTL_HOURS)))
+            max_entries = int(os.environ.get("SEARCH_CACHE_MAX_ENTRIES", str(DEFAULT_MAX_ENTRIES)))
+            _shared_cache = SearchCache(path, ttl_seconds=ttl_hours * 3600, max_entries=max_entries)
+        return _shared_cache
+
+
+def format_search_cache_stats(cache: SearchCache) -> str | None:
+    """Ligne de log : appels Serper economises (None si inutilise)."""
+    total = cache.stats["hit"] + cache.stats["fetched"]
+    if not total:
+        return None
+    return f"[INFO] Cache Serper: {cache.stats['hit']} appel(s) economise(s) sur {total} recherche(s)"
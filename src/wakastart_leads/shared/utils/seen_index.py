@@ -0,0 +1,201 @@
+"""Index persistant des domaines deja connus, partage par search, run et enrich.
+
+Chaque commande avait sa propre notion des URLs traitees (company_report.csv,
+enrichment_accumulated.json) : la recherche redecouvrait des entreprises deja
+analysees et les executions les re-analysaient. Cet index les reunit.
+
+Un index par commande (espace de noms) : `run` et `pipeline` ignorent les
+domaines deja analyses, `enrich` ceux deja enrichis (un domaine analyse reste a
+enrichir, et inversement). `search` exclut les domaines des deux espaces.
+
+Stockage : ensemble de hachages 64 bits (blake2b du domaine normalise), trie, 8
+octets par domaine sur disque. En memoire, un filtre de Bloom repond sans
+recherche dichotomique aux domaines inconnus (cas le plus frequent).
+
+Configuration :
+    SEEN_INDEX_ENABLED=0      # desactive l'index (aucun domaine ignore)
+    SEEN_INDEX_PATH=...       # defaut: src/wakastart_leads/.cache/seen_domains.bin
+                              # (un fichier par espace : seen_domains_analysis.bin, ...)
+"""
+
+import hashlib
+import math
+import os
+import sys
+import threading
+from array import array
+from bisect import bisect_left
+from collections import Counter
+from collections.abc import Iterable
+from pathlib import Path
+
+from .constants import SEEN_INDEX_PATH
+from .url_utils import normalize_url
+
+BLOOM_ERROR_RATE = 0.01
+BLOOM_MIN_CAPACITY = 10_000
+
+# Espaces de noms : commande ayant traite le domaine
+ANALYSIS_SEEN = "analysis"
+ENRICHMENT_SEEN = "enrichment"
+SEEN_NAMESPACES = (ANALYSIS_SEEN, ENRICHMENT_SEEN)
+
+
+def domain_key(url: str) -> str:
+    """Domaine normalise d'une URL ("https://www.Acme.fr/produit" -> "acme.fr")."""
+    return normalize_url(url).split("/")[0]
+
+
+def domain_hash(url: str) -> int:
+    """Hachage 64 bits du domaine normalise."""
+    digest = hashlib.blake2b(domain_key(url).encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "big")
+
+
+class BloomFilter:
+    """Filtre de Bloom sur des hachages 64 bits (double hachage des deux moities)."""
+
+    def __init__(self, capacity: int, error_rate: float = BLOOM_ERROR_RATE) -> None:
+        self.capacity = max(1, capacity)
+        self.size = max(64, math.ceil(-self.capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hash_count = max(1, round(self.size / self.capacity * math.log(2)))
+        self.count = 0
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, value: int) -> Iterable[int]:
+        low, high = value & 0xFFFFFFFF, value >> 32
+        return ((low + i * high) % self.size for i in range(self.hash_count))
+
+    def add(self, value: int) -> None:
+        for position in self._positions(value):
+            self._bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, value: int) -> bool:
+        return all(self._bits[position >> 3] & (1 << (position & 7)) for position in self._positions(value))
+
+
+def _read_hashes(path: Path | None) -> array:
+    """Hachages tries du fichier (uint64 big-endian)."""
+    hashes = array("Q")
+    if path is not None and path.exists():
+        hashes.frombytes(path.read_bytes())
+        if sys.byteorder == "little":
+            hashes.byteswap()
+    return hashes
+
+
+class SeenDomainIndex:
+    """Ensemble persistant des domaines deja traites, avec filtre de Bloom en memoire."""
+
+    def __init__(self, path: Path | None = None) -> None:
+        self.path = path
+        self.stats: Counter[str] = Counter()
+        self._lock = threading.Lock()
+        self._hashes = _read_hashes(path)
+        self._added: set[int] = set()
+        self._rebuild_bloom()
+
+    def _rebuild_bloom(self) -> None:
+        total = len(self._hashes) + len(self._added)
+        self._bloom = BloomFilter(max(BLOOM_MIN_CAPACITY, 2 * total))
+        for value in self._hashes:
+            self._bloom.add(value)
+        for value in self._added:
+            self._bloom.add(value)
+
+    def _known(self, value: int) -> bool:
+        if value not in self._bloom:
+            return False
+        i = bisect_left(self._hashes, value)
+        return value in self._added or (i < len(self._hashes) and self._hashes[i] == value)
+
+    def __contains__(self, url: str) -> bool:
+        value = domain_hash(url)
+        with self._lock:
+            if value not in self._bloom:
+                # Reponse du filtre de Bloom seul, sans recherche dans l'ensemble
+                self.stats["bloom"] += 1
+                return False
+            found = self._known(value)
+            self.stats["hit" if found else "miss"] += 1
+            return found
+
+    def add_many(self, urls: Iterable[str]) -> int:
+        """Ajoute des domaines (en memoire jusqu'a `flush`) ; retourne le nombre de domaines nouveaux."""
+        added = 0
+        with self._lock:
+            for url in urls:
+                if not domain_key(url):
+                    continue
+                value = domain_hash(url)
+                if self._known(value):
+                    continue
+                self._added.add(value)
+                self._bloom.add(value)
+                added += 1
+            if self._bloom.count > self._bloom.capacity:
+                self._rebuild_bloom()
+        return added
+
+    def add(self, url: str) -> bool:
+        """Ajoute un domaine ; True s'il etait inconnu."""
+        return self.add_many([url]) == 1
+
+    def flush(self) -> None:
+        """
+        Ecrit les domaines ajoutes sur disque.
+
+        Le fichier est relu avant la fusion (ajouts d'un autre processus conserves),
+        ecrit dans un fichier temporaire puis renomme.
+        """
+        with self._lock:
+            if self.path is None or not self._added:
+                return
+            merged = array("Q", sorted(set(_read_hashes(self.path)) | set(self._hashes) | self._added))
+            self._hashes = merged
+            self._added.clear()
+            # Hachages d'un autre processus fusionnes : le filtre doit les contenir aussi
+            self._rebuild_bloom()
+            data = array("Q", merged)
+            if sys.byteorder == "little":
+                data.byteswap()
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_name(self.path.name + ".tmp")
+            tmp_path.write_bytes(data.tobytes())
+            tmp_path.replace(self.path)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._hashes) + len(self._added)
+
+
+def seen_index_path(namespace: str) -> Path:
+    """Fichier de l'espace `namespace` ("seen_domains.bin" -> "seen_domains_analysis.bin")."""
+    base = Path(os.environ.get("SEEN_INDEX_PATH") or SEEN_INDEX_PATH)
+    return base.with_name(f"{base.stem}_{namespace}{base.suffix}")
+
+
+_shared_indexes: dict[str, SeenDomainIndex] = {}
+_shared_lock = threading.Lock()
+
+
+def get_seen_index(namespace: str = ANALYSIS_SEEN) -> SeenDomainIndex | None:
+    """Index des domaines vus par une commande (configure par SEEN_INDEX_*), None si desactive."""
+    if os.environ.get("SEEN_INDEX_ENABLED", "1").strip().lower() in ("0", "false", "no", "off"):
+        return None
+    with _shared_lock:
+        if namespace not in _shared_indexes:
+            _shared_indexes[namespace] = SeenDomainIndex(seen_index_path(namespace))
+        return _shared_indexes[namespace]
+
+
+def format_seen_index_stats(index: SeenDomainIndex | None, namespace: str = ANALYSIS_SEEN) -> str | None:
+    """Ligne de log : domaines deja connus parmi les URLs consultees (None si inutilise)."""
+    if index is None or not index.stats:
+        return None
+    total = index.stats["bloom"] + index.stats["hit"] + index.stats["miss"]
+    return (
+        f"[INFO] Domaines deja vus ({namespace}): {index.stats['hit']} sur {total} consultation(s) "
+        f"({len(index)} domaine(s) connu(s))"
+    )
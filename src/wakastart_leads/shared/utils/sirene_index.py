@@ -0,0 +1,233 @@
+"""Index Sirene local construit depuis le fichier stock de l'INSEE (StockUniteLegale).
+
+L'API Sirene est interrogee pour chaque SIREN et chaque recherche par nom
+(timeout 30 s, quotas). Le fichier stock public des unites legales est ingere une
+fois dans une base SQLite compacte (`wakastart sirene-index <fichier>`) ; l'outil
+SireneSearchTool y repond localement et n'appelle l'API que pour les absents.
+
+Sources acceptees : CSV (eventuellement dans un .zip, comme publie par l'INSEE)
+et Parquet (necessite pyarrow).
+
+Configuration :
+    SIRENE_INDEX_ENABLED=0    # ignore l'index local (defaut: utilise s'il existe)
+    SIRENE_INDEX_PATH=...     # defaut: src/wakastart_leads/.cache/sirene_index.sqlite3
+"""
+
+import csv
+import io
+import os
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+import zipfile
+from collections import Counter
+from collections.abc import Iterator
+from pathlib import Path
+
+from .constants import SIRENE_INDEX_PATH
+
+# Colonnes du stock conservees dans l'index (ordre de la table `unites`)
+STOCK_COLUMNS = (
+    "siren",
+    "denominationUniteLegale",
+    "denominationUsuelle1UniteLegale",
+    "sigleUniteLegale",
+    "nomUniteLegale",
+    "prenomUsuelUniteLegale",
+    "categorieJuridiqueUniteLegale",
+    "activitePrincipaleUniteLegale",
+    "etatAdministratifUniteLegale",
+    "dateCreationUniteLegale",
+    "trancheEffectifsUniteLegale",
+    "categorieEntreprise",
+)
+# Champs de la periode courante dans le JSON de l'API
+_PERIODE_FIELDS = {
+    "denominationUniteLegale",
+    "denominationUsuelle1UniteLegale",
+    "nomUniteLegale",
+    "categorieJuridiqueUniteLegale",
+    "activitePrincipaleUniteLegale",
+    "etatAdministratifUniteLegale",
+}
+BATCH_SIZE = 50_000
+
+
+def normalize_name(name: str) -> str:
+    """Nom normalise pour la recherche (sans accents ni ponctuation, minuscules)."""
+    text = unicodedata.normalize("NFKD", name or "")
+    text = "".join(c for c in text if not unicodedata.combining(c)).casefold()
+    return re.sub(r"[^a-z0-9]+", " ", text).strip()
+
+
+def _display_name(row: dict[str, str]) -> str:
+    name = row.get("denominationUniteLegale") or ""
+    if not name and row.get("nomUniteLegale"):
+        name = f"{row.get('prenomUsuelUniteLegale') or ''} {row['nomUniteLegale']}"
+    return name.strip()
+
+
+def iter_stock_rows(source: Path) -> Iterator[dict[str, str]]:
+    """Lignes du fichier stock (CSV, CSV zippe ou Parquet), colonnes utiles uniquement."""
+    suffix = source.suffix.lower()
+    if suffix == ".parquet":
+        try:
+            import pyarrow.parquet as pq
+        except ImportError as e:
+            raise RuntimeError("Lecture Parquet : installer pyarrow (pip install pyarrow)") from e
+        parquet = pq.ParquetFile(source)
+        columns = [c for c in STOCK_COLUMNS if c in parquet.schema_arrow.names]
+        for batch in parquet.iter_batches(columns=columns, batch_size=BATCH_SIZE):
+            for row in batch.to_pylist():
+                yield {key: "" if value is None else str(value) for key, value in row.items()}
+        return
+
+    if suffix == ".zip":
+        with zipfile.ZipFile(source) as archive:
+            name = next(n for n in archive.namelist() if n.lower().endswith(".csv"))
+            with archive.open(name) as raw:
+                yield from _iter_csv(io.TextIOWrapper(raw, encoding="utf-8", newline=""))
+        return
+
+    with open(source, encoding="utf-8", newline="") as f:
+        yield from _iter_csv(f)
+
+
+def _iter_csv(f: io.TextIOBase) -> Iterator[dict[str, str]]:
+    for row in csv.DictReader(f):
+        yield {key: row.get(key) or "" for key in STOCK_COLUMNS}
+
+
+def build_sirene_index(source: Path, output: Path, active_only: bool = False) -> int:
+    """
+    Construit l'index SQLite depuis un fichier stock StockUniteLegale.
+
+    La base est ecrite dans un fichier temporaire puis renommee : un index
+    existant reste utilisable pendant la reconstruction.
+
+    Args:
+        source: Fichier stock (.csv, .zip ou .parquet)
+        output: Chemin de la base SQLite a produire
+        active_only: Ignore les unites legales cessees (index plus compact)
+
+    Returns:
+        Nombre d'unites legales indexees
+    """
+    output.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = output.with_name(output.name + ".tmp")
+    tmp_path.unlink(missing_ok=True)
+
+    conn = sqlite3.connect(str(tmp_path))
+    conn.execute("PRAGMA journal_mode = OFF")
+    conn.execute("PRAGMA synchronous = OFF")
+    columns = ", ".join(f"{c} TEXT" for c in STOCK_COLUMNS[1:])
+    conn.execute(f"CREATE TABLE unites (siren TEXT PRIMARY KEY, {columns}, name_norm TEXT)")
+    conn.execute("CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT)")
+    insert = f"INSERT OR REPLACE INTO unites VALUES ({', '.join('?' * (len(STOCK_COLUMNS) + 1))})"
+
+    count = 0
+    batch: list[tuple[str, ...]] = []
+    for row in iter_stock_rows(source):
+        if active_only and row["etatAdministratifUniteLegale"] == "C":
+            continue
+        batch.append((*(row[c] for c in STOCK_COLUMNS), normalize_name(_display_name(row))))
+        if len(batch) >= BATCH_SIZE:
+            conn.executemany(insert, batch)
+            count += len(batch)
+            batch.clear()
+    conn.executemany(insert, batch)
+    count += len(batch)
+
+    conn.execute("CREATE INDEX unites_name ON unites (name_norm)")
+    conn.executemany(
+        "INSERT INTO meta VALUES (?, ?)",
+        [("source", source.name), ("built_at", time.strftime("%Y-%m-%d %H:%M:%S")), ("count", str(count))],
+    )
+    conn.commit()
+    conn.close()
+    tmp_path.replace(output)
+    return count
+
+
+def _to_unite_legale(row: sqlite3.Row) -> dict:
+    """Ligne de l'index au format JSON de l'API (uniteLegale + periode courante)."""
+    unite: dict = {"siren": row["siren"]}
+    periode: dict = {}
+    for key in STOCK_COLUMNS[1:]:
+        if row[key]:
+            (periode if key in _PERIODE_FIELDS else unite)[key] = row[key]
+    unite["periodesUniteLegale"] = [periode]
+    return unite
+
+
+class SireneIndex:
+    """Index Sirene local en lecture seule (SQLite)."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.stats: Counter[str] = Counter()
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+
+    def get(self, siren: str) -> dict | None:
+        """Unite legale (format API) d'un SIREN, ou None si absente de l'index."""
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM unites WHERE siren = ?", (siren,)).fetchone()
+            self.stats["hit" if row is not None else "miss"] += 1
+        return _to_unite_legale(row) if row is not None else None
+
+    def search(self, name: str, limit: int = 5) -> list[dict]:
+        """
+        Unites legales dont le nom commence par `name` (normalise), actives en premier.
+
+        Equivalent local de la recherche API `denominationUniteLegale:mot*mot*`.
+        """
+        prefix = normalize_name(name)
+        if not prefix:
+            return []
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT * FROM unites WHERE name_norm >= ? AND name_norm < ? "
+                "ORDER BY etatAdministratifUniteLegale = 'C', length(name_norm) LIMIT ?",
+                (prefix, prefix + "\uffff", limit),
+            ).fetchall()
+            self.stats["hit" if rows else "miss"] += 1
+        return [_to_unite_legale(row) for row in rows]
+
+    def metadata(self) -> dict[str, str]:
+        """Source, date de construction et nombre d'unites de l'index."""
+        with self._lock:
+            return dict(self._conn.execute("SELECT key, value FROM meta").fetchall())
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM unites").fetchone()[0]
+
+
+_shared_index: SireneIndex | None = None
+_shared_lock = threading.Lock()
+
+
+def get_sirene_index() -> SireneIndex | None:
+    """Index Sirene local du processus, ou None s'il n'a pas ete construit (ou SIRENE_INDEX_ENABLED=0)."""
+    global _shared_index
+    if os.environ.get("SIRENE_INDEX_ENABLED", "1").strip().lower() in ("0", "false", "no", "off"):
+        return None
+    with _shared_lock:
+        if _shared_index is None:
+            path = Path(os.environ.get("SIRENE_INDEX_PATH") or SIRENE_INDEX_PATH)
+            if not path.exists():
+                return None
+            _shared_index = SireneIndex(path)
+        return _shared_index
+
+
+def format_sirene_index_stats(index: SireneIndex | None) -> str | None:
+    """Ligne de log : requetes Sirene servies localement (None si inutilise)."""
+    if index is None or not index.stats:
+        return None
+    total = index.stats["hit"] + index.stats["miss"]
+    return f"[INFO] Index Sirene local: {index.stats['hit']} requete(s) servie(s) sur {total}"
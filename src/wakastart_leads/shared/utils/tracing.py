@@ -0,0 +1,272 @@
+"""Spans de timing par tache, appel LLM et appel d'outil pour une execution de crew."""
+
+import contextlib
+import inspect
+import json
+import os
+import secrets
+import threading
+import time
+from collections.abc import Callable, Iterator
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any
+
+import requests
+
+# Endpoint OTLP/HTTP optionnel (ex: http://localhost:4318/v1/traces)
+OTLP_ENDPOINT_ENV = "WAKASTART_OTLP_ENDPOINT"
+OTLP_SERVICE_NAME = "wakastart-leads"
+
+
+@dataclass
+class Span:
+    """Intervalle de temps mesure (tache, appel LLM ou appel d'outil)."""
+
+    name: str
+    kind: str
+    start: float
+    duration_seconds: float = 0.0
+    status: str = "ok"
+    error: str | None = None
+    span_id: str = field(default_factory=lambda: secrets.token_hex(8))
+    parent_id: str | None = None
+    attributes: dict[str, Any] = field(default_factory=dict)
+
+
+class Tracer:
+    """
+    Collecte les spans d'une execution de crew (une URL).
+
+    `instrument_crew` enveloppe les taches, les LLMs et les outils des agents :
+    chaque appel LLM ou outil est rattache a la tache en cours.
+
+    `observer` (optionnel, ex: RunMetrics) est notifie au debut et a la fin de
+    chaque span (`span_started` / `span_finished`), pendant l'execution.
+    """
+
+    def __init__(self, observer: Any = None) -> None:
+        self.trace_id = secrets.token_hex(16)
+        self._spans: list[Span] = []
+        self._lock = threading.Lock()
+        self._current_task: Span | None = None
+        self._observer = observer
+
+    @property
+    def spans(self) -> list[Span]:
+        """Copie des spans termines (sure meme si le crew tourne encore apres un timeout)."""
+        with self._lock:
+            return list(self._spans)
+
+    @contextlib.contextmanager
+    def span(self, name: str, kind: str, **attributes: Any) -> Iterator[Span]:
+        """Mesure un bloc de code et enregistre le span a la sortie (statut "error" si exception)."""
+        parent = self._current_task
+        span = Span(
+            name=name,
+            kind=kind,
+            start=time.time(),
+            parent_id=parent.span_id if parent and kind != "task" else None,
+            attributes=attributes,
+        )
+        started = time.perf_counter()
+        if self._observer is not None:
+            self._observer.span_started(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.status = "error"
+            span.error = str(e)
+            raise
+        finally:
+            span.duration_seconds = time.perf_counter() - started
+            with self._lock:
+                self._spans.append(span)
+            if self._observer is not None:
+                self._observer.span_finished(span)
+
+    @contextlib.contextmanager
+    def task_span(self, name: str, **attributes: Any) -> Iterator[Span]:
+        """Span de type "task" : les appels LLM et outils du bloc y sont rattaches."""
+        with self.span(name, "task", **attributes) as span:
+            self._current_task = span
+            try:
+                yield span
+            finally:
+                self._current_task = None
+
+    def instrument_crew(self, crew: Any) -> None:
+        """Enveloppe les taches, LLMs et outils du crew (une seule fois par objet)."""
+        for task in getattr(crew, "tasks", None) or []:
+            self._wrap_task(task)
+        for agent in getattr(crew, "agents", None) or []:
+            llm = getattr(agent, "llm", None)
+            if llm is not None and hasattr(llm, "call"):
+                self._wrap_llm(llm, agent)
+            for tool in getattr(agent, "tools", None) or []:
+                self._wrap_tool(tool)
+
+    def _wrap_task(self, task: Any) -> None:
+        original = task.execute_sync
+        name = getattr(task, "name", None) or "task"
+
+        def execute_sync(*args: Any, **kwargs: Any) -> Any:
+            agent = kwargs.get("agent") or getattr(task, "agent", None)
+            with self.task_span(name, agent=str(getattr(agent, "role", "")).strip()):
+                return original(*args, **kwargs)
+
+        _set_instance_attr(task, "execute_sync", execute_sync)
+
+        # Chemin asynchrone natif (Crew.akickoff)
+        if hasattr(task, "aexecute_sync"):
+            original_async = task.aexecute_sync
+
+            async def aexecute_sync(*args: Any, **kwargs: Any) -> Any:
+                agent = kwargs.get("agent") or getattr(task, "agent", None)
+                with self.task_span(name, agent=str(getattr(agent, "role", "")).strip()):
+                    return await original_async(*args, **kwargs)
+
+            _set_instance_attr(task, "aexecute_sync", aexecute_sync)
+
+    def _wrap_llm(self, llm: Any, agent: Any) -> None:
+        original = llm.call
+        model = str(getattr(llm, "model", ""))
+        role = str(getattr(agent, "role", "")).strip()
+
+        def call(*args: Any, **kwargs: Any) -> Any:
+            with self.span(model, "llm", model=model, agent=role):
+                return original(*args, **kwargs)
+
+        _set_instance_attr(llm, "call", call)
+
+        if inspect.iscoroutinefunction(getattr(llm, "acall", None)):
+            original_async = llm.acall
+
+            async def acall(*args: Any, **kwargs: Any) -> Any:
+                with self.span(model, "llm", model=model, agent=role):
+                    return await original_async(*args, **kwargs)
+
+            _set_instance_attr(llm, "acall", acall)
+
+    def _wrap_tool(self, tool: Any) -> None:
+        original = tool._run
+        name = str(getattr(tool, "name", type(tool).__name__))
+
+        def _run(*args: Any, **kwargs: Any) -> Any:
+            with self.span(name, "tool", tool=name):
+                return original(*args, **kwargs)
+
+        _set_instance_attr(tool, "_run", _run)
+
+        # Outils asynchrones (AsyncTool._arun)
+        if inspect.iscoroutinefunction(getattr(tool, "_arun", None)):
+            original_async = tool._arun
+
+            async def _arun(*args: Any, **kwargs: Any) -> Any:
+                with self.span(name, "tool", tool=name):
+                    return await original_async(*args, **kwargs)
+
+            _set_instance_attr(tool, "_arun", _arun)
+
+
+def _set_instance_attr(obj: Any, name: str, value: Callable[..., Any]) -> None:
+    """Remplace une methode sur l'instance (contourne la validation pydantic des Task/Tool)."""
+    object.__setattr__(obj, name, value)
+
+
+def summarize_spans(spans: list[Span]) -> list[tuple[str, str, int, float]]:
+    """Agrege les spans par (type, nom) : [(kind, name, appels, secondes)] tries par temps decroissant."""
+    totals: dict[tuple[str, str], list[float]] = {}
+    for span in spans:
+        entry = totals.setdefault((span.kind, span.name), [0, 0.0])
+        entry[0] += 1
+        entry[1] += span.duration_seconds
+    rows = [(kind, name, int(count), seconds) for (kind, name), (count, seconds) in totals.items()]
+    return sorted(rows, key=lambda row: row[3], reverse=True)
+
+
+def format_time_summary(spans: list[Span], limit: int = 10) -> list[str]:
+    """Lignes de log resumant ou le temps a ete passe (taches, LLMs, outils)."""
+    lines: list[str] = []
+    for kind, label in (("task", "Taches"), ("llm", "LLMs"), ("tool", "Outils")):
+        rows = [row for row in summarize_spans(spans) if row[0] == kind][:limit]
+        if not rows:
+            continue
+        lines.append(f"  {label}:")
+        for _, name, count, seconds in rows:
+            lines.append(f"    - {name:<50} {seconds:>8.1f}s ({count} appel(s))")
+    return lines
+
+
+def append_trace(path: Path, url: str, spans: list[Span], trace_id: str | None = None) -> None:
+    """Ajoute les spans d'une URL au fichier de trace JSONL (une ligne par span)."""
+    if not spans:
+        return
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "a", encoding="utf-8") as f:
+        for span in spans:
+            f.write(json.dumps({"url": url, "trace_id": trace_id, **asdict(span)}, ensure_ascii=False) + "\n")
+
+
+def _otlp_value(value: Any) -> dict[str, Any]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def to_otlp_payload(url: str, spans: list[Span], trace_id: str) -> dict[str, Any]:
+    """Convertit les spans au format OTLP/JSON (ExportTraceServiceRequest)."""
+    otlp_spans = []
+    for span in spans:
+        start_ns = int(span.start * 1e9)
+        attributes = {"wakastart.url": url, "wakastart.kind": span.kind, **span.attributes}
+        otlp_span: dict[str, Any] = {
+            "traceId": trace_id,
+            "spanId": span.span_id,
+            "name": span.name,
+            "kind": 1,
+            "startTimeUnixNano": str(start_ns),
+            "endTimeUnixNano": str(start_ns + int(span.duration_seconds * 1e9)),
+            "attributes": [{"key": k, "value": _otlp_value(v)} for k, v in attributes.items()],
+            "status": {"code": 2, "message": span.error or ""} if span.status == "error" else {"code": 1},
+        }
+        if span.parent_id:
+            otlp_span["parentSpanId"] = span.parent_id
+        otlp_spans.append(otlp_span)
+
+    return {
+        "resourceSpans": [
+            {
+                "resource": {"attributes": [{"key": "service.name", "value": {"stringValue": OTLP_SERVICE_NAME}}]},
+                "scopeSpans": [{"scope": {"name": "wakastart_leads.tracing"}, "spans": otlp_spans}],
+            }
+        ]
+    }
+
+
+def export_otlp(url: str, spans: list[Span], trace_id: str, endpoint: str | None = None) -> bool:
+    """
+    Envoie les spans a un collecteur OTLP/HTTP (JSON) si un endpoint est configure.
+
+    Args:
+        url: URL traitee (ajoutee en attribut de chaque span)
+        spans: Spans a exporter
+        trace_id: Identifiant de trace (32 caracteres hexadecimaux)
+        endpoint: Endpoint OTLP ; par defaut la variable WAKASTART_OTLP_ENDPOINT
+
+    Returns:
+        True si l'export a reussi, False sinon (ou si aucun endpoint)
+    """
+    endpoint = endpoint or os.getenv(OTLP_ENDPOINT_ENV, "").strip()
+    if not endpoint or not spans:
+        return False
+    try:
+        response = requests.post(endpoint, json=to_otlp_payload(url, spans, trace_id), timeout=5)
+        return response.status_code < 300
+    except requests.exceptions.RequestException as e:
+        print(f"[WARNING] Export OTLP echoue ({endpoint}): {e}")
+        return False
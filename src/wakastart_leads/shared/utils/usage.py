@@ -0,0 +1,175 @@
+"""Comptabilite des tokens et des couts LLM par agent, par URL et par execution."""
+
+import json
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any
+
+from crewai.llms.base_llm import BaseLLM
+
+
+@dataclass(frozen=True)
+class ModelPrice:
+    """Tarif d'un modele en USD par million de tokens."""
+
+    input: float
+    output: float
+    cached_input: float
+
+
+# Tarifs de reference (fevrier 2026, cf. docs/plans/2026-02-05-cost-optimization-design.md).
+# Les tokens lus depuis le cache fournisseur sont factures au tarif `cached_input`.
+MODEL_PRICING: dict[str, ModelPrice] = {
+    "claude-opus-4-5": ModelPrice(5.00, 25.00, 0.50),
+    "claude-sonnet-4-5": ModelPrice(3.00, 15.00, 0.30),
+    "claude-haiku-4-5": ModelPrice(1.00, 5.00, 0.10),
+    "claude-3-haiku": ModelPrice(0.25, 1.25, 0.03),
+    "gemini-2.5-pro": ModelPrice(1.25, 10.00, 0.31),
+    "gemini-2.5-flash-lite": ModelPrice(0.10, 0.40, 0.025),
+    "gemini-2.5-flash": ModelPrice(0.30, 2.50, 0.075),
+    "gemini-2.0-flash-lite": ModelPrice(0.075, 0.30, 0.01875),
+    "gemini-2.0-flash": ModelPrice(0.15, 0.60, 0.0375),
+    "gpt-5": ModelPrice(1.25, 10.00, 0.125),
+    "gpt-4o-mini": ModelPrice(0.15, 0.60, 0.075),
+    "gpt-4o": ModelPrice(2.50, 10.00, 1.25),
+}
+
+
+def price_for(model: str) -> ModelPrice | None:
+    """
+    Retrouve le tarif d'un modele ("anthropic/claude-sonnet-4-5-20250929" -> claude-sonnet-4-5).
+
+    Le prefixe fournisseur est ignore et la cle la plus longue qui prefixe le nom l'emporte.
+
+    Returns:
+        ModelPrice ou None si le modele est inconnu
+    """
+    name = model.split("/", 1)[-1].lower()
+    matches = [key for key in MODEL_PRICING if name.startswith(key)]
+    return MODEL_PRICING[max(matches, key=len)] if matches else None
+
+
+@dataclass
+class UsageRecord:
+    """Consommation d'un agent (et de sa tache) pour une URL."""
+
+    agent: str
+    model: str
+    tasks: list[str]
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    cached_prompt_tokens: int = 0
+    requests: int = 0
+
+    @property
+    def total_tokens(self) -> int:
+        return self.prompt_tokens + self.completion_tokens
+
+    @property
+    def cost_usd(self) -> float:
+        """Cout estime en USD (0.0 si le modele n'a pas de tarif connu)."""
+        price = price_for(self.model)
+        if price is None:
+            return 0.0
+        uncached = max(self.prompt_tokens - self.cached_prompt_tokens, 0)
+        return (
+            uncached * price.input
+            + self.cached_prompt_tokens * price.cached_input
+            + self.completion_tokens * price.output
+        ) / 1_000_000
+
+    def as_dict(self) -> dict[str, Any]:
+        return asdict(self) | {"total_tokens": self.total_tokens, "cost_usd": round(self.cost_usd, 6)}
+
+
+def collect_usage(crew: Any) -> list[UsageRecord]:
+    """
+    Lit la consommation de chaque agent du crew (compteurs internes des LLMs CrewAI).
+
+    Un crew est instancie par URL : les compteurs de ses LLMs correspondent donc
+    exactement a la consommation de cette URL.
+    """
+    records: list[UsageRecord] = []
+    tasks = getattr(crew, "tasks", None) or []
+    for agent in getattr(crew, "agents", None) or []:
+        llm = getattr(agent, "llm", None)
+        if not isinstance(llm, BaseLLM):
+            continue
+        usage = llm.get_token_usage_summary()
+        role = str(getattr(agent, "role", "")).strip()
+        records.append(
+            UsageRecord(
+                agent=role,
+                model=str(llm.model),
+                tasks=[str(t.name) for t in tasks if getattr(t, "agent", None) is agent and t.name],
+                prompt_tokens=usage.prompt_tokens,
+                completion_tokens=usage.completion_tokens,
+                cached_prompt_tokens=usage.cached_prompt_tokens,
+                requests=usage.successful_requests,
+            )
+        )
+    return records
+
+
+def aggregate_usage(records: list[UsageRecord], key: str = "model") -> dict[str, UsageRecord]:
+    """Agrege des consommations par modele ("model") ou par agent ("agent")."""
+    totals: dict[str, UsageRecord] = {}
+    for record in records:
+        name = getattr(record, key)
+        total = totals.setdefault(name, UsageRecord(agent=record.agent, model=record.model, tasks=[]))
+        total.prompt_tokens += record.prompt_tokens
+        total.completion_tokens += record.completion_tokens
+        total.cached_prompt_tokens += record.cached_prompt_tokens
+        total.requests += record.requests
+        total.tasks.extend(t for t in record.tasks if t not in total.tasks)
+    return totals
+
+
+def format_usage_summary(records: list[UsageRecord]) -> list[str]:
+    """Lignes de log : tokens et cout par modele, puis total."""
+    lines: list[str] = []
+    for model, total in sorted(aggregate_usage(records).items(), key=lambda item: item[1].cost_usd, reverse=True):
+        lines.append(
+            f"    - {model:<45} {total.prompt_tokens:>10,} in / {total.completion_tokens:>9,} out "
+            f"({total.cached_prompt_tokens:,} en cache) ${total.cost_usd:.4f}"
+        )
+    if records:
+        cost = sum(r.cost_usd for r in records)
+        tokens = sum(r.total_tokens for r in records)
+        lines.append(f"    Total: {tokens:,} tokens, ${cost:.4f}")
+    return lines
+
+
+def write_cost_report(results: list[Any], path: Path) -> None:
+    """
+    Ecrit le rapport de couts d'une execution (JSON) : detail par URL et agent,
+    totaux par modele et par agent, total de l'execution.
+
+    Args:
+        results: Liste de UrlResult (attribut `usage`)
+        path: Fichier JSON de sortie
+    """
+    all_records = [record for result in results for record in result.usage]
+    report = {
+        "urls": [
+            {
+                "url": result.url,
+                "status": result.status.value,
+                "cost_usd": round(sum(r.cost_usd for r in result.usage), 6),
+                "total_tokens": sum(r.total_tokens for r in result.usage),
+                "agents": [r.as_dict() for r in result.usage],
+            }
+            for result in results
+        ],
+        "by_model": {name: r.as_dict() for name, r in aggregate_usage(all_records, "model").items()},
+        "by_agent": {name: r.as_dict() for name, r in aggregate_usage(all_records, "agent").items()},
+        "total": {
+            "prompt_tokens": sum(r.prompt_tokens for r in all_records),
+            "completion_tokens": sum(r.completion_tokens for r in all_records),
+            "cached_prompt_tokens": sum(r.cached_prompt_tokens for r in all_records),
+            "cost_usd": round(sum(r.cost_usd for r in all_records), 6),
+        },
+    }
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
@@ -0,0 +1,147 @@
+"""Tests pour le harnais de charge hors-ligne (doublures et execution de bout en bout)."""
+
+import random
+
+import requests
+
+from wakastart_leads.bench.fakes import (
+    BenchProfiles,
+    FakeProviderServer,
+    ProviderProfile,
+    bench_siren,
+    bench_url,
+    company_index,
+    llm_provider_for,
+)
+from wakastart_leads.bench.load import LoadReport, main, run_load
+
+FAST = ProviderProfile(median_ms=1, p95_ms=2)
+
+# ===========================================================================
+# Tests des doublures
+# ===========================================================================
+
+
+class TestProviderProfile:
+    """Tests pour les profils de latence et d'erreurs."""
+
+    def test_latency_median_close_to_target(self):
+        profile = ProviderProfile(median_ms=100, p95_ms=300)
+        rng = random.Random(0)
+        samples = sorted(profile.sample_latency(rng) for _ in range(2000))
+        assert 0.08 < samples[1000] < 0.12
+
+    def test_outcomes_follow_rates(self):
+        profile = ProviderProfile(error_rate=0.2, rate_limit_rate=0.3)
+        rng = random.Random(0)
+        outcomes = [profile.sample_outcome(rng) for _ in range(2000)]
+        assert 0.25 < outcomes.count("rate_limited") / 2000 < 0.35
+        assert 0.15 < outcomes.count("error") / 2000 < 0.25
+
+    def test_build_applies_overrides(self):
+        profiles = BenchProfiles.build(llm=FAST, api=FAST, overrides={"anthropic": {"median_ms": 500}})
+        assert profiles.get("anthropic").median_ms == 500
+        assert profiles.get("anthropic").p95_ms == 2
+        assert profiles.get("gemini").median_ms == 1
+
+
+class TestFakeProviderServer:
+    """Tests pour le serveur HTTP factice."""
+
+    def test_sirene_lookup_by_siren(self):
+        with FakeProviderServer(BenchProfiles.build(llm=FAST, api=FAST)) as server:
+            response = requests.get(f"{server.url('sirene')}/siren/{bench_siren(7)}", timeout=5)
+        assert response.status_code == 200
+        assert response.json()["uniteLegale"]["siren"] == bench_siren(7)
+
+    def test_rate_limit_returns_429_and_is_counted(self):
+        api = ProviderProfile(median_ms=0, rate_limit_rate=1.0)
+        with FakeProviderServer(BenchProfiles.build(llm=FAST, api=api)) as server:
+            response = requests.post(f"{server.url('serper')}/search", json={"q": "x"}, timeout=5)
+        assert response.status_code == 429
+        assert server.stats.as_dict()["serper"] == {"calls": 1, "errors": 0, "rate_limited": 1}
+
+    def test_site_page_mentions_company(self):
+        with FakeProviderServer(BenchProfiles.build(llm=FAST, api=FAST)) as server:
+            response = requests.get(f"{server.url('site')}/company-3", timeout=5)
+        assert "Company 3" in response.text
+
+
+class TestHelpers:
+    """Tests pour les fonctions utilitaires des doublures."""
+
+    def test_company_index_roundtrip(self):
+        assert company_index(f"Analyse {bench_url(42)}/about") == 42
+
+    def test_llm_provider_for(self):
+        assert llm_provider_for("anthropic/claude-sonnet-4-5-20250929") == "anthropic"
+        assert llm_provider_for("gemini/gemini-2.5-flash") == "gemini"
+        assert llm_provider_for("openai/gpt-4o") == "openai"
+
+
+# ===========================================================================
+# Tests du rapport et de l'execution de bout en bout
+# ===========================================================================
+
+
+class TestLoadReport:
+    """Tests pour les metriques du rapport."""
+
+    def test_metrics(self):
+        report = LoadReport(
+            mode="parallel",
+            workers=2,
+            urls=4,
+            succeeded=3,
+            wall_seconds=10.0,
+            busy_seconds=16.0,
+            latencies=[2.0, 4.0, 4.0, 6.0],
+        )
+        assert report.failed == 1
+        assert report.urls_per_hour == 1080.0
+        assert report.p50 == 4.0
+        assert report.concurrency_efficiency == 0.8
+
+
+class TestRunLoad:
+    """Tests de bout en bout avec les vrais crews et les doublures locales."""
+
+    def test_parallel_mode_processes_all_urls(self):
+        profiles = BenchProfiles.build(llm=FAST, api=FAST)
+        report = run_load("parallel", 2, profiles, workers=2, tool_calls_per_task=1)
+        assert report.succeeded == 2
+        assert report.provider_stats["gemini"]["calls"] > 0
+        assert report.provider_stats["anthropic"]["calls"] > 0
+
+    def test_batch_mode_parses_enrichment(self):
+        profiles = BenchProfiles.build(llm=FAST, api=FAST)
+        report = run_load("batch", 3, profiles, batch_size=2, tool_calls_per_task=0)
+        assert report.succeeded == 3
+        assert report.provider_stats["openai"]["calls"] == 2
+
+    def test_llm_rate_limits_reported_as_failures(self):
+        profiles = BenchProfiles.build(llm=ProviderProfile(median_ms=0, rate_limit_rate=1.0), api=FAST)
+        report = run_load("sequential", 1, profiles, retry_count=0)
+        assert report.succeeded == 0
+        assert report.provider_stats["gemini"]["rate_limited"] > 0
+
+    def test_main_writes_json(self, tmp_path):
+        output = tmp_path / "load.json"
+        code = main(
+            [
+                "--mode",
+                "batch",
+                "--urls",
+                "2",
+                "--llm-median-ms",
+                "1",
+                "--llm-p95-ms",
+                "2",
+                "--tool-calls",
+                "0",
+                "--json",
+                str(output),
+            ]
+        )
+        assert code == 0
+        assert '"urls_per_hour"' in output.read_text(encoding="utf-8")
@@ -0,0 +1,143 @@
+"""Tests pour les micro-benchmarks (generateurs, comparaison a la baseline)."""
+
+import json
+
+from wakastart_leads.bench import generators
+from wakastart_leads.bench.micro import (
+    BENCHMARKS,
+    BenchResult,
+    compare_to_baseline,
+    is_local_baseline,
+    load_baseline,
+    machine_id,
+    main,
+    run_all,
+    save_baseline,
+)
+from wakastart_leads.shared.utils.parallel_runner import clean_csv_row
+
+# ===========================================================================
+# Tests des generateurs
+# ===========================================================================
+
+
+class TestGenerators:
+    """Tests pour les generateurs de donnees synthetiques."""
+
+    def test_csv_rows_have_23_columns(self):
+        rows = generators.generate_csv_rows(50)
+        assert len(rows) == 50
+        assert all(len(row) == 23 for row in rows)
+
+    def test_deterministic_for_seed(self):
+        assert generators.generate_noisy_urls(20, seed=1) == generators.generate_noisy_urls(20, seed=1)
+
+    def test_noisy_llm_rows_contain_noise(self):
+        rows = generators.generate_noisy_llm_rows(200)
+        assert any("```" in r for r in rows)
+        assert any(r.count("Societe,Site Web") >= 2 for r in rows)
+
+    def test_noisy_llm_rows_are_cleanable(self):
+        for raw in generators.generate_noisy_llm_rows(50):
+            cleaned = clean_csv_row(raw)
+            assert cleaned is not None
+            assert "```" not in cleaned
+
+    def test_enrichment_outputs_batched(self):
+        outputs = generators.generate_enrichment_outputs(45, batch_size=20)
+        assert len(outputs) == 3
+
+
+# ===========================================================================
+# Tests d'execution et de comparaison
+# ===========================================================================
+
+
+class TestRunAll:
+    """Tests pour l'execution des benchmarks."""
+
+    def test_runs_every_benchmark_on_small_input(self):
+        results = run_all(n_rows=200, repeat=1)
+        assert [r.name for r in results] == list(BENCHMARKS)
+        assert all(r.items > 0 and r.seconds > 0 for r in results)
+
+    def test_parse_enrichment_counts_all_items(self):
+        (result,) = run_all(n_rows=100, names=["_parse_enrichment_output"], repeat=1)
+        assert result.items == 100
+
+
+class TestCompareToBaseline:
+    """Tests pour la detection des regressions."""
+
+    def test_no_regression_within_threshold(self):
+        results = [BenchResult("normalize_url", 1000, 1.0, 0)]
+        baseline = {"normalize_url": {"throughput": 1100, "peak_bytes_per_item": 0}}
+        assert compare_to_baseline(results, baseline, threshold=0.25) == []
+
+    def test_throughput_regression_detected(self):
+        results = [BenchResult("normalize_url", 1000, 1.0, 0)]
+        baseline = {"normalize_url": {"throughput": 2000, "peak_bytes_per_item": 0}}
+        regressions = compare_to_baseline(results, baseline, threshold=0.25)
+        assert len(regressions) == 1
+        assert "normalize_url" in regressions[0]
+
+    def test_memory_regression_detected(self):
+        results = [BenchResult("load_existing_csv", 1000, 1.0, 10_000_000)]
+        baseline = {"load_existing_csv": {"throughput": 1000, "peak_bytes_per_item": 5000}}
+        assert len(compare_to_baseline(results, baseline, threshold=0.25)) == 1
+
+    def test_small_memory_noise_ignored(self):
+        results = [BenchResult("clean_csv_row", 1000, 1.0, 50_000)]
+        baseline = {"clean_csv_row": {"throughput": 1000, "peak_bytes_per_item": 1}}
+        assert compare_to_baseline(results, baseline) == []
+
+    def test_relative_throughput_compared_when_recorded(self):
+        # Debit absolu deux fois plus faible que la baseline, debit relatif inchange
+        results = [BenchResult("normalize_url", 1000, 1.0, 0, relative=0.5)]
+        baseline = {"normalize_url": {"throughput": 2000, "relative": 0.5, "peak_bytes_per_item": 0}}
+        assert compare_to_baseline(results, baseline, threshold=0.25) == []
+
+    def test_save_and_load_roundtrip(self, tmp_path):
+        path = tmp_path / "baseline.json"
+        save_baseline([BenchResult("normalize_url", 1000, 0.5, 0)], path, n_rows=1000)
+        baseline = load_baseline(path)
+        assert baseline["normalize_url"]["throughput"] == 2000.0
+
+
+class TestMain:
+    """Tests pour le point d'entree CLI."""
+
+    def test_exit_code_on_regression(self, tmp_path, capsys):
+        path = tmp_path / "baseline.json"
+        baseline = {"machine": machine_id(), "benchmarks": {"normalize_url": {"relative": 1e12}}}
+        path.write_text(json.dumps(baseline), encoding="utf-8")
+        code = main(["--rows", "100", "--repeat", "1", "--only", "normalize_url", "--baseline", str(path)])
+        assert code == 1
+        assert "[REGRESSION]" in capsys.readouterr().out
+
+    def test_baseline_from_other_machine_only_warns(self, tmp_path, capsys):
+        path = tmp_path / "baseline.json"
+        baseline = {"machine": "autre-machine", "benchmarks": {"normalize_url": {"relative": 1e12}}}
+        path.write_text(json.dumps(baseline), encoding="utf-8")
+        code = main(["--rows", "100", "--repeat", "1", "--only", "normalize_url", "--baseline", str(path)])
+        assert code == 0
+        assert "[WARNING] normalize_url" in capsys.readouterr().out
+
+    def test_absolute_baseline_only_warns(self, tmp_path, capsys):
+        path = tmp_path / "baseline.json"
+        path.write_text(json.dumps({"benchmarks": {"normalize_url": {"throughput": 1e12}}}), encoding="utf-8")
+        code = main(["--rows", "100", "--repeat", "1", "--only", "normalize_url", "--baseline", str(path)])
+        assert code == 0
+        assert "--save-baseline" in capsys.readouterr().out
+
+    def test_saved_baseline_records_relative_throughput(self, tmp_path):
+        path = tmp_path / "baseline.json"
+        main(["--rows", "100", "--repeat", "1", "--only", "normalize_url", "--baseline", str(path), "--save-baseline"])
+        assert load_baseline(path)["normalize_url"]["relative"] > 0
+        assert is_local_baseline(path)
+
+    def test_exit_code_without_regression(self, tmp_path):
+        path = tmp_path / "baseline.json"
+        path.write_text(json.dumps({"benchmarks": {"normalize_url": {"throughput": 1}}}), encoding="utf-8")
+        code = main(["--rows", "100", "--repeat", "1", "--only", "normalize_url", "--baseline", str(path)])
+        assert code == 0
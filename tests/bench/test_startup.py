@@ -0,0 +1,124 @@
+"""Tests pour le benchmark de demarrage (imports des points d'entree CLI)."""
+
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+from wakastart_leads.bench.startup import (
+    _MARKER,
+    SRC_DIR,
+    StartupResult,
+    compare_to_baseline,
+    load_baseline,
+    load_entry_points,
+    main,
+    measure_entry_point,
+    parse_importtime,
+    save_baseline,
+)
+
+IMPORTTIME_OUTPUT = "\n".join(
+    [
+        "import time: self [us] | cumulative | imported package",
+        "import time:       500 |        900 | site",
+        _MARKER,
+        "import time:       100 |        100 | wakastart_leads",
+        "import time:      2000 |       2000 |   json.decoder",
+        "import time:      1000 |       3000 |   json",
+        "import time:      5000 |      80000 |     crewai",
+        "import time:      4000 |      90000 | wakastart_leads.main",
+    ]
+)
+
+
+class TestParseImporttime:
+    """Tests pour l'analyse de la sortie `-X importtime`."""
+
+    def test_sums_top_level_after_marker(self):
+        total, modules, _ = parse_importtime(IMPORTTIME_OUTPUT)
+        assert total == 90_100
+        assert "site" not in modules
+        assert modules[-1] == "wakastart_leads.main"
+
+    def test_heaviest_root_packages(self):
+        _, _, heaviest = parse_importtime(IMPORTTIME_OUTPUT)
+        assert heaviest == [("crewai", 80000), ("json", 3000)]
+
+
+class TestLoadEntryPoints:
+    """Tests pour la lecture des scripts du pyproject."""
+
+    @pytest.mark.skipif(sys.version_info < (3, 11), reason="tomllib absent")
+    def test_reads_project_scripts(self, tmp_path):
+        pyproject = tmp_path / "pyproject.toml"
+        pyproject.write_text(
+            '[project]\nname = "x"\n\n[project.scripts]\nwakastart-run = "wakastart_leads.main:run"\n',
+            encoding="utf-8",
+        )
+        assert load_entry_points(pyproject) == {"wakastart-run": "wakastart_leads.main:run"}
+
+    def test_repo_scripts_target_main(self):
+        scripts = load_entry_points()
+        assert "wakastart" in scripts
+        assert all(target.startswith("wakastart_leads.") for target in scripts.values())
+
+
+class TestLazyImports:
+    """Les commandes ne chargent CrewAI qu'a l'execution."""
+
+    def test_main_does_not_import_crewai(self):
+        code = "import sys, wakastart_leads.main; print(sorted(m for m in ('crewai', 'litellm') if m in sys.modules))"
+        env = dict(os.environ, PYTHONPATH=str(SRC_DIR))
+        proc = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, env=env, check=True)
+        assert proc.stdout.strip() == "[]"
+
+    def test_crew_resolved_on_first_access(self):
+        from wakastart_leads import crews
+        from wakastart_leads.crews.analysis import crew
+
+        assert crews.AnalysisCrew is crew.AnalysisCrew
+
+    def test_measure_entry_point(self):
+        result = measure_entry_point("wakastart-sirene-index", "wakastart_leads.main:sirene_index", repeat=1)
+        assert result.import_us > 0
+        assert "wakastart_leads.main" in result.modules
+        assert "crewai" not in result.modules
+
+
+class TestCompareToBaseline:
+    """Tests pour la detection des regressions."""
+
+    def test_regression_detected(self):
+        results = [StartupResult("wakastart-run", "wakastart_leads.main:run", 11_000_000, heaviest=[("crewai", 10**7)])]
+        regressions = compare_to_baseline(results, {"wakastart-run": {"import_us": 100_000}})
+        assert len(regressions) == 1
+        assert "crewai" in regressions[0]
+
+    def test_small_noise_ignored(self):
+        results = [StartupResult("wakastart-run", "wakastart_leads.main:run", 40_000)]
+        assert compare_to_baseline(results, {"wakastart-run": {"import_us": 10_000}}) == []
+
+    def test_save_and_load_roundtrip(self, tmp_path):
+        path = tmp_path / "baseline.json"
+        save_baseline([StartupResult("wakastart", "wakastart_leads.main:cli", 1234, modules=["a", "b"])], path)
+        entry = load_baseline(path)["wakastart"]
+        assert entry == {"target": "wakastart_leads.main:cli", "import_us": 1234, "modules": 2}
+
+
+class TestMain:
+    """Tests pour le point d'entree CLI."""
+
+    def test_exit_code_on_regression(self, tmp_path, capsys):
+        path = tmp_path / "baseline.json"
+        path.write_text(json.dumps({"entry_points": {"wakastart-bench": {"import_us": 1}}}), encoding="utf-8")
+        code = main(["--only", "wakastart-bench", "--repeat", "1", "--baseline", str(path)])
+        assert code == 1
+        assert "[REGRESSION]" in capsys.readouterr().out
+
+    def test_exit_code_without_regression(self, tmp_path):
+        path = tmp_path / "baseline.json"
+        path.write_text(json.dumps({"entry_points": {"wakastart-bench": {"import_us": 10**9}}}), encoding="utf-8")
+        assert main(["--only", "wakastart-bench", "--repeat", "1", "--baseline", str(path)]) == 0
@@ -1,11 +1,14 @@
 """Fixtures partagees pour tous les tests."""
 
+import asyncio
 from unittest.mock import MagicMock
 
+import httpx
 import pytest
 
 from wakastart_leads.crews.analysis.tools.apollo_tool import ApolloSearchTool
 from wakastart_leads.crews.analysis.tools.gamma_tool import GammaCreateTool
+from wakastart_leads.shared.tools import async_http
 from wakastart_leads.shared.tools.pappers_tool import PappersSearchTool
 from wakastart_leads.shared.tools.sirene_tool import SireneSearchTool
 
@@ -14,6 +17,14 @@ from wakastart_leads.shared.tools.sirene_tool import SireneSearchTool
 # ---------------------------------------------------------------------------
 
 
+@pytest.fixture(autouse=True)
+def _no_local_indexes(monkeypatch):
+    """Ignore les index Sirene, de noms et de domaines vus eventuellement construits sur le poste."""
+    monkeypatch.setenv("SIRENE_INDEX_ENABLED", "0")
+    monkeypatch.setenv("NAME_INDEX_ENABLED", "0")
+    monkeypatch.setenv("SEEN_INDEX_ENABLED", "0")
+
+
 @pytest.fixture()
 def mock_apollo_api_key(monkeypatch):
     """Injecte une cle API Apollo de test."""
@@ -94,6 +105,28 @@ def mock_response():
     return _make_response
 
 
+@pytest.fixture()
+def async_http_handler():
+    """
+    Installe un handler httpx (request -> Response) sur le client asynchrone partage.
+
+    A appeler depuis un test async : le client est celui de la boucle courante.
+    Retourne la liste des requetes recues.
+    """
+
+    def _install(handler):
+        requests_seen: list[httpx.Request] = []
+
+        def record(request: httpx.Request) -> httpx.Response:
+            requests_seen.append(request)
+            return handler(request)
+
+        async_http._clients[asyncio.get_running_loop()] = httpx.AsyncClient(transport=httpx.MockTransport(record))
+        return requests_seen
+
+    return _install
+
+
 # ---------------------------------------------------------------------------
 # Fixtures de donnees API - Apollo (People API Search)
 # ---------------------------------------------------------------------------
@@ -0,0 +1,106 @@
+"""Tests unitaires pour la cascade de modeles du scoring commercial."""
+
+from types import SimpleNamespace
+
+import pytest
+
+from wakastart_leads.crews.analysis import cascade
+from wakastart_leads.crews.analysis.cascade import (
+    DEFAULT_BAND,
+    format_cascade_stats,
+    is_cascade_enabled,
+    needs_review,
+    parse_score_signal,
+    previous_task_skipped,
+    uncertainty_band,
+)
+
+
+@pytest.fixture(autouse=True)
+def _reset_stats(monkeypatch):
+    monkeypatch.delenv("ANALYSIS_CASCADE_BAND", raising=False)
+    cascade.stats.clear()
+    yield
+    cascade.stats.clear()
+
+
+class TestConfiguration:
+    def test_disabled_by_default(self, monkeypatch):
+        monkeypatch.delenv("ANALYSIS_CASCADE", raising=False)
+        assert is_cascade_enabled() is False
+
+    def test_enabled(self, monkeypatch):
+        monkeypatch.setenv("ANALYSIS_CASCADE", "true")
+        assert is_cascade_enabled() is True
+
+    def test_default_band(self):
+        assert uncertainty_band() == DEFAULT_BAND
+
+    def test_custom_band_is_ordered(self, monkeypatch):
+        monkeypatch.setenv("ANALYSIS_CASCADE_BAND", "75 - 40")
+        assert uncertainty_band() == (40, 75)
+
+    def test_invalid_band_falls_back_to_default(self, monkeypatch):
+        monkeypatch.setenv("ANALYSIS_CASCADE_BAND", "haut")
+        assert uncertainty_band() == DEFAULT_BAND
+
+
+class TestParseScoreSignal:
+    def test_score_and_confidence(self):
+        assert parse_score_signal("Analyse...\nSCORE: 85 | CONFIANCE: Haute") == (85, "haute")
+
+    def test_last_signal_wins(self):
+        text = "SCORE: 40 | CONFIANCE: basse\n...\nSCORE: 92% | CONFIANCE: haute"
+        assert parse_score_signal(text) == (92, "haute")
+
+    def test_score_without_confidence(self):
+        assert parse_score_signal("score : 30") == (30, None)
+
+    def test_score_is_capped(self):
+        assert parse_score_signal("SCORE: 150 | CONFIANCE: haute") == (100, "haute")
+
+    def test_missing_signal(self):
+        assert parse_score_signal("Score de pertinence eleve") == (None, None)
+        assert parse_score_signal("") == (None, None)
+
+
+class TestNeedsReview:
+    @pytest.mark.parametrize(
+        "raw, expected",
+        [
+            ("SCORE: 95 | CONFIANCE: haute", False),
+            ("SCORE: 20 | CONFIANCE: moyenne", False),
+            ("SCORE: 65 | CONFIANCE: haute", True),
+            ("SCORE: 50 | CONFIANCE: haute", True),
+            ("SCORE: 80 | CONFIANCE: haute", True),
+            ("SCORE: 95 | CONFIANCE: basse", True),
+            ("Pas de signal", True),
+        ],
+    )
+    def test_decision(self, raw, expected):
+        assert needs_review(SimpleNamespace(raw=raw)) is expected
+
+    def test_custom_band(self, monkeypatch):
+        monkeypatch.setenv("ANALYSIS_CASCADE_BAND", "60-70")
+        assert needs_review(SimpleNamespace(raw="SCORE: 55 | CONFIANCE: haute")) is False
+
+    def test_stats(self):
+        needs_review(SimpleNamespace(raw="SCORE: 95 | CONFIANCE: haute"))
+        needs_review(SimpleNamespace(raw="SCORE: 65 | CONFIANCE: haute"))
+        needs_review(SimpleNamespace(raw="SCORE: 10 | CONFIANCE: haute"))
+        assert cascade.stats == {"accepted": 2, "reviewed": 1}
+        assert "2 score(s) accepte(s)" in format_cascade_stats()
+
+    def test_stats_unused(self):
+        assert format_cascade_stats() is None
+
+
+class TestGammaEscalation:
+    def test_skipped_review_runs_cheap_gamma(self):
+        from crewai.tasks.task_output import TaskOutput
+
+        # Sortie d'une tache conditionnelle sautee (ConditionalTask.get_skipped_task_output)
+        assert previous_task_skipped(TaskOutput(description="revue", raw="", agent="reviewer")) is True
+
+    def test_executed_task_skips_next_variant(self):
+        assert previous_task_skipped(SimpleNamespace(raw="Score revu : 72/100")) is False
@@ -1,5 +1,6 @@
 """Tests unitaires pour CompanyUrlAnalysisAutomationCrew (instanciation des agents, taches et crew)."""
 
+import inspect
 from unittest.mock import MagicMock, patch
 
 import pytest
@@ -15,7 +16,9 @@ AGENTS = [
     "economic_intelligence_analyst",
     "corporate_analyst_and_saas_qualifier",
     "wakastart_sales_engineer",
+    "wakastart_sales_reviewer",
     "gamma_webpage_creator",
+    "gamma_webpage_creator_premium",
     "lead_generation_expert",
     "data_compiler_and_reporter",
 ]
@@ -24,7 +27,9 @@ TASKS = [
     "extraction_and_macro_filtering",
     "origin_identification_and_saas_qualification",
     "commercial_analysis",
+    "commercial_analysis_review",
     "gamma_webpage_creation",
+    "gamma_webpage_creation_premium",
     "decision_makers_identification",
     "compile_final_company_analysis_report",
 ]
@@ -59,9 +64,10 @@ def _mock_constructors():
         patch(f"{M}.LLM", return_value=MagicMock()),
         patch(f"{M}.Agent", return_value=MagicMock()),
         patch(f"{M}.Task", return_value=MagicMock()),
+        patch(f"{M}.ConditionalTask", return_value=MagicMock()),
         patch(f"{M}.Crew", return_value=MagicMock()),
-        patch(f"{M}.SerperDevTool", return_value=MagicMock()),
-        patch(f"{M}.ScrapeWebsiteTool", return_value=MagicMock()),
+        patch(f"{M}.CachedSerperDevTool", return_value=MagicMock()),
+        patch(f"{M}.CachedScrapeWebsiteTool", return_value=MagicMock()),
         patch(f"{M}.SireneSearchTool", return_value=MagicMock()),
         patch(f"{M}.GammaCreateTool", return_value=MagicMock()),
         patch(f"{M}.ApolloSearchTool", return_value=MagicMock()),
@@ -87,9 +93,15 @@ class TestCrewAgents:
     def test_wakastart_sales_engineer(self, crew_instance):
         assert crew_instance.wakastart_sales_engineer() is not None
 
+    def test_wakastart_sales_reviewer(self, crew_instance):
+        assert crew_instance.wakastart_sales_reviewer() is not None
+
     def test_gamma_webpage_creator(self, crew_instance):
         assert crew_instance.gamma_webpage_creator() is not None
 
+    def test_gamma_webpage_creator_premium(self, crew_instance):
+        assert crew_instance.gamma_webpage_creator_premium() is not None
+
     def test_lead_generation_expert(self, crew_instance):
         assert crew_instance.lead_generation_expert() is not None
 
@@ -115,9 +127,15 @@ class TestCrewTasks:
     def test_commercial_analysis(self, crew_instance):
         assert crew_instance.commercial_analysis() is not None
 
+    def test_commercial_analysis_review(self, crew_instance):
+        assert crew_instance.commercial_analysis_review() is not None
+
     def test_gamma_webpage_creation(self, crew_instance):
         assert crew_instance.gamma_webpage_creation() is not None
 
+    def test_gamma_webpage_creation_premium(self, crew_instance):
+        assert crew_instance.gamma_webpage_creation_premium() is not None
+
     def test_decision_makers_identification(self, crew_instance):
         assert crew_instance.decision_makers_identification() is not None
 
@@ -145,3 +163,126 @@ class TestCrewMethod:
     def test_log_file_settable(self, crew_instance):
         crew_instance.log_file = "/tmp/test.json"
         assert crew_instance.log_file == "/tmp/test.json"
+
+    def test_default_prefetch_inputs_keeps_given_values(self, crew_instance):
+        inputs = crew_instance.default_prefetch_inputs({"url": "https://a.com", "prefetched_company_data": "x"})
+        assert inputs["prefetched_company_data"] == "x"
+        assert inputs["prefetched_decision_makers"] == "Aucune donnee pre-chargee."
+
+    def test_finalize_result_writes_registry_facts(self, crew_instance):
+        from wakastart_leads.shared.tools.registry import RegistryFacts
+        from wakastart_leads.shared.utils.parallel_runner import RunStatus, UrlResult
+
+        crew_instance.registry_facts = RegistryFacts(siren="309634954", creation_year="2015")
+        row = ",".join(["Acme", "https://acme.fr", "US", "2019"] + ["x"] * 19)
+        result = UrlResult("https://acme.fr", RunStatus.SUCCESS, f"```csv\n{row}\n```", None, 1.0)
+
+        crew_instance.finalize_result(result)
+
+        # Annee et nationalite de l'agent conservees, faits du registre dans result.facts
+        assert result.csv_row.split(",")[:4] == ["Acme", "https://acme.fr", "US", "2019"]
+        assert result.facts["siren"] == "309634954"
+        assert result.facts["creation_year"] == "2015"
+
+    def test_finalize_result_without_facts_is_noop(self, crew_instance):
+        from wakastart_leads.shared.utils.parallel_runner import RunStatus, UrlResult
+
+        result = UrlResult("https://acme.fr", RunStatus.SUCCESS, "raw", None, 1.0)
+        crew_instance.finalize_result(result)
+        assert result.csv_row == "raw"
+        assert result.facts == {}
+
+
+# ===========================================================================
+# Tests de la cascade de modeles
+# ===========================================================================
+
+
+class TestCrewCascade:
+    """Verifie le choix des modeles et la tache de revue selon ANALYSIS_CASCADE."""
+
+    @pytest.fixture()
+    def distinct_constructors(self):
+        """Constructeurs retournant un objet distinct par appel (identites comparables)."""
+
+        with (
+            patch(f"{M}.LLM", side_effect=lambda **kw: MagicMock(model=kw["model"])) as llm,
+            patch(f"{M}.Agent", side_effect=lambda **kw: MagicMock(llm=kw["llm"])),
+            patch(f"{M}.Task", side_effect=lambda **kw: MagicMock(context=[])),
+            patch(f"{M}.ConditionalTask", side_effect=lambda **kw: MagicMock(context=[])) as conditional,
+            patch(f"{M}.Crew", return_value=MagicMock()) as crew_cls,
+            patch(f"{M}.enable_prompt_caching", side_effect=lambda llm: llm),
+            patch(f"{M}.enable_response_cache"),
+            patch(f"{M}.CachedSerperDevTool"),
+            patch(f"{M}.CachedScrapeWebsiteTool"),
+            patch(f"{M}.SireneSearchTool"),
+            patch(f"{M}.GammaCreateTool"),
+            patch(f"{M}.ApolloSearchTool"),
+        ):
+            yield llm, conditional, crew_cls
+
+    def _build(self, crew_instance):
+        """Appelle crew() avec tous les agents et taches (sans le decorateur qui les reconstruit)."""
+        crew_instance.agents = [getattr(crew_instance, name)() for name in AGENTS]
+        crew_instance.tasks = []
+        for name in TASKS:
+            crew_task = getattr(crew_instance, name)()
+            crew_task.name = name
+            crew_instance.tasks.append(crew_task)
+        inspect.unwrap(type(crew_instance).crew)(crew_instance)
+
+    def test_default_uses_premium_models(self, crew_instance, distinct_constructors, monkeypatch):
+        monkeypatch.delenv("ANALYSIS_CASCADE", raising=False)
+        assert crew_instance.wakastart_sales_engineer().llm.model == "anthropic/claude-sonnet-4-5-20250929"
+        assert crew_instance.gamma_webpage_creator().llm.model == "gemini/gemini-2.5-pro"
+
+    def test_cascade_uses_cheap_first_model(self, crew_instance, distinct_constructors, monkeypatch):
+        monkeypatch.setenv("ANALYSIS_CASCADE", "1")
+        assert crew_instance.wakastart_sales_engineer().llm.model == "gemini/gemini-2.5-flash"
+        assert crew_instance.wakastart_sales_reviewer().llm.model == "anthropic/claude-sonnet-4-5-20250929"
+        assert crew_instance.gamma_webpage_creator().llm.model == "gemini/gemini-2.5-flash"
+        assert crew_instance.gamma_webpage_creator_premium().llm.model == "gemini/gemini-2.5-pro"
+
+    def test_review_task_uses_needs_review_condition(self, crew_instance, distinct_constructors):
+        from wakastart_leads.crews.analysis.cascade import needs_review
+
+        _, conditional, _ = distinct_constructors
+        crew_instance.commercial_analysis_review()
+        assert conditional.call_args.kwargs["condition"] is needs_review
+
+    def test_gamma_variants_conditional_in_cascade(self, crew_instance, distinct_constructors, monkeypatch):
+        from wakastart_leads.crews.analysis.cascade import previous_task_skipped
+
+        monkeypatch.setenv("ANALYSIS_CASCADE", "1")
+        _, conditional, _ = distinct_constructors
+        crew_instance.gamma_webpage_creation()
+        assert conditional.call_args.kwargs["condition"] is previous_task_skipped
+        crew_instance.gamma_webpage_creation_premium()
+        assert conditional.call_args.kwargs["condition"] is previous_task_skipped
+        assert conditional.call_args.kwargs["agent"] is crew_instance.gamma_webpage_creator_premium()
+
+    def test_crew_without_cascade_drops_review(self, crew_instance, distinct_constructors, monkeypatch):
+        monkeypatch.delenv("ANALYSIS_CASCADE", raising=False)
+        _, _, crew_cls = distinct_constructors
+        self._build(crew_instance)
+
+        kwargs = crew_cls.call_args.kwargs
+        cascade_tasks = ("commercial_analysis_review", "gamma_webpage_creation_premium")
+        assert [t.name for t in kwargs["tasks"]] == [t for t in TASKS if t not in cascade_tasks]
+        assert crew_instance.wakastart_sales_reviewer() not in kwargs["agents"]
+        assert crew_instance.gamma_webpage_creator_premium() not in kwargs["agents"]
+        assert len(kwargs["agents"]) == len(AGENTS) - 2
+
+    def test_crew_with_cascade_feeds_review_downstream(self, crew_instance, distinct_constructors, monkeypatch):
+        monkeypatch.setenv("ANALYSIS_CASCADE", "1")
+        _, _, crew_cls = distinct_constructors
+        self._build(crew_instance)
+
+        kwargs = crew_cls.call_args.kwargs
+        review = crew_instance.commercial_analysis_review()
+        assert review in kwargs["tasks"]
+        assert crew_instance.wakastart_sales_reviewer() in kwargs["agents"]
+        gamma_premium = crew_instance.gamma_webpage_creation_premium()
+        assert crew_instance.gamma_webpage_creation().context == [review]
+        assert gamma_premium.context == [review]
+        assert crew_instance.compile_final_company_analysis_report().context == [review, gamma_premium]
@@ -0,0 +1,154 @@
+"""Tests unitaires pour le pre-chargement des donnees avant kickoff."""
+
+import time
+from unittest.mock import MagicMock, call
+
+from wakastart_leads.crews.analysis.prefetch import (
+    NO_PREFETCH,
+    company_domain,
+    company_name_hint,
+    prefetch_company,
+    prefetch_company_data,
+)
+from wakastart_leads.crews.analysis.tools.apollo_tool import ApolloSearchTool
+from wakastart_leads.crews.analysis.tools.gamma_tool import GammaCreateTool
+from wakastart_leads.shared.tools.sirene_tool import SireneSearchTool
+from wakastart_leads.shared.tools.web_tools import CachedScrapeWebsiteTool
+
+
+def _tool(spec, attr, value=None, delay=0.0, error=None):
+    tool = MagicMock(spec=spec)
+
+    def run(*args, **kwargs):
+        time.sleep(delay)
+        if error:
+            raise error
+        return value
+
+    getattr(tool, attr).side_effect = run
+    return tool
+
+
+def _tools(delay=0.0):
+    return [
+        _tool(CachedScrapeWebsiteTool, "_run", "Acme - Logiciel SaaS", delay),
+        _tool(SireneSearchTool, "_run", "SIREN : 123456789", delay),
+        _tool(ApolloSearchTool, "_run", "Decideur 1: Jean Dupont", delay),
+        _tool(GammaCreateTool, "_resolve_company_logo", "https://wsrv.nl/?url=acme", delay),
+    ]
+
+
+class TestHelpers:
+    def test_company_domain(self):
+        assert company_domain("https://www.Acme-Sante.fr/produit") == "acme-sante.fr"
+
+    def test_company_name_hint(self):
+        assert company_name_hint("acme-sante.fr") == "acme sante"
+
+
+class TestPrefetchCompanyData:
+    def test_all_sections_injected(self):
+        tools = _tools()
+        inputs = prefetch_company_data("https://www.acme-sante.fr", tools)
+
+        assert "Acme - Logiciel SaaS" in inputs["prefetched_company_data"]
+        assert "123456789" in inputs["prefetched_company_data"]
+        assert "wsrv.nl" in inputs["prefetched_company_data"]
+        assert inputs["prefetched_decision_makers"] == "Decideur 1: Jean Dupont"
+        assert tools[0]._run.call_args_list[0] == call(website_url="https://www.acme-sante.fr")
+        tools[1]._run.assert_called_once_with(query="acme sante")
+        tools[2]._run.assert_called_once_with(domain="acme-sante.fr", company_name="acme sante")
+
+    def test_fetches_run_concurrently(self):
+        tools = _tools(delay=0.2)
+        tools[0] = _tool(CachedScrapeWebsiteTool, "_run", "Acme - SIREN 309634954", delay=0.2)
+        tools[1].fetch_unite_legale.return_value = UNITE_LEGALE
+        start = time.perf_counter()
+        prefetch_company_data("https://acme.fr", tools)
+        assert time.perf_counter() - start < 0.6
+
+    def test_failed_fetch_is_omitted(self):
+        tools = _tools()
+        tools[0] = _tool(CachedScrapeWebsiteTool, "_run", error=ConnectionError("DNS"))
+        inputs = prefetch_company_data("https://acme.fr", tools)
+        assert "PAGE D'ACCUEIL" not in inputs["prefetched_company_data"]
+        assert "123456789" in inputs["prefetched_company_data"]
+
+    def test_homepage_url_override(self):
+        tools = _tools()
+        prefetch_company_data("https://acme.fr", tools, homepage_url="http://127.0.0.1/site/acme")
+        assert tools[0]._run.call_args_list[0] == call(website_url="http://127.0.0.1/site/acme")
+
+    def test_no_tools(self):
+        assert prefetch_company_data("https://acme.fr", []) == {
+            "prefetched_company_data": NO_PREFETCH,
+            "prefetched_decision_makers": NO_PREFETCH,
+        }
+
+
+UNITE_LEGALE = {
+    "siren": "309634954",
+    "dateCreationUniteLegale": "2015-03-01",
+    "trancheEffectifsUniteLegale": "11",
+    "periodesUniteLegale": [
+        {"denominationUniteLegale": "ACME SANTE", "categorieJuridiqueUniteLegale": "5710"},
+    ],
+}
+
+OVH_UNITE_LEGALE = {"siren": "424761419", "periodesUniteLegale": [{"denominationUniteLegale": "OVH"}]}
+
+
+def _registry_tools(pages):
+    tools = _tools()
+    tools[0] = _tool(CachedScrapeWebsiteTool, "_run")
+    tools[0]._run.side_effect = lambda website_url: pages.get(website_url, "Page introuvable")
+    tools[1].fetch_unite_legale.return_value = UNITE_LEGALE
+    return tools
+
+
+class TestRegistryPrefetch:
+    def test_siren_from_homepage_resolved_without_llm(self):
+        tools = _registry_tools({"https://acme.fr": "Acme - SIREN 309 634 954 - RCS Paris"})
+        prefetched = prefetch_company("https://acme.fr", tools)
+
+        assert prefetched.registry.siren == "309634954"
+        assert prefetched.registry.creation_year == "2015"
+        tools[1].fetch_unite_legale.assert_called_once_with("309634954")
+        data = prefetched.inputs["prefetched_company_data"]
+        assert data.startswith("FAITS REGISTRE (Sirene")
+        assert "Annee de creation: 2015" in data
+        # La recherche Sirene par nom (ambigue) est remplacee par les faits du registre
+        assert "SIRENE (recherche sur le nom" not in data
+
+    def test_siren_from_legal_page(self):
+        tools = _registry_tools(
+            {"https://acme.fr": "Acme", "https://acme.fr/mentions-legales": "Acme SAS, RCS Lyon B 309634954"}
+        )
+        assert prefetch_company("https://acme.fr", tools).registry.siren == "309634954"
+
+    def test_hosting_provider_siren_skipped(self):
+        homepage = "Hebergeur : OVH SAS, RCS Lille 424 761 419. Editeur : Acme Sante, SIREN 309 634 954"
+        tools = _registry_tools({"https://acme-sante.fr": homepage})
+        tools[1].fetch_unite_legale.side_effect = lambda siren: (
+            OVH_UNITE_LEGALE if siren == "424761419" else UNITE_LEGALE
+        )
+        prefetched = prefetch_company("https://acme-sante.fr", tools)
+
+        assert prefetched.registry.siren == "309634954"
+        assert prefetched.registry.name == "ACME SANTE"
+
+    def test_no_matching_siren_injects_nothing(self):
+        tools = _registry_tools({"https://acme-sante.fr": "Hebergeur : OVH SAS, RCS Lille 424 761 419"})
+        tools[1].fetch_unite_legale.return_value = OVH_UNITE_LEGALE
+        prefetched = prefetch_company("https://acme-sante.fr", tools)
+
+        assert prefetched.registry is None
+        assert "FAITS REGISTRE" not in prefetched.inputs["prefetched_company_data"]
+
+    def test_no_siren_keeps_name_search(self):
+        tools = _registry_tools({"https://acme.fr": "Acme"})
+        prefetched = prefetch_company("https://acme.fr", tools)
+
+        assert prefetched.registry is None
+        tools[1].fetch_unite_legale.assert_not_called()
+        assert "SIRENE (recherche sur le nom" in prefetched.inputs["prefetched_company_data"]
@@ -1,7 +1,9 @@
 """Tests unitaires pour ApolloSearchTool."""
 
+import json
 from unittest.mock import patch
 
+import httpx
 import requests
 
 from wakastart_leads.crews.analysis.tools.apollo_tool import ApolloSearchInput
@@ -468,3 +470,92 @@ class TestApolloRun:
             boss_pos = result.find("Big Boss")
             dev_pos = result.find("Junior Dev")
             assert boss_pos < dev_pos or dev_pos == -1
+
+    def test_second_call_same_domain_served_from_memo(
+        self, apollo_tool, mock_apollo_api_key, mock_response,
+        apollo_search_response, apollo_enrich_ceo_response,
+        apollo_enrich_president_response, apollo_enrich_cto_response,
+    ):
+        """Pre-chargement puis appel de l'agent : un seul enrichissement (payant)."""
+        responses = [
+            mock_response(200, apollo_search_response),
+            mock_response(200, apollo_enrich_ceo_response),
+            mock_response(200, apollo_enrich_president_response),
+            mock_response(200, apollo_enrich_cto_response),
+        ]
+        with patch(self.PATCH_TARGET, side_effect=responses) as mock_post:
+            first = apollo_tool._run(self.VALID_DOMAIN, self.VALID_COMPANY)
+            second = apollo_tool._run(" Stripe.com ", self.VALID_COMPANY)
+        assert first == second
+        assert mock_post.call_count == 4
+
+    def test_errors_not_memoized(self, apollo_tool, mock_apollo_api_key):
+        with patch(self.PATCH_TARGET, side_effect=requests.exceptions.Timeout):
+            assert apollo_tool._run(self.VALID_DOMAIN, self.VALID_COMPANY).startswith("Erreur")
+        assert self.VALID_DOMAIN not in apollo_tool._results
+
+
+# ===========================================================================
+# Tests _arun (client HTTP asynchrone)
+# ===========================================================================
+
+
+class TestApolloArun:
+    VALID_DOMAIN = "stripe.com"
+    VALID_COMPANY = "Stripe"
+
+    async def test_success_full_flow(
+        self, apollo_tool, mock_apollo_api_key, async_http_handler,
+        apollo_search_response, apollo_enrich_ceo_response,
+        apollo_enrich_president_response, apollo_enrich_cto_response,
+    ):
+        """Enrichissements simultanes : reponse choisie d'apres l'ID demande."""
+        enrich_by_id = {
+            r["person"]["id"]: r
+            for r in (apollo_enrich_ceo_response, apollo_enrich_president_response, apollo_enrich_cto_response)
+        }
+
+        def handler(request):
+            if request.url.path.endswith(apollo_tool.SEARCH_ENDPOINT):
+                return httpx.Response(200, json=apollo_search_response)
+            return httpx.Response(200, json=enrich_by_id[json.loads(request.content)["id"]])
+
+        seen = async_http_handler(handler)
+        result = await apollo_tool._arun(self.VALID_DOMAIN, self.VALID_COMPANY)
+
+        assert len(seen) == 4
+        assert "Patrick Collison" in result
+        assert "3 contacts" in result
+
+    async def test_no_search_results(
+        self, apollo_tool, mock_apollo_api_key, async_http_handler, apollo_search_empty_response
+    ):
+        seen = async_http_handler(lambda request: httpx.Response(200, json=apollo_search_empty_response))
+        result = await apollo_tool._arun("unknown.com", "Unknown")
+        assert "Aucun decideur trouve" in result
+        # Recherche filtree puis fallback sans filtres
+        assert len(seen) == 2
+
+    async def test_http_401(self, apollo_tool, mock_apollo_api_key, async_http_handler):
+        async_http_handler(lambda request: httpx.Response(401, text="Unauthorized"))
+        result = await apollo_tool._arun(self.VALID_DOMAIN, self.VALID_COMPANY)
+        assert "invalide" in result.lower()
+
+    async def test_result_memoized(
+        self, apollo_tool, mock_apollo_api_key, async_http_handler, apollo_search_response, apollo_enrich_ceo_response
+    ):
+        def handler(request):
+            if request.url.path.endswith(apollo_tool.SEARCH_ENDPOINT):
+                return httpx.Response(200, json=apollo_search_response)
+            return httpx.Response(200, json=apollo_enrich_ceo_response)
+
+        seen = async_http_handler(handler)
+        first = await apollo_tool._arun(self.VALID_DOMAIN, self.VALID_COMPANY)
+        calls = len(seen)
+        assert await apollo_tool._arun(self.VALID_DOMAIN, self.VALID_COMPANY) == first
+        assert len(seen) == calls
+
+    async def test_missing_api_key(self, apollo_tool, clear_all_api_keys):
+        result = await apollo_tool._arun(self.VALID_DOMAIN, self.VALID_COMPANY)
+        assert "APOLLO_API_KEY non configuree" in result
+
@@ -1,8 +1,10 @@
 """Tests unitaires pour GammaCreateTool."""
 
 import os
+from typing import ClassVar
 from unittest.mock import MagicMock, patch
 
+import httpx
 import pytest
 import requests
 from pydantic import ValidationError
@@ -14,6 +16,7 @@ from wakastart_leads.crews.analysis.tools.gamma_tool import (
     WAKASTELLAR_LOGO_URL,
     GammaCreateInput,
     GammaCreateTool,
+    _warn_linkener_not_configured,
 )
 
 # ===========================================================================
@@ -116,6 +119,15 @@ class TestResolveCompanyLogo:
             call_url = mock_head.call_args[0][0]
             assert call_url == f"{UNAVATAR_BASE}/testcorp.com"
 
+    def test_logo_resolved_once_per_domain(self, gamma_tool):
+        mock_resp = MagicMock()
+        mock_resp.status_code = 200
+        with patch(self.PATCH_HEAD, return_value=mock_resp) as mock_head:
+            first = gamma_tool._resolve_company_logo("testcorp.com", "TestCorp")
+            second = gamma_tool._resolve_company_logo("https://www.testcorp.com/", "TestCorp")
+        assert first == second
+        assert mock_head.call_count == 1
+
 
 # ===========================================================================
 # Tests _build_enhanced_prompt
@@ -619,6 +631,15 @@ class TestCreateLinkenerUrl:
         result = gamma_tool._create_linkener_url("https://gamma.app/docs/xxx", "TestCorp")
         assert result is None
 
+    @patch.dict(os.environ, {}, clear=True)
+    @patch("wakastart_leads.crews.analysis.tools.gamma_tool.linkener_logger")
+    def test_missing_env_warned_once(self, mock_logger, gamma_tool):
+        """L'absence de configuration n'est signalee qu'une fois, pas a chaque appel."""
+        _warn_linkener_not_configured.cache_clear()
+        gamma_tool._create_linkener_url("https://gamma.app/docs/xxx", "TestCorp")
+        gamma_tool._create_linkener_url("https://gamma.app/docs/yyy", "OtherCorp")
+        mock_logger.warning.assert_called_once()
+
     @patch.dict(
         os.environ,
         {
@@ -701,3 +722,99 @@ class TestCreateLinkenerUrl:
         result = gamma_tool._create_linkener_url("https://gamma.app/docs/xxx", "TestCorp")
 
         assert result is None
+
+
+# ===========================================================================
+# Tests _arun (client HTTP asynchrone)
+# ===========================================================================
+
+
+class TestGammaArun:
+    PATCH_SLEEP = "wakastart_leads.crews.analysis.tools.gamma_tool.asyncio.sleep"
+    LINKENER_ENV: ClassVar[dict[str, str]] = {
+        "LINKENER_API_BASE": "https://url.wakastart.com/api",
+        "LINKENER_USERNAME": "testuser",
+        "LINKENER_PASSWORD": "testpass",
+    }
+
+    @staticmethod
+    def _handler(statuses, linkener_status=201):
+        """Unavatar (HEAD), Gamma (POST + polling) et Linkener simules."""
+        polls = iter(statuses)
+
+        def handler(request):
+            if request.url.host == "unavatar.io":
+                return httpx.Response(200)
+            if request.url.path.endswith("/generations/from-template"):
+                return httpx.Response(200, json={"generationId": "gen123"})
+            if "/generations/" in request.url.path:
+                return httpx.Response(200, json=next(polls))
+            if request.url.path.endswith("/auth/new_token"):
+                return httpx.Response(200, text="token")
+            return httpx.Response(linkener_status)
+
+        return handler
+
+    async def test_missing_api_key(self, gamma_tool, clear_all_api_keys):
+        result = await gamma_tool._arun("prompt", "TestCorp", "testcorp.com")
+        assert "GAMMA_API_KEY non configuree" in result
+
+    async def test_polls_until_completed(
+        self, gamma_tool, mock_gamma_api_key, async_http_handler, gamma_completed_status
+    ):
+        seen = async_http_handler(self._handler([{"status": "pending"}, gamma_completed_status]))
+        with patch.dict(os.environ, {"LINKENER_API_BASE": ""}), patch(self.PATCH_SLEEP) as mock_sleep:
+            result = await gamma_tool._arun("prompt", "TestCorp", "testcorp.com")
+
+        assert result == "https://gamma.app/docs/abc123"
+        assert mock_sleep.await_count == 1
+        post = next(r for r in seen if r.method == "POST")
+        assert post.headers["X-API-KEY"] == "test-gamma-key-12345"
+
+    async def test_short_url(self, gamma_tool, mock_gamma_api_key, async_http_handler, gamma_completed_status):
+        async_http_handler(self._handler([gamma_completed_status]))
+        with patch.dict(os.environ, self.LINKENER_ENV), patch(self.PATCH_SLEEP):
+            result = await gamma_tool._arun("prompt", "France Care", "francecare.fr")
+        assert result == "https://url.wakastart.com/france-care"
+
+    async def test_slug_conflict_retried_once(self, gamma_tool, async_http_handler):
+        statuses = iter([409, 201])
+
+        def handler(request):
+            if request.url.path.endswith("/auth/new_token"):
+                return httpx.Response(200, text="token")
+            return httpx.Response(next(statuses))
+
+        async_http_handler(handler)
+        with (
+            patch.dict(os.environ, self.LINKENER_ENV),
+            patch("wakastart_leads.crews.analysis.tools.gamma_tool.time.time", return_value=1234567890.123),
+        ):
+            result = await gamma_tool._acreate_linkener_url("https://gamma.app/docs/xxx", "TestCorp")
+        assert result == "https://url.wakastart.com/testcorp-890"
+
+    async def test_generation_failed(self, gamma_tool, mock_gamma_api_key, async_http_handler):
+        async_http_handler(self._handler([{"status": "failed", "error": "quota"}]))
+        with patch(self.PATCH_SLEEP):
+            result = await gamma_tool._arun("prompt", "TestCorp", "testcorp.com")
+        assert result == "Erreur: Generation Gamma echouee: quota"
+
+    async def test_http_403(self, gamma_tool, mock_gamma_api_key, async_http_handler):
+        def handler(request):
+            if request.method == "HEAD":
+                return httpx.Response(404)
+            return httpx.Response(403, text="Forbidden")
+
+        async_http_handler(handler)
+        result = await gamma_tool._arun("prompt", "TestCorp", "testcorp.com")
+        assert "permissions" in result.lower()
+
+    async def test_timeout(self, gamma_tool, mock_gamma_api_key, async_http_handler):
+        def handler(request):
+            if request.method == "HEAD":
+                return httpx.Response(200)
+            raise httpx.ReadTimeout("timeout", request=request)
+
+        async_http_handler(handler)
+        result = await gamma_tool._arun("prompt", "TestCorp", "testcorp.com")
+        assert "Timeout" in result
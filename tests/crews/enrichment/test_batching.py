@@ -0,0 +1,125 @@
+"""Tests unitaires pour la taille de batch adaptative de l'enrichissement."""
+
+from types import SimpleNamespace
+
+from wakastart_leads.crews.enrichment.batching import (
+    CEILING_PROBE,
+    AdaptiveBatchSizer,
+    estimate_output_tokens,
+    format_batch_stats,
+    observed_output_tokens,
+)
+
+
+def _healthy(sizer: AdaptiveBatchSizer, tokens_per_url: int = 100, latency: float = 10.0) -> int:
+    size = sizer.size
+    return sizer.record(size, size, size * tokens_per_url, latency)
+
+
+class TestEstimateOutputTokens:
+    def test_estimate(self):
+        assert estimate_output_tokens("a" * 400) == 100
+
+    def test_empty(self):
+        assert estimate_output_tokens("") == 0
+        assert estimate_output_tokens(None) == 0
+
+    def test_observed_uses_real_completion_tokens(self):
+        output = SimpleNamespace(raw="a" * 400, token_usage=SimpleNamespace(completion_tokens=2500))
+        assert observed_output_tokens(output) == 2500
+
+    def test_observed_falls_back_to_estimate(self):
+        assert observed_output_tokens(SimpleNamespace(raw="a" * 400, token_usage=None)) == 100
+        output = SimpleNamespace(raw="a" * 400, token_usage=SimpleNamespace(completion_tokens=0))
+        assert observed_output_tokens(output) == 100
+
+
+class TestAdaptiveBatchSizer:
+    def test_initial_size_is_clamped(self):
+        assert AdaptiveBatchSizer(initial=80, max_size=50).size == 50
+        assert AdaptiveBatchSizer(initial=0, min_size=2).size == 2
+
+    def test_next_size_bounded_by_remaining(self):
+        sizer = AdaptiveBatchSizer(initial=20)
+        assert sizer.next_size(7) == 7
+        assert sizer.next_size(100) == 20
+
+    def test_grows_when_healthy(self):
+        sizer = AdaptiveBatchSizer(initial=4, max_size=50)
+        assert _healthy(sizer) == 5
+        assert _healthy(sizer) == 6
+        sizer = AdaptiveBatchSizer(initial=20, max_size=50)
+        assert _healthy(sizer) == 25
+
+    def test_never_exceeds_max(self):
+        sizer = AdaptiveBatchSizer(initial=45, max_size=50)
+        for _ in range(5):
+            _healthy(sizer)
+        assert sizer.size == 50
+
+    def test_parse_failure_halves(self):
+        sizer = AdaptiveBatchSizer(initial=20)
+        assert sizer.record(20, 0, 0, 30.0) == 10
+
+    def test_missing_results_count_as_failure(self):
+        sizer = AdaptiveBatchSizer(initial=20)
+        assert sizer.record(20, 15, 3000, 30.0) == 10
+
+    def test_failure_respects_min(self):
+        sizer = AdaptiveBatchSizer(initial=3, min_size=2)
+        assert sizer.record(3, 0, 0, 1.0) == 2
+
+    def test_failed_size_becomes_ceiling(self):
+        sizer = AdaptiveBatchSizer(initial=20)
+        sizer.record(20, 0, 0, 30.0)
+        # 10 -> 12 -> 15 -> 18 -> 19 (plafond)
+        for _ in range(5):
+            _healthy(sizer)
+        assert sizer.size == 19
+        assert sizer.ceiling == 19
+
+    def test_ceiling_raised_after_probes(self):
+        sizer = AdaptiveBatchSizer(initial=20)
+        sizer.record(20, 0, 0, 30.0)
+        while sizer.size < sizer.ceiling:
+            _healthy(sizer)
+        for _ in range(CEILING_PROBE):
+            _healthy(sizer)
+        assert sizer.ceiling == 20
+
+    def test_token_budget_limits_size(self):
+        sizer = AdaptiveBatchSizer(initial=20, max_size=100, output_token_budget=10_000)
+        # 500 tokens/URL : 10 000 * 0.7 / 500 = 14 URLs
+        assert sizer.record(20, 20, 10_000, 30.0) == 14
+
+    def test_slow_batch_shrinks(self):
+        sizer = AdaptiveBatchSizer(initial=20, target_latency=60.0)
+        assert sizer.record(20, 20, 2000, 120.0) == 15
+
+    def test_latency_ignored_without_target(self):
+        sizer = AdaptiveBatchSizer(initial=20, target_latency=None)
+        assert sizer.record(20, 20, 2000, 10_000.0) == 25
+
+    def test_converges_to_largest_safe_batch(self):
+        # Simulation : tout batch de plus de 30 URLs produit un JSON tronque
+        sizer = AdaptiveBatchSizer(initial=10, max_size=100, target_latency=None)
+        sizes = []
+        for _ in range(60):
+            size = sizer.next_size(1000)
+            sizes.append(size)
+            sizer.record(size, size if size <= 30 else 0, 0, 10.0)
+        assert max(sizes[-20:]) <= 31
+        assert sum(sizes[-20:]) / 20 >= 25
+
+
+class TestFormatBatchStats:
+    def test_unused(self):
+        assert format_batch_stats(AdaptiveBatchSizer()) is None
+
+    def test_summary(self):
+        sizer = AdaptiveBatchSizer(initial=10)
+        sizer.record(10, 10, 1000, 5.0)
+        sizer.record(12, 0, 0, 5.0)
+        line = format_batch_stats(sizer)
+        assert "2 batch(s), 1 en echec" in line
+        assert "taille 10-12" in line
@@ -0,0 +1,70 @@
+"""Tests unitaires pour la lecture tolerante des reponses d'enrichissement."""
+
+import json
+
+from wakastart_leads.crews.enrichment.parsing import match_batch_results, salvage_json_objects
+
+
+def _entry(url: str) -> dict:
+    return {"url": url, "nationalite": "FR", "solution_saas": "SaaS", "pertinence": "80 %", "explication": "ok"}
+
+
+class TestSalvageJsonObjects:
+    def test_valid_array(self):
+        entries = [_entry("a.fr"), _entry("b.fr")]
+        assert salvage_json_objects(json.dumps(entries)) == entries
+
+    def test_code_fences(self):
+        raw = "```json\n" + json.dumps([_entry("a.fr")]) + "\n```"
+        assert salvage_json_objects(raw) == [_entry("a.fr")]
+
+    def test_surrounding_text(self):
+        raw = "Voici les resultats :\n" + json.dumps([_entry("a.fr")]) + "\nFin."
+        assert salvage_json_objects(raw) == [_entry("a.fr")]
+
+    def test_truncated_output_keeps_complete_objects(self):
+        raw = json.dumps([_entry("a.fr"), _entry("b.fr"), _entry("c.fr")])
+        truncated = raw[: raw.index('"c.fr"') + 10]
+        assert salvage_json_objects(truncated) == [_entry("a.fr"), _entry("b.fr")]
+
+    def test_invalid_object_is_skipped(self):
+        raw = "[" + json.dumps(_entry("a.fr")) + ', {"url": "b.fr", "pertinence": 80 %}, ' + json.dumps(_entry("c.fr"))
+        assert salvage_json_objects(raw) == [_entry("a.fr"), _entry("c.fr")]
+
+    def test_raw_newline_in_string(self):
+        raw = '[{"url": "a.fr", "explication": "ligne 1\nligne 2"}]'
+        assert salvage_json_objects(raw)[0]["explication"] == "ligne 1\nligne 2"
+
+    def test_single_object(self):
+        assert salvage_json_objects(json.dumps(_entry("a.fr"))) == [_entry("a.fr")]
+
+    def test_empty_or_unreadable(self):
+        assert salvage_json_objects("") == []
+        assert salvage_json_objects(None) == []
+        assert salvage_json_objects("Aucun resultat") == []
+
+
+class TestMatchBatchResults:
+    def test_matches_normalized_urls(self):
+        batch = ["https://www.a.fr", "https://b.fr"]
+        matched, missing = match_batch_results([_entry("a.fr"), _entry("https://b.fr/")], batch)
+        assert [e["url"] for e in matched] == ["https://www.a.fr", "https://b.fr"]
+        assert missing == []
+
+    def test_matches_by_domain(self):
+        matched, missing = match_batch_results([_entry("https://a.fr/produit")], ["https://a.fr"])
+        assert matched[0]["url"] == "https://a.fr"
+        assert matched[0]["pertinence"] == "80 %"
+        assert missing == []
+
+    def test_missing_urls(self):
+        batch = ["https://a.fr", "https://b.fr", "https://c.fr"]
+        _, missing = match_batch_results([_entry("b.fr")], batch)
+        assert missing == ["https://a.fr", "https://c.fr"]
+
+    def test_ignores_unknown_duplicates_and_urlless(self):
+        results = [_entry("a.fr"), _entry("a.fr") | {"pertinence": "10 %"}, _entry("other.com"), {"nationalite": "FR"}]
+        matched, missing = match_batch_results(results, ["https://a.fr"])
+        assert len(matched) == 1
+        assert matched[0]["pertinence"] == "80 %"
+        assert missing == []
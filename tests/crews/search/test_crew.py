@@ -21,9 +21,10 @@ def _mock_search_constructors():
         patch(f"{SM}.Agent", return_value=MagicMock()),
         patch(f"{SM}.Task", return_value=MagicMock()),
         patch(f"{SM}.Crew", return_value=MagicMock()),
-        patch(f"{SM}.SerperDevTool", return_value=MagicMock()),
-        patch(f"{SM}.ScrapeWebsiteTool", return_value=MagicMock()),
+        patch(f"{SM}.CachedSerperDevTool", return_value=MagicMock()),
+        patch(f"{SM}.CachedScrapeWebsiteTool", return_value=MagicMock()),
         patch(f"{SM}.SireneSearchTool", return_value=MagicMock()),
+        patch(f"{SM}.PappersBulkSearchTool", return_value=MagicMock()),
     ):
         yield
 
@@ -119,3 +120,18 @@ class TestSearchCrewMethods:
 
     def test_log_file_default_none(self, search_crew_instance):
         assert search_crew_instance.log_file is None
+
+    def test_deep_scan_output_file_override(self, search_crew_instance):
+        """Chaque sous-recherche parallele ecrit sa propre sortie brute."""
+        search_crew_instance.output_file = "/tmp/search_results_raw_2.json"
+        with patch(f"{SM}.Task", return_value=MagicMock()) as mock_task:
+            search_crew_instance.search_saas_deep_scan()
+        assert mock_task.call_args.kwargs["output_file"] == "/tmp/search_results_raw_2.json"
+
+    def test_seen_indexes_passed_to_serper_tool(self, search_crew_instance):
+        """Les domaines deja connus sont retires des resultats Serper des la decouverte."""
+        seen = [MagicMock()]
+        search_crew_instance.seen_indexes = seen
+        with patch(f"{SM}.CachedSerperDevTool", return_value=MagicMock()) as mock_tool:
+            search_crew_instance.saas_discovery_scout()
+        mock_tool.assert_called_once_with(exclude_domains=seen)
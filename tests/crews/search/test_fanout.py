@@ -0,0 +1,112 @@
+"""Tests unitaires pour le decoupage des criteres en sous-recherches."""
+
+import threading
+import time
+
+from wakastart_leads.crews.search.fanout import merge_urls, parse_url_list, run_subsearches, split_criteria
+
+CRITERIA = {
+    "keywords": ["SaaS sante", "CRM medical", "healthtech France"],
+    "sector": "sante",
+    "geographic_zone": "France",
+    "creation_year_min": 2018,
+    "max_results": 30,
+}
+
+
+class TestSplitCriteria:
+    def test_one_subsearch_per_keyword(self):
+        subs = split_criteria(CRITERIA)
+        assert [s["keywords"] for s in subs] == [["SaaS sante"], ["CRM medical"], ["healthtech France"]]
+        assert all(s["sector"] == "sante" and s["creation_year_min"] == 2018 for s in subs)
+        assert all(s["max_results"] == 10 for s in subs)
+
+    def test_keywords_times_zones(self):
+        subs = split_criteria({**CRITERIA, "keywords": ["a", "b"], "geographic_zone": "France, Belgique"})
+        assert [(s["keywords"][0], s["geographic_zone"]) for s in subs] == [
+            ("a", "France"),
+            ("a", "Belgique"),
+            ("b", "France"),
+            ("b", "Belgique"),
+        ]
+        assert subs[0]["max_results"] == 8
+
+    def test_keywords_as_string(self):
+        subs = split_criteria({"keywords": "SaaS RH; paie", "max_results": 10})
+        assert [s["keywords"] for s in subs] == [["SaaS RH"], ["paie"]]
+
+    def test_nothing_to_split(self):
+        criteria = {"keywords": ["SaaS"], "geographic_zone": "France"}
+        assert split_criteria(criteria) == [criteria]
+        assert split_criteria({}) == [{}]
+
+    def test_max_subsearches(self):
+        assert len(split_criteria(CRITERIA, max_subsearches=2)) == 2
+
+    def test_does_not_mutate_input(self):
+        criteria = dict(CRITERIA)
+        split_criteria(criteria)
+        assert criteria == CRITERIA
+
+
+class TestParseUrlList:
+    def test_json_list(self):
+        assert parse_url_list('["https://a.fr", " b.fr ", 3, ""]') == ["https://a.fr", "b.fr"]
+
+    def test_code_fence(self):
+        assert parse_url_list('```json\n["https://a.fr"]\n```') == ["https://a.fr"]
+
+    def test_unreadable(self):
+        assert parse_url_list("pas du json") is None
+        assert parse_url_list('{"url": "https://a.fr"}') is None
+
+
+class TestMergeUrls:
+    def test_dedupes_with_normalize_url(self):
+        merged = merge_urls([["https://www.acme.fr/", "https://beta.io"], ["acme.fr", "http://gamma.com"]])
+        assert merged == ["https://www.acme.fr/", "https://beta.io", "http://gamma.com"]
+
+    def test_interleaves_before_limit(self):
+        merged = merge_urls([["a1.fr", "a2.fr", "a3.fr"], ["b1.fr", "b2.fr"]], limit=3)
+        assert merged == ["https://a1.fr", "https://b1.fr", "https://a2.fr"]
+
+    def test_empty(self):
+        assert merge_urls([]) == []
+        assert merge_urls([[], []]) == []
+
+
+class TestRunSubsearches:
+    def test_results_in_input_order(self):
+        def run_one(index, sub):
+            time.sleep(0.01 * (3 - index))
+            return [f"https://{sub['keywords'][0]}.fr"]
+
+        subs = [{"keywords": [k]} for k in ("a", "b", "c")]
+        assert run_subsearches(subs, run_one, max_workers=3) == [["https://a.fr"], ["https://b.fr"], ["https://c.fr"]]
+
+    def test_bounded_concurrency(self):
+        active = 0
+        peak = 0
+        lock = threading.Lock()
+
+        def run_one(index, sub):
+            nonlocal active, peak
+            with lock:
+                active += 1
+                peak = max(peak, active)
+            time.sleep(0.02)
+            with lock:
+                active -= 1
+            return []
+
+        run_subsearches([{}] * 8, run_one, max_workers=3)
+        assert 1 < peak <= 3
+
+    def test_failed_subsearch_is_empty(self, capsys):
+        def run_one(index, sub):
+            if index == 1:
+                raise RuntimeError("quota")
+            return ["https://ok.fr"]
+
+        assert run_subsearches([{}, {}, {}], run_one, max_workers=2) == [["https://ok.fr"], [], ["https://ok.fr"]]
+        assert "Sous-recherche 2/3 echouee: quota" in capsys.readouterr().out
@@ -0,0 +1,86 @@
+"""Tests pour le client HTTP asynchrone partage et le pont `_arun` des outils."""
+
+import asyncio
+
+import httpx
+import pytest
+from crewai.tools.structured_tool import ToolUsageLimitExceededError
+from pydantic import BaseModel, Field
+
+from wakastart_leads.shared.tools.async_http import (
+    AsyncStructuredTool,
+    AsyncTool,
+    aclose_async_client,
+    get_async_client,
+)
+
+
+class EchoInput(BaseModel):
+    query: str = Field(..., description="Texte")
+
+
+class EchoTool(AsyncTool):
+    name: str = "echo"
+    description: str = "Renvoie la requete."
+    args_schema: type[BaseModel] = EchoInput
+
+    def _run(self, query: str) -> str:
+        return f"sync:{query}"
+
+    async def _arun(self, query: str) -> str:
+        await asyncio.sleep(0)
+        return f"async:{query}"
+
+
+class TestAsyncClient:
+    async def test_client_shared_within_loop(self):
+        client = get_async_client()
+        assert get_async_client() is client
+        await aclose_async_client()
+        assert client.is_closed
+
+    async def test_new_client_after_close(self):
+        client = get_async_client()
+        await aclose_async_client()
+        other = get_async_client()
+        assert other is not client
+        await aclose_async_client()
+
+    def test_one_client_per_loop(self):
+        async def grab() -> httpx.AsyncClient:
+            client = get_async_client()
+            await aclose_async_client()
+            return client
+
+        assert asyncio.run(grab()) is not asyncio.run(grab())
+
+    async def test_close_without_client(self):
+        await aclose_async_client()
+
+    def test_max_connections_from_env(self, monkeypatch):
+        monkeypatch.setenv("HTTP_MAX_CONNECTIONS", "7")
+
+        async def limits() -> int:
+            client = get_async_client()
+            pool = client._transport._pool
+            await aclose_async_client()
+            return pool._max_connections
+
+        assert asyncio.run(limits()) == 7
+
+
+class TestAsyncTool:
+    def test_structured_tool_type(self):
+        assert isinstance(EchoTool().to_structured_tool(), AsyncStructuredTool)
+
+    def test_sync_path_uses_run(self):
+        assert EchoTool().to_structured_tool().invoke({"query": "x"}) == "sync:x"
+
+    async def test_async_path_uses_arun(self):
+        assert await EchoTool().to_structured_tool().ainvoke({"query": "x"}) == "async:x"
+
+    async def test_async_path_counts_usage(self):
+        tool = EchoTool(max_usage_count=1).to_structured_tool()
+        await tool.ainvoke({"query": "x"})
+        with pytest.raises(ToolUsageLimitExceededError):
+            await tool.ainvoke({"query": "y"})
@@ -1,10 +1,19 @@
 """Tests unitaires pour PappersSearchTool."""
 
+import asyncio
+import threading
+import time
 from unittest.mock import patch
 
+import httpx
 import requests
 
-from wakastart_leads.shared.tools.pappers_tool import PappersSearchInput
+from wakastart_leads.shared.tools.pappers_tool import (
+    PappersBulkSearchTool,
+    PappersLookup,
+    PappersSearchInput,
+    _bulk_session,
+)
 
 # ===========================================================================
 # Tests d'instanciation
@@ -233,3 +242,199 @@ class TestPappersRunGenericException:
         with patch(self.PATCH_TARGET, side_effect=ValueError("unexpected")):
             result = pappers_tool._run("WakaStellar")
             assert "inattendue" in result.lower()
+
+
+# ===========================================================================
+# Tests fetch_entreprise - JSON brut pour le chemin deterministe
+# ===========================================================================
+
+
+class TestPappersFetchEntreprise:
+    PATCH_TARGET = "wakastart_leads.shared.tools.pappers_tool.requests.get"
+
+    def test_returns_raw_json(self, pappers_tool, mock_pappers_api_key, mock_response, pappers_company_detail):
+        with patch(self.PATCH_TARGET, return_value=mock_response(200, pappers_company_detail)) as mock_get:
+            data = pappers_tool.fetch_entreprise("123456789")
+        assert data["date_creation"] == "2020-01-15"
+        assert mock_get.call_args.kwargs["params"] == {"siren": "123456789"}
+
+    def test_none_without_key(self, pappers_tool, clear_all_api_keys):
+        assert pappers_tool.fetch_entreprise("123456789") is None
+
+    def test_none_on_error(self, pappers_tool, mock_pappers_api_key, mock_response):
+        with patch(self.PATCH_TARGET, return_value=mock_response(500, text="boom")):
+            assert pappers_tool.fetch_entreprise("123456789") is None
+
+
+# ===========================================================================
+# Tests search_many - recherche groupee
+# ===========================================================================
+
+
+class TestPappersSearchMany:
+    PATCH_TARGET = "wakastart_leads.shared.tools.pappers_tool.requests.Session.get"
+
+    def test_siren_and_name_keyed_by_input(
+        self, pappers_tool, mock_pappers_api_key, mock_response, pappers_company_detail, pappers_search_results
+    ):
+        def fake_get(url, params=None, timeout=None):
+            if url.endswith("/entreprise"):
+                return mock_response(200, pappers_company_detail)
+            return mock_response(200, pappers_search_results)
+
+        with patch(self.PATCH_TARGET, side_effect=fake_get):
+            lookups = pappers_tool.search_many(["123 456 789", "WakaTest"])
+
+        assert list(lookups) == ["123 456 789", "WakaTest"]
+        assert lookups["123 456 789"].siren == "123456789"
+        assert lookups["123 456 789"].data["code_naf"] == "6201Z"
+        # Nom : meilleur resultat de la recherche
+        assert lookups["WakaTest"].siren == "123456789"
+        assert lookups["WakaTest"].summary()["ville"] == "Paris"
+
+    def test_duplicates_fetched_once(self, pappers_tool, mock_pappers_api_key, mock_response, pappers_company_detail):
+        with patch(self.PATCH_TARGET, return_value=mock_response(200, pappers_company_detail)) as mock_get:
+            lookups = pappers_tool.search_many(["123456789", " 123456789 ", "", "123456789"])
+        assert list(lookups) == ["123456789"]
+        assert mock_get.call_count == 1
+
+    def test_runs_concurrently(self, pappers_tool, mock_pappers_api_key, mock_response, pappers_company_detail):
+        active = 0
+        peak = 0
+        lock = threading.Lock()
+
+        def slow_get(url, params=None, timeout=None):
+            nonlocal active, peak
+            with lock:
+                active += 1
+                peak = max(peak, active)
+            time.sleep(0.02)
+            with lock:
+                active -= 1
+            return mock_response(200, pappers_company_detail)
+
+        with patch(self.PATCH_TARGET, side_effect=slow_get):
+            lookups = pappers_tool.search_many([f"Entreprise {i}" for i in range(12)], max_workers=4)
+        assert len(lookups) == 12
+        assert 1 < peak <= 4
+
+    def test_not_found_and_errors(self, pappers_tool, mock_pappers_api_key, mock_response):
+        def fake_get(url, params=None, timeout=None):
+            if params.get("siren") == "111111111":
+                return mock_response(404)
+            if params.get("siren") == "222222222":
+                raise requests.exceptions.ConnectionError("down")
+            if params.get("siren") == "333333333":
+                return mock_response(401, text="unauthorized")
+            return mock_response(200, {"resultats": []})
+
+        with patch(self.PATCH_TARGET, side_effect=fake_get):
+            lookups = pappers_tool.search_many(["111111111", "222222222", "333333333", "Inconnue"])
+
+        assert not lookups["111111111"].found and lookups["111111111"].error is None
+        assert "connexion" in lookups["222222222"].error.lower()
+        assert "401" in lookups["333333333"].error
+        assert not lookups["Inconnue"].found
+
+    def test_missing_api_key(self, pappers_tool, clear_all_api_keys):
+        with patch(self.PATCH_TARGET) as mock_get:
+            lookups = pappers_tool.search_many(["123456789"])
+        assert "PAPPERS_API_KEY" in lookups["123456789"].error
+        mock_get.assert_not_called()
+
+    def test_empty_input(self, pappers_tool, mock_pappers_api_key):
+        assert pappers_tool.search_many([]) == {}
+
+    def test_session_pool_and_retry(self):
+        session = _bulk_session("key", 6)
+        adapter = session.get_adapter("https://api.pappers.fr/v2/entreprise")
+        assert session.headers["api-key"] == "key"
+        assert adapter._pool_maxsize == 6
+        assert 429 in adapter.max_retries.status_forcelist
+
+
+class TestPappersAsync:
+    PATCH_SLEEP = "wakastart_leads.shared.tools.pappers_tool.asyncio.sleep"
+
+    async def test_arun_siren(self, pappers_tool, mock_pappers_api_key, async_http_handler, pappers_company_detail):
+        seen = async_http_handler(lambda request: httpx.Response(200, json=pappers_company_detail))
+        result = await pappers_tool._arun("123456789")
+        assert seen[0].url.path.endswith("/entreprise")
+        assert seen[0].headers["api-key"] == "test-pappers-key-12345"
+        assert result == pappers_tool._format_company_details(pappers_company_detail)
+
+    async def test_arun_timeout(self, pappers_tool, mock_pappers_api_key, async_http_handler):
+        def timeout(request):
+            raise httpx.ConnectTimeout("timeout", request=request)
+
+        async_http_handler(timeout)
+        assert "Timeout" in await pappers_tool._arun("WakaStellar")
+
+    async def test_asearch_many_matches_sync(
+        self, pappers_tool, mock_pappers_api_key, async_http_handler, pappers_company_detail, pappers_search_results
+    ):
+        def handler(request):
+            if request.url.path.endswith("/entreprise"):
+                return httpx.Response(200, json=pappers_company_detail)
+            return httpx.Response(200, json=pappers_search_results)
+
+        async_http_handler(handler)
+        lookups = await pappers_tool.asearch_many(["123 456 789", "WakaTest", "123 456 789"])
+
+        assert list(lookups) == ["123 456 789", "WakaTest"]
+        assert lookups["123 456 789"].siren == "123456789"
+        assert lookups["WakaTest"].summary()["ville"] == "Paris"
+
+    async def test_asearch_many_bounded_concurrency(self, pappers_tool, mock_pappers_api_key, pappers_company_detail):
+        active = 0
+        peak = 0
+
+        async def slow_get(url, params, headers):
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.01)
+            active -= 1
+            return httpx.Response(200, json=pappers_company_detail)
+
+        with patch("wakastart_leads.shared.tools.pappers_tool._aget_with_retry", side_effect=slow_get):
+            lookups = await pappers_tool.asearch_many([f"Entreprise {i}" for i in range(12)], max_concurrency=4)
+        assert len(lookups) == 12
+        assert 1 < peak <= 4
+
+    async def test_retry_on_429(self, pappers_tool, mock_pappers_api_key, async_http_handler, pappers_company_detail):
+        statuses = iter([429, 503, 200])
+        seen = async_http_handler(lambda request: httpx.Response(next(statuses), json=pappers_company_detail))
+        with patch(self.PATCH_SLEEP):
+            lookups = await pappers_tool.asearch_many(["123456789"])
+        assert len(seen) == 3
+        assert lookups["123456789"].found
+
+    async def test_bulk_arun(self, mock_pappers_api_key, async_http_handler):
+        async_http_handler(lambda request: httpx.Response(404))
+        result = await PappersBulkSearchTool()._arun(["111111111"])
+        assert result.splitlines()[1] == "- 111111111 -> Non trouvé sur Pappers"
+
+
+class TestPappersBulkSearchTool:
+    def test_tool_name(self):
+        assert PappersBulkSearchTool().name == "pappers_bulk_search"
+
+    def test_missing_api_key(self, clear_all_api_keys):
+        assert "PAPPERS_API_KEY" in PappersBulkSearchTool()._run(["123456789"])
+
+    def test_one_line_per_input(self, mock_pappers_api_key, pappers_company_detail):
+        lookups = {
+            "123456789": PappersLookup("123456789", "123456789", pappers_company_detail),
+            "Inconnue": PappersLookup("Inconnue"),
+            "Panne": PappersLookup("Panne", error="Erreur API Pappers (code 500)"),
+        }
+        with patch("wakastart_leads.shared.tools.pappers_tool.PappersSearchTool.search_many", return_value=lookups):
+            result = PappersBulkSearchTool()._run(["123456789", "Inconnue", "Panne"])
+
+        lines = result.splitlines()
+        assert "3 entrées" in lines[0]
+        assert lines[1].startswith("- 123456789 -> SIREN 123456789 | WakaStellar SAS")
+        assert "NAF 6201Z" in lines[1] and "Active" in lines[1]
+        assert lines[2] == "- Inconnue -> Non trouvé sur Pappers"
+        assert lines[3] == "- Panne -> Erreur API Pappers (code 500)"
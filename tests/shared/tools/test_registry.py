@@ -0,0 +1,123 @@
+"""Tests unitaires pour le chemin deterministe des faits legaux (Sirene/Pappers)."""
+
+from unittest.mock import patch
+
+from wakastart_leads.shared.tools.registry import (
+    RegistryFacts,
+    apply_registry_facts,
+    facts_from_pappers,
+    facts_from_sirene,
+    find_siren,
+    find_sirens,
+    is_valid_siren,
+    name_matches,
+    resolve_registry_facts,
+)
+
+SIRENE_TARGET = "wakastart_leads.shared.tools.sirene_tool.requests.get"
+PAPPERS_TARGET = "wakastart_leads.shared.tools.pappers_tool.requests.get"
+
+
+class TestFindSiren:
+    def test_luhn_key(self):
+        assert is_valid_siren("309634954")
+        assert not is_valid_siren("309634955")
+        assert not is_valid_siren("30963495")
+
+    def test_common_patterns(self):
+        assert find_siren("SIREN : 309 634 954") == "309634954"
+        assert find_siren("Immatriculee au RCS Paris B 309.634.954") == "309634954"
+        assert find_siren("SIRET 30963495400012 - TVA FR") == "309634954"
+
+    def test_invalid_or_missing(self):
+        assert find_siren("SIREN : 123 456 789") is None
+        assert find_siren("Tel 01 23 45 67 89") is None
+        assert find_siren("") is None
+
+    def test_all_candidates_in_order(self):
+        text = "Hebergeur : OVH SAS, RCS Lille 424 761 419. Editeur : Acme Sante, SIREN 309 634 954 (309634954)"
+        assert find_sirens(text) == ["424761419", "309634954"]
+
+
+class TestNameMatches:
+    def test_domain_and_name_hints(self):
+        assert name_matches("ACME SANTE SAS", "acme-sante.fr")
+        assert name_matches("Acme Santé", "acme sante")
+        assert name_matches("GOOGLE FRANCE", "google.fr")
+
+    def test_hosting_provider_rejected(self):
+        assert not name_matches("OVH SAS", "acme-sante.fr", "acme sante")
+
+    def test_empty_or_short_hints(self):
+        assert not name_matches(None, "acme.fr")
+        assert not name_matches("AB CONSEIL", "ab.fr")
+
+
+class TestFacts:
+    def test_from_sirene(self, sirene_unite_legale_response):
+        facts = facts_from_sirene(sirene_unite_legale_response["uniteLegale"])
+        assert facts == RegistryFacts(
+            siren="309634954",
+            name="GOOGLE FRANCE",
+            creation_year="1979",
+            legal_form="Société par actions simplifiée (SAS)",
+            headcount_band="500-999 salariés",
+            active=True,
+        )
+
+    def test_foreign_legal_category(self):
+        facts = facts_from_sirene({"siren": "1", "periodesUniteLegale": [{"categorieJuridiqueUniteLegale": "3120"}]})
+        assert facts.foreign
+
+    def test_from_pappers(self, pappers_company_detail):
+        facts = facts_from_pappers(pappers_company_detail)
+        assert facts.source == "pappers"
+        assert facts.creation_year == "2020"
+        assert facts.legal_form == "SAS"
+        assert facts.headcount_band == "10-19"
+
+    def test_as_dict_skips_missing(self):
+        assert RegistryFacts(siren="309634954").as_dict() == {
+            "siren": "309634954",
+            "foreign": "False",
+            "source": "sirene",
+        }
+
+
+class TestResolveRegistryFacts:
+    def test_sirene_first(self, mock_sirene_api_key, mock_response, sirene_unite_legale_response):
+        with patch(SIRENE_TARGET, return_value=mock_response(200, sirene_unite_legale_response)):
+            facts = resolve_registry_facts("309634954")
+        assert facts.source == "sirene"
+        assert facts.name == "GOOGLE FRANCE"
+
+    def test_pappers_fallback(self, mock_sirene_api_key, mock_pappers_api_key, mock_response, pappers_company_detail):
+        with (
+            patch(SIRENE_TARGET, return_value=mock_response(404)),
+            patch(PAPPERS_TARGET, return_value=mock_response(200, pappers_company_detail)),
+        ):
+            facts = resolve_registry_facts("123456789")
+        assert facts.source == "pappers"
+
+    def test_unknown_everywhere(self, clear_all_api_keys):
+        assert resolve_registry_facts("309634954") is None
+
+
+class TestApplyRegistryFacts:
+    ROW = ",".join(["Acme", "https://acme.fr", "Unknown", "Unknown", '"CRM, sante"'] + ["x"] * 18)
+
+    def test_fills_unknown_creation_year_without_deriving_nationality(self):
+        row = apply_registry_facts(self.ROW, RegistryFacts(siren="309634954", creation_year="2015"))
+        assert row.startswith('Acme,https://acme.fr,Unknown,2015,"CRM, sante",')
+
+    def test_keeps_agent_year_and_nationality(self):
+        row = self.ROW.replace("Unknown,Unknown", "INT (Lien FR),2019")
+        facts = RegistryFacts(siren="309634954", creation_year="2015")
+        assert apply_registry_facts(row, facts).startswith("Acme,https://acme.fr,INT (Lien FR),2019,")
+
+    def test_foreign_entity_fills_unknown_nationality(self):
+        row = apply_registry_facts(self.ROW, RegistryFacts(siren="1", creation_year="2015", foreign=True))
+        assert row.startswith("Acme,https://acme.fr,INT (Lien FR),2015,")
+
+    def test_malformed_row_unchanged(self):
+        assert apply_registry_facts("Acme,2019", RegistryFacts(siren="1", creation_year="2015")) == "Acme,2019"
@@ -2,6 +2,7 @@
 
 from unittest.mock import patch
 
+import httpx
 import requests
 
 from wakastart_leads.shared.tools.sirene_tool import SireneSearchInput
@@ -144,6 +145,43 @@ class TestSireneRunErrors:
             assert "connexion" in result.lower()
 
 
+# ===========================================================================
+# Tests _arun (client HTTP asynchrone)
+# ===========================================================================
+
+
+class TestSireneArun:
+    async def test_siren_lookup(
+        self, sirene_tool, mock_sirene_api_key, async_http_handler, sirene_unite_legale_response
+    ):
+        seen = async_http_handler(lambda request: httpx.Response(200, json=sirene_unite_legale_response))
+        result = await sirene_tool._arun("309 634 954")
+        assert seen[0].url.path.endswith("/siren/309634954")
+        assert result == sirene_tool._format_unite_legale(sirene_unite_legale_response["uniteLegale"])
+
+    async def test_name_search(
+        self, sirene_tool, mock_sirene_api_key, async_http_handler, sirene_search_results_response
+    ):
+        seen = async_http_handler(lambda request: httpx.Response(200, json=sirene_search_results_response))
+        await sirene_tool._arun("Google")
+        assert seen[0].url.path.endswith("/siren")
+        assert "Google" in seen[0].url.params["q"]
+
+    async def test_http_401(self, sirene_tool, mock_sirene_api_key, async_http_handler):
+        async_http_handler(lambda request: httpx.Response(401, text="Unauthorized"))
+        assert "invalide ou expiree" in await sirene_tool._arun("Google")
+
+    async def test_timeout(self, sirene_tool, mock_sirene_api_key, async_http_handler):
+        def timeout(request):
+            raise httpx.ReadTimeout("timeout", request=request)
+
+        async_http_handler(timeout)
+        assert "Timeout" in await sirene_tool._arun("Google")
+
+    async def test_missing_api_key(self, sirene_tool, clear_all_api_keys):
+        assert "INSEE_SIRENE_API_KEY non configuree" in await sirene_tool._arun("Google")
+
+
 # ===========================================================================
 # Tests _format_unite_legale (methode pure)
 # ===========================================================================
@@ -277,3 +315,26 @@ class TestSireneRunGenericException:
         with patch(self.PATCH_TARGET, side_effect=ValueError("unexpected")):
             result = sirene_tool._run("Google")
             assert "inattendue" in result.lower()
+
+
+# ===========================================================================
+# Tests fetch_unite_legale - JSON brut pour le chemin deterministe
+# ===========================================================================
+
+
+class TestSireneFetchUniteLegale:
+    PATCH_TARGET = "wakastart_leads.shared.tools.sirene_tool.requests.get"
+
+    def test_returns_raw_json(self, sirene_tool, mock_sirene_api_key, mock_response, sirene_unite_legale_response):
+        with patch(self.PATCH_TARGET, return_value=mock_response(200, sirene_unite_legale_response)):
+            unite = sirene_tool.fetch_unite_legale("309634954")
+        assert unite["dateCreationUniteLegale"] == "1979-01-01"
+
+    def test_none_without_key(self, sirene_tool, clear_all_api_keys):
+        assert sirene_tool.fetch_unite_legale("309634954") is None
+
+    def test_none_on_error(self, sirene_tool, mock_sirene_api_key, mock_response):
+        with patch(self.PATCH_TARGET, return_value=mock_response(404)):
+            assert sirene_tool.fetch_unite_legale("309634954") is None
+        with patch(self.PATCH_TARGET, side_effect=requests.exceptions.Timeout()):
+            assert sirene_tool.fetch_unite_legale("309634954") is None
@@ -0,0 +1,210 @@
+"""Tests unitaires pour les outils web caches (pages scrapees et recherches Serper)."""
+
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from wakastart_leads.shared.tools.web_tools import CachedScrapeWebsiteTool, CachedSerperDevTool
+from wakastart_leads.shared.utils.page_cache import CachedPage, PageCache, format_page_cache_stats, page_key
+from wakastart_leads.shared.utils.search_cache import SearchCache, format_search_cache_stats, normalize_query
+from wakastart_leads.shared.utils.seen_index import SeenDomainIndex
+
+PATCH_TARGET = "wakastart_leads.shared.tools.web_tools.requests.get"
+HTML = "<html><body><h1>Acme</h1><p>Logiciel SaaS</p></body></html>"
+
+
+def _response(status_code=200, text=HTML, headers=None):
+    response = MagicMock(status_code=status_code, text=text, headers=headers or {})
+    response.ok = status_code < 400
+    return response
+
+
+@pytest.fixture()
+def cache():
+    return PageCache()
+
+
+@pytest.fixture()
+def tool(cache):
+    return CachedScrapeWebsiteTool(page_cache=cache)
+
+
+class TestPageCache:
+    def test_key_lowercases_host_and_drops_fragment(self):
+        assert page_key("https://WWW.Acme.fr/pricing#plans") == page_key("https://acme.fr/pricing")
+        assert page_key("acme.fr") == page_key("https://acme.fr/")
+
+    def test_key_keeps_path_query_and_scheme(self):
+        assert page_key("https://acme.fr/Docs?id=AbC") == "https://acme.fr/Docs?id=AbC"
+        assert page_key("https://acme.fr/Docs") != page_key("https://acme.fr/docs")
+        assert page_key("http://acme.fr/") != page_key("https://acme.fr/")
+
+    def test_memory_lru_bounded_by_size(self):
+        cache = PageCache(max_bytes=2 * (len(HTML) + 4))
+        for name in ("a", "b"):
+            cache.put(CachedPage(f"https://{name}.fr", HTML, "Acme"))
+        cache.get("https://a.fr")
+        cache.put(CachedPage("https://c.fr", HTML, "Acme"))
+        assert len(cache) == 2
+        assert cache.get("https://b.fr") is None
+        assert cache.get("https://a.fr") is not None
+
+    def test_persists_across_instances(self, tmp_path):
+        path = tmp_path / "pages.sqlite3"
+        PageCache(path).put(CachedPage("https://acme.fr", HTML, "Acme", etag='"v1"', fetched_at=1.0))
+        page = PageCache(path).get("acme.fr")
+        assert page.etag == '"v1"'
+        assert page.html == HTML
+
+    def test_stats_line(self, cache):
+        assert format_page_cache_stats(cache) is None
+        cache.record("hit")
+        assert "1 hit(s)" in format_page_cache_stats(cache)
+
+
+class TestCachedScrapeWebsiteTool:
+    def test_keeps_scrape_tool_name(self, tool):
+        assert tool.name == "Read website content"
+
+    def test_second_agent_served_from_cache(self, cache):
+        with patch(PATCH_TARGET, return_value=_response()) as mock_get:
+            first = CachedScrapeWebsiteTool(page_cache=cache)._run(website_url="https://acme.fr/")
+            second = CachedScrapeWebsiteTool(page_cache=cache)._run(website_url="https://www.acme.fr")
+        assert mock_get.call_count == 1
+        assert first == second
+        assert "Logiciel SaaS" in first
+        assert cache.stats == {"fetched": 1, "hit": 1}
+
+    def test_stale_page_revalidated_with_304(self, tool, cache):
+        cache.put(CachedPage("https://acme.fr", HTML, "cached text", etag='"v1"', last_modified="Mon", fetched_at=0.0))
+        with patch(PATCH_TARGET, return_value=_response(304, text="")) as mock_get:
+            assert tool._run(website_url="https://acme.fr") == "cached text"
+        headers = mock_get.call_args.kwargs["headers"]
+        assert headers["If-None-Match"] == '"v1"'
+        assert headers["If-Modified-Since"] == "Mon"
+        assert cache.is_fresh(cache.get("https://acme.fr"))
+        assert cache.stats["revalidated"] == 1
+
+    def test_stale_page_replaced_when_modified(self, tool, cache):
+        cache.put(CachedPage("https://acme.fr", "<p>old</p>", "old", etag='"v1"', fetched_at=0.0))
+        with patch(PATCH_TARGET, return_value=_response(headers={"ETag": '"v2"'})):
+            assert "Acme" in tool._run(website_url="https://acme.fr")
+        assert cache.get("https://acme.fr").etag == '"v2"'
+
+    def test_error_pages_not_cached(self, tool, cache):
+        with patch(PATCH_TARGET, return_value=_response(503, text="<p>Service Unavailable</p>")):
+            tool._run(website_url="https://acme.fr")
+        assert cache.get("https://acme.fr") is None
+
+    def test_fresh_window(self):
+        cache = PageCache(fresh_seconds=60)
+        assert cache.is_fresh(CachedPage("u", "", "", fetched_at=time.time()))
+        assert not cache.is_fresh(CachedPage("u", "", "", fetched_at=time.time() - 120))
+
+
+SERPER_TARGET = "wakastart_leads.shared.tools.web_tools.SerperDevTool._make_api_request"
+SERPER_RESULTS = {"organic": [{"title": "Acme", "link": "https://acme.fr", "snippet": "SIREN 123456789"}]}
+
+
+@pytest.fixture()
+def search_cache():
+    return SearchCache()
+
+
+class TestSearchCache:
+    def test_normalize_query(self):
+        assert normalize_query('  "Acme  Levée de fonds"? ') == "acme levee de fonds"
+
+    def test_key_depends_on_params(self):
+        base = SearchCache.make_key("Acme SIREN", type="search", gl="fr")
+        assert base == SearchCache.make_key("acme   siren", type="search", gl="fr")
+        assert base != SearchCache.make_key("Acme SIREN", type="news", gl="fr")
+
+    def test_expired_entries_ignored(self):
+        cache = SearchCache(ttl_seconds=0)
+        cache.put("k", "q", SERPER_RESULTS)
+        assert cache.get("k") is None
+
+    def test_persists_across_runs(self, tmp_path):
+        path = tmp_path / "serper.sqlite3"
+        SearchCache(path).put("k", "Acme SIREN", SERPER_RESULTS)
+        assert SearchCache(path).get("k") == SERPER_RESULTS
+
+    def test_lru_eviction_over_max_entries(self):
+        cache = SearchCache(max_entries=2)
+        cache.put("a", "qa", SERPER_RESULTS)
+        cache.put("b", "qb", SERPER_RESULTS)
+        cache.get("a")
+        cache.put("c", "qc", SERPER_RESULTS)
+        assert len(cache) == 2
+        assert cache.get("b") is None
+        assert cache.get("a") == SERPER_RESULTS
+
+    def test_inflight_lock_released_after_fetch(self, search_cache):
+        with search_cache.lock_for("k"):
+            assert "k" in search_cache._inflight
+        assert search_cache._inflight == {}
+
+    def test_stats_line(self, search_cache):
+        assert format_search_cache_stats(search_cache) is None
+        search_cache.record("fetched")
+        search_cache.record("hit")
+        assert "1 appel(s) economise(s) sur 2" in format_search_cache_stats(search_cache)
+
+
+class TestCachedSerperDevTool:
+    def test_keeps_serper_tool_name(self, search_cache):
+        assert CachedSerperDevTool(search_cache=search_cache).name == "Search the internet with Serper"
+
+    def test_same_query_from_two_agents_calls_api_once(self, search_cache, monkeypatch):
+        monkeypatch.setenv("SERPER_API_KEY", "test")
+        with patch(SERPER_TARGET, return_value=SERPER_RESULTS) as mock_api:
+            first = CachedSerperDevTool(search_cache=search_cache)._run(search_query="Acme SIREN")
+            second = CachedSerperDevTool(search_cache=search_cache)._run(search_query="acme siren")
+        assert mock_api.call_count == 1
+        assert first["organic"] == second["organic"]
+        assert search_cache.stats == {"fetched": 1, "hit": 1}
+
+    def test_different_search_type_not_shared(self, search_cache):
+        tool = CachedSerperDevTool(search_cache=search_cache)
+        with patch(SERPER_TARGET, return_value=SERPER_RESULTS) as mock_api:
+            tool._make_api_request("Acme", "search")
+            tool._make_api_request("Acme", "news")
+        assert mock_api.call_count == 2
+
+    def test_known_domains_removed_from_results_not_cache(self, search_cache):
+        seen = SeenDomainIndex()
+        seen.add("https://www.acme.fr")
+        results = {"organic": [*SERPER_RESULTS["organic"], {"title": "Beta", "link": "https://beta.io"}]}
+        tool = CachedSerperDevTool(search_cache=search_cache, exclude_domains=[seen])
+        with patch(SERPER_TARGET, return_value=results):
+            filtered = tool._make_api_request("SaaS RH", "search")
+        assert [item["link"] for item in filtered["organic"]] == ["https://beta.io"]
+        # Le cache partage garde la reponse complete (autres commandes, --include-seen)
+        assert CachedSerperDevTool(search_cache=search_cache)._make_api_request("SaaS RH", "search") == results
+
+    def test_errors_not_cached(self, search_cache):
+        tool = CachedSerperDevTool(search_cache=search_cache)
+        with patch(SERPER_TARGET, side_effect=[ValueError("Empty response"), SERPER_RESULTS]) as mock_api:
+            with pytest.raises(ValueError):
+                tool._make_api_request("Acme", "search")
+            assert tool._make_api_request("Acme", "search") == SERPER_RESULTS
+        assert mock_api.call_count == 2
+
+    def test_concurrent_identical_queries_deduplicated(self, search_cache):
+        tool = CachedSerperDevTool(search_cache=search_cache)
+
+        def slow_api(query, search_type):
+            time.sleep(0.05)
+            return SERPER_RESULTS
+
+        with patch(SERPER_TARGET, side_effect=slow_api) as mock_api:
+            threads = [threading.Thread(target=tool._make_api_request, args=("Acme", "search")) for _ in range(4)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        assert mock_api.call_count == 1
+        assert search_cache._inflight == {}
@@ -0,0 +1,171 @@
+"""Tests pour la fabrique de crews (construction unique, copie isolee par URL)."""
+
+import inspect
+from unittest.mock import MagicMock
+
+import pytest
+from crewai import LLM, Agent, Crew, Task
+from pydantic import BaseModel, Field, PrivateAttr
+
+from wakastart_leads.shared.tools.async_http import AsyncTool
+from wakastart_leads.shared.utils.crew_factory import (
+    CrewFactory,
+    clone_llm,
+    clone_tool,
+    crew_factory_for,
+    is_crew_factory_enabled,
+)
+from wakastart_leads.shared.utils.parallel_runner import RunStatus, run_parallel
+
+
+class EchoInput(BaseModel):
+    query: str = Field(..., description="Texte")
+
+
+class MemoTool(AsyncTool):
+    name: str = "memo"
+    description: str = "Memorise les requetes."
+    args_schema: type[BaseModel] = EchoInput
+    _seen: dict[str, str] = PrivateAttr(default_factory=dict)
+
+    def _run(self, query: str) -> str:
+        self._seen[query] = query
+        return query
+
+
+def _llm() -> LLM:
+    return LLM(model="openai/gpt-4o-mini", api_key="test-key", temperature=0.2)
+
+
+class TinyCrew:
+    reusable_crew = True
+    log_file: str | None = None
+    builds = 0
+
+    def crew(self) -> Crew:
+        TinyCrew.builds += 1
+        analyst = Agent(role="Analyste", goal="g", backstory="b", llm=_llm(), tools=[MemoTool()])
+        writer = Agent(role="Redacteur", goal="g", backstory="b", llm=_llm())
+        first = Task(name="first", description="Analyse {url}", expected_output="Faits", agent=analyst)
+        second = Task(name="second", description="Synthese", expected_output="Ligne CSV", agent=writer, context=[first])
+        return Crew(agents=[analyst, writer], tasks=[first, second], output_log_file=self.log_file)
+
+
+@pytest.fixture(autouse=True)
+def _reset_builds():
+    TinyCrew.builds = 0
+
+
+class TestCloneLlm:
+    def test_own_counters_and_stop(self):
+        llm = _llm()
+        clone = clone_llm(llm)
+        clone._token_usage["prompt_tokens"] += 100
+        clone.stop.append("Observation:")
+        assert llm._token_usage["prompt_tokens"] == 0
+        assert llm.stop == []
+        assert clone.model == llm.model and clone.temperature == 0.2
+
+    def test_instance_patches_rebound_to_clone(self):
+        llm = _llm()
+        object.__setattr__(llm, "call", lambda *args, **kwargs: "template")
+        clone = clone_llm(llm)
+        assert "call" not in vars(clone)
+        # Cache de prompt re-applique : la methode d'origine est celle de la copie
+        patched = vars(clone)["_extract_openai_token_usage"]
+        assert inspect.getclosurevars(patched).nonlocals["extract"].__self__ is clone
+
+    def test_non_llm_returned_as_is(self):
+        mock = MagicMock()
+        assert clone_llm(mock) is mock
+
+
+class TestCloneTool:
+    def test_private_memo_not_shared(self):
+        tool = MemoTool()
+        clone = clone_tool(tool)
+        clone._run("x")
+        assert tool._seen == {}
+        assert clone._seen == {"x": "x"}
+        assert clone.name == "memo"
+
+
+class TestCrewFactory:
+    def test_template_built_once(self):
+        factory = CrewFactory(TinyCrew)
+        for _ in range(3):
+            factory.create()
+        assert TinyCrew.builds == 1
+        assert factory.created == 3
+
+    def test_copies_are_isolated(self):
+        factory = CrewFactory(TinyCrew)
+        _, first = factory.create()
+        _, second = factory.create()
+
+        for a, b in zip(first.agents, second.agents, strict=True):
+            assert a is not b
+            assert a.llm is not b.llm
+            assert a.llm._token_usage is not b.llm._token_usage
+        assert first.agents[0].tools[0] is not second.agents[0].tools[0]
+        assert first.tasks[1].context[0] is first.tasks[0]
+        assert second.tasks[1].context[0] is second.tasks[0]
+        assert second.tasks[0].agent is second.agents[0]
+
+    def test_instance_sees_copied_crew(self, tmp_path):
+        log_file = str(tmp_path / "site.json")
+        instance, crew = CrewFactory(TinyCrew).create(log_file)
+        assert isinstance(instance, TinyCrew)
+        assert instance.agents is crew.agents
+        assert instance.log_file == log_file
+        assert crew.output_log_file == log_file
+
+    def test_build_error_retried(self):
+        class BrokenOnce(TinyCrew):
+            calls = 0
+
+            def crew(self) -> Crew:
+                BrokenOnce.calls += 1
+                if BrokenOnce.calls == 1:
+                    raise ValueError("GEMINI_API_KEY manquante")
+                return super().crew()
+
+        factory = CrewFactory(BrokenOnce)
+        with pytest.raises(ValueError):
+            factory.create()
+        _, crew = factory.create()
+        assert len(crew.agents) == 2
+
+
+class TestCrewFactoryFor:
+    def test_opt_in_required(self):
+        class PlainCrew:
+            pass
+
+        assert crew_factory_for(PlainCrew) is None
+        assert crew_factory_for(MagicMock()) is None
+        assert isinstance(crew_factory_for(TinyCrew), CrewFactory)
+
+    def test_disabled_by_env(self, monkeypatch):
+        monkeypatch.setenv("CREW_FACTORY_ENABLED", "0")
+        assert not is_crew_factory_enabled()
+        assert crew_factory_for(TinyCrew) is None
+
+
+class TestRunnerIntegration:
+    @staticmethod
+    def _kickoff(monkeypatch):
+        monkeypatch.setattr(Crew, "kickoff", lambda self, inputs=None: MagicMock(raw=inputs["url"]))
+
+    async def test_one_build_per_run(self, tmp_path, monkeypatch):
+        self._kickoff(monkeypatch)
+        urls = [f"https://site{i}.com" for i in range(4)]
+        results = await run_parallel(urls, TinyCrew, tmp_path, max_workers=2, timeout=60)
+        assert all(r.status == RunStatus.SUCCESS for r in results)
+        assert TinyCrew.builds == 1
+
+    async def test_rebuild_when_disabled(self, tmp_path, monkeypatch):
+        self._kickoff(monkeypatch)
+        monkeypatch.setenv("CREW_FACTORY_ENABLED", "0")
+        await run_parallel(["https://a.com", "https://b.com"], TinyCrew, tmp_path, max_workers=2, timeout=60)
+        assert TinyCrew.builds == 2
@@ -0,0 +1,107 @@
+"""Tests pour le module llm_cache (cache disque des reponses LLM)."""
+
+import asyncio
+from unittest.mock import MagicMock
+
+from crewai.llms.base_llm import BaseLLM
+
+from wakastart_leads.shared.utils.llm_cache import LLMResponseCache, enable_response_cache
+
+MESSAGES = [{"role": "system", "content": "Analyste"}, {"role": "user", "content": "https://a.com"}]
+
+
+class CountingLLM(BaseLLM):
+    """LLM minimal qui compte les appels reellement transmis au fournisseur."""
+
+    def __init__(self, temperature: float = 0.0):
+        super().__init__(model="gemini/gemini-2.5-flash", temperature=temperature)
+        object.__setattr__(self, "calls", 0)
+
+    def call(self, messages, tools=None, **kwargs):
+        object.__setattr__(self, "calls", self.calls + 1)
+        return f"Final Answer: {messages[-1]['content']}"
+
+    async def acall(self, messages, tools=None, **kwargs):
+        object.__setattr__(self, "calls", self.calls + 1)
+        return f"Final Answer: {messages[-1]['content']}"
+
+
+class TestLLMResponseCache:
+    """Tests pour le stockage SQLite."""
+
+    def test_get_set_counts_hits_and_misses(self, tmp_path):
+        cache = LLMResponseCache(tmp_path / "cache.sqlite3")
+        key = cache.make_key("m", 0.0, MESSAGES)
+        assert cache.get(key) is None
+        cache.set(key, "m", "ok")
+        assert cache.get(key) == "ok"
+        assert (cache.hits, cache.misses) == (1, 1)
+
+    def test_key_depends_on_temperature_and_messages(self):
+        base = LLMResponseCache.make_key("m", 0.0, MESSAGES)
+        assert base == LLMResponseCache.make_key("m", 0.0, [dict(m) for m in MESSAGES])
+        assert base != LLMResponseCache.make_key("m", 0.7, MESSAGES)
+        assert base != LLMResponseCache.make_key("m", 0.0, MESSAGES[:1])
+        assert base != LLMResponseCache.make_key("m", 0.0, MESSAGES, tools=[{"name": "serper"}])
+
+    def test_persists_across_instances(self, tmp_path):
+        path = tmp_path / "cache.sqlite3"
+        LLMResponseCache(path).set("k", "m", "ok")
+        assert LLMResponseCache(path).get("k") == "ok"
+
+    def test_lru_eviction_under_size_cap(self, tmp_path):
+        cache = LLMResponseCache(tmp_path / "cache.sqlite3", max_bytes=25)
+        cache.set("a", "m", "x" * 10)
+        cache.set("b", "m", "x" * 10)
+        cache.get("a")  # "b" devient le moins recemment utilise
+        cache.set("c", "m", "x" * 10)
+        assert cache.get("b") is None
+        assert cache.get("a") is not None
+        assert cache.size_bytes() <= 25
+
+
+class TestEnableResponseCache:
+    """Tests pour l'instrumentation des LLMs CrewAI."""
+
+    def test_second_call_served_from_cache(self, tmp_path):
+        llm = enable_response_cache(CountingLLM(), LLMResponseCache(tmp_path / "cache.sqlite3"))
+        assert llm.call(MESSAGES) == llm.call(MESSAGES) == "Final Answer: https://a.com"
+        assert llm.calls == 1
+
+    def test_async_call_served_from_cache(self, tmp_path):
+        cache = LLMResponseCache(tmp_path / "cache.sqlite3")
+        llm = enable_response_cache(CountingLLM(), cache)
+
+        async def two_calls():
+            return await llm.acall(MESSAGES), await llm.acall(MESSAGES)
+
+        assert asyncio.run(two_calls()) == ("Final Answer: https://a.com",) * 2
+        assert llm.calls == 1
+        # Cache partage entre chemins synchrone et asynchrone
+        assert llm.call(MESSAGES) == "Final Answer: https://a.com"
+        assert llm.calls == 1
+
+    def test_different_temperature_misses(self, tmp_path):
+        cache = LLMResponseCache(tmp_path / "cache.sqlite3")
+        enable_response_cache(CountingLLM(0.0), cache).call(MESSAGES)
+        warm = enable_response_cache(CountingLLM(0.5), cache)
+        warm.call(MESSAGES)
+        assert warm.calls == 1
+
+    def test_disabled_by_default(self, monkeypatch):
+        monkeypatch.delenv("LLM_CACHE_ENABLED", raising=False)
+        llm = CountingLLM()
+        original = llm.call
+        assert enable_response_cache(llm).call == original
+
+    def test_ignores_non_crewai_llm(self, tmp_path):
+        llm = MagicMock()
+        original = llm.call
+        enable_response_cache(llm, LLMResponseCache(tmp_path / "cache.sqlite3"))
+        assert llm.call is original
+
+    def test_not_wrapped_twice(self, tmp_path):
+        cache = LLMResponseCache(tmp_path / "cache.sqlite3")
+        llm = enable_response_cache(CountingLLM(), cache)
+        wrapped = llm.call
+        assert enable_response_cache(llm, cache).call is wrapped
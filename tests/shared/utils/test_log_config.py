@@ -0,0 +1,126 @@
+"""Tests pour la journalisation structuree (niveaux, composants, mode silencieux, log consolide)."""
+
+import logging
+
+import pytest
+
+from wakastart_leads.shared.utils.log_config import (
+    ROOT_LOGGER,
+    RunLog,
+    configure_logging,
+    get_logger,
+    is_crew_verbose,
+    is_quiet,
+    parse_components,
+)
+
+
+@pytest.fixture(autouse=True)
+def reset_levels(monkeypatch):
+    """Les niveaux des loggers survivent aux tests : ils sont remis a INFO / herites."""
+    for name in ("LOG_LEVEL", "LOG_COMPONENTS", "LOG_QUIET", "CREW_VERBOSE"):
+        monkeypatch.delenv(name, raising=False)
+    yield
+    logging.getLogger(ROOT_LOGGER).setLevel(logging.INFO)
+    for component in ("gamma", "kaspr", "run"):
+        logging.getLogger(f"{ROOT_LOGGER}.{component}").setLevel(logging.NOTSET)
+
+
+class TestEnvToggles:
+    """Tests pour LOG_QUIET, CREW_VERBOSE et LOG_COMPONENTS."""
+
+    def test_defaults(self):
+        assert not is_quiet()
+        assert is_crew_verbose()
+
+    def test_quiet_disables_crew_verbose(self, monkeypatch):
+        monkeypatch.setenv("LOG_QUIET", "1")
+        assert is_quiet()
+        assert not is_crew_verbose()
+
+    def test_crew_verbose_explicit(self, monkeypatch):
+        monkeypatch.setenv("LOG_QUIET", "1")
+        monkeypatch.setenv("CREW_VERBOSE", "1")
+        assert is_crew_verbose()
+
+    def test_parse_components(self):
+        assert parse_components("gamma=DEBUG, kaspr=warning,bad,linkener=LOUD") == {
+            "gamma": logging.DEBUG,
+            "kaspr": logging.WARNING,
+        }
+
+
+class TestConsole:
+    """Tests pour les niveaux et le filtre console."""
+
+    def test_debug_hidden_by_default(self, capsys):
+        configure_logging()
+        get_logger("gamma").debug("trace gamma")
+        get_logger("gamma").info("info gamma")
+        assert capsys.readouterr().out == "info gamma\n"
+
+    def test_component_level(self, monkeypatch, capsys):
+        monkeypatch.setenv("LOG_LEVEL", "WARNING")
+        monkeypatch.setenv("LOG_COMPONENTS", "gamma=DEBUG")
+        configure_logging()
+        get_logger("gamma").debug("trace gamma")
+        get_logger("kaspr").info("info kaspr")
+        assert capsys.readouterr().out == "trace gamma\n"
+
+    def test_quiet_keeps_summaries_and_warnings(self, tmp_path, monkeypatch, capsys):
+        monkeypatch.setenv("LOG_QUIET", "1")
+        with RunLog(tmp_path / "run.txt") as run_log:
+            run_log.write("detail")
+            run_log.summary("[OK] https://acme.com (1.0s)")
+            get_logger("kaspr").warning("credits insuffisants")
+        assert capsys.readouterr().out == "[OK] https://acme.com (1.0s)\ncredits insuffisants\n"
+
+    def test_summaries_hidden_when_verbose(self, tmp_path, capsys):
+        with RunLog(tmp_path / "run.txt") as run_log:
+            run_log.write("detail")
+            run_log.summary("[OK] https://acme.com (1.0s)")
+        assert capsys.readouterr().out == "detail\n"
+
+
+class TestRunLog:
+    """Tests pour le log consolide ecrit par le QueueListener."""
+
+    def test_file_receives_all_levels(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("LOG_QUIET", "1")
+        monkeypatch.setenv("LOG_LEVEL", "ERROR")
+        configure_logging()
+        path = tmp_path / "logs" / "run.txt"
+
+        run_log = RunLog(path)
+        for i in range(100):
+            run_log.write(f"ligne {i}")
+        run_log.write("trace", level=logging.DEBUG)
+        run_log.summary("resume")
+        run_log.close()
+
+        lines = path.read_text(encoding="utf-8").splitlines()
+        assert lines[:2] == ["ligne 0", "ligne 1"]
+        assert lines[-1] == "trace"
+        assert len(lines) == 101
+
+    def test_close_idempotent(self, tmp_path):
+        run_log = RunLog(tmp_path / "run.txt")
+        run_log.close()
+        run_log.close()
+        assert (tmp_path / "run.txt").exists()
+
+
+class TestToolLoggers:
+    """Les traces des outils passent par les loggers de composant."""
+
+    def test_gamma_trace_needs_component_level(self, monkeypatch, capsys):
+        from wakastart_leads.crews.analysis.tools.gamma_tool import GammaCreateTool
+
+        tool = GammaCreateTool()
+        assert tool._resolve_company_logo("", "Acme") == ""
+        assert "Domaine vide" not in capsys.readouterr().out
+
+        monkeypatch.setenv("LOG_COMPONENTS", "gamma=DEBUG")
+        configure_logging()
+        tool._resolve_company_logo("", "Acme")
+        assert "Domaine vide pour Acme" in capsys.readouterr().out
@@ -0,0 +1,221 @@
+"""Tests pour le stockage des logs (compression, index, rotation par age et par taille)."""
+
+import asyncio
+import os
+import sys
+import time
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from wakastart_leads.shared.utils.log_rotation import cleanup_old_logs, get_log_max_bytes
+from wakastart_leads.shared.utils.log_store import (
+    INDEX_FILENAME,
+    LogIndex,
+    archive_log,
+    compress_log,
+    index_open_log,
+    is_log_compression_enabled,
+    read_log,
+)
+from wakastart_leads.shared.utils.parallel_runner import RunStatus, run_parallel, run_sequential, run_with_retry
+
+
+def _write_log(path, content="x" * 100, age_days=0):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(content, encoding="utf-8")
+    mtime = time.time() - age_days * 86400
+    os.utime(path, (mtime, mtime))
+    return path
+
+
+class TestCompressLog:
+    """Tests pour la compression d'un log ferme."""
+
+    def test_gzip_roundtrip(self, tmp_path):
+        log = _write_log(tmp_path / "acme.com_20250101_120000.json", '[{"task": "analyse"}]', age_days=3)
+        mtime = log.stat().st_mtime
+
+        compressed = compress_log(log)
+
+        assert compressed.name == "acme.com_20250101_120000.json.gz"
+        assert not log.exists()
+        assert read_log(compressed) == '[{"task": "analyse"}]'
+        assert compressed.stat().st_mtime == pytest.approx(mtime)
+
+    def test_disabled_by_env(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("LOG_COMPRESSION", "none")
+        log = _write_log(tmp_path / "run.txt")
+        assert not is_log_compression_enabled()
+        assert compress_log(log) == log
+        assert log.exists()
+
+    def test_already_compressed_unchanged(self, tmp_path):
+        compressed = compress_log(_write_log(tmp_path / "run.txt"))
+        assert compress_log(compressed) == compressed
+
+
+class TestLogIndex:
+    """Tests pour l'index des logs."""
+
+    def test_archive_indexes_url_and_run(self, tmp_path):
+        archived = archive_log(_write_log(tmp_path / "acme.com_1.json"), url="https://www.acme.com/", run_id="t1")
+        (entry,) = LogIndex(tmp_path).entries()
+        assert entry["file"] == archived.name
+        assert entry["url"] == "https://www.acme.com/"
+        assert entry["run_id"] == "t1"
+        assert entry["bytes"] == archived.stat().st_size
+
+    def test_find_by_url_normalized(self, tmp_path):
+        first = archive_log(_write_log(tmp_path / "acme.com_1.json"), url="https://acme.com")
+        second = archive_log(_write_log(tmp_path / "acme.com_2.json"), url="https://www.acme.com/")
+        archive_log(_write_log(tmp_path / "beta.io_1.json"), url="https://beta.io")
+        assert LogIndex(tmp_path).find(url="acme.com") == [first, second]
+
+    def test_run_id_defaults_to_log_name(self, tmp_path):
+        archived = archive_log(_write_log(tmp_path / "run_20250101_120000.txt"))
+        assert LogIndex(tmp_path).find(run_id="run_20250101_120000") == [archived]
+
+    def test_missing_log_not_indexed(self, tmp_path):
+        assert archive_log(tmp_path / "absent.json", url="https://acme.com") is None
+        assert archive_log(None) is None
+        assert not (tmp_path / INDEX_FILENAME).exists()
+
+    def test_open_log_indexed_uncompressed(self, tmp_path):
+        path = tmp_path / "acme.com_1.json"
+        # Indexe avant d'etre ecrit (crew encore en cours), retrouve une fois cree
+        assert index_open_log(path, url="https://acme.com") == path
+        assert LogIndex(tmp_path).find(url="https://acme.com") == []
+        _write_log(path)
+        assert LogIndex(tmp_path).find(url="https://acme.com") == [path]
+
+    def test_truncated_line_ignored(self, tmp_path):
+        archive_log(_write_log(tmp_path / "a.json"), url="https://a.com")
+        with open(tmp_path / INDEX_FILENAME, "a", encoding="utf-8") as f:
+            f.write('{"file": "b.js')
+        assert len(LogIndex(tmp_path).entries()) == 1
+
+
+class TestCleanupOldLogs:
+    """Tests pour la rotation par age et par taille."""
+
+    def test_deletes_by_age_keeps_min(self, tmp_path):
+        for i in range(4):
+            _write_log(tmp_path / f"old_{i}.json", age_days=40 + i)
+        _write_log(tmp_path / "new.json")
+
+        deleted = cleanup_old_logs(tmp_path, max_age_days=30, min_keep=2, max_total_bytes=0)
+
+        assert deleted == 3
+        assert sorted(p.name for p in tmp_path.iterdir()) == ["new.json", "old_0.json"]
+
+    def test_deletes_oldest_over_size(self, tmp_path):
+        for i in range(6):
+            _write_log(tmp_path / f"log_{i}.json", "x" * 1000, age_days=6 - i)
+
+        deleted = cleanup_old_logs(tmp_path, max_age_days=30, min_keep=1, max_total_bytes=2500)
+
+        assert deleted == 4
+        assert sorted(p.name for p in tmp_path.iterdir()) == ["log_4.json", "log_5.json"]
+
+    def test_prunes_index(self, tmp_path):
+        old = archive_log(_write_log(tmp_path / "old.json", age_days=40), url="https://old.com")
+        os.utime(old, (time.time() - 40 * 86400,) * 2)
+        archive_log(_write_log(tmp_path / "new.json"), url="https://new.com")
+
+        cleanup_old_logs(tmp_path, max_age_days=30, min_keep=1, max_total_bytes=0)
+
+        index = LogIndex(tmp_path)
+        assert [e["url"] for e in index.entries()] == ["https://new.com"]
+        assert (tmp_path / INDEX_FILENAME).exists()
+
+    def test_max_bytes_from_env(self, monkeypatch):
+        monkeypatch.setenv("LOG_MAX_TOTAL_MB", "1.5")
+        assert get_log_max_bytes() == 1536 * 1024
+
+
+class TestRunnerArchivesLogs:
+    """Les logs CrewAI par URL et le log consolide sont compresses et indexes."""
+
+    @staticmethod
+    def _crew_class():
+        class LoggingCrew:
+            log_file = None
+
+            def crew(self):
+                crew = MagicMock()
+
+                def kickoff(inputs):
+                    with open(self.log_file, "w", encoding="utf-8") as f:
+                        f.write(f'[{{"url": "{inputs["url"]}"}}]')
+                    return MagicMock(raw=f"Societe,{inputs['url']}")
+
+                crew.kickoff.side_effect = kickoff
+                return crew
+
+        return LoggingCrew
+
+    async def test_parallel_url_logs(self, tmp_path):
+        urls = ["https://acme.com", "https://beta.io"]
+        results = await run_parallel(urls, self._crew_class(), tmp_path, max_workers=2)
+
+        assert all(r.status == RunStatus.SUCCESS for r in results)
+        index = LogIndex(tmp_path)
+        (log,) = index.find(url="https://acme.com")
+        assert log.suffix == ".gz"
+        assert str(log) == results[0].log_file
+        assert "acme.com" in read_log(log)
+        assert not list(tmp_path.glob("*.json"))
+
+    async def test_timeout_log_left_to_running_crew(self, tmp_path):
+        class SlowCrew(self._crew_class()):
+            def crew(self):
+                crew = super().crew()
+                write_log = crew.kickoff.side_effect
+                # Le log est ecrit par le thread du kickoff, apres le timeout
+                crew.kickoff.side_effect = lambda inputs: time.sleep(0.3) or write_log(inputs)
+                return crew
+
+        result = await run_with_retry("https://acme.com", SlowCrew, tmp_path, timeout=0.05, retry_count=0)
+        await asyncio.sleep(0.5)
+
+        assert result.status == RunStatus.TIMEOUT
+        # Log brut laisse au crew (non compresse pendant son ecriture) mais indexe
+        assert result.log_file.endswith(".json")
+        assert "acme.com" in read_log(Path(result.log_file))
+        assert LogIndex(tmp_path).find(url="https://acme.com") == [Path(result.log_file)]
+
+    async def test_sequential_consolidated_log(self, tmp_path, capsys):
+        await run_sequential(["https://acme.com"], self._crew_class(), tmp_path, tmp_path / "report.csv", retry_count=0)
+
+        (log,) = tmp_path.glob("run_*.txt.gz")
+        assert LogIndex(tmp_path).find(run_id=log.name.removesuffix(".txt.gz")) == [log]
+
+
+class TestLogsCommand:
+    """Tests pour la commande `logs` (recherche via l'index)."""
+
+    def test_prints_indexed_logs(self, tmp_path, monkeypatch, capsys):
+        from wakastart_leads import main
+
+        log_dir = tmp_path / "analysis" / "logs"
+        archived = archive_log(_write_log(log_dir / "acme.com_1.json", "contenu"), url="https://acme.com")
+        monkeypatch.setattr(main, "ANALYSIS_OUTPUT", tmp_path / "analysis")
+        monkeypatch.setattr(main, "SEARCH_OUTPUT", tmp_path / "search")
+        monkeypatch.setattr(main, "ENRICHMENT_OUTPUT", tmp_path / "enrichment")
+
+        with patch.object(sys, "argv", ["wakastart", "logs", "www.acme.com", "--show"]):
+            main.logs()
+
+        out = capsys.readouterr().out
+        assert str(archived) in out
+        assert "contenu" in out
+
+    def test_exit_code_when_not_found(self, tmp_path, monkeypatch):
+        from wakastart_leads import main
+
+        for name in ("ANALYSIS_OUTPUT", "SEARCH_OUTPUT", "ENRICHMENT_OUTPUT"):
+            monkeypatch.setattr(main, name, tmp_path)
+        with patch.object(sys, "argv", ["wakastart", "logs", "https://absent.com"]), pytest.raises(SystemExit):
+            main.logs()
@@ -0,0 +1,134 @@
+"""Tests unitaires pour l'index de noms d'entreprises (recherche approchee)."""
+
+import sys
+from unittest.mock import patch
+
+import pytest
+
+from wakastart_leads.shared.tools.sirene_tool import SireneSearchTool
+from wakastart_leads.shared.utils.name_index import (
+    CompanyNameIndex,
+    company_key,
+    format_name_index_stats,
+    get_name_index,
+    similarity,
+    sirene_name_entries,
+)
+
+SIRENE_TARGET = "wakastart_leads.shared.tools.sirene_tool.requests.get"
+
+
+@pytest.fixture()
+def names():
+    index = CompanyNameIndex()
+    index.add_many(
+        [
+            ("ACME SANTE", "123456782", ""),
+            ("ACME SANTE CLOUD SAS", "987654324", ""),
+            ("GOOGLE FRANCE", "309634954", ""),
+            ("Doctolib", "", "https://doctolib.fr"),
+        ],
+        source="sirene",
+    )
+    return index
+
+
+class TestCompanyKey:
+    def test_strips_accents_and_legal_form(self):
+        assert company_key("Acme Santé S.A.S.") == company_key("ACME SANTE") == "acme sante"
+
+    def test_legal_form_only_name_kept(self):
+        assert company_key("SAS") == "sas"
+
+    def test_similarity(self):
+        assert similarity("acme sante", "acme sante") == 1.0
+        assert similarity("acme sante", "akme sante") > similarity("acme sante", "google france")
+
+
+class TestCompanyNameIndex:
+    def test_ranked_candidates_with_scores(self, names):
+        matches = names.match("Acme Santé SAS")
+        assert [m.siren for m in matches[:2]] == ["123456782", "987654324"]
+        assert matches[0].score == 1.0
+        assert matches[0].score > matches[1].score
+
+    def test_typo_and_brand_variants(self, names):
+        assert names.match("Akme Sante")[0].siren == "123456782"
+        assert names.match("google fr")[0].siren == "309634954"
+
+    def test_no_match_below_threshold(self, names):
+        assert names.match("Zebulon Industries") == []
+
+    def test_duplicates_ignored(self, names):
+        assert names.add_many([("Acme Santé", "123456782", "")], source="run") == 0
+        assert len(names) == 4
+
+    def test_persists_across_instances(self, tmp_path):
+        path = tmp_path / "names.sqlite3"
+        CompanyNameIndex(path).add("Acme Santé", "123456782")
+        assert CompanyNameIndex(path).match("acme sante")[0].siren == "123456782"
+
+    def test_short_names(self, names):
+        names.add("3M", "542051180")
+        assert names.match("3m")[0].siren == "542051180"
+
+    def test_stats(self, names):
+        assert format_name_index_stats(names) is None
+        names.match("acme")
+        names.match("zebulon")
+        assert "1 recherche(s) resolue(s) sur 2" in format_name_index_stats(names)
+
+    def test_disabled_by_env(self, monkeypatch):
+        monkeypatch.setenv("NAME_INDEX_ENABLED", "0")
+        assert get_name_index() is None
+
+    def test_sirene_name_entries(self):
+        row = {"siren": "1", "denominationUniteLegale": "ACME", "sigleUniteLegale": "AC"}
+        assert list(sirene_name_entries([row])) == [("ACME", "1", ""), ("AC", "1", "")]
+
+
+class TestSireneToolNameIndex:
+    def test_name_search_answered_by_index(self, names, clear_all_api_keys):
+        with patch(SIRENE_TARGET) as mock_get:
+            result = SireneSearchTool(name_index=names)._run("Acme Santé SAS")
+        mock_get.assert_not_called()
+        assert "1. **ACME SANTE** - SIREN: 123456782 - similarite 1.00" in result
+
+    def test_candidates_without_siren_ignored(self, names, mock_sirene_api_key, mock_response, sirene_empty_response):
+        with patch(SIRENE_TARGET, return_value=mock_response(200, sirene_empty_response)) as mock_get:
+            SireneSearchTool(name_index=names)._run("Doctolib")
+        mock_get.assert_called_once()
+
+    def test_weak_match_falls_through_to_api(self, names, mock_sirene_api_key, mock_response, sirene_empty_response):
+        with patch(SIRENE_TARGET, return_value=mock_response(200, sirene_empty_response)) as mock_get:
+            result = SireneSearchTool(name_index=names)._run("Acme")
+        mock_get.assert_called_once()
+        assert "similarite" not in result
+
+    def test_api_results_feed_index(self, mock_sirene_api_key, mock_response, sirene_search_results_response):
+        index = CompanyNameIndex()
+        with patch(SIRENE_TARGET, return_value=mock_response(200, sirene_search_results_response)):
+            SireneSearchTool(name_index=index)._run("Google")
+        assert index.match("google france")[0].siren == "309634954"
+
+    def test_api_query_without_legal_form(self, mock_sirene_api_key, mock_response, sirene_search_results_response):
+        with patch(SIRENE_TARGET, return_value=mock_response(200, sirene_search_results_response)) as mock_get:
+            SireneSearchTool(name_index=CompanyNameIndex())._run("Acme Santé SAS")
+        assert mock_get.call_args.kwargs["params"]["q"] == "periode(denominationUniteLegale:Acme*Santé*)"
+
+
+class TestSireneIndexNamesOption:
+    def test_names_imported_from_stock(self, tmp_path, monkeypatch, capsys):
+        from wakastart_leads.main import sirene_index
+
+        stock = tmp_path / "stock.csv"
+        stock.write_text(
+            "siren,denominationUniteLegale,sigleUniteLegale,etatAdministratifUniteLegale\n123456782,ACME SANTE,AS,A\n",
+            encoding="utf-8",
+        )
+        index = CompanyNameIndex()
+        argv = ["wakastart", "sirene-index", str(stock), "--output", str(tmp_path / "i.sqlite3"), "--names"]
+        with patch.object(sys, "argv", argv), patch("wakastart_leads.main.get_name_index", return_value=index):
+            sirene_index()
+        assert index.match("acme sante")[0].siren == "123456782"
+        assert "2 nom(s) ajoute(s)" in capsys.readouterr().out
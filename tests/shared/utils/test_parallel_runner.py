@@ -1,7 +1,7 @@
 """Tests pour le module parallel_runner."""
 
 import asyncio
-from unittest.mock import MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
@@ -10,10 +10,13 @@ from wakastart_leads.shared.utils.parallel_runner import (
     UrlResult,
     append_result_to_csv,
     clean_csv_row,
+    is_async_kickoff_enabled,
     merge_results_to_csv,
     run_parallel,
     run_sequential,
     run_single_url,
+    run_stream,
+    run_with_retry,
 )
 
 
@@ -183,6 +186,113 @@ class TestRunSingleUrl:
         assert result.status == RunStatus.FAILED
         assert "API Error" in result.error
 
+    async def test_prefetch_inputs_merged_before_kickoff(self, tmp_path):
+        """Les donnees pre-chargees par la classe du crew sont injectees dans les inputs."""
+        crew = MagicMock()
+        crew.kickoff.return_value = MagicMock(raw="data")
+
+        class PrefetchCrew:
+            log_file = None
+
+            def crew(self):
+                return crew
+
+            def prefetch_inputs(self, url):
+                return {"prefetched_company_data": f"Accueil de {url}"}
+
+        result = await run_single_url("https://example.com", PrefetchCrew, tmp_path, timeout=60)
+
+        assert result.status == RunStatus.SUCCESS
+        crew.kickoff.assert_called_once_with(
+            inputs={"url": "https://example.com", "prefetched_company_data": "Accueil de https://example.com"}
+        )
+        assert [span.name for span in result.spans if span.kind == "task"] == ["prefetch"]
+
+    async def test_finalize_result_called_after_kickoff(self, tmp_path):
+        """La classe du crew peut completer le resultat sans LLM (ex: faits du registre)."""
+        crew = MagicMock()
+        crew.kickoff.return_value = MagicMock(raw="data")
+
+        class FinalizeCrew:
+            log_file = None
+
+            def crew(self):
+                return crew
+
+            def finalize_result(self, result):
+                result.csv_row += ",2015"
+                result.facts["siren"] = "309634954"
+
+        result = await run_single_url("https://example.com", FinalizeCrew, tmp_path, timeout=60)
+
+        assert result.csv_row == "data,2015"
+        assert result.facts == {"siren": "309634954"}
+
+
+class TestAsyncKickoff:
+    """Tests pour le kickoff asynchrone natif (RUNNER_ASYNC)."""
+
+    def test_disabled_by_default(self, monkeypatch):
+        monkeypatch.delenv("RUNNER_ASYNC", raising=False)
+        assert not is_async_kickoff_enabled()
+
+    async def test_uses_akickoff(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("RUNNER_ASYNC", "1")
+        crew_class = MagicMock()
+        crew = crew_class.return_value.crew.return_value
+        crew.akickoff = AsyncMock(return_value=MagicMock(raw="CSV,row"))
+
+        result = await run_single_url("https://example.com", crew_class, tmp_path, timeout=60)
+
+        assert result.status == RunStatus.SUCCESS
+        assert result.csv_row == "CSV,row"
+        crew.akickoff.assert_awaited_once_with(inputs={"url": "https://example.com"})
+        crew.kickoff.assert_not_called()
+
+    async def test_timeout_cancels_kickoff(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("RUNNER_ASYNC", "1")
+        cancelled = asyncio.Event()
+
+        async def slow_akickoff(inputs):
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        crew_class = MagicMock()
+        crew_class.return_value.crew.return_value.akickoff = slow_akickoff
+
+        result = await run_single_url("https://slow.com", crew_class, tmp_path, timeout=0.05)
+
+        assert result.status == RunStatus.TIMEOUT
+        assert cancelled.is_set()
+
+    async def test_parallel_many_in_flight(self, tmp_path, monkeypatch):
+        """Toutes les URLs en cours simultanement sur la boucle, sans thread par URL."""
+        monkeypatch.setenv("RUNNER_ASYNC", "1")
+        active = 0
+        peak = 0
+
+        async def akickoff(inputs):
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.01)
+            active -= 1
+            return MagicMock(raw=inputs["url"])
+
+        crew_class = MagicMock()
+        crew_class.return_value.crew.return_value.akickoff = akickoff
+        urls = [f"https://site{i}.com" for i in range(100)]
+
+        with patch("wakastart_leads.shared.utils.parallel_runner.asyncio.to_thread") as to_thread:
+            results = await run_parallel(urls, crew_class, tmp_path, max_workers=100, timeout=60)
+
+        assert all(r.status == RunStatus.SUCCESS for r in results)
+        assert peak == 100
+        to_thread.assert_not_called()
+
 
 class TestRunParallel:
     """Tests pour la fonction run_parallel."""
@@ -566,3 +676,109 @@ class TestRunParallelIncremental:
         assert all(r.status == RunStatus.SUCCESS for r in received_results)
         received_urls = {r.url for r in received_results}
         assert received_urls == {"https://a.com", "https://b.com"}
+
+
+def _ok_crew_class():
+    def create_mock_instance():
+        instance = MagicMock()
+        instance.crew.return_value.kickoff.return_value = MagicMock(raw="data")
+        return instance
+
+    return MagicMock(side_effect=create_mock_instance)
+
+
+class TestRunWithRetry:
+    """Tests pour run_with_retry."""
+
+    @pytest.mark.asyncio
+    async def test_retries_until_success(self, tmp_path):
+        calls = [0]
+
+        def create_mock_instance():
+            calls[0] += 1
+            instance = MagicMock()
+            if calls[0] == 1:
+                instance.crew.return_value.kickoff.side_effect = Exception("flaky")
+            else:
+                instance.crew.return_value.kickoff.return_value = MagicMock(raw="data")
+            return instance
+
+        with patch("wakastart_leads.shared.utils.parallel_runner.asyncio.sleep") as mock_sleep:
+            result = await run_with_retry("https://a.com", MagicMock(side_effect=create_mock_instance), tmp_path, 60, 2)
+
+        assert result.status == RunStatus.SUCCESS
+        assert calls[0] == 2
+        mock_sleep.assert_awaited_once_with(1)
+
+    @pytest.mark.asyncio
+    async def test_returns_last_failure(self, tmp_path):
+        crew_class = MagicMock()
+        crew_class.return_value.crew.return_value.kickoff.side_effect = Exception("down")
+
+        with patch("wakastart_leads.shared.utils.parallel_runner.asyncio.sleep"):
+            result = await run_with_retry("https://a.com", crew_class, tmp_path, 60, 1)
+
+        assert result.status == RunStatus.FAILED
+        assert crew_class.call_count == 2
+
+
+class TestRunStream:
+    """Tests pour run_stream (URLs consommees au fil de l'eau)."""
+
+    @pytest.mark.asyncio
+    async def test_processes_until_end_of_stream(self, tmp_path):
+        queue: asyncio.Queue = asyncio.Queue()
+        for url in ["https://a.com", "https://b.com", "https://c.com", None]:
+            queue.put_nowait(url)
+
+        results = await run_stream(queue, _ok_crew_class(), tmp_path, max_workers=2, timeout=60, retry_count=0)
+
+        assert sorted(r.url for r in results) == ["https://a.com", "https://b.com", "https://c.com"]
+        assert all(r.status == RunStatus.SUCCESS for r in results)
+
+    @pytest.mark.asyncio
+    async def test_starts_before_stream_is_complete(self, tmp_path):
+        queue: asyncio.Queue = asyncio.Queue()
+        received: list[str] = []
+
+        async def producer():
+            queue.put_nowait("https://first.com")
+            # La 2e URL n'est publiee qu'apres le traitement de la 1re
+            while not received:
+                await asyncio.sleep(0.01)
+            queue.put_nowait("https://second.com")
+            queue.put_nowait(None)
+
+        _, results = await asyncio.gather(
+            producer(),
+            run_stream(
+                queue,
+                _ok_crew_class(),
+                tmp_path,
+                max_workers=3,
+                timeout=60,
+                retry_count=0,
+                on_result=lambda r: received.append(r.url),
+            ),
+        )
+
+        assert received == ["https://first.com", "https://second.com"]
+        assert len(results) == 2
+
+    @pytest.mark.asyncio
+    async def test_saves_incrementally(self, tmp_path):
+        queue: asyncio.Queue = asyncio.Queue()
+        queue.put_nowait("https://a.com")
+        queue.put_nowait(None)
+        csv_path = tmp_path / "report.csv"
+
+        await run_stream(queue, _ok_crew_class(), tmp_path, timeout=60, retry_count=0, output_path=csv_path)
+
+        lines = csv_path.read_text(encoding="utf-8-sig").strip().splitlines()
+        assert lines[1] == "data"
+
+    @pytest.mark.asyncio
+    async def test_empty_stream(self, tmp_path):
+        queue: asyncio.Queue = asyncio.Queue()
+        queue.put_nowait(None)
+        assert await run_stream(queue, _ok_crew_class(), tmp_path, max_workers=4) == []
@@ -0,0 +1,120 @@
+"""Tests pour le module prompt_cache (cache de prompt cote fournisseur)."""
+
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+import yaml
+from crewai import LLM
+
+from wakastart_leads.shared.utils.prompt_cache import add_anthropic_cache_breakpoints, enable_prompt_caching
+
+
+@pytest.fixture()
+def _fake_keys(monkeypatch):
+    monkeypatch.setenv("ANTHROPIC_API_KEY", "test-key")
+    monkeypatch.setenv("GEMINI_API_KEY", "test-key")
+    monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+
+
+class TestAnthropicBreakpoints:
+    """Tests pour le marquage cache_control Anthropic."""
+
+    def test_system_and_last_message_marked(self):
+        params = {
+            "system": "Backstory statique",
+            "messages": [
+                {"role": "user", "content": "Tache"},
+                {"role": "assistant", "content": "Thought"},
+                {"role": "user", "content": "Observation"},
+            ],
+        }
+        result = add_anthropic_cache_breakpoints(params)
+        assert result["system"] == [
+            {"type": "text", "text": "Backstory statique", "cache_control": {"type": "ephemeral"}}
+        ]
+        assert result["messages"][-1]["content"][-1]["cache_control"] == {"type": "ephemeral"}
+        assert result["messages"][0]["content"] == "Tache"
+
+    def test_without_system(self):
+        result = add_anthropic_cache_breakpoints({"messages": [{"role": "user", "content": "x"}]})
+        assert "system" not in result
+
+
+@pytest.mark.usefixtures("_fake_keys")
+class TestEnablePromptCaching:
+    """Tests sur les LLMs natifs CrewAI."""
+
+    def test_anthropic_params_and_usage(self):
+        llm = enable_prompt_caching(LLM(model="anthropic/claude-sonnet-4-5-20250929"))
+
+        params = llm._prepare_completion_params([{"role": "user", "content": "Tache"}], "System")
+        assert params["system"][0]["cache_control"] == {"type": "ephemeral"}
+
+        response = SimpleNamespace(
+            usage=SimpleNamespace(
+                input_tokens=100, output_tokens=50, cache_read_input_tokens=900, cache_creation_input_tokens=0
+            )
+        )
+        llm._track_token_usage_internal(llm._extract_anthropic_token_usage(response))
+        summary = llm.get_token_usage_summary()
+        assert summary.prompt_tokens == 1000
+        assert summary.cached_prompt_tokens == 900
+
+    def test_gemini_reports_cached_tokens(self):
+        llm = enable_prompt_caching(LLM(model="gemini/gemini-2.5-flash"))
+        response = SimpleNamespace(
+            usage_metadata=SimpleNamespace(
+                prompt_token_count=2000,
+                candidates_token_count=100,
+                total_token_count=2100,
+                cached_content_token_count=1500,
+            )
+        )
+        llm._track_token_usage_internal(llm._extract_token_usage(response))
+        assert llm.get_token_usage_summary().cached_prompt_tokens == 1500
+
+    def test_openai_reports_cached_tokens(self):
+        llm = enable_prompt_caching(LLM(model="openai/gpt-4o"))
+        response = SimpleNamespace(
+            usage=SimpleNamespace(
+                prompt_tokens=2000,
+                completion_tokens=10,
+                total_tokens=2010,
+                prompt_tokens_details=SimpleNamespace(cached_tokens=1024),
+            )
+        )
+        llm._track_token_usage_internal(llm._extract_openai_token_usage(response))
+        assert llm.get_token_usage_summary().cached_prompt_tokens == 1024
+
+    def test_non_native_llm_unchanged(self):
+        mock = MagicMock()
+        assert enable_prompt_caching(mock) is mock
+
+
+class TestPromptOrdering:
+    """Les donnees dynamiques doivent etre en fin de prompt (prefixe statique cacheable)."""
+
+    def test_url_at_end_of_analysis_prompts(self):
+        config = Path(__file__).parents[3] / "src/wakastart_leads/crews/analysis/config"
+        agents = yaml.safe_load((config / "agents.yaml").read_text(encoding="utf-8"))
+        tasks = yaml.safe_load((config / "tasks.yaml").read_text(encoding="utf-8"))
+
+        assert not any("{url}" in str(agent) for agent in agents.values())
+        description = tasks["extraction_and_macro_filtering"]["description"]
+        static, dynamic = description.split("URL A TRAITER : {url}")
+        assert "{" not in static
+        assert dynamic.rstrip().endswith("{prefetched_company_data}")
+
+    def test_criteria_at_end_of_search_prompts(self):
+        config = Path(__file__).parents[3] / "src/wakastart_leads/crews/search/config"
+        agents = yaml.safe_load((config / "agents.yaml").read_text(encoding="utf-8"))
+        tasks = yaml.safe_load((config / "tasks.yaml").read_text(encoding="utf-8"))
+
+        assert not any("{search_criteria}" in str(agent) for agent in agents.values())
+        for task in tasks.values():
+            description = task["description"]
+            first_input = description.find("{")
+            # Entrees ({search_criteria}, {sector}, {max_results}) dans les 3 dernieres lignes seulement
+            assert first_input == -1 or len(description[first_input:].splitlines()) <= 3
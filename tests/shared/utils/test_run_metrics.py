@@ -0,0 +1,216 @@
+"""Tests pour les metriques en direct (compteurs, export Prometheus, vue de progression)."""
+
+import io
+import urllib.error
+import urllib.request
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from wakastart_leads.shared.utils.parallel_runner import RunStatus, UrlResult, run_parallel, run_with_retry
+from wakastart_leads.shared.utils.run_metrics import (
+    CONTENT_TYPE,
+    Histogram,
+    MetricsServer,
+    ProgressView,
+    RunMetrics,
+    format_duration,
+    format_progress,
+    get_metrics_port,
+    live_metrics,
+)
+from wakastart_leads.shared.utils.tracing import Span, Tracer
+
+
+class FakeClock:
+    def __init__(self, now: float = 1000.0) -> None:
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _result(status=RunStatus.SUCCESS, duration=30.0):
+    return UrlResult(url="https://acme.com", status=status, csv_row=None, error=None, duration_seconds=duration)
+
+
+class TestHistogram:
+    """Tests pour l'histogramme a seaux fixes."""
+
+    def test_cumulative_buckets(self):
+        hist = Histogram((1.0, 5.0))
+        for value in (0.5, 2.0, 3.0, 10.0):
+            hist.observe(value)
+        assert hist.cumulative() == [("1", 1), ("5", 3), ("+Inf", 4)]
+        assert hist.sum == 15.5
+
+
+class TestRunMetrics:
+    """Tests pour les compteurs, le debit et l'ETA."""
+
+    def test_throughput_eta_and_error_rate(self):
+        clock = FakeClock()
+        metrics = RunMetrics(total=10, workers=2, clock=clock)
+        for status in (RunStatus.SUCCESS, RunStatus.SUCCESS, RunStatus.TIMEOUT, RunStatus.SUCCESS):
+            metrics.url_started()
+            clock.now += 30
+            metrics.url_finished(_result(status))
+
+        snapshot = metrics.snapshot()
+        assert snapshot["done"] == 4
+        assert snapshot["in_flight"] == 0
+        assert snapshot["throughput_per_minute"] == pytest.approx(2.0)
+        assert snapshot["eta_seconds"] == pytest.approx(180.0)
+        assert snapshot["error_rate"] == pytest.approx(0.25)
+
+    def test_throughput_window_forgets_old_completions(self):
+        clock = FakeClock()
+        metrics = RunMetrics(total=3, clock=clock)
+        metrics.url_finished(_result())
+        clock.now += 3600
+        assert metrics.snapshot()["throughput_per_minute"] == 0
+        assert metrics.snapshot()["eta_seconds"] is None
+
+    def test_tracer_observer_records_provider_calls(self):
+        metrics = RunMetrics()
+        tracer = Tracer(observer=metrics)
+
+        with tracer.span("gpt-4o", "llm"):
+            assert metrics.snapshot()["oldest_call"][0] == "gpt-4o"
+        with pytest.raises(RuntimeError), tracer.span("serper", "tool"):
+            raise RuntimeError("down")
+        with tracer.task_span("analyse"):
+            pass
+
+        assert metrics.snapshot()["oldest_call"] is None
+        assert metrics.provider_latency[("llm", "gpt-4o")].count == 1
+        assert metrics.provider_errors == {("tool", "serper"): 1}
+        assert ("task", "analyse") not in metrics.provider_latency
+
+
+class TestPrometheusExport:
+    """Tests pour le format texte Prometheus."""
+
+    def test_render(self):
+        metrics = RunMetrics(total=5, workers=3)
+        metrics.url_started()
+        metrics.url_started()
+        metrics.attempt_finished(_result(RunStatus.FAILED))
+        metrics.attempt_finished(_result())
+        metrics.url_finished(_result(duration=45.0))
+        metrics.span_started(Span(name="claude-sonnet", kind="llm", start=0.0))
+
+        text = metrics.render_prometheus()
+
+        assert "# TYPE wakastart_urls_in_flight gauge\nwakastart_urls_in_flight 1\n" in text
+        assert 'wakastart_urls_completed_total{status="success"} 1' in text
+        assert 'wakastart_attempts_total{status="failed"} 1' in text
+        assert 'wakastart_url_duration_seconds_bucket{le="60"} 1' in text
+        assert "wakastart_url_duration_seconds_count 1" in text
+        assert 'wakastart_provider_calls_in_flight{kind="llm",name="claude-sonnet"} 1' in text
+        assert text.endswith("\n")
+
+    def test_label_escaping(self):
+        metrics = RunMetrics()
+        metrics.span_finished(Span(name='Search "web"\\x', kind="tool", start=0.0, duration_seconds=1.0))
+        assert 'name="Search \\"web\\"\\\\x"' in metrics.render_prometheus()
+
+
+class TestMetricsServer:
+    """Tests pour l'endpoint HTTP local."""
+
+    def test_serves_metrics(self):
+        metrics = RunMetrics(total=2)
+        server = MetricsServer(metrics, port=0).start()
+        try:
+            with urllib.request.urlopen(server.url, timeout=5) as response:
+                assert response.headers["Content-Type"] == CONTENT_TYPE
+                assert "wakastart_urls_planned 2" in response.read().decode("utf-8")
+            with pytest.raises(urllib.error.HTTPError):
+                urllib.request.urlopen(server.url.replace("/metrics", "/"), timeout=5)
+        finally:
+            server.stop()
+
+
+class TestProgressView:
+    """Tests pour la ligne de progression."""
+
+    def test_format_progress(self):
+        snapshot = {
+            "total": 200,
+            "done": 12,
+            "in_flight": 3,
+            "workers": 3,
+            "throughput_per_minute": 4.24,
+            "eta_seconds": 2660,
+            "error_rate": 0.083,
+            "llm_mean_seconds": 3.14,
+            "oldest_call": ("gpt-4o", 95),
+        }
+        assert format_progress(snapshot) == (
+            "[12/200] en cours 3/3 | 4.2 URL/min | ETA 44m20s | erreurs 8% | LLM 3.1s moy. | plus ancien: gpt-4o 1m35s"
+        )
+
+    def test_format_duration(self):
+        assert format_duration(45) == "45s"
+        assert format_duration(8040) == "2h14m"
+
+    def test_render_without_tty_appends_lines(self):
+        stream = io.StringIO()
+        view = ProgressView(RunMetrics(total=None), stream=stream)
+        view.render()
+        assert stream.getvalue().startswith("[0/?] en cours 0/1")
+        assert stream.getvalue().endswith("\n")
+
+
+class TestLiveMetrics:
+    """Tests pour l'activation par variables d'environnement."""
+
+    def test_disabled_by_default(self, monkeypatch):
+        monkeypatch.delenv("RUNNER_METRICS_PORT", raising=False)
+        monkeypatch.delenv("RUNNER_PROGRESS", raising=False)
+        with live_metrics(total=3) as metrics:
+            assert metrics is None
+
+    def test_invalid_port_ignored(self, monkeypatch):
+        monkeypatch.setenv("RUNNER_METRICS_PORT", "abc")
+        assert get_metrics_port() == 0
+
+    def test_progress_final_line(self, monkeypatch, capsys):
+        monkeypatch.setenv("RUNNER_PROGRESS", "1")
+        with live_metrics(total=1, workers=2) as metrics:
+            metrics.url_started()
+            metrics.url_finished(_result())
+        assert "[1/1] en cours 0/2" in capsys.readouterr().err
+
+
+class TestRunnerMetrics:
+    """Le runner alimente les metriques (URLs en cours, tentatives, statuts finaux)."""
+
+    @pytest.mark.asyncio
+    async def test_run_parallel(self, tmp_path):
+        def create_mock_instance():
+            instance = MagicMock()
+            instance.crew.return_value.kickoff.return_value = MagicMock(raw="data")
+            return instance
+
+        metrics = RunMetrics(total=3, workers=2)
+        urls = ["https://a.com", "https://b.com", "https://c.com"]
+        await run_parallel(urls, MagicMock(side_effect=create_mock_instance), tmp_path, max_workers=2, metrics=metrics)
+
+        assert metrics.completed == {"success": 3}
+        assert metrics.in_flight == 0
+        assert metrics.url_duration.count == 3
+
+    @pytest.mark.asyncio
+    async def test_retries_counted_as_attempts(self, tmp_path):
+        crew_class = MagicMock()
+        crew_class.return_value.crew.return_value.kickoff.side_effect = Exception("down")
+        metrics = RunMetrics(total=1)
+
+        with patch("wakastart_leads.shared.utils.parallel_runner.asyncio.sleep"):
+            await run_with_retry("https://a.com", crew_class, tmp_path, 60, 2, metrics=metrics)
+
+        assert metrics.attempts == {"failed": 3}
+        assert metrics.completed == {"failed": 1}
+        assert metrics.snapshot()["error_rate"] == 1.0
@@ -0,0 +1,180 @@
+"""Tests unitaires pour l'index des domaines deja vus."""
+
+import json
+from unittest.mock import patch
+
+import pytest
+
+from wakastart_leads.shared.utils.seen_index import (
+    ANALYSIS_SEEN,
+    ENRICHMENT_SEEN,
+    BloomFilter,
+    SeenDomainIndex,
+    domain_hash,
+    domain_key,
+    format_seen_index_stats,
+    get_seen_index,
+)
+
+
+class TestDomainKey:
+    def test_normalizes_scheme_www_and_path(self):
+        assert domain_key("https://www.Acme.fr/produit?x=1") == "acme.fr"
+        assert domain_key("acme.fr") == "acme.fr"
+        assert domain_hash("http://acme.fr/") == domain_hash("https://www.acme.fr/contact")
+
+    def test_distinct_domains(self):
+        assert domain_hash("acme.fr") != domain_hash("acme.com")
+
+
+class TestBloomFilter:
+    def test_no_false_negatives(self):
+        bloom = BloomFilter(1000)
+        values = [domain_hash(f"site{i}.fr") for i in range(1000)]
+        for value in values:
+            bloom.add(value)
+        assert all(value in bloom for value in values)
+
+    def test_false_positive_rate(self):
+        bloom = BloomFilter(1000, error_rate=0.01)
+        for i in range(1000):
+            bloom.add(domain_hash(f"site{i}.fr"))
+        false_positives = sum(domain_hash(f"autre{i}.fr") in bloom for i in range(10_000))
+        assert false_positives < 300
+
+
+class TestSeenDomainIndex:
+    def test_add_and_contains(self):
+        index = SeenDomainIndex()
+        assert index.add_many(["https://acme.fr", "www.acme.fr/page", "beta.io", ""]) == 2
+        assert "http://www.acme.fr/" in index
+        assert "beta.io" in index
+        assert "gamma.com" not in index
+        assert len(index) == 2
+
+    def test_add_returns_new(self):
+        index = SeenDomainIndex()
+        assert index.add("acme.fr") is True
+        assert index.add("https://www.acme.fr") is False
+
+    def test_persisted_as_sorted_hashes(self, tmp_path):
+        path = tmp_path / "seen.bin"
+        index = SeenDomainIndex(path)
+        index.add_many([f"site{i}.fr" for i in range(50)])
+        index.flush()
+        # 8 octets par domaine
+        assert path.stat().st_size == 50 * 8
+
+        reloaded = SeenDomainIndex(path)
+        assert len(reloaded) == 50
+        assert all(f"https://www.site{i}.fr" in reloaded for i in range(50))
+        assert "site50.fr" not in reloaded
+
+    def test_flush_keeps_other_process_additions(self, tmp_path):
+        path = tmp_path / "seen.bin"
+        first, second = SeenDomainIndex(path), SeenDomainIndex(path)
+        first.add("acme.fr")
+        first.flush()
+        second.add("beta.io")
+        second.flush()
+        reloaded = SeenDomainIndex(path)
+        assert "acme.fr" in reloaded and "beta.io" in reloaded
+        # Le filtre de Bloom de `second` couvre les domaines fusionnes depuis le fichier
+        assert "acme.fr" in second
+
+    def test_bloom_answers_unknown_domains(self):
+        index = SeenDomainIndex()
+        index.add("acme.fr")
+        assert "acme.fr" in index
+        for i in range(100):
+            assert f"inconnu{i}.fr" not in index
+        assert index.stats["hit"] == 1
+        # La grande majorite des absents est ecartee par le filtre seul
+        assert index.stats["bloom"] >= 95
+
+    def test_bloom_grows_with_index(self):
+        index = SeenDomainIndex()
+        index.add_many([f"site{i}.fr" for i in range(25_000)])
+        assert index._bloom.capacity >= 25_000
+        assert all(f"site{i}.fr" in index for i in range(0, 25_000, 997))
+
+    def test_stats_line(self):
+        index = SeenDomainIndex()
+        assert format_seen_index_stats(index) is None
+        index.add("acme.fr")
+        assert "acme.fr" in index
+        assert "1 sur 1" in format_seen_index_stats(index)
+        assert "(enrichment)" in format_seen_index_stats(index, ENRICHMENT_SEEN)
+
+
+class TestGetSeenIndex:
+    def test_disabled_by_env(self, monkeypatch):
+        monkeypatch.setenv("SEEN_INDEX_ENABLED", "0")
+        assert get_seen_index() is None
+
+    def test_path_from_env(self, monkeypatch, tmp_path):
+        monkeypatch.setenv("SEEN_INDEX_ENABLED", "1")
+        monkeypatch.setenv("SEEN_INDEX_PATH", str(tmp_path / "seen.bin"))
+        with patch("wakastart_leads.shared.utils.seen_index._shared_indexes", {}):
+            analysis, enrichment = get_seen_index(ANALYSIS_SEEN), get_seen_index(ENRICHMENT_SEEN)
+            assert analysis.path == tmp_path / "seen_analysis.bin"
+            assert enrichment.path == tmp_path / "seen_enrichment.bin"
+            assert get_seen_index(ANALYSIS_SEEN) is analysis
+
+
+class TestMainSeenIntegration:
+    @pytest.fixture()
+    def seen(self, tmp_path, monkeypatch):
+        from wakastart_leads import main
+
+        indexes = {namespace: SeenDomainIndex(tmp_path / f"seen_{namespace}.bin") for namespace in main.SEEN_NAMESPACES}
+        monkeypatch.setattr(main, "get_seen_index", indexes.get)
+        monkeypatch.setattr(main, "ANALYSIS_OUTPUT", tmp_path / "analysis")
+        monkeypatch.setattr(main, "ENRICHMENT_OUTPUT", tmp_path / "enrichment")
+        (tmp_path / "analysis").mkdir()
+        (tmp_path / "analysis" / "company_report.csv").write_text(
+            "Societe,Site Web\nAcme,https://acme.fr\n", encoding="utf-8-sig"
+        )
+        (tmp_path / "enrichment").mkdir()
+        (tmp_path / "enrichment" / "enrichment_accumulated.json").write_text(
+            json.dumps([{"url": "https://www.beta.io"}]), encoding="utf-8"
+        )
+        return main, indexes, tmp_path
+
+    def test_each_command_skips_its_own_domains(self, seen):
+        main, indexes, tmp_path = seen
+        urls = ["https://acme.fr/", "beta.io", "https://gamma.com"]
+
+        analysis = main._load_seen_indexes(ANALYSIS_SEEN)
+        enrichment = main._load_seen_indexes(ENRICHMENT_SEEN)
+
+        assert analysis == [indexes[ANALYSIS_SEEN]]
+        # Un domaine analyse reste a enrichir, et inversement
+        assert main._skip_seen(urls, analysis) == ["beta.io", "https://gamma.com"]
+        assert main._skip_seen(urls, enrichment) == ["https://acme.fr/", "https://gamma.com"]
+        assert (tmp_path / "seen_analysis.bin").exists()
+
+    def test_search_excludes_both_namespaces(self, seen):
+        main, _, _ = seen
+        indexes = main._load_seen_indexes(*main.SEEN_NAMESPACES)
+        assert main._skip_seen(["https://acme.fr/", "beta.io", "https://gamma.com"], indexes) == ["https://gamma.com"]
+
+    def test_record_seen_domains(self, seen):
+        main, _, tmp_path = seen
+        main._record_seen_domains(["https://delta.fr"], ENRICHMENT_SEEN)
+        assert "delta.fr" in SeenDomainIndex(tmp_path / "seen_enrichment.bin")
+        assert "delta.fr" not in SeenDomainIndex(tmp_path / "seen_analysis.bin")
+
+    def test_search_results_exclude_seen(self, seen, monkeypatch):
+        main, indexes, tmp_path = seen
+        monkeypatch.setattr(main, "SEARCH_OUTPUT", tmp_path / "search")
+        (tmp_path / "search").mkdir()
+        (tmp_path / "search" / "search_results_raw.json").write_text(
+            '["https://acme.fr", "https://beta.io", "https://new.fr"]', encoding="utf-8"
+        )
+        indexes[ANALYSIS_SEEN].add("acme.fr")
+        indexes[ENRICHMENT_SEEN].add("beta.io")
+
+        urls = main._post_process_search_results(str(tmp_path / "urls.json"), list(indexes.values()))
+
+        assert urls == ["https://new.fr"]
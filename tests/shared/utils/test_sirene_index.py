@@ -0,0 +1,168 @@
+"""Tests unitaires pour l'index Sirene local (fichier stock INSEE)."""
+
+import csv
+import sys
+import zipfile
+from unittest.mock import patch
+
+import httpx
+import pytest
+
+from wakastart_leads.shared.tools.sirene_tool import SireneSearchTool
+from wakastart_leads.shared.utils.sirene_index import (
+    SireneIndex,
+    build_sirene_index,
+    format_sirene_index_stats,
+    get_sirene_index,
+    normalize_name,
+)
+
+# Extrait du stock StockUniteLegale (colonnes non indexees comprises)
+STOCK_HEADER = [
+    "siren",
+    "statutDiffusionUniteLegale",
+    "dateCreationUniteLegale",
+    "sigleUniteLegale",
+    "prenomUsuelUniteLegale",
+    "trancheEffectifsUniteLegale",
+    "categorieEntreprise",
+    "etatAdministratifUniteLegale",
+    "nomUniteLegale",
+    "denominationUniteLegale",
+    "denominationUsuelle1UniteLegale",
+    "categorieJuridiqueUniteLegale",
+    "activitePrincipaleUniteLegale",
+]
+STOCK_ROWS = [
+    ["309634954", "O", "1979-01-01", "", "", "41", "GE", "A", "", "GOOGLE FRANCE", "", "5720", "70.10Z"],
+    ["552032534", "O", "1955-01-01", "", "", "53", "GE", "A", "", "DANONE", "", "5599", "70.10Z"],
+    ["123456782", "O", "2015-03-01", "", "", "11", "PME", "C", "", "ACME SANTÉ", "", "5710", "62.01Z"],
+    ["987654324", "O", "2019-06-01", "", "", "12", "PME", "A", "", "ACME SANTE CLOUD", "", "5710", "62.01Z"],
+    ["111222333", "O", "2020-01-01", "", "Jean", "", "", "A", "DUPONT", "", "", "1000", "62.02A"],
+]
+SIRENE_TARGET = "wakastart_leads.shared.tools.sirene_tool.requests.get"
+
+
+@pytest.fixture()
+def stock_csv(tmp_path):
+    path = tmp_path / "StockUniteLegale_utf8.csv"
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(STOCK_HEADER)
+        writer.writerows(STOCK_ROWS)
+    return path
+
+
+@pytest.fixture()
+def index(stock_csv, tmp_path):
+    output = tmp_path / "sirene_index.sqlite3"
+    build_sirene_index(stock_csv, output)
+    return SireneIndex(output)
+
+
+class TestBuildSireneIndex:
+    def test_counts_rows(self, stock_csv, tmp_path):
+        assert build_sirene_index(stock_csv, tmp_path / "index.sqlite3") == len(STOCK_ROWS)
+
+    def test_active_only(self, stock_csv, tmp_path):
+        assert build_sirene_index(stock_csv, tmp_path / "index.sqlite3", active_only=True) == len(STOCK_ROWS) - 1
+
+    def test_zipped_stock(self, stock_csv, tmp_path):
+        archive = tmp_path / "StockUniteLegale_utf8.zip"
+        with zipfile.ZipFile(archive, "w") as z:
+            z.write(stock_csv, stock_csv.name)
+        output = tmp_path / "index.sqlite3"
+        build_sirene_index(archive, output)
+        assert SireneIndex(output).metadata()["source"] == archive.name
+
+    def test_rebuild_replaces_index(self, stock_csv, tmp_path):
+        output = tmp_path / "index.sqlite3"
+        build_sirene_index(stock_csv, output)
+        build_sirene_index(stock_csv, output, active_only=True)
+        assert len(SireneIndex(output)) == len(STOCK_ROWS) - 1
+        assert not (tmp_path / "index.sqlite3.tmp").exists()
+
+
+class TestSireneIndex:
+    def test_normalize_name(self):
+        assert normalize_name("  Acme-Santé S.A.S ") == "acme sante s a s"
+
+    def test_get_returns_api_format(self, index):
+        unite = index.get("309634954")
+        assert unite["dateCreationUniteLegale"] == "1979-01-01"
+        assert unite["periodesUniteLegale"][0]["denominationUniteLegale"] == "GOOGLE FRANCE"
+        assert index.get("000000000") is None
+
+    def test_search_prefix_accents_active_first(self, index):
+        names = [u["periodesUniteLegale"][0]["denominationUniteLegale"] for u in index.search("acme santé")]
+        assert names == ["ACME SANTE CLOUD", "ACME SANTÉ"]
+
+    def test_search_individual_by_name(self, index):
+        assert index.search("jean dupont")[0]["siren"] == "111222333"
+
+    def test_stats(self, index):
+        assert format_sirene_index_stats(index) is None
+        index.get("309634954")
+        index.search("inconnue")
+        assert "1 requete(s) servie(s) sur 2" in format_sirene_index_stats(index)
+
+    def test_shared_index_requires_built_file(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("SIRENE_INDEX_ENABLED", "1")
+        monkeypatch.setenv("SIRENE_INDEX_PATH", str(tmp_path / "absent.sqlite3"))
+        assert get_sirene_index() is None
+
+
+class TestSireneToolLocalIndex:
+    def test_siren_served_locally_without_api_key(self, index, clear_all_api_keys):
+        with patch(SIRENE_TARGET) as mock_get:
+            result = SireneSearchTool(local_index=index)._run("309 634 954")
+        mock_get.assert_not_called()
+        assert "GOOGLE FRANCE" in result
+        assert "Date de creation: 1979-01-01" in result
+
+    def test_name_served_locally(self, index):
+        with patch(SIRENE_TARGET) as mock_get:
+            result = SireneSearchTool(local_index=index)._run("Danone")
+        mock_get.assert_not_called()
+        assert "552032534" in result
+
+    def test_miss_falls_back_to_api(self, index, mock_sirene_api_key, mock_response, sirene_unite_legale_response):
+        with patch(SIRENE_TARGET, return_value=mock_response(200, sirene_unite_legale_response)) as mock_get:
+            SireneSearchTool(local_index=index)._run("000000000")
+        assert "/siren/000000000" in mock_get.call_args.args[0]
+
+    def test_fetch_unite_legale_uses_index(self, index, clear_all_api_keys):
+        assert SireneSearchTool(local_index=index).fetch_unite_legale("552032534")["siren"] == "552032534"
+
+    @pytest.fixture()
+    def corrupt_index(self, tmp_path):
+        path = tmp_path / "sirene.sqlite3"
+        path.write_bytes(b"pas une base SQLite" * 100)
+        return SireneIndex(path)
+
+    def test_corrupt_index_falls_back_to_api(
+        self, corrupt_index, mock_sirene_api_key, mock_response, sirene_unite_legale_response
+    ):
+        tool = SireneSearchTool(local_index=corrupt_index)
+        with patch(SIRENE_TARGET, return_value=mock_response(200, sirene_unite_legale_response)) as mock_get:
+            assert "GOOGLE FRANCE" in tool._run("309 634 954")
+            assert tool.fetch_unite_legale("309634954")["siren"] == "309634954"
+        assert mock_get.call_count == 2
+
+    async def test_corrupt_index_falls_back_to_async_api(
+        self, corrupt_index, mock_sirene_api_key, async_http_handler, sirene_unite_legale_response
+    ):
+        seen = async_http_handler(lambda request: httpx.Response(200, json=sirene_unite_legale_response))
+        assert "GOOGLE FRANCE" in await SireneSearchTool(local_index=corrupt_index)._arun("309 634 954")
+        assert seen[0].url.path.endswith("/siren/309634954")
+
+
+class TestSireneIndexCommand:
+    def test_builds_index(self, stock_csv, tmp_path, capsys):
+        from wakastart_leads.main import sirene_index
+
+        output = tmp_path / "cli.sqlite3"
+        with patch.object(sys, "argv", ["wakastart", "sirene-index", str(stock_csv), "--output", str(output)]):
+            sirene_index()
+        assert len(SireneIndex(output)) == len(STOCK_ROWS)
+        assert "[OK] 5 unite(s) legale(s) indexee(s)" in capsys.readouterr().out
@@ -0,0 +1,224 @@
+"""Tests pour le module tracing (spans par tache, LLM et outil)."""
+
+import asyncio
+import json
+import threading
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from wakastart_leads.shared.utils.log_store import read_log
+from wakastart_leads.shared.utils.parallel_runner import (
+    RunStatus,
+    UrlResult,
+    record_trace,
+    run_sequential,
+    run_single_url,
+)
+from wakastart_leads.shared.utils.tracing import (
+    Span,
+    Tracer,
+    append_trace,
+    export_otlp,
+    format_time_summary,
+    summarize_spans,
+    to_otlp_payload,
+)
+
+
+class FakeTask:
+    name = "commercial_analysis"
+
+    def __init__(self, agent):
+        self.agent = agent
+
+    def execute_sync(self, *args, **kwargs):
+        self.agent.tools[0]._run(query="x")
+        return self.agent.llm.call([{"role": "user", "content": "hi"}])
+
+
+class FakeTool:
+    name = "sirene_search"
+
+    def _run(self, **kwargs):
+        return "ok"
+
+
+class FakeLLM:
+    model = "gemini/gemini-2.5-flash"
+
+    def call(self, messages, **kwargs):
+        return "answer"
+
+
+def _fake_crew():
+    agent = MagicMock(role="Analyste", llm=FakeLLM(), tools=[FakeTool()])
+    crew = MagicMock(agents=[agent], tasks=[FakeTask(agent)])
+    return crew
+
+
+class FakeAsyncTask(FakeTask):
+    async def aexecute_sync(self, *args, **kwargs):
+        await self.agent.tools[0]._arun(query="x")
+        return await self.agent.llm.acall([{"role": "user", "content": "hi"}])
+
+
+class FakeAsyncTool(FakeTool):
+    async def _arun(self, **kwargs):
+        return "ok"
+
+
+class FakeAsyncLLM(FakeLLM):
+    async def acall(self, messages, **kwargs):
+        return "answer"
+
+
+class TestTracer:
+    """Tests pour la collecte des spans."""
+
+    def test_span_records_error(self):
+        tracer = Tracer()
+        with pytest.raises(ValueError), tracer.span("boom", "tool"):
+            raise ValueError("API down")
+        (span,) = tracer.spans
+        assert span.status == "error"
+        assert span.error == "API down"
+
+    def test_instrument_crew_nests_llm_and_tool_under_task(self):
+        tracer = Tracer()
+        crew = _fake_crew()
+        tracer.instrument_crew(crew)
+
+        assert crew.tasks[0].execute_sync() == "answer"
+
+        by_kind = {span.kind: span for span in tracer.spans}
+        assert set(by_kind) == {"task", "llm", "tool"}
+        assert by_kind["task"].name == "commercial_analysis"
+        assert by_kind["llm"].name == "gemini/gemini-2.5-flash"
+        assert by_kind["tool"].name == "sirene_search"
+        assert by_kind["llm"].parent_id == by_kind["task"].span_id
+        assert by_kind["tool"].parent_id == by_kind["task"].span_id
+
+    async def test_instrument_crew_async_path(self):
+        tracer = Tracer()
+        agent = MagicMock(role="Analyste", llm=FakeAsyncLLM(), tools=[FakeAsyncTool()])
+        crew = MagicMock(agents=[agent], tasks=[FakeAsyncTask(agent)])
+        tracer.instrument_crew(crew)
+
+        assert await crew.tasks[0].aexecute_sync() == "answer"
+
+        by_kind = {span.kind: span for span in tracer.spans}
+        assert set(by_kind) == {"task", "llm", "tool"}
+        assert by_kind["llm"].parent_id == by_kind["task"].span_id
+        assert by_kind["tool"].parent_id == by_kind["task"].span_id
+
+
+class TestSummaries:
+    """Tests pour l'agregation et l'ecriture des spans."""
+
+    def test_summarize_sorted_by_total_time(self):
+        spans = [
+            Span("apollo_search", "tool", 0, 1.0),
+            Span("apollo_search", "tool", 0, 2.0),
+            Span("gamma_create_webpage", "tool", 0, 10.0),
+        ]
+        assert summarize_spans(spans) == [
+            ("tool", "gamma_create_webpage", 1, 10.0),
+            ("tool", "apollo_search", 2, 3.0),
+        ]
+
+    def test_format_time_summary_groups_by_kind(self):
+        lines = format_time_summary([Span("commercial_analysis", "task", 0, 5.0), Span("serper", "tool", 0, 1.0)])
+        assert lines[0].strip() == "Taches:"
+        assert any("Outils:" in line for line in lines)
+
+    def test_append_trace_writes_jsonl(self, tmp_path):
+        path = tmp_path / "trace.jsonl"
+        append_trace(path, "https://a.com", [Span("t", "task", 0, 1.0), Span("l", "llm", 0, 0.5)], "abc")
+        lines = [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+        assert len(lines) == 2
+        assert lines[0]["url"] == "https://a.com"
+        assert lines[1]["kind"] == "llm"
+
+
+class TestOtlpExport:
+    """Tests pour l'export OTLP/HTTP."""
+
+    def test_payload_links_parent(self):
+        parent = Span("task", "task", 1.0, 2.0)
+        child = Span("llm", "llm", 1.5, 0.5, parent_id=parent.span_id, status="error", error="429")
+        payload = to_otlp_payload("https://a.com", [parent, child], "0" * 32)
+        spans = payload["resourceSpans"][0]["scopeSpans"][0]["spans"]
+        assert spans[1]["parentSpanId"] == parent.span_id
+        assert spans[1]["status"]["code"] == 2
+        assert spans[0]["endTimeUnixNano"] == str(3_000_000_000)
+
+    def test_no_endpoint_no_request(self, monkeypatch):
+        monkeypatch.delenv("WAKASTART_OTLP_ENDPOINT", raising=False)
+        with patch("wakastart_leads.shared.utils.tracing.requests.post") as mock_post:
+            assert export_otlp("https://a.com", [Span("t", "task", 0, 1.0)], "0" * 32) is False
+        mock_post.assert_not_called()
+
+    def test_posts_to_configured_endpoint(self, monkeypatch):
+        monkeypatch.setenv("WAKASTART_OTLP_ENDPOINT", "http://localhost:4318/v1/traces")
+        with patch("wakastart_leads.shared.utils.tracing.requests.post") as mock_post:
+            mock_post.return_value.status_code = 200
+            assert export_otlp("https://a.com", [Span("t", "task", 0, 1.0)], "0" * 32) is True
+        assert mock_post.call_args.args[0] == "http://localhost:4318/v1/traces"
+
+    async def test_record_trace_exports_off_loop_without_lock(self, monkeypatch, tmp_path):
+        monkeypatch.setenv("WAKASTART_OTLP_ENDPOINT", "http://localhost:4318/v1/traces")
+        lock = asyncio.Lock()
+        seen = {}
+
+        def fake_export(url, spans, trace_id):
+            seen["thread"] = threading.current_thread()
+            seen["locked"] = lock.locked()
+            return True
+
+        result = UrlResult("https://a.com", RunStatus.SUCCESS, "x", None, 1.0, [Span("t", "task", 0, 1.0)], "0" * 32)
+        with patch("wakastart_leads.shared.utils.parallel_runner.export_otlp", side_effect=fake_export):
+            await record_trace(result, tmp_path / "trace.jsonl", lock)
+
+        assert seen["locked"] is False
+        assert seen["thread"] is not threading.main_thread()
+        assert (tmp_path / "trace.jsonl").exists()
+
+
+class TestRunnerIntegration:
+    """Tests de l'instrumentation depuis les runners."""
+
+    async def test_run_single_url_attaches_spans(self, tmp_path):
+        crew = _fake_crew()
+        crew.kickoff.side_effect = lambda inputs: MagicMock(raw=crew.tasks[0].execute_sync())
+        crew_class = MagicMock()
+        crew_class.return_value.crew.return_value = crew
+
+        result = await run_single_url("https://a.com", crew_class, tmp_path, timeout=60)
+
+        assert result.status == RunStatus.SUCCESS
+        assert {span.kind for span in result.spans} == {"task", "llm", "tool"}
+        assert result.trace_id is not None
+
+    async def test_run_sequential_writes_trace_and_summary(self, tmp_path):
+        def make_instance():
+            crew = _fake_crew()
+            crew.kickoff.side_effect = lambda inputs: MagicMock(raw=crew.tasks[0].execute_sync())
+            instance = MagicMock()
+            instance.crew.return_value = crew
+            return instance
+
+        log_dir = tmp_path / "logs"
+        await run_sequential(
+            urls=["https://a.com"],
+            crew_class=MagicMock(side_effect=make_instance),
+            log_dir=log_dir,
+            output_path=tmp_path / "report.csv",
+            timeout=60,
+            retry_count=0,
+        )
+
+        (trace,) = log_dir.glob("run_*_trace.jsonl")
+        assert len(trace.read_text(encoding="utf-8").splitlines()) == 3
+        (log,) = log_dir.glob("run_*.txt.gz")
+        assert "RÉPARTITION DU TEMPS" in read_log(log)
@@ -0,0 +1,164 @@
+"""Tests pour le module usage (tokens et couts LLM)."""
+
+import json
+from unittest.mock import MagicMock, patch
+
+import pytest
+from crewai.llms.base_llm import BaseLLM
+
+from wakastart_leads.shared.utils.parallel_runner import (
+    RunStatus,
+    UrlResult,
+    run_sequential,
+    run_single_url,
+    run_with_retry,
+)
+from wakastart_leads.shared.utils.usage import (
+    UsageRecord,
+    aggregate_usage,
+    collect_usage,
+    format_usage_summary,
+    price_for,
+    write_cost_report,
+)
+
+
+class StubLLM(BaseLLM):
+    """LLM minimal dont les compteurs de tokens sont pre-remplis."""
+
+    def __init__(self, model: str, prompt: int, completion: int, cached: int = 0):
+        super().__init__(model=model)
+        self._track_token_usage_internal(
+            {"prompt_tokens": prompt, "completion_tokens": completion, "cached_tokens": cached}
+        )
+
+    def call(self, messages, **kwargs):
+        return ""
+
+
+class TestPriceFor:
+    """Tests pour la resolution des tarifs."""
+
+    def test_strips_provider_and_version(self):
+        assert price_for("anthropic/claude-sonnet-4-5-20250929").input == 3.00
+
+    def test_longest_prefix_wins(self):
+        assert price_for("gemini/gemini-2.0-flash-lite").input == 0.075
+        assert price_for("gemini/gemini-2.0-flash").input == 0.15
+
+    def test_unknown_model(self):
+        assert price_for("mistral/mistral-large") is None
+
+
+class TestUsageRecord:
+    """Tests pour le calcul de cout."""
+
+    def test_cost_with_cache(self):
+        record = UsageRecord("A", "anthropic/claude-sonnet-4-5", [], 1_000_000, 100_000, 400_000)
+        # 600k * 3 + 400k * 0.30 + 100k * 15 (par million)
+        assert record.cost_usd == pytest.approx(1.8 + 0.12 + 1.5)
+
+    def test_unknown_model_costs_nothing(self):
+        assert UsageRecord("A", "local/llama", [], 1000, 1000).cost_usd == 0.0
+
+
+class TestCollectUsage:
+    """Tests pour la lecture des compteurs du crew."""
+
+    def test_collects_per_agent_with_tasks(self):
+        scorer = MagicMock(role="Ingenieur Commercial\n", llm=StubLLM("anthropic/claude-sonnet-4-5", 1000, 200, 500))
+        compiler = MagicMock(role="Data Compiler", llm=StubLLM("gemini/gemini-2.0-flash-lite", 300, 50))
+        tasks = [MagicMock(agent=scorer), MagicMock(agent=compiler)]
+        tasks[0].name = "commercial_analysis"
+        tasks[1].name = "compile_final_company_analysis_report"
+        crew = MagicMock(agents=[scorer, compiler], tasks=tasks)
+
+        records = collect_usage(crew)
+
+        assert [r.agent for r in records] == ["Ingenieur Commercial", "Data Compiler"]
+        assert records[0].tasks == ["commercial_analysis"]
+        assert records[0].cached_prompt_tokens == 500
+        assert records[1].total_tokens == 350
+
+    def test_ignores_non_llm_objects(self):
+        assert collect_usage(MagicMock(agents=[MagicMock()], tasks=[])) == []
+
+    def test_aggregate_by_model(self):
+        records = [
+            UsageRecord("A1", "gemini/gemini-2.5-flash", ["t1"], 100, 10),
+            UsageRecord("A2", "gemini/gemini-2.5-flash", ["t2"], 200, 20),
+        ]
+        total = aggregate_usage(records)["gemini/gemini-2.5-flash"]
+        assert (total.prompt_tokens, total.completion_tokens, total.tasks) == (300, 30, ["t1", "t2"])
+
+    def test_format_summary_has_total(self):
+        lines = format_usage_summary([UsageRecord("A", "gemini/gemini-2.5-flash", [], 1000, 100)])
+        assert "Total: 1,100 tokens" in lines[-1]
+
+
+class TestCostReport:
+    """Tests pour le rapport de couts par execution."""
+
+    def test_write_cost_report(self, tmp_path):
+        usage = [UsageRecord("A", "gemini/gemini-2.5-flash", ["t"], 1_000_000, 0)]
+        results = [UrlResult("https://a.com", RunStatus.SUCCESS, "row", None, 1.0, usage=usage)]
+        path = tmp_path / "costs.json"
+
+        write_cost_report(results, path)
+
+        report = json.loads(path.read_text(encoding="utf-8"))
+        assert report["urls"][0]["cost_usd"] == pytest.approx(0.30)
+        assert report["by_model"]["gemini/gemini-2.5-flash"]["prompt_tokens"] == 1_000_000
+        assert report["total"]["cost_usd"] == pytest.approx(0.30)
+
+    async def test_run_single_url_attaches_usage(self, tmp_path):
+        agent = MagicMock(role="Analyste", llm=StubLLM("gemini/gemini-2.5-flash", 1000, 100), tools=[])
+        crew = MagicMock(agents=[agent], tasks=[])
+        crew.kickoff.return_value = MagicMock(raw="row")
+        crew_class = MagicMock()
+        crew_class.return_value.crew.return_value = crew
+
+        result = await run_single_url("https://a.com", crew_class, tmp_path, timeout=60)
+
+        assert result.total_tokens == 1100
+        assert result.cost_usd > 0
+
+
+def _flaky_crew_class():
+    """Premiere tentative en echec apres 1100 tokens, seconde reussie avec 1100 tokens."""
+    attempts = [0]
+
+    def create_instance():
+        attempts[0] += 1
+        agent = MagicMock(role="Analyste", llm=StubLLM("gemini/gemini-2.5-flash", 1000, 100), tools=[])
+        crew = MagicMock(agents=[agent], tasks=[])
+        if attempts[0] == 1:
+            crew.kickoff.side_effect = Exception("429")
+        else:
+            crew.kickoff.return_value = MagicMock(raw="row")
+        instance = MagicMock()
+        instance.crew.return_value = crew
+        return instance
+
+    return MagicMock(side_effect=create_instance)
+
+
+class TestRetryUsage:
+    """Les tokens des tentatives echouees restent dans le cout de l'URL."""
+
+    async def test_run_with_retry_sums_attempts(self, tmp_path):
+        with patch("wakastart_leads.shared.utils.parallel_runner.asyncio.sleep"):
+            result = await run_with_retry("https://a.com", _flaky_crew_class(), tmp_path, 60, 1)
+
+        assert result.status == RunStatus.SUCCESS
+        assert result.total_tokens == 2200
+
+    async def test_run_sequential_sums_attempts(self, tmp_path):
+        with patch("wakastart_leads.shared.utils.parallel_runner.asyncio.sleep"):
+            (result,) = await run_sequential(
+                ["https://a.com"], _flaky_crew_class(), tmp_path, tmp_path / "report.csv", retry_count=1
+            )
+
+        assert result.total_tokens == 2200
+        report = json.loads(next(tmp_path.glob("run_*_costs.json")).read_text(encoding="utf-8"))
+        assert report["total"]["prompt_tokens"] == 2000
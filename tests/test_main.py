@@ -75,3 +75,232 @@ class TestNormalizeUrl:
 
     def test_with_path(self):
         assert normalize_url("https://www.example.com/page") == "example.com/page"
+
+
+# ===========================================================================
+# Tests pipeline recherche -> analyse
+# ===========================================================================
+
+
+class TestRunPipeline:
+    """Tests pour _run_pipeline (URLs des sous-recherches analysees au fil de l'eau)."""
+
+    @pytest.fixture()
+    def pipeline_env(self, tmp_path, monkeypatch):
+        from unittest.mock import MagicMock
+
+        from wakastart_leads import main
+
+        monkeypatch.setattr(main, "ANALYSIS_OUTPUT", tmp_path / "analysis")
+        monkeypatch.setattr(main, "SEARCH_OUTPUT", tmp_path / "search")
+        monkeypatch.setattr(main, "get_name_index", lambda: None)
+
+        analyzed: list[str] = []
+
+        def create_mock_instance():
+            instance = MagicMock()
+
+            def kickoff(inputs):
+                analyzed.append(inputs["url"])
+                return MagicMock(raw=f"Societe,{inputs['url']}")
+
+            instance.crew.return_value.kickoff.side_effect = kickoff
+            return instance
+
+        # Les crews sont importes par les commandes : on remplace celui du package
+        monkeypatch.setattr("wakastart_leads.crews.analysis.AnalysisCrew", MagicMock(side_effect=create_mock_instance))
+        return main, tmp_path, analyzed
+
+    def _args(self, workers=2):
+        import argparse
+
+        return argparse.Namespace(workers=workers, parallel=2, retry=0, timeout=60, include_seen=False)
+
+    @pytest.mark.asyncio
+    async def test_dedupes_against_existing_report(self, pipeline_env, monkeypatch):
+        main, tmp_path, analyzed = pipeline_env
+        report = tmp_path / "analysis" / "company_report.csv"
+        report.parent.mkdir(parents=True)
+        report.write_text("Societe,Site Web\nAcme,https://acme.fr\n", encoding="utf-8-sig")
+        found = {0: ["https://www.acme.fr", "beta.io"], 1: ["https://beta.io/", "https://gamma.com"]}
+        monkeypatch.setattr(main, "_run_subsearch", lambda index, sub, seen=None: found[index])
+
+        criteria = {"keywords": ["a", "b"], "max_results": 10}
+        results = await main._run_pipeline(criteria, self._args())
+
+        assert sorted(analyzed) == ["https://beta.io", "https://gamma.com"]
+        assert len(results) == 2
+        lines = report.read_text(encoding="utf-8-sig").splitlines()
+        assert lines[1] == "Acme,https://acme.fr"
+        assert sorted(lines[2:]) == ["Societe,https://beta.io", "Societe,https://gamma.com"]
+        written = list((tmp_path / "search").glob("search_urls_*.json"))
+        assert json.loads(written[0].read_text(encoding="utf-8")) == ["https://beta.io", "https://gamma.com"]
+
+    @pytest.mark.asyncio
+    async def test_seen_domains_excluded_during_discovery(self, pipeline_env, monkeypatch):
+        from wakastart_leads.shared.utils.seen_index import SeenDomainIndex
+
+        main, _, analyzed = pipeline_env
+        index = SeenDomainIndex()
+        index.add("https://gamma.com")
+        monkeypatch.setattr(main, "_load_seen_indexes", lambda *namespaces: [index])
+        received = []
+
+        def run_subsearch(index_, sub, seen=None):
+            received.append(seen)
+            return ["https://beta.io", "https://gamma.com"]
+
+        monkeypatch.setattr(main, "_run_subsearch", run_subsearch)
+
+        await main._run_pipeline({"keywords": ["a"], "max_results": 10}, self._args(workers=1))
+
+        # Index transmis aux sous-recherches (filtre Serper), filet de securite a la publication
+        assert received == [[index]]
+        assert analyzed == ["https://beta.io"]
+
+    @pytest.mark.asyncio
+    async def test_include_seen_skips_seen_index(self, pipeline_env, monkeypatch):
+        main, _, _ = pipeline_env
+        monkeypatch.setattr(main, "_load_seen_indexes", lambda *namespaces: pytest.fail("index charge"))
+        received = []
+        monkeypatch.setattr(main, "_run_subsearch", lambda index, sub, seen=None: received.append(seen) or [])
+        args = self._args(workers=1)
+        args.include_seen = True
+
+        await main._run_pipeline({"keywords": ["a"], "max_results": 10}, args)
+
+        assert received == [[]]
+
+    @pytest.mark.asyncio
+    async def test_analysis_starts_before_search_ends(self, pipeline_env, monkeypatch):
+        import threading
+
+        from wakastart_leads.crews import analysis
+
+        main, _, analyzed = pipeline_env
+        first_analyzed = threading.Event()
+        original = analysis.AnalysisCrew.side_effect
+
+        def create_and_signal():
+            instance = original()
+            kickoff = instance.crew.return_value.kickoff.side_effect
+
+            def signalling_kickoff(inputs):
+                result = kickoff(inputs)
+                first_analyzed.set()
+                return result
+
+            instance.crew.return_value.kickoff.side_effect = signalling_kickoff
+            return instance
+
+        analysis.AnalysisCrew.side_effect = create_and_signal
+
+        def run_subsearch(index, sub, seen=None):
+            if index == 0:
+                return ["https://first.fr"]
+            # La 2e sous-recherche ne se termine qu'une fois la 1re URL analysee
+            assert first_analyzed.wait(timeout=5)
+            return ["https://second.fr"]
+
+        monkeypatch.setattr(main, "_run_subsearch", run_subsearch)
+
+        await main._run_pipeline({"keywords": ["a", "b"], "max_results": 10}, self._args())
+
+        assert analyzed == ["https://first.fr", "https://second.fr"]
+
+    @pytest.mark.asyncio
+    async def test_max_results_caps_published_urls(self, pipeline_env, monkeypatch):
+        main, _, analyzed = pipeline_env
+        monkeypatch.setattr(
+            main, "_run_subsearch", lambda index, sub, seen=None: [f"https://s{index}-{i}.fr" for i in range(5)]
+        )
+
+        await main._run_pipeline({"keywords": ["a", "b"], "max_results": 3}, self._args(workers=1))
+
+        assert len(analyzed) == 3
+
+
+# ===========================================================================
+# Tests _run_enrichment_batches
+# ===========================================================================
+
+
+class TestRunEnrichmentBatches:
+    """Tests pour _run_enrichment_batches (recuperation partielle et remise en file)."""
+
+    @pytest.fixture()
+    def enrich_env(self, tmp_path, monkeypatch):
+        from unittest.mock import MagicMock
+
+        from wakastart_leads import main
+
+        monkeypatch.setattr(main, "ENRICHMENT_OUTPUT", tmp_path)
+        batches: list[list[str]] = []
+        responses: list[str] = []
+
+        def create_mock_instance():
+            instance = MagicMock()
+
+            def kickoff(inputs):
+                batches.append([line[2:] for line in inputs["urls"].splitlines()])
+                response = responses.pop(0)
+                if isinstance(response, Exception):
+                    raise response
+                return MagicMock(raw=response)
+
+            instance.crew.return_value.kickoff.side_effect = kickoff
+            return instance
+
+        monkeypatch.setattr(
+            "wakastart_leads.crews.enrichment.EnrichmentCrew", MagicMock(side_effect=create_mock_instance)
+        )
+        return main, tmp_path, batches, responses
+
+    def test_requeues_missing_urls(self, enrich_env):
+        from wakastart_leads.crews.enrichment.batching import AdaptiveBatchSizer
+
+        main, tmp_path, batches, responses = enrich_env
+        urls = ["https://a.fr", "https://b.fr", "https://c.fr"]
+        # 1er batch tronque apres a.fr ; b.fr et c.fr sont renvoyes dans le batch suivant
+        responses.append('[{"url": "a.fr", "pertinence": "80 %"}, {"url": "b.fr", "pert')
+        responses.append('[{"url": "b.fr", "pertinence": "60 %"}, {"url": "c.fr", "pertinence": "40 %"}]')
+        accumulated: list[dict] = []
+
+        main._run_enrichment_batches(
+            urls, AdaptiveBatchSizer(initial=3, min_size=3), accumulated, tmp_path / "acc.json"
+        )
+
+        assert batches == [urls, ["https://b.fr", "https://c.fr"]]
+        assert [e["url"] for e in accumulated] == urls
+        assert json.loads((tmp_path / "acc.json").read_text(encoding="utf-8")) == accumulated
+
+    def test_kickoff_error_shrinks_batch_and_requeues(self, enrich_env):
+        from wakastart_leads.crews.enrichment.batching import AdaptiveBatchSizer
+
+        main, tmp_path, batches, responses = enrich_env
+        urls = ["https://a.fr", "https://b.fr"]
+        responses.append(RuntimeError("context length exceeded"))
+        responses.append('[{"url": "a.fr", "pertinence": "80 %"}]')
+        responses.append('[{"url": "b.fr", "pertinence": "60 %"}]')
+        sizer = AdaptiveBatchSizer(initial=2)
+        accumulated: list[dict] = []
+
+        main._run_enrichment_batches(urls, sizer, accumulated, tmp_path / "acc.json")
+
+        assert batches == [urls, ["https://a.fr"], ["https://b.fr"]]
+        assert not sizer.history[0].healthy
+        assert [e["url"] for e in accumulated] == urls
+
+    def test_abandons_after_max_attempts(self, enrich_env):
+        from wakastart_leads.crews.enrichment.batching import AdaptiveBatchSizer
+
+        main, tmp_path, batches, responses = enrich_env
+        responses.extend(["pas de JSON"] * main.ENRICH_MAX_ATTEMPTS)
+        accumulated: list[dict] = []
+
+        main._run_enrichment_batches(
+            ["https://a.fr"], AdaptiveBatchSizer(initial=1), accumulated, tmp_path / "acc.json"
+        )
+
+        assert len(batches) == main.ENRICH_MAX_ATTEMPTS
+        assert accumulated == []